@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Exchange parsing benchmark.
+
+Writes a synthetic exchange log (one million lines by default), then times:
+
+- parse: ``Exchange.from_jsonl`` on every line
+- filter: parsing plus a provider filter, as ``exchanges search --provider``
+  does without an index
+- stats: parsing plus ``ExchangeStats``, which reads timestamps, metadata
+  and timings
+
+and measures the memory held by every line parsed into a list.
+
+    python scripts/bench-exchange-parse.py
+    python scripts/bench-exchange-parse.py --lines 200000 --keep log.jsonl
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROVIDERS = ("openai", "kokoro", "whisper")
+
+
+def write_log(path: Path, lines: int) -> None:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    with open(path, "w") as f:
+        for i in range(lines):
+            tts = i % 2 == 1
+            metadata = {
+                "voice_mode_version": "6.0.0",
+                "provider": PROVIDERS[i % 3],
+                "model": "tts-1" if tts else "whisper-1",
+                "transport": "local",
+                "audio_format": "pcm",
+                "timing": "ttfa 0.8s, gen 1.6s, play 4.1s" if tts else "record 3.2s, stt 1.4s",
+            }
+            if tts:
+                metadata["voice"] = "af_sky"
+            entry = {
+                "version": 4,
+                "timestamp": (start + timedelta(seconds=i * 7)).isoformat(),
+                "conversation_id": f"conv_{i // 20}",
+                "type": "tts" if tts else "stt",
+                "text": f"Exchange number {i} with a sentence or two of transcript text in it.",
+                "project_path": "/home/user/project",
+                "metadata": metadata,
+                "timings": {"ttfa": 812.4, "tts_gen": 1630.2} if tts else {"record": 3214.5, "stt": 1402.1},
+            }
+            f.write(json.dumps(entry) + "\n")
+
+
+def timed(label: str, lines: int, run) -> None:
+    gc.collect()
+    began = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - began
+    print(f"{label:<8} {elapsed:6.2f}s  {lines / elapsed:>11,.0f} lines/s  ({result})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument("--memory-lines", type=int, default=100_000,
+                        help="Lines parsed into a list for the memory measurement")
+    parser.add_argument("--keep", help="Write the log here (and reuse it if it exists)")
+    args = parser.parse_args()
+
+    from voice_mode.exchanges import Exchange, ExchangeFilter, ExchangeStats
+
+    path = Path(args.keep) if args.keep else Path(tempfile.mkdtemp(prefix="voicemode-parse-bench-")) / "exchanges.jsonl"
+    if not path.exists():
+        write_log(path, args.lines)
+    with open(path) as f:
+        lines = f.readlines()[:args.lines]
+    print(f"{len(lines):,} lines, {path.stat().st_size / 1e6:.0f} MB: {path}")
+
+    def parse():
+        count = 0
+        for line in lines:
+            Exchange.from_jsonl(line)
+            count += 1
+        return f"{count:,} exchanges"
+
+    def filter_provider():
+        exchange_filter = ExchangeFilter().by_provider("kokoro")
+        matches = sum(1 for _ in exchange_filter.apply(Exchange.from_jsonl(line) for line in lines))
+        return f"{matches:,} matches"
+
+    def stats():
+        summary = ExchangeStats(Exchange.from_jsonl(line) for line in lines)
+        return f"{summary.total:,} counted"
+
+    timed("parse", len(lines), parse)
+    timed("filter", len(lines), filter_provider)
+    timed("stats", len(lines), stats)
+
+    sample = lines[:args.memory_lines]
+    gc.collect()
+    tracemalloc.start()
+    kept = [Exchange.from_jsonl(line) for line in sample]
+    unread, _ = tracemalloc.get_traced_memory()
+    for exchange in kept:
+        exchange.timestamp, exchange.metadata, exchange.timings
+    decoded, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"memory   {unread / len(kept):,.0f} bytes/exchange as parsed, "
+          f"{decoded / len(kept):,.0f} with timestamp and metadata decoded ({len(kept):,} kept)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Soak test for long-running MCP server sessions.
+
+Runs thousands of converse turns in one event loop, the way a server that
+stays up for days does. The providers are local stand-in TTS and STT
+servers, run in a separate process so they don't count towards our
+resources. The audio goes to a virtual audio device. Every few turns it
+records:
+
+- RSS, open file descriptors and OS threads
+- asyncio tasks and the event logger's in-memory session events
+- files left in the temporary directory
+- memory traced by tracemalloc
+
+The first sample after the warm-up turns is the baseline. The run fails
+(exit status 1) if any measure grows past its budget by the end. Failing
+runs also print the allocation sites that grew the most. The baseline
+RSS includes the tracemalloc snapshot taken with it, a copy of every
+trace that roughly doubles the traced memory; ``--no-tracemalloc``
+measures RSS without that overhead.
+
+The turns mix full conversations, speak-only calls and provider errors.
+That way the error paths (failover, early returns) run as often as the
+happy path.
+
+    python scripts/soak-converse.py --turns 2000
+    python scripts/soak-converse.py --turns 500 --fail-every 7 --report soak.json
+    python scripts/soak-converse.py --real-audio --turns 300
+
+The virtual device replaces the ``sounddevice`` module. It delivers a
+synthetic utterance faster than real time (``--audio-speed``), so VAD,
+STT and chimes all run. With ``--real-audio`` the default PortAudio
+devices are used instead, which also measures PortAudio's own
+re-initialization on every turn. Use a loopback or null device for
+those runs.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+from itertools import count
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SAMPLE_RATE = 24000
+
+# Measure -> (default budget, unit, scale for display)
+BUDGETS = {
+    "rss": (32.0, "MB", 1e6),
+    "traced": (4.0, "MB", 1e6),
+    "fds": (4, "", 1),
+    "threads": (2, "", 1),
+    "tasks": (2, "", 1),
+    "session_events": (50, "", 1),
+    "tmp_files": (0, "", 1),
+}
+
+
+def voiced(seconds: float, sample_rate: int = SAMPLE_RATE):
+    """A vowel-like harmonic signal that WebRTC VAD classifies as speech."""
+    import numpy as np
+
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    pitch = 140 + 20 * np.sin(2 * np.pi * 3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    signal = sum(np.sin(k * phase) / k for k in range(1, 15)) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+    return (signal / np.abs(signal).max() * 8000).astype(np.int16)
+
+
+# Stand-in providers (run in their own process)
+
+def serve_providers(port_queue, tts_seconds: float, fail_every: int) -> None:
+    """OpenAI-compatible /v1/audio/speech and /v1/audio/transcriptions."""
+    import io
+    import wave
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    pcm = voiced(tts_seconds).tobytes()
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(pcm)
+    audio = {"pcm": pcm, "wav": buffer.getvalue()}
+    requests = count(1)
+
+    class Handler(BaseHTTPRequestHandler):
+        # Keep-alive, like the real services
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            # In pieces, so streaming playback gets several chunks
+            for start in range(0, len(body), 4096):
+                self.wfile.write(body[start:start + 4096])
+
+        def do_GET(self):
+            if self.path.rstrip("/").endswith("/models"):
+                models = [{"id": "tts-1", "object": "model"}, {"id": "whisper-1", "object": "model"}]
+                self._send(200, json.dumps({"object": "list", "data": models}).encode(), "application/json")
+            else:
+                self._send(200, b"ok", "text/plain")
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            number = next(requests)
+            if fail_every and number % fail_every == 0:
+                error = {"error": {"message": "Stand-in provider failure", "type": "server_error"}}
+                self._send(503, json.dumps(error).encode(), "application/json")
+            elif self.path.endswith("/audio/speech"):
+                response_format = json.loads(body).get("response_format", "pcm")
+                self._send(200, audio.get(response_format, audio["wav"]), f"audio/{response_format}")
+            elif self.path.endswith("/audio/transcriptions"):
+                self._send(200, f"soak reply {number}".encode(), "text/plain")
+            else:
+                self._send(404, b"not found", "text/plain")
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+# Virtual audio device
+
+def virtual_sounddevice(speed: float, speech_seconds: float) -> types.ModuleType:
+    """A stand-in for the ``sounddevice`` module with one input and one output.
+
+    Input streams run their callback on a thread, as PortAudio does. The
+    callback gets half a second of silence, ``speech_seconds`` of speech
+    and then silence, at ``speed`` times real time. Output blocks for
+    the length of the audio divided by ``speed``.
+    """
+    import numpy as np
+
+    sd = types.ModuleType("sounddevice")
+    sd.__version__ = "virtual"
+    utterance = np.concatenate([np.zeros(SAMPLE_RATE // 2, dtype=np.int16), voiced(speech_seconds)])
+    state = {"until": 0.0, "reinitializations": 0}
+
+    def utterance_at(position: int, frames: int):
+        block = utterance[position:position + frames]
+        if len(block) < frames:
+            block = np.concatenate([block, np.zeros(frames - len(block), dtype=np.int16)])
+        return block
+
+    def block_until(deadline: float) -> None:
+        remaining = deadline - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    class PortAudioError(Exception):
+        pass
+
+    class CallbackFlags:
+        input_underflow = input_overflow = output_underflow = output_overflow = False
+
+        def __bool__(self):
+            return False
+
+    devices = [
+        {"name": "Virtual Microphone", "index": 0, "max_input_channels": 1, "max_output_channels": 0,
+         "default_samplerate": float(SAMPLE_RATE), "hostapi": 0},
+        {"name": "Virtual Speaker", "index": 1, "max_input_channels": 0, "max_output_channels": 2,
+         "default_samplerate": float(SAMPLE_RATE), "hostapi": 0},
+    ]
+
+    def query_devices(device=None, kind=None):
+        if kind is not None:
+            return devices[0 if kind == "input" else 1]
+        if device is not None:
+            return devices[device]
+        return list(devices)
+
+    def play(data, samplerate=None, **kwargs):
+        state["until"] = time.perf_counter() + len(data) / (samplerate or SAMPLE_RATE) / speed
+
+    def wait(ignore_errors=True):
+        block_until(state["until"])
+
+    def stop(ignore_errors=True):
+        state["until"] = 0.0
+
+    def rec(frames, samplerate=None, channels=1, dtype=None, **kwargs):
+        play(range(frames), samplerate)
+        return utterance_at(0, frames).reshape(-1, 1)
+
+    def _initialize():
+        state["reinitializations"] += 1
+
+    def _terminate():
+        pass
+
+    class InputStream:
+        def __init__(self, samplerate=None, blocksize=None, channels=1, dtype=None, callback=None, **kwargs):
+            self.samplerate = samplerate or SAMPLE_RATE
+            self.blocksize = blocksize or SAMPLE_RATE // 100
+            self.callback = callback
+            self.latency = 0.01
+            self.active = False
+            self._stop = threading.Event()
+            self._thread = None
+
+        def _run(self):
+            position = 0
+            interval = self.blocksize / self.samplerate / speed
+            deadline = time.perf_counter()
+            while not self._stop.is_set():
+                now = time.perf_counter()
+                time_info = types.SimpleNamespace(inputBufferAdcTime=now - self.latency, currentTime=now,
+                                                  outputBufferDacTime=0.0)
+                self.callback(utterance_at(position, self.blocksize).reshape(-1, 1), self.blocksize,
+                              time_info, CallbackFlags())
+                position += self.blocksize
+                deadline += interval
+                self._stop.wait(max(0.0, deadline - time.perf_counter()))
+
+        def start(self):
+            self.active = True
+            self._thread = threading.Thread(target=self._run, name="virtual-input", daemon=True)
+            self._thread.start()
+
+        def stop(self):
+            self._stop.set()
+            if self._thread is not None:
+                self._thread.join()
+            self.active = False
+
+        close = abort = stop
+
+        def __enter__(self):
+            self.start()
+            return self
+
+        def __exit__(self, *exc_info):
+            self.close()
+
+    class OutputStream:
+        def __init__(self, samplerate=None, channels=1, dtype=None, callback=None, **kwargs):
+            self.samplerate = samplerate or SAMPLE_RATE
+            self.latency = 0.02
+            self.active = False
+            self._until = 0.0
+
+        def start(self):
+            self.active = True
+
+        def write(self, data):
+            self._until = max(self._until, time.perf_counter()) + len(data) / self.samplerate / speed
+            block_until(self._until)
+            return False
+
+        def stop(self):
+            block_until(self._until)
+            self.active = False
+
+        def abort(self):
+            self.active = False
+
+        close = abort
+
+    sd.PortAudioError = PortAudioError
+    sd.CallbackFlags = CallbackFlags
+    sd.default = types.SimpleNamespace(device=[0, 1], samplerate=None, channels=None)
+    sd.query_devices = query_devices
+    sd.play, sd.wait, sd.stop, sd.rec = play, wait, stop, rec
+    sd._initialize, sd._terminate = _initialize, _terminate
+    sd.InputStream, sd.OutputStream = InputStream, OutputStream
+    sd.state = state
+    return sd
+
+
+# Measurements
+
+def sample(turn: int, process, tmp_dir: Path) -> dict:
+    from voice_mode.utils import get_event_logger
+
+    gc.collect()
+    event_logger = get_event_logger()
+    return {
+        "turn": turn,
+        "time": time.time(),
+        "rss": process.memory_info().rss,
+        "traced": tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0,
+        "fds": process.num_fds() if hasattr(process, "num_fds") else process.num_handles(),
+        "threads": process.num_threads(),
+        "tasks": len(asyncio.all_tasks()),
+        "session_events": len(event_logger.session_events) if event_logger else 0,
+        "tmp_files": sum(1 for path in tmp_dir.rglob("*") if path.is_file()),
+    }
+
+
+def show(measure: str, value: float) -> str:
+    _, unit, scale = BUDGETS[measure]
+    return f"{value / scale:.1f} {unit}".strip() if unit else str(int(value))
+
+
+def top_allocations(baseline, snapshot, limit: int) -> list:
+    ignore = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+    stats = snapshot.filter_traces(ignore).compare_to(baseline.filter_traces(ignore), "lineno")
+    return [stat for stat in stats if stat.size_diff > 0][:limit]
+
+
+def classify(result: str) -> str:
+    if result.startswith("Voice response"):
+        return "transcribed"
+    if result.startswith("No speech"):
+        return "no_speech"
+    if result.startswith("✓"):
+        return "spoke"
+    return "error"
+
+
+# Driver
+
+async def soak(args, tmp_dir: Path) -> dict:
+    import psutil
+
+    from voice_mode.config import EVENT_LOG_DIR, EVENT_LOG_ENABLED
+    from voice_mode.tools.converse import converse
+    from voice_mode.utils import initialize_event_logger
+
+    # As the server sets it up
+    if EVENT_LOG_ENABLED:
+        initialize_event_logger(log_dir=Path(EVENT_LOG_DIR), enabled=True)
+
+    process = psutil.Process()
+    samples, outcomes = [], {}
+    baseline_snapshot = None
+    began = time.perf_counter()
+    for turn in range(1, args.turns + 1):
+        if args.speak_only_every and turn % args.speak_only_every == 0:
+            result = await converse.fn(message=f"Soak turn {turn}, no reply needed", wait_for_response=False,
+                                       wait_for_playback=True, transport="local")
+        else:
+            result = await converse.fn(message=f"Soak turn {turn}", wait_for_response=True, transport="local",
+                                       listen_duration_max=args.listen_max, listen_duration_min=0.5)
+        outcome = classify(result)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        if outcome == "error" and args.verbose:
+            print(f"turn {turn}: {result.splitlines()[0]}", file=sys.stderr)
+
+        if turn == args.warmup or (turn > args.warmup and turn % args.sample_every == 0) or turn == args.turns:
+            if turn == args.warmup and tracemalloc.is_tracing():
+                # Before the sample: the snapshot holds a copy of every trace
+                # (about as much again as the traced memory) until the end
+                baseline_snapshot = tracemalloc.take_snapshot()
+            samples.append(sample(turn, process, tmp_dir))
+            current = samples[-1]
+            rate = turn / (time.perf_counter() - began)
+            print(f"turn {turn:6d}  " + "  ".join(f"{m} {show(m, current[m])}" for m in BUDGETS)
+                  + f"  ({rate:.1f} turns/s)", flush=True)
+
+    snapshot = tracemalloc.take_snapshot() if baseline_snapshot is not None else None
+    return {
+        "samples": samples,
+        "outcomes": outcomes,
+        "elapsed": time.perf_counter() - began,
+        "allocations": top_allocations(baseline_snapshot, snapshot, args.top) if snapshot else [],
+    }
+
+
+def check(result: dict, budgets: dict) -> bool:
+    samples = result["samples"]
+    baseline, final = samples[0], samples[-1]
+    ok = True
+    print()
+    print(f"Growth from turn {baseline['turn']} to turn {final['turn']}:")
+    print(f"{'Measure':16s} {'Baseline':>12s} {'End':>12s} {'Growth':>12s} {'Budget':>12s}")
+    print("-" * 68)
+    for measure in BUDGETS:
+        growth = final[measure] - baseline[measure]
+        over = growth > budgets[measure]
+        ok = ok and not over
+        print(f"{measure:16s} {show(measure, baseline[measure]):>12s} {show(measure, final[measure]):>12s} "
+              f"{show(measure, growth):>12s} {show(measure, budgets[measure]):>12s}{'  OVER' if over else ''}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50, help="Turns before the baseline sample")
+    parser.add_argument("--sample-every", type=int, default=50, help="Turns between samples")
+    parser.add_argument("--speak-only-every", type=int, default=4,
+                        help="Every Nth turn only speaks (wait_for_response=False); 0 for never")
+    parser.add_argument("--fail-every", type=int, default=11,
+                        help="Every Nth provider request fails with a 503; 0 for never")
+    parser.add_argument("--listen-max", type=float, default=5.0, help="listen_duration_max per turn (s)")
+    parser.add_argument("--tts-seconds", type=float, default=1.0, help="Length of the stand-in TTS audio")
+    parser.add_argument("--speech-seconds", type=float, default=1.0, help="Length of the virtual utterance")
+    parser.add_argument("--audio-speed", type=float, default=25.0,
+                        help="How much faster than real time the virtual device runs")
+    parser.add_argument("--real-audio", action="store_true", help="Use the PortAudio default devices")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip tracemalloc (runs faster)")
+    parser.add_argument("--top", type=int, default=15, help="Allocation sites to show")
+    parser.add_argument("--report", help="Write the samples and outcomes to this JSON file")
+    parser.add_argument("--dir", help="VoiceMode home for the run (default: a temporary directory)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log at INFO and print failed turns")
+    for measure, (default, unit, _) in BUDGETS.items():
+        parser.add_argument(f"--max-{measure.replace('_', '-')}", type=float, default=default,
+                            help=f"Budget for {measure} growth{f' ({unit})' if unit else ''} (default: {default})")
+    args = parser.parse_args()
+    if args.turns <= args.warmup:
+        parser.error("--turns must be greater than --warmup")
+    budgets = {measure: getattr(args, f"max_{measure}") * BUDGETS[measure][2] for measure in BUDGETS}
+
+    home = Path(args.dir or tempfile.mkdtemp(prefix="voicemode-soak-"))
+    tmp_dir = home / "tmp"
+    tmp_dir.mkdir(parents=True, exist_ok=True)
+
+    context = multiprocessing.get_context("spawn")
+    port_queue = context.Queue()
+    providers = context.Process(target=serve_providers, args=(port_queue, args.tts_seconds, args.fail_every),
+                                daemon=True)
+    providers.start()
+    base_url = f"http://127.0.0.1:{port_queue.get(timeout=30)}/v1"
+
+    # Before voice_mode reads its configuration
+    os.environ.update({
+        "HOME": str(home),
+        "VOICEMODE_BASE_DIR": str(home / ".voicemode"),
+        "VOICEMODE_TTS_BASE_URLS": base_url,
+        "VOICEMODE_STT_BASE_URLS": base_url,
+        "VOICEMODE_TTS_AUDIO_FORMAT": "pcm",
+        "VOICEMODE_DAEMON_AUTO_CONNECT": "false",
+        "TMPDIR": str(tmp_dir),
+    })
+    tempfile.tempdir = str(tmp_dir)
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR,
+                        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    virtual = None
+    if not args.real_audio:
+        virtual = sys.modules["sounddevice"] = virtual_sounddevice(args.audio_speed, args.speech_seconds)
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    print(f"Soaking {args.turns} turns against {base_url} "
+          f"({'PortAudio default devices' if args.real_audio else f'virtual audio at {args.audio_speed:g}x'})")
+    try:
+        result = asyncio.run(soak(args, tmp_dir))
+    finally:
+        providers.terminate()
+
+    ok = check(result, budgets)
+    print()
+    print(f"{args.turns} turns in {result['elapsed']:.0f}s: "
+          + ", ".join(f"{n} {outcome}" for outcome, n in sorted(result["outcomes"].items())))
+    if virtual is not None:
+        print(f"Audio system re-initialized {virtual.state['reinitializations']} times")
+    if result["allocations"] and (not ok or args.verbose):
+        print()
+        print("Allocation sites that grew the most since the baseline:")
+        for stat in result["allocations"]:
+            frame = stat.traceback[0]
+            print(f"  {stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  {frame.filename}:{frame.lineno}")
+
+    if args.report:
+        report = {
+            "turns": args.turns,
+            "elapsed": result["elapsed"],
+            "outcomes": result["outcomes"],
+            "budgets": budgets,
+            "samples": result["samples"],
+            "allocations": [{"file": stat.traceback[0].filename, "line": stat.traceback[0].lineno,
+                             "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+                            for stat in result["allocations"]],
+            "ok": ok,
+        }
+        Path(args.report).write_text(json.dumps(report, indent=2))
+        print(f"Report written to {args.report}")
+    if not args.dir:
+        shutil.rmtree(home, ignore_errors=True)
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
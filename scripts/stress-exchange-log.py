@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Multi-process stress test for the exchange log.
+
+Starts several processes that log exchanges to the same daily file at once,
+the way concurrent MCP server sessions do, then checks the file: every line
+must parse, and each process's sequence numbers must appear exactly once
+and in order. Prints throughput.
+
+    python scripts/stress-exchange-log.py --processes 8 --records 5000
+    python scripts/stress-exchange-log.py --text-bytes 70000 --fsync batch
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def worker(log_dir: str, records: int, text_bytes: int, batch_size: int, fsync: str, start) -> None:
+    from voice_mode.conversation_logger import ConversationLogger
+    from voice_mode.utils.append_log import AppendLogWriter
+
+    writer = AppendLogWriter(batch_size=batch_size, flush_interval=0.05, fsync=fsync, max_queue=records + 1)
+    conversation_logger = ConversationLogger(base_dir=Path(log_dir), writer=writer)
+    text = ("word " * (text_bytes // 5 + 1))[:text_bytes]
+    start.wait()
+    for i in range(records):
+        if i % 2:
+            conversation_logger.log_tts(text, provider="kokoro", timings={"ttfa": 0.1})
+        else:
+            conversation_logger.log_stt(text, provider="whisper", timings={"record": 1.0})
+    writer.close(timeout=60)
+    if writer.dropped or writer.errors:
+        print(f"pid {os.getpid()}: {writer.dropped} dropped, {writer.errors} errors", file=sys.stderr)
+
+
+def check(log_dir: Path, processes: int, records: int) -> bool:
+    sequences = defaultdict(list)
+    bad_lines = 0
+    for log_file in sorted(log_dir.glob("exchanges_*.jsonl")):
+        with open(log_file, "rb") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    entry = json.loads(line)
+                    sequences[entry["pid"]].append(entry["seq"])
+                except (ValueError, KeyError) as e:
+                    bad_lines += 1
+                    print(f"{log_file.name}:{line_number}: corrupt line ({e})")
+
+    ok = bad_lines == 0 and len(sequences) == processes
+    for pid, seqs in sequences.items():
+        if seqs != list(range(1, records + 1)):
+            ok = False
+            print(f"pid {pid}: {len(seqs)} records, sequence numbers missing or out of order")
+    print(f"Lines checked: {sum(len(s) for s in sequences.values())}, corrupt: {bad_lines}")
+    return ok
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--records", type=int, default=2000, help="Records per process")
+    parser.add_argument("--text-bytes", type=int, default=200, help="Transcript size per record")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--fsync", choices=("never", "batch", "always"), default="never")
+    parser.add_argument("--dir", help="Log directory (default: a temporary directory)")
+    args = parser.parse_args()
+
+    log_dir = Path(args.dir or tempfile.mkdtemp(prefix="voicemode-log-stress-"))
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    context = multiprocessing.get_context("spawn")
+    start = context.Event()
+    workers = [
+        context.Process(target=worker, args=(str(log_dir), args.records, args.text_bytes,
+                                             args.batch_size, args.fsync, start))
+        for _ in range(args.processes)
+    ]
+    for process in workers:
+        process.start()
+    time.sleep(1.0)  # Let the workers import before timing
+    began = time.perf_counter()
+    start.set()
+    for process in workers:
+        process.join()
+    elapsed = time.perf_counter() - began
+
+    total = args.processes * args.records
+    size = sum(f.stat().st_size for f in log_dir.glob("exchanges_*.jsonl"))
+    print(f"{args.processes} processes x {args.records} records ({args.text_bytes} byte transcripts, "
+          f"fsync={args.fsync}) in {elapsed:.2f}s")
+    print(f"Throughput: {total / elapsed:,.0f} records/s, {size / elapsed / 1e6:.1f} MB/s")
+    print(f"Log directory: {log_dir}")
+    ok = check(log_dir, args.processes, args.records)
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
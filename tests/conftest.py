@@ -49,3 +49,13 @@ def mock_subprocess(monkeypatch):
     monkeypatch.setattr("subprocess.Popen", mock.Popen)
     monkeypatch.setattr("subprocess.run", mock.run)
     return mock
+
+
+@pytest.fixture(autouse=True)
+def isolated_probe_cache(monkeypatch):
+    """Keep persisted probe results (~/.voicemode/cache/probes.json) out of tests."""
+    from voice_mode.utils import probe_cache
+    from voice_mode.utils.dependencies import cache as dependency_cache
+
+    monkeypatch.setattr(probe_cache, "_probe_cache", probe_cache.ProbeCache(enabled=False))
+    monkeypatch.setattr(dependency_cache, "_dependency_cache", None)
@@ -0,0 +1,153 @@
+"""Tests for streaming statistics accumulators."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from voice_mode.accumulators import QuantileSketch, RunningStats
+from voice_mode.exchanges import Exchange, ExchangeMetadata, ExchangeStats
+from voice_mode.statistics import ConversationStatistics
+
+
+def _exact_quantile(values, q):
+    values = sorted(values)
+    return values[int(q * (len(values) - 1))]
+
+
+class TestQuantileSketch:
+    """Test percentile estimates and merging."""
+
+    def test_relative_accuracy(self):
+        rng = random.Random(42)
+        values = [rng.lognormvariate(0, 1.5) for _ in range(20000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+        for q in (0.5, 0.95, 0.99):
+            exact = _exact_quantile(values, q)
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_merge_matches_single_sketch(self):
+        values = [i / 10 for i in range(1, 1001)]
+        whole, left, right = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for value in values:
+            whole.add(value)
+        for value in values[:300]:
+            left.add(value)
+        for value in values[300:]:
+            right.add(value)
+        left.merge(right)
+        assert left.count == whole.count
+        assert left.quantile(0.95) == whole.quantile(0.95)
+
+    def test_zero_and_empty(self):
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+        sketch.add(0.0)
+        sketch.add(0.0)
+        sketch.add(5.0)
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(5.0, rel=0.01)
+
+    def test_merge_requires_same_accuracy(self):
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.05))
+
+
+class TestRunningStats:
+    """Test the count/sum/min/max accumulator."""
+
+    def test_summary(self):
+        stats = RunningStats([3.0, 1.0, 2.0])
+        summary = stats.to_dict()
+        assert summary['avg'] == 2.0
+        assert summary['min'] == 1.0
+        assert summary['max'] == 3.0
+        assert summary['count'] == 3
+        assert summary['p50'] == pytest.approx(2.0, rel=0.01)
+        assert RunningStats().to_dict() == {}
+
+    def test_merge_and_state_round_trip(self):
+        stats = RunningStats([1.0, 2.0])
+        stats.merge(RunningStats([10.0]))
+        stats.merge(RunningStats())
+        restored = RunningStats.from_state(stats.to_state())
+        assert restored.to_dict() == stats.to_dict()
+        assert restored.max == 10.0
+
+
+def _exchange(minute, type, timing=None, conversation="conv_a", provider="openai", error=None):
+    start = datetime(2025, 1, 1, 9, 0, tzinfo=timezone.utc)
+    return Exchange(
+        version=3,
+        timestamp=start + timedelta(minutes=minute),
+        conversation_id=conversation,
+        type=type,
+        text="one two three",
+        metadata=ExchangeMetadata(voice_mode_version="1", provider=provider, timing=timing, error=error),
+    )
+
+
+@pytest.fixture
+def exchanges():
+    return [
+        _exchange(0, "tts", "ttfa 1.0s, gen 2.0s, play 3.0s"),
+        _exchange(1, "stt", "record 5.0s, stt 0.5s"),
+        _exchange(2, "tts", "ttfa 2.0s, gen 1.0s, play 4.0s", error="Connection refused"),
+        _exchange(60, "stt", "record 4.0s, stt 1.5s", conversation="conv_b", provider="whisper"),
+    ]
+
+
+class TestExchangeStats:
+    """Test single-pass exchange statistics."""
+
+    def test_consumes_iterator_once(self, exchanges):
+        stats = ExchangeStats(iter(exchanges))
+        assert stats.total == 4
+        assert stats.stt_count == 2
+        timing = stats.timing_stats()
+        assert timing['tts']['ttfa']['avg'] == 1.5
+        assert timing['stt']['processing']['max'] == 1.5
+        assert timing['overall']['turnaround_count'] == 3
+        assert stats.provider_breakdown() == {'openai': 3, 'whisper': 1}
+        assert stats.error_stats()['error_types'] == {'network': 1}
+        assert stats.conversation_stats()['total_conversations'] == 2
+
+    def test_merge_equals_single_pass(self, exchanges):
+        whole = ExchangeStats(exchanges)
+        merged = ExchangeStats(exchanges[:2]).merge(ExchangeStats(exchanges[2:]))
+        assert merged.to_dict() == whole.to_dict()
+
+    def test_empty(self):
+        stats = ExchangeStats()
+        assert stats.total == 0
+        assert stats.timing_stats() == {'stt': {}, 'tts': {}, 'overall': {}}
+        assert "Total Exchanges: 0" in stats.get_summary_report()
+
+
+class TestSessionStatistics:
+    """Test the in-process session tracker."""
+
+    def test_percentiles_and_export(self):
+        tracker = ConversationStatistics()
+        for i in range(1, 11):
+            tracker.add_conversation_result("hi", "ok", timing_str=f"ttfa {i / 10}s, total {i}s")
+        tracker.add_conversation_result("hi", "", success=False, error_message="boom")
+        stats = tracker.get_session_statistics()
+        assert stats.total_interactions == 11
+        assert stats.failed_interactions == 1
+        assert stats.max_total_time == 10.0
+        assert stats.percentiles['total_time']['p50'] == pytest.approx(5.0, rel=0.02)
+        # Exporting takes the tracker lock once only
+        assert tracker.export_metrics()['statistics']['total_interactions'] == 11
+
+    def test_totals_cover_whole_session(self):
+        tracker = ConversationStatistics()
+        tracker._max_metrics = 5
+        tracker.clear_statistics()
+        for i in range(20):
+            tracker.add_conversation_result("hi", "ok", timing_str=f"total {i}s")
+        assert tracker.get_session_statistics().total_interactions == 20
+        assert tracker.get_session_statistics().min_total_time == 0.0
+        assert len(tracker.get_recent_metrics(50)) == 5
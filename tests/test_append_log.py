@@ -0,0 +1,223 @@
+"""Tests for the buffered append-log writer."""
+
+import json
+import os
+import time
+from datetime import datetime
+
+import pytest
+
+from voice_mode.conversation_logger import ConversationLogger
+from voice_mode.utils.append_log import AppendLogWriter, fcntl, rewrite_log
+from voice_mode.utils.event_logger import EventLogger
+
+
+@pytest.fixture
+def writer():
+    writer = AppendLogWriter(batch_size=10, flush_interval=0.05)
+    yield writer
+    writer.close()
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_batches_and_flush(writer, tmp_path):
+    path = tmp_path / "logs" / "a.jsonl"
+    for i in range(25):
+        assert writer.write(path, {"n": i})
+    assert writer.flush()
+    assert [entry["n"] for entry in _lines(path)] == list(range(25))
+    stats = writer.stats()
+    assert stats["written"] == 25
+    assert stats["queued"] == 0
+    assert 3 <= stats["batches"] <= 25
+
+
+def test_flush_interval_writes_partial_batch(tmp_path):
+    writer = AppendLogWriter(batch_size=1000, flush_interval=0.05)
+    path = tmp_path / "a.jsonl"
+    writer.write(path, "already serialized")
+    deadline = time.monotonic() + 5
+    while not path.exists() or not path.read_text():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert path.read_text() == "already serialized\n"
+    writer.close()
+
+
+def test_records_split_between_files(writer, tmp_path):
+    yesterday, today = tmp_path / "day1.jsonl", tmp_path / "day2.jsonl"
+    writer.write(yesterday, {"n": 1})
+    writer.write(today, {"n": 2})
+    writer.write(yesterday, {"n": 3})
+    writer.flush()
+    assert [entry["n"] for entry in _lines(yesterday)] == [1, 3]
+    assert [entry["n"] for entry in _lines(today)] == [2]
+
+
+def test_reopens_deleted_file(writer, tmp_path):
+    path = tmp_path / "a.jsonl"
+    writer.write(path, {"n": 1})
+    writer.flush()
+    path.unlink()
+    writer.write(path, {"n": 2})
+    writer.flush()
+    assert _lines(path) == [{"n": 2}]
+
+
+def test_rewrite_log(tmp_path):
+    path = tmp_path / "a.jsonl"
+    path.write_text('{"n": 1}\n{"n": 2}\nnot json\n{"n": 3')
+    inode = path.stat().st_ino
+
+    assert rewrite_log(path, lambda line: line) == 0
+    assert path.stat().st_ino == inode
+
+    assert rewrite_log(path, lambda line: line.replace("2", "20")) == 1
+    assert path.read_text() == '{"n": 1}\n{"n": 20}\nnot json\n{"n": 3'
+    assert path.stat().st_ino != inode
+    assert [p.name for p in tmp_path.iterdir()] == ["a.jsonl"]
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs flock")
+def test_append_waiting_for_rewrite_goes_to_new_file(writer, tmp_path):
+    path = tmp_path / "a.jsonl"
+    writer.write(path, {"n": 1})
+    writer.flush()
+
+    def transform(line):
+        # The writer blocks on the lock with the old file open
+        writer.write(path, {"n": 2})
+        time.sleep(0.3)
+        return line.replace("1", "10")
+
+    assert rewrite_log(path, transform) == 1
+    assert writer.flush()
+    assert _lines(path) == [{"n": 10}, {"n": 2}]
+
+
+def test_full_queue_drops(tmp_path):
+    writer = AppendLogWriter(batch_size=1, max_queue=1)
+    # Hold the writer lock so the thread cannot drain the queue
+    with writer._lock:
+        results = [writer.write(tmp_path / "a.jsonl", {"n": i}) for i in range(50)]
+    assert not all(results)
+    assert writer.stats()["dropped"] == results.count(False)
+    writer.close()
+    assert len(_lines(tmp_path / "a.jsonl")) == results.count(True)
+
+
+def test_bad_record_does_not_stop_writer(writer, tmp_path):
+    path = tmp_path / "a.jsonl"
+    writer.write(path, {"bad": object()})
+    writer.write(path, {"n": 1})
+    writer.flush()
+    assert _lines(path) == [{"n": 1}]
+    assert writer.stats()["errors"] == 1
+
+
+def test_writes_after_close_are_synchronous(tmp_path):
+    writer = AppendLogWriter()
+    writer.close()
+    path = tmp_path / "a.jsonl"
+    writer.write(path, {"n": 1})
+    assert _lines(path) == [{"n": 1}]
+
+
+@pytest.mark.parametrize("fsync", ["batch", "always"])
+def test_fsync_policies(tmp_path, fsync):
+    writer = AppendLogWriter(fsync=fsync)
+    writer.write(tmp_path / "a.jsonl", {"n": 1})
+    writer.close()
+    assert _lines(tmp_path / "a.jsonl") == [{"n": 1}]
+    with pytest.raises(ValueError):
+        AppendLogWriter(fsync="sometimes")
+
+
+def test_loggers_share_writer(writer, tmp_path):
+    conversations = ConversationLogger(base_dir=tmp_path / "conversations", writer=writer)
+    events = EventLogger(log_dir=tmp_path / "events", writer=writer)
+    conversations.log_stt("hello")
+    events.log_event(EventLogger.STT_COMPLETE, {"text": "hello"})
+    assert conversations.flush()
+
+    exchange_log = next((tmp_path / "conversations").glob("exchanges_*.jsonl"))
+    event_log = next((tmp_path / "events").glob("voicemode_events_*.jsonl"))
+    assert _lines(exchange_log)[0]["text"] == "hello"
+    assert _lines(event_log)[0]["event_type"] == EventLogger.STT_COMPLETE
+
+
+def _log_from_process(log_dir, records):
+    from voice_mode.conversation_logger import ConversationLogger
+    from voice_mode.utils.append_log import AppendLogWriter
+
+    writer = AppendLogWriter(batch_size=7, flush_interval=0.01)
+    conversation_logger = ConversationLogger(base_dir=log_dir, writer=writer)
+    for _ in range(records):
+        conversation_logger.log_stt("word " * 4000, provider="whisper")
+    writer.close()
+
+
+def test_concurrent_processes_do_not_corrupt_lines(tmp_path):
+    import multiprocessing
+
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_log_from_process, args=(tmp_path, 100)) for _ in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(60)
+        assert process.exitcode == 0
+
+    sequences = {}
+    for entry in _lines(next(tmp_path.glob("exchanges_*.jsonl"))):
+        sequences.setdefault(entry["pid"], []).append(entry["seq"])
+    assert len(sequences) == 4
+    assert all(seqs == list(range(1, 101)) for seqs in sequences.values())
+
+
+class TestConversationContinuity:
+    """Conversation IDs when several processes share a log."""
+
+    def _entry(self, pid, conversation_id="conv_other", project=None):
+        return json.dumps({
+            "version": 4,
+            "timestamp": datetime.now().astimezone().isoformat(),
+            "pid": pid,
+            "seq": 1,
+            "conversation_id": conversation_id,
+            "type": "stt",
+            "text": "hi",
+            "project_path": project or os.getcwd(),
+        })
+
+    def _log(self, tmp_path, *lines):
+        path = tmp_path / f"exchanges_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+        path.write_text("".join(line + "\n" for line in lines))
+        return path
+
+    def test_running_process_conversation_not_joined(self, tmp_path, writer):
+        # The parent of this process (pytest's launcher or shell) is running
+        self._log(tmp_path, self._entry(os.getppid()))
+        assert ConversationLogger(base_dir=tmp_path, writer=writer).conversation_id != "conv_other"
+
+    def test_exited_process_conversation_continued(self, tmp_path, writer):
+        self._log(tmp_path, self._entry(_exited_pid()))
+        assert ConversationLogger(base_dir=tmp_path, writer=writer).conversation_id == "conv_other"
+
+    def test_torn_last_line_skipped(self, tmp_path, writer):
+        path = self._log(tmp_path, self._entry(_exited_pid()))
+        with open(path, "a") as f:
+            f.write(self._entry(_exited_pid(), "conv_torn")[:40])
+        assert ConversationLogger(base_dir=tmp_path, writer=writer).conversation_id == "conv_other"
+
+
+def _exited_pid():
+    import subprocess
+    import sys
+
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
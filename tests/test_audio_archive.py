@@ -0,0 +1,205 @@
+"""Tests for archival and retention of saved audio."""
+
+import json
+import os
+import shutil
+import struct
+import time
+import wave
+from pathlib import Path
+
+import pytest
+
+from voice_mode import audio_archive
+from voice_mode.audio_archive import ArchiveInProgress, AudioArchiver, LOCK_FILE, _RunLock
+from voice_mode.core import find_audio_file, get_audio_path
+
+DAY = 86400
+NOW = time.time()
+
+
+def _fake_transcode(source, bitrate, ffmpeg='ffmpeg'):
+    """Stand-in for ffmpeg: an Opus file a tenth the size."""
+    src = Path(source)
+    if b"corrupt" in src.read_bytes():
+        return source, None, f"{src.name}: Invalid data found when processing input"
+    target = src.with_suffix('.opus')
+    target.write_bytes(b"O" * (src.stat().st_size // 10))
+    mtime = src.stat().st_mtime
+    os.utime(target, (mtime, mtime))
+    return source, str(target), None
+
+
+def _audio(audio_dir, name, age_days, size=10000, data=None):
+    path = get_audio_path(name, audio_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data if data is not None else b"\0" * size)
+    mtime = NOW - age_days * DAY
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def _log(logs_dir, day, *audio_files):
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    with open(logs_dir / f"exchanges_{day}.jsonl", "a") as f:
+        for audio_file in audio_files:
+            f.write(json.dumps({"conversation_id": "conv_1", "type": "stt", "text": "hi",
+                                "audio_file": audio_file}) + "\n")
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_archive, "transcode", _fake_transcode)
+    monkeypatch.setattr(audio_archive.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+    return tmp_path / "audio", tmp_path / "logs"
+
+
+def _archiver(dirs, **kwargs):
+    options = dict(after_days=7, bitrate=24000, max_age_days=0, max_size=0, workers=0)
+    options.update(kwargs)
+    return AudioArchiver(dirs[0], dirs[1], **options)
+
+
+def test_transcodes_old_audio_and_updates_references(dirs):
+    audio_dir, logs_dir = dirs
+    old = _audio(audio_dir, "20250103_235959_000_conv_stt.wav", age_days=30)
+    recent = _audio(audio_dir, "20250110_120000_000_conv_tts.wav", age_days=1)
+    _log(logs_dir, "2025-01-03", "other.wav")
+    # Logged just after midnight
+    _log(logs_dir, "2025-01-04", old.name, recent.name)
+
+    report = _archiver(dirs).run()
+
+    assert report.transcoded == 1
+    assert report.references_updated == 1
+    assert report.reclaimed == 9000
+    assert not old.exists()
+    assert old.with_suffix(".opus").stat().st_mtime == pytest.approx(NOW - 30 * DAY)
+    assert recent.exists()
+    entries = [json.loads(line) for line in (logs_dir / "exchanges_2025-01-04.jsonl").read_text().splitlines()]
+    assert [e["audio_file"] for e in entries] == ["20250103_235959_000_conv_stt.opus", recent.name]
+    assert json.loads((logs_dir / "exchanges_2025-01-03.jsonl").read_text())["audio_file"] == "other.wav"
+
+
+def test_original_name_resolves_to_archived_copy(dirs):
+    audio_dir, _ = dirs
+    old = _audio(audio_dir, "20250103_120000_000_conv_stt.wav", age_days=30)
+    flat = audio_dir / "legacy_stt.wav"
+    flat.write_bytes(b"\0" * 1000)
+    os.utime(flat, (NOW - 30 * DAY, NOW - 30 * DAY))
+
+    _archiver(dirs).run()
+
+    assert get_audio_path(old.name, audio_dir) == old.with_suffix(".opus")
+    assert find_audio_file(old.name, audio_dir) == old.with_suffix(".opus")
+    assert find_audio_file("legacy_stt.wav", audio_dir) == audio_dir / "legacy_stt.opus"
+    assert find_audio_file("20250103_000000_000_missing.wav", audio_dir) is None
+
+
+def test_failed_transcode_keeps_original(dirs):
+    audio_dir, _ = dirs
+    broken = _audio(audio_dir, "20250103_120000_000_conv_stt.wav", age_days=30, data=b"corrupt")
+
+    report = _archiver(dirs).run()
+
+    assert report.failed == 1
+    assert "Invalid data" in report.errors[0]
+    assert broken.exists()
+
+
+def test_retention_by_age_and_size(dirs):
+    audio_dir, _ = dirs
+    ancient = _audio(audio_dir, "20240101_120000_000_conv_stt.opus", age_days=400)
+    older = _audio(audio_dir, "20250101_120000_000_conv_stt.opus", age_days=20, size=6000)
+    newer = _audio(audio_dir, "20250102_120000_000_conv_stt.opus", age_days=10, size=6000)
+
+    dry = _archiver(dirs, max_age_days=365, max_size=8000).run(dry_run=True)
+    assert dry.deleted == 2
+    assert ancient.exists() and older.exists()
+
+    report = _archiver(dirs, max_age_days=365, max_size=8000).run()
+    assert report.deleted == 2
+    assert report.reclaimed == 16000
+    assert not ancient.exists() and not older.exists() and newer.exists()
+    # Emptied month directories go too
+    assert not (audio_dir / "2024").exists()
+
+
+def test_runs_are_exclusive(dirs):
+    audio_dir, _ = dirs
+    _audio(audio_dir, "20250103_120000_000_conv_stt.wav", age_days=30)
+    with _RunLock(audio_dir / LOCK_FILE):
+        with pytest.raises(ArchiveInProgress):
+            _archiver(dirs).run()
+
+
+def test_missing_ffmpeg(dirs, monkeypatch):
+    audio_dir, _ = dirs
+    _audio(audio_dir, "20250103_120000_000_conv_stt.wav", age_days=30)
+    monkeypatch.setattr(audio_archive.shutil, "which", lambda name: None)
+    with pytest.raises(RuntimeError, match="ffmpeg"):
+        _archiver(dirs).run()
+    # Nothing to transcode: ffmpeg is not needed
+    assert _archiver(dirs, after_days=60).run().transcoded == 0
+
+
+def test_archive_rechecked_while_running(tmp_path, monkeypatch):
+    import threading
+    from types import SimpleNamespace
+
+    stop = threading.Event()
+    runs = []
+
+    def archive_if_due(interval):
+        runs.append(interval)
+        if len(runs) == 3:
+            stop.set()
+
+    monkeypatch.setattr(audio_archive, "archive_if_due", archive_if_due)
+    monkeypatch.setattr(audio_archive, "AudioArchiver", lambda: SimpleNamespace(audio_dir=tmp_path))
+    monkeypatch.setattr(audio_archive, "MIN_RECHECK", 0.01)
+    # No stamp: the last run failed, so check again after MIN_RECHECK
+    thread = threading.Thread(target=audio_archive.archive_periodically, args=(DAY, stop))
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert runs == [DAY] * 3
+
+
+def test_archive_waits_until_due(tmp_path, monkeypatch):
+    import threading
+    from types import SimpleNamespace
+
+    (tmp_path / audio_archive.STAMP_FILE).touch()
+    monkeypatch.setattr(audio_archive, "archive_if_due", lambda interval: None)
+    monkeypatch.setattr(audio_archive, "AudioArchiver", lambda: SimpleNamespace(audio_dir=tmp_path))
+    waits = []
+
+    class Stop(threading.Event):
+        def wait(self, timeout=None):
+            waits.append(timeout)
+            return True
+
+    audio_archive.archive_periodically(DAY, Stop())
+    assert DAY - 60 < waits[0] <= DAY
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_real_transcode_in_worker_pool(tmp_path):
+    audio_dir = tmp_path / "audio"
+    path = get_audio_path("20250103_120000_000_conv_stt.wav", audio_dir)
+    path.parent.mkdir(parents=True)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(24000)
+        f.writeframes(b"".join(struct.pack("<h", (i * 37) % 2000 - 1000) for i in range(24000 * 3)))
+    os.utime(path, (NOW - 30 * DAY, NOW - 30 * DAY))
+
+    report = AudioArchiver(audio_dir, tmp_path / "logs", after_days=7, bitrate=24000,
+                           max_age_days=0, max_size=0, workers=1).run()
+
+    assert report.transcoded == 1, report.errors
+    opus = path.with_suffix(".opus")
+    assert opus.read_bytes()[:4] == b"OggS"
+    assert report.reclaimed > 100000
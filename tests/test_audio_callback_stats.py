@@ -0,0 +1,94 @@
+"""Tests for real-time audio callback statistics."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from voice_mode import metrics
+from voice_mode.utils import event_logger as event_logger_module
+from voice_mode.utils.append_log import AppendLogWriter
+from voice_mode.utils.audio_callback_stats import CallbackStats
+from voice_mode.utils.event_logger import EventLogger
+
+
+class Flags(SimpleNamespace):
+    """Stands in for sounddevice.CallbackFlags."""
+
+    def __init__(self, **flags):
+        names = ('input_underflow', 'input_overflow', 'output_underflow', 'output_overflow')
+        super().__init__(**{name: flags.get(name, False) for name in names})
+
+    def __bool__(self):
+        return any(vars(self).values())
+
+
+def _time_info(current, adc=0.0, dac=0.0):
+    return SimpleNamespace(currentTime=current, inputBufferAdcTime=adc, outputBufferDacTime=dac)
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    metrics.REGISTRY.clear()
+    yield
+    metrics.REGISTRY.clear()
+
+
+def test_record_counts_and_latency():
+    stats = CallbackStats("output", 24000)
+    now = time.perf_counter()
+    stats.record(now, 480, _time_info(10.0, dac=10.025), Flags(), queue_depth=3)
+    stats.record(now, 480, _time_info(10.02, dac=10.06), Flags(output_underflow=True), queue_depth=0)
+    # A callback that took longer than its 20 ms of audio
+    stats.record(now - 0.03, 480, _time_info(0.0), Flags(), queue_depth=7)
+
+    assert (stats.callbacks, stats.frames) == (3, 1440)
+    assert (stats.underflows, stats.overflows, stats.xruns) == (1, 0, 1)
+    assert stats.over_budget == 1
+    assert stats.max >= 0.03
+    assert stats.latency_min == pytest.approx(0.025)
+    assert stats.latency_max == pytest.approx(0.04)
+    assert sum(stats.buckets) == 3 and stats.buckets[-1] == 0
+
+    data = stats.to_dict()
+    assert data["queue_depth_max"] == 7
+    assert data["queue_depth_mean"] == pytest.approx(3.33)
+    assert data["latency_min_ms"] == pytest.approx(25.0)
+    assert sum(data["callback_ms"].values()) == 3
+
+
+def test_input_latency_and_overflow():
+    stats = CallbackStats("input", 24000)
+    stats.record(time.perf_counter(), 480, _time_info(5.01, adc=5.0), Flags(input_overflow=True))
+    assert stats.overflows == 1
+    assert stats.latency_max == pytest.approx(0.01)
+
+
+def test_finish_reports_to_event_log_span_and_metrics(tmp_path, monkeypatch):
+    writer = AppendLogWriter(flush_interval=0)
+    logger = EventLogger(tmp_path, writer=writer)
+    monkeypatch.setattr(event_logger_module, "_event_logger", logger)
+    span = SimpleNamespace(attributes={})
+    span.set_attributes = lambda **attributes: span.attributes.update(attributes)
+
+    stats = CallbackStats("input", 24000)
+    stats.reported_latency = 0.02
+    for _ in range(4):
+        stats.record(time.perf_counter(), 480, None, Flags(input_overflow=True))
+    data = stats.finish(span)
+    writer.close()
+
+    lines = [line for path in tmp_path.glob("*.jsonl") for line in path.read_text().splitlines()]
+    logged = [line for line in lines if "AUDIO_STREAM_STATS" in line]
+    assert len(logged) == 1
+    assert span.attributes["audio.overflows"] == 4
+    assert span.attributes["audio.reported_latency_ms"] == 20.0
+    assert data["callbacks"] == 4
+    assert metrics.AUDIO_CALLBACK_SECONDS.count(stream="input") == 4
+    assert metrics.AUDIO_XRUNS.value(stream="input", kind="overflow") == 4
+    assert 'voicemode_audio_xruns_total{stream="input",kind="overflow"} 4' in metrics.REGISTRY.render()
+
+
+def test_finish_without_callbacks_reports_nothing():
+    assert CallbackStats("output", 24000).finish()["callbacks"] == 0
+    assert metrics.AUDIO_CALLBACK_SECONDS.count(stream="output") == 0
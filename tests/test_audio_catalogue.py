@@ -0,0 +1,173 @@
+"""Tests for the saved audio catalogue."""
+
+import asyncio
+import json
+import struct
+
+import pytest
+
+from voice_mode.audio_catalogue import AudioCatalogue, audio_duration, month_range, parse_name
+from voice_mode.utils.audio_saver import AudioSaver, wav_bytes
+
+
+def _wav(path, seconds=1.0, rate=24000):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(wav_bytes(b"\0\0" * int(seconds * rate), rate))
+    return path
+
+
+@pytest.fixture
+def catalogue(tmp_path):
+    # No throttling: every query sees changes made just before it
+    with AudioCatalogue(tmp_path, refresh_interval=0) as catalogue:
+        yield catalogue
+
+
+def test_parse_name():
+    parsed = parse_name("20250728_123456_789_4t8u0f_stt.wav")
+    assert (parsed["type"], parsed["conversation_key"]) == ("stt", "4t8u0f")
+    assert parse_name("20250728_123456_789-tts.mp3")["type"] == "tts"
+    assert parse_name("no_speech_20250728_123456.wav")["type"] == "no_speech"
+    assert parse_name("recording.wav")["created"] is None
+
+
+def test_scan_year_month_tree_and_flat_files(catalogue, tmp_path):
+    _wav(tmp_path / "2025" / "07" / "20250728_123456_789_4t8u0f_stt.wav", seconds=2)
+    (tmp_path / "2025" / "07" / "20250728_123500_000_4t8u0f_tts.mp3").write_bytes(b"ID3")
+    _wav(tmp_path / "no_speech_20250601_000000.wav")
+    (tmp_path / "notes.txt").write_text("not audio")
+
+    files = catalogue.page()["files"]
+
+    assert [f["name"] for f in files] == [
+        "20250728_123500_000_4t8u0f_tts.mp3",
+        "20250728_123456_789_4t8u0f_stt.wav",
+        "no_speech_20250601_000000.wav",
+    ]
+    assert files[1]["duration"] == pytest.approx(2.0)
+    assert files[1]["path"] == "2025/07/20250728_123456_789_4t8u0f_stt.wav"
+    assert files[0]["duration"] is None
+    assert catalogue.summary()["files"] == 3
+
+
+def test_refresh_rescans_only_changed_directories(catalogue, tmp_path):
+    _wav(tmp_path / "2025" / "06" / "20250601_000000_000_a_stt.wav")
+    july = _wav(tmp_path / "2025" / "07" / "20250701_000000_000_a_stt.wav")
+    assert catalogue.refresh(force=True) == 2
+    assert catalogue.refresh(force=True) == 0
+
+    july.unlink()
+    _wav(tmp_path / "2025" / "07" / "20250702_000000_000_a_tts.wav")
+    assert catalogue.refresh(force=True) == 2
+    assert catalogue.get(july.name) is None
+    assert catalogue.get("20250702_000000_000_a_tts.wav")["type"] == "tts"
+
+
+def test_archived_copy_keeps_metadata(catalogue, tmp_path):
+    original = _wav(tmp_path / "2025" / "07" / "20250701_000000_000_a_stt.wav")
+    catalogue.record(original, conversation_id="conv_20250701_000000_a")
+
+    # What the archiver does
+    original.with_suffix(".opus").write_bytes(b"OggS")
+    original.unlink()
+
+    entry = catalogue.get(original.name)
+    assert entry["name"] == "20250701_000000_000_a_stt.opus"
+    assert entry["conversation_id"] == "conv_20250701_000000_a"
+
+
+def test_pagination_and_filters(catalogue, tmp_path):
+    for day in range(1, 8):
+        _wav(tmp_path / "2025" / "07" / f"202507{day:02d}_120000_000_a_stt.wav")
+        _wav(tmp_path / "2025" / "07" / f"202507{day:02d}_120001_000_b_tts.wav")
+    _wav(tmp_path / "2025" / "08" / "20250801_120000_000_a_stt.wav")
+
+    names, cursor = [], None
+    while True:
+        page = catalogue.page(limit=4, cursor=cursor)
+        names += [f["name"] for f in page["files"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(names) == len(set(names)) == 15
+    assert names == sorted(names, reverse=True)
+
+    start, end = month_range("2025-07")
+    assert len(catalogue.page(start=start, end=end)["files"]) == 14
+    start, end = month_range("2025-07-03")
+    assert len(catalogue.page(start=start, end=end)["files"]) == 2
+    assert len(catalogue.page(type="tts")["files"]) == 7
+    assert len(catalogue.page(conversation_id="conv_20250701_120000_a")["files"]) == 8
+    assert catalogue.page(format="opus")["files"] == []
+    with pytest.raises(ValueError):
+        catalogue.page(cursor="garbage")
+
+
+def test_schema_change_rebuilds(tmp_path):
+    _wav(tmp_path / "2025" / "07" / "20250701_000000_000_a_stt.wav")
+    with AudioCatalogue(tmp_path) as catalogue:
+        catalogue.refresh(force=True)
+        catalogue._conn.execute("UPDATE meta SET value = '0' WHERE key = 'schema_version'")
+    with AudioCatalogue(tmp_path, refresh_interval=0) as catalogue:
+        assert catalogue._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 0
+        assert len(catalogue.page()["files"]) == 1
+
+
+def _ogg_page(granule, payload, header_type=0):
+    return (b"OggS" + bytes([0, header_type]) + struct.pack("<qIII", granule, 1, 0, 0)
+            + bytes([1, len(payload)]) + payload)
+
+
+def test_header_durations(tmp_path):
+    opus = tmp_path / "a.opus"
+    head = b"OpusHead" + bytes([1, 1]) + struct.pack("<HIh", 312, 24000, 0) + b"\0"
+    opus.write_bytes(_ogg_page(0, head, 2) + _ogg_page(96312, b"\0" * 20, 4))
+    assert audio_duration(opus) == pytest.approx(2.0)
+
+    flac = tmp_path / "a.flac"
+    # 44.1 kHz, mono, 16 bit, 88200 samples
+    packed = (44100 << 44) | (0 << 41) | (15 << 36) | 88200
+    flac.write_bytes(b"fLaC" + bytes([0x80, 0, 0, 34]) + b"\0" * 10 + struct.pack(">Q", packed) + b"\0" * 16)
+    assert audio_duration(flac) == pytest.approx(2.0)
+
+    pcm = tmp_path / "a.pcm"
+    pcm.write_bytes(b"\0" * 48000)
+    assert audio_duration(pcm) == pytest.approx(1.0)
+    assert audio_duration(tmp_path / "missing.wav") is None
+
+
+def test_saver_records_files(catalogue, tmp_path):
+    saver = AudioSaver(catalogue=catalogue)
+    path = tmp_path / "2025" / "07" / "20250701_000000_000_a_stt.wav"
+    saver.save(wav_bytes(b"\0\0" * 12000, 24000), path, conversation_id="conv_x_a")
+    saver.close()
+
+    row = catalogue._conn.execute(
+        "SELECT conversation_id, duration FROM files WHERE name = ?", (path.name,)
+    ).fetchone()
+    assert row == ("conv_x_a", pytest.approx(0.5))
+    # Files outside the audio directory are not catalogued
+    assert not catalogue.record(tmp_path.parent / "elsewhere.wav")
+
+
+def test_resources(tmp_path, monkeypatch):
+    from voice_mode.resources import audio_files
+
+    _wav(tmp_path / "2025" / "07" / "20250701_000000_000_a_stt.wav")
+    _wav(tmp_path / "2025" / "07" / "20250702_000000_000_a_stt.wav")
+    catalogue = AudioCatalogue(tmp_path, refresh_interval=0)
+    monkeypatch.setattr(audio_files, "get_audio_catalogue", lambda: catalogue)
+    monkeypatch.setattr(audio_files, "AUDIO_DIR", tmp_path)
+    monkeypatch.setattr(audio_files, "SAVE_AUDIO", True)
+    list_audio_files = getattr(audio_files.list_audio_files, "fn", audio_files.list_audio_files)
+    get_audio_file = getattr(audio_files.get_audio_file, "fn", audio_files.get_audio_file)
+
+    page = json.loads(asyncio.run(list_audio_files("month=2025-07,limit=1")))
+    assert [f["name"] for f in page["files"]] == ["20250702_000000_000_a_stt.wav"]
+    assert page["next"] == f"audio://files/month=2025-07,limit=1,cursor={page['next_cursor']}"
+    assert "error" in json.loads(asyncio.run(list_audio_files("colour=red")))
+
+    entry = json.loads(asyncio.run(get_audio_file("20250701_000000_000_a_stt.wav")))
+    assert entry["full_path"] == str(tmp_path / "2025" / "07" / "20250701_000000_000_a_stt.wav")
+    assert asyncio.run(get_audio_file("missing.wav")) == "Audio file not found: missing.wav"
+    catalogue.close()
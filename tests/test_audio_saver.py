@@ -0,0 +1,89 @@
+"""Tests for the background audio saver."""
+
+import threading
+import wave
+from pathlib import Path
+
+import pytest
+
+from voice_mode import audio_archive
+from voice_mode.core import find_audio_file
+from voice_mode.utils.audio_saver import AudioSaver, wav_bytes
+
+
+@pytest.fixture
+def saver():
+    saver = AudioSaver()
+    yield saver
+    saver.close()
+
+
+def test_wav_bytes(tmp_path):
+    path = tmp_path / "a.wav"
+    path.write_bytes(wav_bytes(b"\x01\x00" * 2400, 24000))
+    with wave.open(str(path)) as f:
+        assert (f.getnchannels(), f.getsampwidth(), f.getframerate(), f.getnframes()) == (1, 2, 24000, 2400)
+
+
+def test_save_returns_before_write(saver, tmp_path):
+    path = tmp_path / "2025" / "01" / "20250101_000000_000_conv_stt.wav"
+    assert saver.save(b"RIFF data", path) == path
+    assert saver.flush()
+    assert path.read_bytes() == b"RIFF data"
+    assert sorted(p.name for p in path.parent.iterdir()) == [path.name]
+    assert saver.stats()["saved"] == 1
+
+
+def test_full_queue_writes_inline(tmp_path):
+    saver = AudioSaver(max_queue=1)
+    busy, release = threading.Event(), threading.Event()
+    original = saver._write
+
+    def slow_write(path, data, conversation_id=None):
+        if threading.current_thread() is saver._thread:
+            busy.set()
+            release.wait(5)
+        original(path, data, conversation_id)
+
+    saver._write = slow_write
+    paths = [tmp_path / f"{i}.wav" for i in range(3)]
+    # The first occupies the worker, the second fills the queue
+    saver.save(b"0", paths[0])
+    assert busy.wait(5)
+    saver.save(b"1", paths[1])
+    saver.save(b"2", paths[2])
+    assert paths[2].read_bytes() == b"2"
+    assert not paths[0].exists()
+    release.set()
+    saver.close()
+    assert [p.read_bytes() for p in paths] == [b"0", b"1", b"2"]
+    assert saver.stats()["inline"] == 1
+
+
+def test_compress(tmp_path, monkeypatch):
+    def fake_transcode(source, bitrate, ffmpeg='ffmpeg'):
+        target = Path(source).with_suffix('.opus')
+        target.write_bytes(b"OggS")
+        return source, str(target), None
+
+    monkeypatch.setattr(audio_archive, "transcode", fake_transcode)
+    saver = AudioSaver(compress=True)
+    path = tmp_path / "20250101_000000_000_conv_stt.wav"
+    final = saver.save(b"RIFF data", path)
+    assert final == path.with_suffix(".opus")
+    # Only WAV is compressed
+    assert saver.save(b"ID3", tmp_path / "20250101_000000_000_conv_tts.mp3").suffix == ".mp3"
+    saver.close()
+    assert final.read_bytes() == b"OggS"
+    assert not path.exists()
+
+
+def test_failed_compression_keeps_wav(tmp_path, monkeypatch):
+    monkeypatch.setattr(audio_archive, "transcode", lambda source, bitrate, ffmpeg='ffmpeg': (source, None, "bad"))
+    saver = AudioSaver(compress=True)
+    final = saver.save(b"RIFF data", tmp_path / "20250101_000000_000_conv_stt.wav")
+    saver.close()
+    assert not final.exists()
+    assert saver.stats()["errors"] == 1
+    # The .opus reference in the exchange log resolves to the WAV
+    assert find_audio_file(final.name, tmp_path) == tmp_path / "20250101_000000_000_conv_stt.wav"
@@ -0,0 +1,260 @@
+"""Tests for the audio device scheduler."""
+
+import asyncio
+
+import pytest
+
+from voice_mode.audio_scheduler import (
+    AudioDeviceBusyError,
+    AudioJobCancelled,
+    AudioPriority,
+    AudioScheduler,
+    current_audio_job,
+    current_session_id,
+)
+
+
+async def _play(scheduler, owner, priority, order, duration=0.01, hold_device=False):
+    async with scheduler.job(owner, priority.name.lower(), priority, hold_device=hold_device):
+        async with scheduler.device("playback"):
+            order.append(owner)
+            await asyncio.sleep(duration)
+
+
+async def _wait_for_queue(scheduler, depth):
+    while scheduler.status()["queue_depth"] < depth:
+        await asyncio.sleep(0.001)
+
+
+class TestDevicePhases:
+    """Test which parts of a job are exclusive."""
+
+    async def test_only_device_phase_is_exclusive(self):
+        scheduler = AudioScheduler()
+        synthesized = asyncio.Event()
+
+        async def other_job():
+            async with scheduler.job("session-b", "speak", AudioPriority.SPEAK):
+                # Synthesis runs while session-a holds the device
+                synthesized.set()
+                async with scheduler.device("playback"):
+                    pass
+
+        async with scheduler.job("session-a", "speak", AudioPriority.SPEAK):
+            async with scheduler.device("playback"):
+                task = asyncio.create_task(other_job())
+                await asyncio.wait_for(synthesized.wait(), 1)
+                assert scheduler.status()["holder"]["owner"] == "session-a"
+        await task
+        assert scheduler.status()["grants"] == 2
+
+    async def test_current_job(self):
+        scheduler = AudioScheduler()
+        assert current_audio_job() is None
+        async with scheduler.job("session-a") as job:
+            assert current_audio_job() is job
+        assert current_audio_job() is None
+
+    async def test_hold_device_keeps_device_between_phases(self):
+        scheduler = AudioScheduler()
+        async with scheduler.job("session-a", hold_device=True) as job:
+            async with scheduler.device("playback"):
+                pass
+            assert scheduler.holder is job
+            async with scheduler.device("capture"):
+                assert scheduler.status()["holder"]["phase"] == "capture"
+            scheduler.release(job)
+            assert scheduler.holder is None
+
+    async def test_device_outside_job(self):
+        scheduler = AudioScheduler()
+        async with scheduler.device("playback") as job:
+            assert job.priority == AudioPriority.NOTIFICATION
+            assert scheduler.holder is job
+        assert scheduler.holder is None
+        assert scheduler.status()["running"] == []
+
+
+class TestPriorities:
+    """Test the order in which waiting jobs get the device."""
+
+    async def test_priority_order(self):
+        scheduler = AudioScheduler()
+        order = []
+        async with scheduler.job("holder", hold_device=True):
+            async with scheduler.device("playback"):
+                tasks = [
+                    asyncio.create_task(_play(scheduler, "notify", AudioPriority.NOTIFICATION, order)),
+                    asyncio.create_task(_play(scheduler, "speak", AudioPriority.SPEAK, order)),
+                    asyncio.create_task(_play(scheduler, "converse", AudioPriority.CONVERSE, order)),
+                ]
+                await _wait_for_queue(scheduler, 3)
+        await asyncio.gather(*tasks)
+        assert order == ["converse", "speak", "notify"]
+
+    async def test_fifo_within_priority(self):
+        scheduler = AudioScheduler()
+        order = []
+        async with scheduler.job("holder", hold_device=True):
+            async with scheduler.device("playback"):
+                tasks = []
+                for i in range(3):
+                    tasks.append(asyncio.create_task(_play(scheduler, f"s{i}", AudioPriority.SPEAK, order)))
+                    await _wait_for_queue(scheduler, i + 1)
+        await asyncio.gather(*tasks)
+        assert order == ["s0", "s1", "s2"]
+
+    async def test_same_session_keeps_order(self):
+        scheduler = AudioScheduler()
+        order = []
+
+        async def play(priority, label):
+            async with scheduler.job("session-a", label, priority):
+                async with scheduler.device("playback"):
+                    order.append(label)
+
+        async with scheduler.job("holder", hold_device=True):
+            async with scheduler.device("playback"):
+                narration = asyncio.create_task(play(AudioPriority.SPEAK, "narration"))
+                await _wait_for_queue(scheduler, 1)
+                question = asyncio.create_task(play(AudioPriority.CONVERSE, "question"))
+                await _wait_for_queue(scheduler, 2)
+        await asyncio.gather(narration, question)
+        assert order == ["narration", "question"]
+
+    async def test_wait_statistics(self):
+        scheduler = AudioScheduler()
+        order = []
+        async with scheduler.job("holder", hold_device=True):
+            async with scheduler.device("playback"):
+                task = asyncio.create_task(_play(scheduler, "speak", AudioPriority.SPEAK, order))
+                await _wait_for_queue(scheduler, 1)
+                await asyncio.sleep(0.05)
+        await task
+        stats = scheduler.status()["wait_seconds"]["speak"]
+        assert stats["count"] == 1
+        assert stats["max"] >= 0.05
+        assert scheduler.status()["max_queue_depth"] == 1
+
+
+class TestTimeoutsAndCancellation:
+    """Test giving up on the device."""
+
+    async def test_busy_timeout(self):
+        scheduler = AudioScheduler()
+        async with scheduler.job("session-a", "converse", hold_device=True):
+            async with scheduler.device("playback"):
+                with pytest.raises(AudioDeviceBusyError, match="session-a"):
+                    async with scheduler.job("session-b", timeout=0.05):
+                        async with scheduler.device("playback"):
+                            pass
+        status = scheduler.status()
+        assert status["timeouts"] == 1
+        assert status["queue_depth"] == 0
+        async with scheduler.job("session-b", timeout=0.05):
+            async with scheduler.device("playback"):
+                pass
+
+    async def test_cancel_waiting_job(self):
+        scheduler = AudioScheduler()
+        order = []
+        async with scheduler.job("holder", hold_device=True):
+            async with scheduler.device("playback"):
+                task = asyncio.create_task(_play(scheduler, "speak", AudioPriority.SPEAK, order))
+                await _wait_for_queue(scheduler, 1)
+                assert scheduler.cancel(owner="speak") == 1
+                with pytest.raises(AudioJobCancelled):
+                    await task
+        assert order == []
+        assert scheduler.status()["cancelled"] == 1
+
+    async def test_cancel_playing_job_stops_output(self):
+        scheduler = AudioScheduler()
+        stopped = []
+        async with scheduler.job("session-a") as job:
+            async with scheduler.device("playback"):
+                job.on_stop(lambda: stopped.append(True))
+                assert scheduler.cancel(job_id=job.id) == 1
+                assert job.stop_requested
+        assert stopped == [True]
+
+    async def test_task_cancellation_leaves_queue(self):
+        scheduler = AudioScheduler()
+        order = []
+        async with scheduler.job("holder", hold_device=True):
+            async with scheduler.device("playback"):
+                task = asyncio.create_task(_play(scheduler, "speak", AudioPriority.SPEAK, order))
+                await _wait_for_queue(scheduler, 1)
+                task.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await task
+                assert scheduler.status()["queue_depth"] == 0
+        assert scheduler.holder is None
+
+    async def test_cancelled_waiter_does_not_block_next_job(self):
+        scheduler = AudioScheduler()
+        order = []
+        async with scheduler.job("holder", hold_device=True):
+            async with scheduler.device("playback"):
+                task = asyncio.create_task(_play(scheduler, "speak", AudioPriority.SPEAK, order))
+                await _wait_for_queue(scheduler, 1)
+                scheduler.cancel(owner="speak")
+        # The cancelled job has not left the queue yet when the next one arrives
+        assert scheduler.status()["queue_depth"] == 1
+        async with scheduler.job("session-b", timeout=0.5):
+            async with scheduler.device("playback"):
+                order.append("session-b")
+        with pytest.raises(AudioJobCancelled):
+            await task
+        assert order == ["session-b"]
+
+    async def test_released_on_error(self):
+        scheduler = AudioScheduler()
+        with pytest.raises(ValueError):
+            async with scheduler.job("session-a", hold_device=True):
+                async with scheduler.device("playback"):
+                    raise ValueError("boom")
+        assert scheduler.holder is None
+
+
+class TestPreemption:
+    """Test interrupting lower-priority playback."""
+
+    async def _speak_then_converse(self, scheduler):
+        stopped = []
+        playing = asyncio.Event()
+
+        async def speak():
+            async with scheduler.job("session-a", "speak", AudioPriority.SPEAK) as job:
+                async with scheduler.device("playback"):
+                    job.on_stop(lambda: stopped.append(job.id))
+                    playing.set()
+                    while not job.stop_requested:
+                        await asyncio.sleep(0.005)
+                        if not scheduler.preemption and scheduler.status()["queue_depth"]:
+                            # Nothing will interrupt us; finish normally
+                            break
+                return job
+
+        speak_task = asyncio.create_task(speak())
+        await playing.wait()
+        order = []
+        await _play(scheduler, "session-b", AudioPriority.CONVERSE, order)
+        return await speak_task, stopped
+
+    async def test_preempts_other_session(self):
+        scheduler = AudioScheduler(preemption=True)
+        job, stopped = await self._speak_then_converse(scheduler)
+        assert job.preempted
+        assert stopped == [job.id]
+        assert scheduler.status()["preempted"] == 1
+
+    async def test_disabled_by_default(self):
+        scheduler = AudioScheduler()
+        job, stopped = await self._speak_then_converse(scheduler)
+        assert not job.preempted
+        assert stopped == []
+
+
+def test_session_id_outside_request():
+    assert current_session_id() == "local"
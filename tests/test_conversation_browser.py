@@ -0,0 +1,174 @@
+"""Tests for the paginated, index-backed conversation browser."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from voice_mode.exchanges.browser import ConversationBrowser, decode_cursor, encode_cursor
+
+try:
+    import flask  # noqa: F401
+    HAS_FLASK = True
+except ImportError:
+    HAS_FLASK = False
+
+# Midday yesterday, so the test conversations all fall on one day
+NOW = (datetime.now() - timedelta(days=1)).replace(hour=12, minute=0, second=0, microsecond=0).astimezone()
+
+
+def _entry(conversation_id, minutes, text="some words here", audio_file=None, project="/work/app"):
+    return {
+        "version": 4,
+        "timestamp": (NOW + timedelta(minutes=minutes)).isoformat(),
+        "conversation_id": conversation_id,
+        "type": "stt",
+        "text": text,
+        "project_path": project,
+        "audio_file": audio_file,
+        "metadata": {"voice_mode_version": "6.0.0"},
+    }
+
+
+def _append(base_dir, *entries):
+    logs_dir = base_dir / "logs" / "conversations"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    with open(logs_dir / f"exchanges_{NOW.strftime('%Y-%m-%d')}.jsonl", "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    _append(tmp_path, *[_entry(f"conv_{i}", i, text=f"conversation {i}") for i in range(7)])
+    _append(tmp_path, _entry("conv_0", 10, text="back again", project="/work/other"))
+    return tmp_path
+
+
+@pytest.fixture
+def browser(base_dir):
+    browser = ConversationBrowser(base_dir, refresh_interval=0)
+    yield browser
+    browser.close()
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(1.5, "conv_a")) == (1.5, "conv_a")
+    for bad in ("zzz", encode_cursor(1.5, "x")[:-3], "WzFd"):
+        with pytest.raises(ValueError):
+            decode_cursor(bad)
+
+
+def test_pages_follow_cursor(browser):
+    seen = []
+    cursor = None
+    while True:
+        page = browser.page(limit=3, cursor=cursor)
+        assert len(page["conversations"]) <= 3
+        seen.extend(c["id"] for c in page["conversations"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    # conv_0 was active last
+    assert seen == ["conv_0", "conv_6", "conv_5", "conv_4", "conv_3", "conv_2", "conv_1"]
+
+
+def test_page_summaries_and_filters(browser):
+    first = browser.page(limit=1)["conversations"][0]
+    assert first["exchange_count"] == 2
+    assert first["project"] == "/work/app"
+    assert first["summary"] == "conversation 0... | back again..."
+
+    assert len(browser.page(project="/work/app")["conversations"]) == 7
+    assert browser.page(project="/nowhere")["conversations"] == []
+    assert len(browser.page(day=NOW.date())["conversations"]) == 7
+    assert browser.page(day=(NOW - timedelta(days=3)).date())["conversations"] == []
+
+
+def test_conversation_detail(browser, base_dir):
+    _append(base_dir, _entry("conv_audio", 20, audio_file="20250101_000000_000_abc_tts.wav"))
+    browser.refresh(force=True)
+    conversation = browser.conversation("conv_audio")
+    assert [e["audio_url"] for e in conversation["exchanges"]] == ["/audio/20250101_000000_000_abc_tts.wav"]
+    assert browser.conversation("conv_missing") is None
+
+
+def test_stats_from_rollups(browser, base_dir):
+    stats = browser.stats(days=7)
+    assert stats["total_exchanges"] == 8
+    assert stats["conversations"]["total_conversations"] == 7
+    assert stats["conversations"]["exchanges_per_conversation"]["max"] == 2
+    # Yesterday's log was summarized into a rollup, which later requests read
+    assert list((base_dir / "logs" / "conversations").glob("*.rollup.json"))
+    assert browser.stats(days=7) == stats
+
+
+def test_new_lines_picked_up_and_etag_changes(base_dir):
+    browser = ConversationBrowser(base_dir, refresh_interval=60)
+    etag = browser.etag("/api/conversations")
+    assert browser.etag("/api/conversations") == etag
+    assert browser.etag("/api/projects") != etag
+
+    _append(base_dir, _entry("conv_new", 30))
+    # Throttled: nothing re-read until forced or the interval passes
+    assert browser.etag("/api/conversations") == etag
+    assert browser.refresh(force=True) == 1
+    assert browser.etag("/api/conversations") != etag
+    assert browser.page(limit=1)["conversations"][0]["id"] == "conv_new"
+    browser.close()
+
+
+@pytest.mark.skipif(not HAS_FLASK, reason="Flask not installed (install with 'pip install voice-mode[scripts]')")
+class TestApp:
+    @pytest.fixture
+    def client(self, base_dir):
+        from voice_mode.conversation_browser import create_app
+
+        audio = base_dir / "audio" / "2025" / "01"
+        audio.mkdir(parents=True)
+        (audio / "20250101_000000_000_abc_tts.wav").write_bytes(bytes(range(256)) * 4)
+        app = create_app(base_dir)
+        yield app.test_client()
+        app.extensions["conversation_browser"].close()
+
+    def test_pagination_and_conditional_get(self, client):
+        response = client.get("/api/conversations?limit=5")
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data["conversations"]) == 5
+        etag = response.headers["ETag"]
+
+        assert client.get("/api/conversations?limit=5", headers={"If-None-Match": etag}).status_code == 304
+        rest = client.get("/api/conversations?limit=5&cursor=" + data["next_cursor"]).get_json()
+        assert len(rest["conversations"]) == 2
+        assert rest["next_cursor"] is None
+
+        assert client.get("/api/conversations?cursor=nonsense").status_code == 400
+        assert client.get("/api/conversations/conv_missing").status_code == 404
+
+    def test_stats(self, client):
+        data = client.get("/api/stats?days=3").get_json()
+        assert data["days"] == 3
+        assert data["conversations"]["total_conversations"] == 7
+        assert client.get("/api/stats").get_json()["total_exchanges"] == 8
+        assert client.get("/api/stats?days=soon").status_code == 400
+
+    def test_audio_ranges(self, client):
+        url = "/audio/20250101_000000_000_abc_tts.wav"
+        response = client.get(url, headers={"Range": "bytes=1000-"})
+        assert response.status_code == 206
+        assert response.headers["Content-Range"] == "bytes 1000-1023/1024"
+        assert response.data == bytes(range(232, 256))
+
+        assert client.get(url, headers={"Range": "bytes=5000-"}).status_code == 416
+        full = client.get(url)
+        assert full.headers["Accept-Ranges"] == "bytes"
+        assert client.get(url, headers={"If-None-Match": full.headers["ETag"]}).status_code == 304
+        assert client.get("/audio/missing.wav").status_code == 404
+
+    def test_archived_audio_served_under_original_name(self, client, base_dir):
+        audio = base_dir / "audio" / "2025" / "01"
+        (audio / "20250101_000000_000_abc_tts.wav").rename(audio / "20250101_000000_000_abc_tts.opus")
+        response = client.get("/audio/20250101_000000_000_abc_tts.wav")
+        assert response.status_code == 200
+        assert response.mimetype == "audio/ogg"
@@ -36,6 +36,7 @@ def create_test_environment():
     # Create sample JSONL log with conversations
     exchanges = [
         {
+            "version": 3,
             "type": "conversation",
             "timestamp": "2025-07-02T10:00:00",
             "conversation_id": "conv-123",
@@ -43,6 +44,7 @@ def create_test_environment():
             "text": "Hello, how can I help you today?",
             "audio_file": "tts_20250702_100000_123.wav",
             "metadata": {
+                "voice_mode_version": "6.0.0",
                 "model": "tts-1",
                 "voice": "nova",
                 "provider": "openai",
@@ -50,6 +52,7 @@ def create_test_environment():
             }
         },
         {
+            "version": 3,
             "type": "stt",
             "timestamp": "2025-07-02T10:00:10",
             "conversation_id": "conv-123",
@@ -57,10 +60,12 @@ def create_test_environment():
             "text": "I need help with the conversation browser playback feature.",
             "audio_file": "stt_20250702_100010_456.wav",
             "metadata": {
+                "voice_mode_version": "6.0.0",
                 "timing": "duration: 5.2s"
             }
         },
         {
+            "version": 3,
             "type": "conversation",
             "timestamp": "2025-07-02T10:00:20",
             "conversation_id": "conv-123",
@@ -68,6 +73,7 @@ def create_test_environment():
             "text": "I'd be happy to help with the playback feature. What specific aspect are you working on?",
             "audio_file": "tts_20250702_100020_789.wav",
             "metadata": {
+                "voice_mode_version": "6.0.0",
                 "model": "tts-1",
                 "voice": "nova",
                 "provider": "openai",
@@ -99,27 +105,26 @@ def test_playback_ui():
     # Create test environment
     test_dir = create_test_environment()
     
-    # Set environment variable
-    os.environ["VOICEMODE_BASE_DIR"] = str(test_dir)
-    
     try:
-        # Import after setting env var
-        from scripts.conversation_browser import app, get_all_exchanges, group_exchanges_into_conversations
-        
-        # Test data loading
-        exchanges = get_all_exchanges()
-        print(f"✓ Loaded {len(exchanges)} exchanges")
-        
-        # Test conversation grouping
-        conversations = group_exchanges_into_conversations(exchanges)
-        print(f"✓ Grouped into {len(conversations)} conversations")
+        from voice_mode.conversation_browser import create_app
         
-        # Test Flask app
+        app = create_app(test_dir)
         app.config['TESTING'] = True
         client = app.test_client()
         
-        # Test conversation view
-        response = client.get('/?view=conversation')
+        # Test data loading through the paginated API
+        page = client.get('/api/conversations').get_json()
+        assert [c["id"] for c in page["conversations"]] == ["conv-123"]
+        assert page["next_cursor"] is None
+        print(f"✓ Listed {len(page['conversations'])} conversations")
+        
+        conversation = client.get('/api/conversations/conv-123').get_json()
+        assert len(conversation["exchanges"]) == 3
+        assert conversation["exchanges"][0]["audio_url"] == "/audio/tts_20250702_100000_123.wav"
+        print(f"✓ Loaded {len(conversation['exchanges'])} exchanges")
+        
+        # The page renders conversations client-side from the API
+        response = client.get('/?view=date')
         assert response.status_code == 200
         html = response.data.decode('utf-8')
         
@@ -144,20 +149,16 @@ def test_playback_ui():
                 print(f"  ✗ {name} - NOT FOUND")
                 all_passed = False
         
-        # Count specific elements
-        select_all_count = html.count('class="select-all-checkbox"')
-        play_button_count = html.count('class="play-button"')
-        checkbox_count = html.count('class="conversation-checkbox"')
-        
-        print(f"\nElement Counts:")
-        print(f"  - Select All checkboxes: {select_all_count}")
-        print(f"  - Play buttons: {play_button_count}")
-        print(f"  - Conversation checkboxes: {checkbox_count}")
+        # Audio can be fetched in pieces for seeking
+        response = client.get('/audio/tts_20250702_100000_123.wav', headers={'Range': 'bytes=0-43'})
+        assert response.status_code == 206
+        assert len(response.data) == 44
         
         if all_passed:
             print("\n✅ All playback UI elements are present!")
         else:
             print("\n❌ Some playback UI elements are missing!")
+        assert all_passed
             
     finally:
         # Cleanup
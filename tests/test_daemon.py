@@ -0,0 +1,180 @@
+"""Tests for daemon mode."""
+
+import os
+import socket
+import stat
+
+import pytest
+
+from voice_mode import conversation_logger, daemon
+from voice_mode.daemon import (
+    DaemonInfo,
+    _bind_unix_socket,
+    _TokenAuth,
+    find_running_daemon,
+    read_daemon_info,
+    remove_daemon_info,
+    stop_daemon,
+    write_daemon_info,
+)
+
+
+@pytest.fixture
+def state_file(tmp_path):
+    return tmp_path / "daemon.json"
+
+
+def _dead_pid():
+    """A pid that is guaranteed not to be running."""
+    pid = 999999
+    while True:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return pid
+        except PermissionError:
+            pass
+        pid -= 1
+
+
+class TestDaemonState:
+    """Test the daemon.json state file."""
+
+    def test_round_trip(self, state_file):
+        info = DaemonInfo(pid=123, version="1.0", started_at=1.0, host="127.0.0.1", port=8765)
+        write_daemon_info(info, state_file)
+        assert read_daemon_info(state_file) == info
+
+    def test_missing_or_corrupt(self, state_file):
+        assert read_daemon_info(state_file) is None
+        state_file.write_text("not json")
+        assert read_daemon_info(state_file) is None
+
+    def test_unknown_keys_ignored(self, state_file):
+        state_file.write_text('{"pid": 1, "version": "1", "started_at": 0, "extra": true}')
+        assert read_daemon_info(state_file).pid == 1
+
+    def test_urls(self):
+        tcp = DaemonInfo(pid=1, version="1", started_at=0, host="127.0.0.1", port=9000)
+        assert tcp.url == "http://127.0.0.1:9000/mcp"
+        assert tcp.address == tcp.url
+        uds = DaemonInfo(pid=1, version="1", started_at=0, socket="/tmp/vm.sock")
+        assert uds.address == "unix:/tmp/vm.sock"
+
+    def test_only_owner_can_read(self, state_file):
+        write_daemon_info(DaemonInfo(pid=1, version="1", started_at=0, token="secret"), state_file)
+        assert stat.S_IMODE(state_file.stat().st_mode) == 0o600
+
+    def test_remove_only_own_state(self, state_file):
+        write_daemon_info(DaemonInfo(pid=1, version="1", started_at=0), state_file)
+        remove_daemon_info(state_file, pid=2)
+        assert state_file.exists()
+        remove_daemon_info(state_file, pid=1)
+        assert not state_file.exists()
+
+
+class TestFindRunningDaemon:
+    """Test daemon discovery."""
+
+    def test_stale_pid_removed(self, state_file):
+        write_daemon_info(DaemonInfo(pid=_dead_pid(), version="1", started_at=0,
+                                     host="127.0.0.1", port=1), state_file)
+        assert find_running_daemon(state_file) is None
+        assert not state_file.exists()
+
+    def test_live_pid_not_listening(self, state_file):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        write_daemon_info(DaemonInfo(pid=os.getpid(), version="1", started_at=0,
+                                     host="127.0.0.1", port=port), state_file)
+        assert find_running_daemon(state_file) is None
+        # The state belongs to a live process, so it is kept
+        assert state_file.exists()
+
+    def test_listening_daemon_found(self, state_file):
+        with socket.socket() as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(1)
+            info = DaemonInfo(pid=os.getpid(), version="1", started_at=0,
+                              host="127.0.0.1", port=server.getsockname()[1])
+            write_daemon_info(info, state_file)
+            assert find_running_daemon(state_file) == info
+
+    def test_stop_without_daemon(self, state_file):
+        assert stop_daemon(state_file) is None
+
+
+
+class TestAccessControl:
+    """Test who can talk to the daemon."""
+
+    def test_socket_only_for_owner(self, tmp_path):
+        path = str(tmp_path / "daemon.sock")
+        # Left behind by a crashed daemon
+        open(path, "w").close()
+        with _bind_unix_socket(path):
+            assert stat.S_ISSOCK(os.stat(path).st_mode)
+            assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    def test_token_required(self):
+        from starlette.applications import Starlette
+        from starlette.middleware import Middleware
+        from starlette.responses import PlainTextResponse
+        from starlette.routing import Route
+        from starlette.testclient import TestClient
+
+        app = Starlette(routes=[Route("/mcp", lambda request: PlainTextResponse("ok"))],
+                        middleware=[Middleware(_TokenAuth, token="secret")])
+        client = TestClient(app)
+        assert client.get("/mcp").status_code == 401
+        assert client.get("/mcp", headers={"Authorization": "Bearer wrong"}).status_code == 401
+        assert client.get("/mcp", headers={"Authorization": "Bearer secret"}).text == "ok"
+
+    def test_client_sends_token(self):
+        transport = daemon._create_transport(
+            DaemonInfo(pid=1, version="1", started_at=0, host="127.0.0.1", port=1, token="secret"),
+            {daemon.CLIENT_PID_HEADER: "42"}
+        )
+        assert transport.headers == {daemon.CLIENT_PID_HEADER: "42", "Authorization": "Bearer secret"}
+
+
+class TestClientLoggers:
+    """Test per-client conversation state in the daemon."""
+
+    @pytest.fixture
+    def headers(self, tmp_path, monkeypatch):
+        from fastmcp.server import dependencies
+
+        monkeypatch.setattr(conversation_logger, "BASE_DIR", tmp_path)
+        monkeypatch.setattr(conversation_logger, "_client_loggers", None)
+        conversation_logger.enable_client_loggers()
+        headers = {}
+        monkeypatch.setattr(dependencies, "get_http_headers", lambda: dict(headers))
+        return headers
+
+    def test_each_client_has_its_own_project(self, headers, tmp_path):
+        headers.update({daemon.PROJECT_HEADER: "/work/app%20one", daemon.CLIENT_PID_HEADER: str(os.getpid())})
+        first = conversation_logger.get_conversation_logger()
+        assert conversation_logger.get_conversation_logger() is first
+        assert first.current_project_path == "/work/app one"
+
+        headers.update({daemon.PROJECT_HEADER: "/work/lib", daemon.CLIENT_PID_HEADER: "1"})
+        second = conversation_logger.get_conversation_logger()
+        assert second is not first
+        assert second.current_project_path == "/work/lib"
+        assert second.conversation_id != first.conversation_id
+
+    def test_live_client_conversation_not_continued(self, headers):
+        headers.update({daemon.PROJECT_HEADER: "/work/app", daemon.CLIENT_PID_HEADER: str(os.getpid())})
+        first = conversation_logger.get_conversation_logger()
+        first.log_tts("hello")
+        first.flush()
+
+        # A second editor session in the same project, while the first is still open
+        headers[daemon.CLIENT_PID_HEADER] = str(os.getppid())
+        assert conversation_logger.get_conversation_logger().conversation_id != first.conversation_id
+
+    def test_outside_a_request_uses_global_logger(self, headers, monkeypatch):
+        monkeypatch.setattr(conversation_logger, "_conversation_logger", None)
+        assert conversation_logger.get_conversation_logger() is conversation_logger._conversation_logger
@@ -0,0 +1,185 @@
+"""Tests for streaming conversation export."""
+
+import json
+import tarfile
+import zipfile
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from click.testing import CliRunner
+
+from voice_mode.exchanges import ConversationGrouper, Exchange, ExchangeMetadata, ExchangeReader
+from voice_mode.exchanges.export import ConversationExporter
+
+START = datetime(2025, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _exchange(conversation_id, minutes, type="stt", audio_file=None):
+    return Exchange(
+        version=4,
+        timestamp=START + timedelta(minutes=minutes),
+        conversation_id=conversation_id,
+        type=type,
+        text=f"{conversation_id} at {minutes}, with a comma",
+        project_path="/work/app",
+        audio_file=audio_file,
+        metadata=ExchangeMetadata(voice_mode_version="6.0.0", provider="openai"),
+    )
+
+
+def _conversations():
+    return [
+        _exchange("conv_a", 0),
+        _exchange("conv_b", 1),
+        _exchange("conv_a", 2, "tts"),
+        _exchange("conv_b", 3, "tts"),
+        _exchange("conv_c", 30),
+        _exchange("conv_c", 31, "tts"),
+    ]
+
+
+class TestStreamConversations:
+    def test_yields_conversations_once_ended(self):
+        consumed = []
+
+        def exchanges():
+            for exchange in _conversations():
+                consumed.append(exchange)
+                yield exchange
+
+        stream = ConversationGrouper().stream_conversations(exchanges())
+        first = next(stream)
+        # conv_a ended before conv_c started; conv_c has not been read further
+        assert first.id == "conv_a"
+        assert [e.text for e in first.exchanges] == ["conv_a at 0, with a comma", "conv_a at 2, with a comma"]
+        assert len(consumed) == 5
+
+        assert [c.id for c in stream] == ["conv_b", "conv_c"]
+
+    def test_matches_group_exchanges(self):
+        streamed = {c.id: c for c in ConversationGrouper().stream_conversations(_conversations())}
+        grouped = ConversationGrouper().group_exchanges(_conversations())
+        assert streamed == grouped
+
+
+class TestFormats:
+    def _export(self, tmp_path, format, exchanges=None, **kwargs):
+        conversations = ConversationGrouper().stream_conversations(exchanges or _conversations())
+        exporter = ConversationExporter(format, audio_dir=tmp_path / "audio", **kwargs)
+        output = tmp_path / f"export.{format}"
+        return exporter.export(conversations, output), output
+
+    def test_json(self, tmp_path):
+        summary, output = self._export(tmp_path, "json")
+        data = json.loads(output.read_text())
+        assert [c["id"] for c in data] == ["conv_a", "conv_b", "conv_c"]
+        assert data[0]["exchange_count"] == 2
+        assert summary["conversations"] == 3
+        assert summary["exchanges"] == 6
+
+    def test_json_empty(self, tmp_path):
+        summary, output = self._export(tmp_path, "json", exchanges=iter(()))
+        assert json.loads(output.read_text()) == []
+        assert summary["conversations"] == 0
+
+    def test_jsonl(self, tmp_path):
+        _, output = self._export(tmp_path, "jsonl")
+        lines = output.read_text().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == ["conv_a", "conv_b", "conv_c"]
+
+    def test_csv_and_markdown(self, tmp_path):
+        _, output = self._export(tmp_path, "csv")
+        rows = output.read_text().splitlines()
+        assert rows[0].startswith("timestamp,conversation_id")
+        assert len(rows) == 7
+
+        _, output = self._export(tmp_path, "markdown")
+        assert output.read_text().count("# Conversation ") == 3
+
+    def test_html_pages_and_index(self, tmp_path):
+        summary, _ = self._export(tmp_path, "html")
+        directory = tmp_path / "export"
+        assert summary["output"] == str(directory)
+        assert sorted(p.name for p in directory.iterdir()) == [
+            "conv_a.html", "conv_b.html", "conv_c.html", "index.html"]
+        assert 'href="conv_b.html"' in (directory / "index.html").read_text()
+
+    def test_single_html_page(self, tmp_path):
+        summary, output = self._export(tmp_path, "html", exchanges=_conversations()[4:])
+        assert summary["output"] == str(output)
+        assert "Conversation conv_c" in output.read_text()
+
+
+class TestAudioArchive:
+    @pytest.fixture
+    def audio_dir(self, tmp_path):
+        month = tmp_path / "audio" / "2025" / "03"
+        month.mkdir(parents=True)
+        (month / "20250301_120000_000_abc_stt.wav").write_bytes(b"RIFF" + b"\0" * 100)
+        (tmp_path / "audio" / "legacy_tts.wav").write_bytes(b"RIFF" + b"\1" * 100)
+        return tmp_path / "audio"
+
+    def _exchanges(self):
+        return [
+            _exchange("conv_a", 0, audio_file="20250301_120000_000_abc_stt.wav"),
+            _exchange("conv_a", 1, "tts", audio_file="legacy_tts.wav"),
+            _exchange("conv_a", 2, audio_file="20250301_120000_000_abc_stt.wav"),
+            _exchange("conv_b", 30, audio_file="20250301_123000_000_gone_stt.wav"),
+        ]
+
+    def test_zip(self, tmp_path, audio_dir):
+        exporter = ConversationExporter("jsonl", archive="zip", audio_dir=audio_dir)
+        output = tmp_path / "export.zip"
+        summary = exporter.export(ConversationGrouper().stream_conversations(self._exchanges()), output)
+
+        assert summary["audio_files"] == 2
+        assert summary["missing_audio"] == 1
+        with zipfile.ZipFile(output) as archive:
+            names = archive.namelist()
+            assert names == [
+                "audio/2025/03/20250301_120000_000_abc_stt.wav",
+                "audio/legacy_tts.wav",
+                "conversations.jsonl",
+            ]
+            assert archive.getinfo(names[0]).compress_type == zipfile.ZIP_STORED
+            lines = archive.read("conversations.jsonl").decode().splitlines()
+            assert [json.loads(line)["id"] for line in lines] == ["conv_a", "conv_b"]
+
+    def test_tar_with_html(self, tmp_path, audio_dir):
+        exporter = ConversationExporter("html", archive="tar", audio_dir=audio_dir)
+        output = tmp_path / "export.tar"
+        exporter.export(ConversationGrouper().stream_conversations(self._exchanges()), output)
+
+        with tarfile.open(output) as archive:
+            assert sorted(archive.getnames()) == [
+                "audio/2025/03/20250301_120000_000_abc_stt.wav",
+                "audio/legacy_tts.wav",
+                "conv_a.html",
+                "conv_b.html",
+                "index.html",
+            ]
+
+
+def test_cli_export_streams_days(tmp_path, monkeypatch):
+    from voice_mode.cli_commands import exchanges as exchanges_cli
+
+    reader = ExchangeReader(base_dir=tmp_path, use_index=False)
+    now = datetime.now().astimezone()
+    log_file = reader._get_log_file_path(now)
+    with open(log_file, "w") as f:
+        for minutes in (0, 1, 20):
+            exchange = _exchange(f"conv_{minutes // 10}", 0)
+            exchange.timestamp = now - timedelta(minutes=30 - minutes)
+            f.write(exchange.to_jsonl() + "\n")
+    monkeypatch.setattr(exchanges_cli, "ExchangeReader", lambda: reader)
+
+    output = tmp_path / "out.jsonl"
+    result = CliRunner().invoke(exchanges_cli.exchanges, ["export", "--days", "1", "--format", "jsonl", "-o", str(output)])
+    assert result.exit_code == 0, result.output
+    assert "Exported 2 conversations (3 exchanges)" in result.output
+    assert len(output.read_text().splitlines()) == 2
+
+    result = CliRunner().invoke(exchanges_cli.exchanges, ["export", "--format", "csv", "-o", "-"])
+    assert result.exit_code == 0, result.output
+    assert "timestamp,conversation_id" in result.output
+    assert "conv_2 at 0, with a comma" in result.output
@@ -0,0 +1,153 @@
+"""Tests for following exchange logs as they are written."""
+
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from voice_mode.exchanges import ExchangeReader
+from voice_mode.exchanges import follow as follow_module
+from voice_mode.exchanges.follow import ExchangeFollower
+
+
+def _line(text, timestamp=None):
+    return json.dumps({
+        "version": 4,
+        "timestamp": (timestamp or datetime.now()).isoformat(),
+        "conversation_id": "conv_1",
+        "type": "stt",
+        "text": text,
+        "metadata": {"voice_mode_version": "1.0", "provider": "whisper"},
+    }) + "\n"
+
+
+def _append(path, data):
+    with open(path, "a") as f:
+        f.write(data)
+
+
+@pytest.fixture
+def logs_dir(tmp_path):
+    return tmp_path
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable datetime.now() for the follower."""
+    class Clock(datetime):
+        current = datetime.now()
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.current
+
+    monkeypatch.setattr(follow_module, "datetime", Clock)
+    return Clock
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_new_entries_delivered_quickly(logs_dir, use_inotify):
+    follower = ExchangeFollower(logs_dir, use_inotify=use_inotify)
+    today = follower.log_file(datetime.now().date())
+    _append(today, _line("before"))
+    follower.start(at_end=True)
+
+    stop = threading.Event()
+    received = []
+
+    def run():
+        for exchange in follower.follow(stop):
+            received.append((exchange.text, time.monotonic()))
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    time.sleep(0.2)
+
+    written = time.monotonic()
+    _append(today, _line("after"))
+    deadline = written + 2.0
+    while not received and time.monotonic() < deadline:
+        time.sleep(0.005)
+    stop.set()
+    _append(today, "\n")  # Wake the watch so the thread sees stop
+    thread.join(2.0)
+
+    assert [text for text, _ in received] == ["after"]
+    assert received[0][1] - written < 0.1
+
+
+def test_partial_line_waits_for_newline(logs_dir):
+    follower = ExchangeFollower(logs_dir)
+    today = follower.log_file(datetime.now().date())
+    follower.start()
+
+    line = _line("split")
+    _append(today, line[:20])
+    assert follower.read_new() == []
+    _append(today, line[20:])
+    assert [e.text for e in follower.read_new()] == ["split"]
+    assert follower.offset == today.stat().st_size
+
+
+def test_day_rollover(logs_dir, clock):
+    clock.current = datetime(2025, 3, 1, 23, 59, 59)
+    follower = ExchangeFollower(logs_dir)
+    first = follower.log_file(clock.current.date())
+    _append(first, _line("old"))
+    follower.start(at_end=True)
+
+    _append(first, _line("late"))
+    clock.current += timedelta(seconds=2)
+    second = follower.log_file(clock.current.date())
+    _append(second, _line("new"))
+
+    assert [e.text for e in follower.read_new()] == ["late", "new"]
+    assert follower.path == second
+    _append(second, _line("next"))
+    assert [e.text for e in follower.read_new()] == ["next"]
+
+
+def test_replaced_file_read_from_start(logs_dir):
+    follower = ExchangeFollower(logs_dir)
+    today = follower.log_file(datetime.now().date())
+    _append(today, _line("one") + _line("two"))
+    follower.start(at_end=True)
+
+    replacement = logs_dir / "replacement.jsonl"
+    _append(replacement, _line("three"))
+    replacement.replace(today)
+    assert [e.text for e in follower.read_new()] == ["three"]
+
+
+def test_torn_line_recovered(logs_dir):
+    follower = ExchangeFollower(logs_dir)
+    today = follower.log_file(datetime.now().date())
+    follower.start()
+    _append(today, _line("torn")[:30] + _line("whole"))
+    assert [e.text for e in follower.read_new()] == ["whole"]
+
+
+def test_reader_tail_shows_last_lines_then_follows(tmp_path):
+    reader = ExchangeReader(base_dir=tmp_path, use_index=False)
+    today = reader._get_log_file_path(datetime.now())
+    _append(today, _line("one") + _line("two") + _line("three"))
+
+    tail = reader.tail(follow=True, lines=2)
+    assert [next(tail).text, next(tail).text] == ["two", "three"]
+    _append(today, _line("four"))
+    assert next(tail).text == "four"
+    tail.close()
+
+
+def test_start_at_end_keeps_unfinished_line(logs_dir):
+    follower = ExchangeFollower(logs_dir)
+    today = follower.log_file(datetime.now().date())
+    line = _line("finishing")
+    _append(today, _line("done") + line[:25])
+    follower.start(at_end=True)
+
+    assert follower.read_new() == []
+    _append(today, line[25:])
+    assert [e.text for e in follower.read_new()] == ["finishing"]
@@ -0,0 +1,271 @@
+"""Tests for the SQLite exchange index."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from voice_mode.exchanges import ExchangeFilter, ExchangeIndex, ExchangeReader
+
+
+def _entry(conversation_id, text, timestamp, type="stt", provider="openai", project="/work/app"):
+    return {
+        "version": 3,
+        "timestamp": timestamp.isoformat(),
+        "conversation_id": conversation_id,
+        "type": type,
+        "text": text,
+        "project_path": project,
+        "metadata": {"voice_mode_version": "1.0", "provider": provider, "transport": "local"},
+    }
+
+
+def _append(logs_dir, day, *entries):
+    path = logs_dir / f"exchanges_{day.strftime('%Y-%m-%d')}.jsonl"
+    with open(path, "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    return path
+
+
+@pytest.fixture
+def reader(tmp_path):
+    return ExchangeReader(base_dir=tmp_path)
+
+
+@pytest.fixture
+def now():
+    # Slightly in the past so "recent" windows ending now include every entry
+    return datetime.now(timezone.utc).replace(microsecond=0) - timedelta(minutes=5)
+
+
+def _texts(exchanges):
+    return [e.text for e in exchanges]
+
+
+class TestIngestion:
+    """Test incremental ingestion from byte offsets."""
+
+    def test_only_new_lines_ingested(self, reader, now):
+        _append(reader.logs_dir, now, _entry("conv_a", "one", now))
+        index = reader.open_index()
+        assert index.update() == 1
+        assert index.update() == 0
+        _append(reader.logs_dir, now, _entry("conv_a", "two", now + timedelta(seconds=1)))
+        assert index.update() == 1
+        assert _texts(index.exchanges(conversation_id="conv_a")) == ["one", "two"]
+
+    def test_partial_line_waits(self, reader, now):
+        path = _append(reader.logs_dir, now, _entry("conv_a", "one", now))
+        line = json.dumps(_entry("conv_a", "two", now))
+        with open(path, "a") as f:
+            f.write(line[:20])
+        index = reader.open_index()
+        assert index.update() == 1
+        with open(path, "a") as f:
+            f.write(line[20:] + "\n")
+        assert index.update() == 1
+        assert _texts(index.exchanges()) == ["one", "two"]
+
+    def test_truncated_and_deleted_files(self, reader, now):
+        path = _append(reader.logs_dir, now, _entry("conv_a", "one", now), _entry("conv_a", "two", now))
+        index = reader.open_index()
+        index.update()
+        path.write_text(json.dumps(_entry("conv_b", "new", now)) + "\n")
+        index.update()
+        assert _texts(index.exchanges()) == ["new"]
+        path.unlink()
+        index.update()
+        assert index.stats()["exchanges"] == 0
+        assert index.stats()["files"] == 0
+
+    def test_bad_lines_skipped(self, reader, now):
+        path = _append(reader.logs_dir, now, _entry("conv_a", "one", now))
+        with open(path, "a") as f:
+            f.write("not json\n\n")
+        _append(reader.logs_dir, now, _entry("conv_a", "two", now))
+        assert reader.open_index().update() == 2
+
+    def test_rebuild(self, reader, now):
+        _append(reader.logs_dir, now, _entry("conv_a", "one", now))
+        index = reader.open_index()
+        index.update()
+        assert index.rebuild() == 1
+        assert index.stats()["exchanges"] == 1
+
+
+class TestQueries:
+    """Test lookups answered by the index."""
+
+    @pytest.fixture
+    def indexed(self, reader, now):
+        old = now - timedelta(days=30)
+        _append(reader.logs_dir, old, _entry("conv_old", "old question", old, provider="kokoro"))
+        _append(
+            reader.logs_dir, now,
+            _entry("conv_new", "question", now),
+            _entry("conv_new", "answer", now + timedelta(seconds=1), type="tts", project="/work/other"),
+        )
+        reader.open_index().update()
+        return reader
+
+    def test_read_conversation(self, indexed):
+        assert _texts(indexed.read_conversation("conv_old")) == ["old question"]
+
+    def test_read_recent(self, indexed):
+        assert _texts(indexed.read_recent(7)) == ["question", "answer"]
+
+    def test_latest(self, indexed):
+        assert _texts(indexed.get_latest_exchanges(2)) == ["question", "answer"]
+
+    def test_filter_pushdown(self, indexed):
+        assert _texts(indexed.query(ExchangeFilter().by_type("tts"))) == ["answer"]
+        assert _texts(indexed.query(ExchangeFilter().by_provider("KOKORO"))) == ["old question"]
+        assert _texts(indexed.query(ExchangeFilter().by_project("other"))) == ["answer"]
+        # Criteria the index cannot answer are still applied
+        assert _texts(indexed.query(ExchangeFilter().by_text("ANSWER"), days=7)) == ["answer"]
+
+    def test_matches_scanning(self, indexed, tmp_path):
+        scanner = ExchangeReader(base_dir=tmp_path, use_index=False)
+        for conversation_id in ("conv_old", "conv_new"):
+            assert (_texts(indexed.read_conversation(conversation_id))
+                    == _texts(scanner.read_conversation(conversation_id)))
+        assert _texts(indexed.read_recent(60)) == _texts(scanner.read_recent(60))
+
+
+class TestFallback:
+    """Test reading without a usable index."""
+
+    def test_scans_without_index(self, reader, now):
+        _append(reader.logs_dir, now, _entry("conv_a", "one", now))
+        assert _texts(reader.read_conversation("conv_a")) == ["one"]
+        # Reading never creates the index
+        assert not reader.index_path.exists()
+
+    def test_corrupt_index(self, reader, now):
+        _append(reader.logs_dir, now, _entry("conv_a", "one", now))
+        reader.index_path.write_bytes(b"this is not a database" * 100)
+        assert _texts(reader.read_conversation("conv_a")) == ["one"]
+
+
+def test_index_file_not_mistaken_for_log(tmp_path):
+    logs_dir = tmp_path / "logs"
+    logs_dir.mkdir()
+    with ExchangeIndex(logs_dir) as index:
+        assert index.update() == 0
+        assert index.stats()["files"] == 0
+
+
+class TestSearch:
+    """Test full-text search."""
+
+    @pytest.fixture
+    def indexed(self, reader, now):
+        old = now - timedelta(days=30)
+        _append(reader.logs_dir, old, _entry("conv_old", "deploy the staging server", old, provider="kokoro"))
+        _append(
+            reader.logs_dir, now,
+            _entry("conv_new", "please deploy production", now),
+            _entry("conv_new", "Deploying production now, the server is ready", now + timedelta(seconds=1),
+                   type="tts"),
+            _entry("conv_new", "server server server", now + timedelta(seconds=2)),
+        )
+        reader.open_index().update()
+        return reader
+
+    def test_fts_query_translation(self):
+        from voice_mode.exchanges.index import fts_query
+        assert fts_query('deploy*  "staging server"') == '"deploy"* "staging server"'
+        assert fts_query('AND OR NOT (x') == '"AND" "OR" "NOT" "(x"'
+        assert fts_query('"unterminated phrase') == '"unterminated phrase"'
+        assert fts_query('* - ""') is None
+
+    def test_words_phrases_and_prefixes(self, indexed):
+        assert indexed.search("deploy production")[0] == 1
+        assert indexed.search("deploy*")[0] == 3
+        assert indexed.search('"staging server"')[1][0].conversation_id == "conv_old"
+        assert indexed.search('"server staging"')[0] == 0
+
+    def test_filters(self, indexed):
+        assert [e.type for e in indexed.search("deploy*", exchange_type="tts")[1]] == ["tts"]
+        assert indexed.search("deploy*", provider="Kokoro")[0] == 1
+        assert indexed.search("deploy*", days=7)[0] == 2
+
+    def test_ranking_and_paging(self, indexed):
+        total, page = indexed.search("server", limit=1)
+        assert total == 3
+        assert page[0].text == "server server server"
+        total, page = indexed.search("server", limit=2, offset=2, order="time")
+        assert total == 3
+        assert [e.text for e in page] == ["server server server"]
+
+    def test_regex_and_scan_fallback(self, indexed, tmp_path):
+        assert indexed.search(r"deploy(ing)? production", regex=True)[0] == 2
+        scanner = ExchangeReader(base_dir=tmp_path, use_index=False)
+        total, page = scanner.search("server", limit=1, offset=1, order="newest")
+        assert total == 3
+        assert page[0].text.startswith("Deploying")
+
+
+def test_torn_lines_recovered(reader, now):
+    """An entry appended after a torn write shares its line but is kept."""
+    torn = json.dumps(_entry("conv_a", "lost", now))[:50]
+    path = _append(reader.logs_dir, now, _entry("conv_a", "one", now))
+    with open(path, "a") as f:
+        f.write(torn + json.dumps(_entry("conv_a", "two", now)) + "\n")
+    _append(reader.logs_dir, now, _entry("conv_a", "three", now))
+    with open(path, "a") as f:
+        f.write(torn)  # Still being written
+
+    assert _texts(ExchangeReader(base_dir=reader.base_dir, use_index=False).read_date(now)) == ["one", "two", "three"]
+    index = reader.open_index()
+    assert index.update() == 3
+    assert _texts(index.exchanges()) == ["one", "two", "three"]
+
+
+class TestConversations:
+    """Test the per-conversation totals kept alongside the exchanges."""
+
+    def test_totals_follow_ingestion(self, reader, now):
+        yesterday = now - timedelta(days=1)
+        _append(reader.logs_dir, yesterday, _entry("conv_a", "one", yesterday, project=None))
+        index = reader.open_index()
+        index.update()
+        _append(reader.logs_dir, now, _entry("conv_a", "two", now), _entry("conv_b", "three", now))
+        index.update()
+
+        rows = {row[0]: row for row in index.conversations()}
+        assert rows["conv_a"][1:] == (yesterday.timestamp(), now.timestamp(), 2, "/work/app")
+        assert rows["conv_b"][3] == 1
+        assert index.conversation("conv_b") == rows["conv_b"]
+
+        # Dropping a file keeps what the conversation has in other files
+        (reader.logs_dir / f"exchanges_{now.strftime('%Y-%m-%d')}.jsonl").unlink()
+        index.update()
+        assert index.conversations() == [("conv_a", yesterday.timestamp(), yesterday.timestamp(), 1, None)]
+
+    def test_keyset_pages(self, reader, now):
+        _append(reader.logs_dir, now, *[
+            _entry(f"conv_{i}", "text", now + timedelta(seconds=i), project="/p" if i % 2 else None)
+            for i in range(5)
+        ])
+        index = reader.open_index()
+        index.update()
+
+        first = index.conversations(limit=2)
+        assert [row[0] for row in first] == ["conv_4", "conv_3"]
+        rest = index.conversations(limit=10, before=(first[-1][2], first[-1][0]))
+        assert [row[0] for row in rest] == ["conv_2", "conv_1", "conv_0"]
+        assert [row[0] for row in index.conversations(project="/p")] == ["conv_3", "conv_1"]
+        assert [row[0] for row in index.conversations(project="")] == ["conv_4", "conv_2", "conv_0"]
+        assert [row[:2] for row in index.projects()] == [(None, 3), ("/p", 2)]
+
+    def test_fingerprint_changes_with_logs(self, reader, now):
+        _append(reader.logs_dir, now, _entry("conv_a", "one", now))
+        index = reader.open_index()
+        index.update()
+        before = index.fingerprint()
+        assert index.fingerprint() == before
+        _append(reader.logs_dir, now, _entry("conv_a", "two", now))
+        index.update()
+        assert index.fingerprint() != before
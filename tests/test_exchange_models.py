@@ -0,0 +1,82 @@
+"""Tests for the compact exchange model."""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from voice_mode.exchanges import Exchange, ExchangeFilter, ExchangeMetadata
+
+
+def _line(**overrides):
+    entry = {
+        "version": 3,
+        "timestamp": "2025-03-01T12:00:00Z",
+        "conversation_id": "conv_1",
+        "type": "tts",
+        "text": "hello",
+        "metadata": {
+            "voice_mode_version": "6.0.0",
+            "provider": "Kokoro",
+            "voice": "af_sky",
+            "timing": "ttfa 0.8s, gen 1.6s, play 4.1s",
+            "unknown_field": 1,
+        },
+    }
+    entry.update(overrides)
+    return json.dumps(entry)
+
+
+def test_slots():
+    exchange = Exchange.from_jsonl(_line())
+    assert not hasattr(exchange, "__dict__")
+    assert not hasattr(exchange.metadata, "__dict__")
+
+
+def test_timestamp_and_metadata_decoded_on_access():
+    exchange = Exchange.from_jsonl(_line())
+    assert isinstance(exchange._timestamp, str)
+    assert isinstance(exchange._metadata, dict)
+
+    assert exchange.metadata_value("provider") == "Kokoro"
+    assert list(ExchangeFilter().by_provider("kokoro").apply([exchange])) == [exchange]
+    assert isinstance(exchange._metadata, dict)
+
+    assert exchange.timestamp == datetime(2025, 3, 1, 12, tzinfo=timezone.utc)
+    assert exchange.metadata == ExchangeMetadata(
+        voice_mode_version="6.0.0", provider="Kokoro", voice="af_sky",
+        timing="ttfa 0.8s, gen 1.6s, play 4.1s")
+    assert exchange.metadata_value("voice") == "af_sky"
+
+
+def test_legacy_timings_from_undecoded_metadata():
+    exchange = Exchange.from_jsonl(_line())
+    assert exchange.timings == {"ttfa": 800.0, "tts_gen": 1600.0, "tts_play": 4100.0}
+
+    v4 = Exchange.from_jsonl(_line(version=4, timings={"ttfa": 812.4}))
+    assert v4.timings == {"ttfa": 812.4}
+
+
+@pytest.mark.parametrize("overrides", [
+    {"metadata": {"provider": "openai"}},
+    {"metadata": "openai"},
+    {"timestamp": 12},
+])
+def test_invalid_entries_rejected_when_parsed(overrides):
+    with pytest.raises(ValueError):
+        Exchange.from_jsonl(_line(**overrides))
+
+
+def test_round_trip_and_equality():
+    exchange = Exchange.from_jsonl(_line())
+    copy = Exchange.from_jsonl(exchange.to_jsonl())
+    assert copy == exchange
+    assert copy.to_dict()["timestamp"] == "2025-03-01T12:00:00+00:00"
+    assert "unknown_field" not in copy.to_dict()["metadata"]
+
+    built = Exchange(
+        version=3, timestamp=exchange.timestamp, conversation_id="conv_1", type="tts",
+        text="hello", metadata=exchange.metadata)
+    assert built == exchange
+    assert built.has_metadata
+    assert not Exchange.from_jsonl(_line(metadata={})).has_metadata
@@ -0,0 +1,81 @@
+"""Tests for reading the latest exchanges backwards from the end of the logs."""
+
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from voice_mode.exchanges import Exchange, ExchangeReader
+from voice_mode.exchanges.reader import _reverse_lines
+
+
+def _line(text, timestamp):
+    return json.dumps({
+        "version": 4,
+        "timestamp": timestamp.isoformat(),
+        "conversation_id": "conv_1",
+        "type": "stt",
+        "text": text,
+        "metadata": {"voice_mode_version": "1.0", "provider": "whisper"},
+    }) + "\n"
+
+
+def _append(reader, day, data):
+    with open(reader._get_log_file_path(day), "a") as f:
+        f.write(data)
+
+
+@pytest.fixture
+def reader(tmp_path):
+    return ExchangeReader(base_dir=tmp_path, use_index=False)
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 64, 1 << 16])
+def test_reverse_lines(block_size):
+    data = b"one\ntwo\n\nthree\nunfinished"
+    lines = list(_reverse_lines(io.BytesIO(data), len(data), block_size))
+    assert lines == [b"unfinished", b"three", b"", b"two", b"one"]
+
+    lines = list(_reverse_lines(io.BytesIO(data), 8, block_size))
+    assert lines == [b"", b"two", b"one"]
+
+
+def test_latest_parses_only_needed_lines(reader, monkeypatch):
+    now = datetime.now()
+    _append(reader, now, "".join(_line(f"line {i}", now) for i in range(1000)))
+
+    parsed = []
+    original = Exchange.from_jsonl.__func__
+    monkeypatch.setattr(Exchange, "from_jsonl",
+                        classmethod(lambda cls, line: parsed.append(line) or original(cls, line)))
+
+    latest = reader.get_latest_exchanges(3)
+    assert [e.text for e in latest] == ["line 997", "line 998", "line 999"]
+    assert len(parsed) == 3
+
+
+def test_latest_continues_into_earlier_days(reader):
+    now = datetime.now()
+    yesterday = now - timedelta(days=1)
+    _append(reader, yesterday, _line("y1", yesterday) + _line("y2", yesterday))
+    _append(reader, now, _line("t1", now))
+
+    assert [e.text for e in reader.get_latest_exchanges(2)] == ["y2", "t1"]
+    assert [e.text for e in reader.get_latest_exchanges(10)] == ["y1", "y2", "t1"]
+
+
+def test_latest_skips_partial_and_recovers_torn_lines(reader):
+    now = datetime.now()
+    torn = _line("lost", now)[:40] + _line("kept", now)
+    _append(reader, now, _line("first", now) + torn + _line("partial", now)[:-20])
+
+    assert [e.text for e in reader.get_latest_exchanges(5)] == ["first", "kept"]
+
+
+def test_tail_without_follow(reader):
+    now = datetime.now()
+    _append(reader, now, "".join(_line(f"line {i}", now) for i in range(5)))
+
+    assert [e.text for e in reader.tail(follow=False, lines=2)] == ["line 3", "line 4"]
+    assert len(list(reader.tail(follow=False))) == 5
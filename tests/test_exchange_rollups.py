@@ -0,0 +1,126 @@
+"""Tests for cached daily statistics rollups."""
+
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from voice_mode.exchanges import DailyRollups, ExchangeReader, ExchangeStats
+from voice_mode.exchanges.rollups import rollup_path
+
+
+def _entry(conversation_id, timestamp, type="stt", timing=None, provider="openai"):
+    metadata = {"voice_mode_version": "1.0", "provider": provider, "transport": "local"}
+    if timing:
+        metadata["timing"] = timing
+    return {
+        "version": 3,
+        "timestamp": timestamp.isoformat(),
+        "conversation_id": conversation_id,
+        "type": type,
+        "text": "one two three",
+        "metadata": metadata,
+    }
+
+
+def _append(logs_dir, day, *entries):
+    path = logs_dir / f"exchanges_{day.strftime('%Y-%m-%d')}.jsonl"
+    with open(path, "a") as f:
+        for entry in entries:
+            f.write(json.dumps(entry) + "\n")
+    return path
+
+
+@pytest.fixture
+def reader(tmp_path):
+    return ExchangeReader(base_dir=tmp_path, use_index=False)
+
+
+@pytest.fixture
+def days(reader):
+    """Three past days and today, at noon local time."""
+    today = datetime.now().astimezone().replace(hour=12, minute=0, second=0, microsecond=0)
+    if today > datetime.now().astimezone():
+        today -= timedelta(hours=12)
+    for offset in (3, 2, 1):
+        day = today - timedelta(days=offset)
+        _append(
+            reader.logs_dir, day,
+            _entry(f"conv_{offset}", day, timing="record 3.0s, stt 0.5s"),
+            _entry(f"conv_{offset}", day + timedelta(seconds=5), type="tts",
+                   timing=f"ttfa {offset}.0s, gen 1.0s, play 2.0s", provider="kokoro"),
+        )
+    _append(reader.logs_dir, today, _entry("conv_today", today, timing="record 1.0s, stt 0.2s"))
+    return today
+
+
+def test_rollups_written_and_reused(reader, days):
+    rollups = DailyRollups(reader)
+    first = rollups.recent(3)
+    assert (rollups.hits, rollups.misses) == (0, 3)
+    # Today is never cached
+    assert not rollup_path(reader._get_log_file_path(days)).exists()
+
+    again = DailyRollups(reader)
+    second = again.recent(3)
+    assert (again.hits, again.misses) == (3, 0)
+    assert second.to_dict() == first.to_dict()
+
+
+def test_merged_days_match_single_pass(reader, days):
+    reader.daily_stats(3)
+    # Second call is answered from the saved rollups
+    cached = reader.daily_stats(3)
+    scanned = ExchangeStats(reader.query(days=4))
+    assert cached.total == scanned.total == 7
+    assert cached.to_dict() == scanned.to_dict()
+    assert cached.timing_stats()['tts']['ttfa']['max'] == 3.0
+    assert cached.conversation_stats()['total_conversations'] == 4
+
+
+def test_changed_log_rebuilds_rollup(reader, days):
+    DailyRollups(reader).recent(3)
+    yesterday = days - timedelta(days=1)
+    path = _append(reader.logs_dir, yesterday, _entry("conv_late", yesterday + timedelta(minutes=1)))
+
+    rollups = DailyRollups(reader)
+    assert rollups.day(yesterday.date()).total == 3
+    assert rollups.misses == 1
+
+    # Same size but rewritten in place
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    rollups.day(yesterday.date())
+    assert rollups.misses == 2
+
+
+def test_unreadable_or_stale_rollup_ignored(reader, days):
+    yesterday = (days - timedelta(days=1)).date()
+    cache_file = rollup_path(reader._get_log_file_path(yesterday))
+    DailyRollups(reader).day(yesterday)
+    cache_file.write_text("{not json")
+    assert DailyRollups(reader).day(yesterday).total == 2
+
+    data = json.loads(cache_file.read_text())
+    data["version"] = 0
+    cache_file.write_text(json.dumps(data))
+    rollups = DailyRollups(reader)
+    assert rollups.day(yesterday).total == 2
+    assert rollups.misses == 1
+
+
+def test_state_round_trip(reader, days):
+    stats = ExchangeStats(reader.query(days=4))
+    restored = ExchangeStats.from_state(json.loads(json.dumps(stats.to_state())))
+    assert restored.to_dict() == stats.to_dict()
+    assert restored.first_timestamp == stats.first_timestamp
+    # Restored statistics keep merging correctly across the day boundary
+    extra = ExchangeStats(reader.read_date(days))
+    assert restored.merge(extra).total == stats.total + 1
+
+
+def test_missing_days_are_empty(reader):
+    assert reader.daily_stats(30).total == 0
+    assert reader.daily_stats().total == 0
+    assert not list(reader.logs_dir.glob("*.rollup.json"))
@@ -0,0 +1,56 @@
+"""The failover paths close the per-request clients they create."""
+
+import asyncio
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+from voice_mode import simple_failover
+
+
+def _client(**attributes):
+    client = MagicMock(**attributes)
+    client.close = AsyncMock()
+    return client
+
+
+def test_stt_closes_every_client(monkeypatch):
+    monkeypatch.setattr(simple_failover, "STT_BASE_URLS", ["http://127.0.0.1:2022/v1", "http://127.0.0.1:2023/v1"])
+    refused, working = _client(), _client()
+    refused.audio.transcriptions.create = AsyncMock(side_effect=ConnectionError("refused"))
+    working.audio.transcriptions.create = AsyncMock(return_value="hello")
+    monkeypatch.setattr(simple_failover, "AsyncOpenAI", MagicMock(side_effect=[refused, working]))
+
+    result = asyncio.run(simple_failover.simple_stt_failover(io.BytesIO(b"audio")))
+
+    assert result["text"] == "hello"
+    refused.close.assert_awaited_once()
+    working.close.assert_awaited_once()
+
+
+def test_tts_closes_client_after_playback(monkeypatch):
+    from voice_mode import core
+
+    monkeypatch.setattr(simple_failover, "TTS_BASE_URLS", ["http://127.0.0.1:8880/v1"])
+    client = _client()
+    monkeypatch.setattr(simple_failover, "AsyncOpenAI", MagicMock(return_value=client))
+
+    async def text_to_speech(**kwargs):
+        # Still open while the audio plays
+        client.close.assert_not_awaited()
+        return True, {"ttfa": 0.1}
+
+    monkeypatch.setattr(core, "text_to_speech", text_to_speech)
+    success, _, config = asyncio.run(simple_failover.simple_tts_failover("hi", "af_sky", "tts-1"))
+
+    assert success and config["base_url"] == "http://127.0.0.1:8880/v1"
+    client.close.assert_awaited_once()
+
+
+def test_close_failure_is_ignored(monkeypatch):
+    monkeypatch.setattr(simple_failover, "STT_BASE_URLS", ["http://127.0.0.1:2022/v1"])
+    client = _client()
+    client.audio.transcriptions.create = AsyncMock(return_value="hello")
+    client.close = AsyncMock(side_effect=RuntimeError("event loop is closed"))
+    monkeypatch.setattr(simple_failover, "AsyncOpenAI", MagicMock(return_value=client))
+
+    assert asyncio.run(simple_failover.simple_stt_failover(io.BytesIO(b"audio")))["text"] == "hello"
@@ -0,0 +1,201 @@
+"""Tests for the Prometheus-style pipeline metrics."""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from voice_mode import metrics
+from voice_mode.metrics import (
+    MetricsRegistry, record_request_error, record_tts, start_metrics_export, start_metrics_server, write_snapshot
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    metrics.REGISTRY.clear()
+    yield
+    metrics.REGISTRY.clear()
+
+
+def test_histogram_exposition():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "Test latency", ("provider",), buckets=(0.5, 1.0))
+    histogram.observe(0.2, provider="kokoro")
+    histogram.observe(0.5, provider="kokoro")
+    histogram.observe(3, provider="kokoro")
+
+    assert registry.render().splitlines() == [
+        "# HELP test_seconds Test latency",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{provider="kokoro",le="0.5"} 2',
+        'test_seconds_bucket{provider="kokoro",le="1"} 2',
+        'test_seconds_bucket{provider="kokoro",le="+Inf"} 3',
+        'test_seconds_sum{provider="kokoro"} 3.7',
+        'test_seconds_count{provider="kokoro"} 3',
+    ]
+    assert histogram.count(provider="kokoro") == 3
+
+
+def test_metric_must_render_samples():
+    class Gauge(metrics._Metric):
+        type = "gauge"
+
+    with pytest.raises(TypeError):
+        Gauge("test_value", "Test gauge")
+
+
+def test_counter_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("test_total", "Test counter", ("endpoint",))
+    counter.inc(endpoint='http://x/"v1"\n')
+    counter.inc(2, endpoint=None)
+
+    assert 'test_total{endpoint="http://x/\\"v1\\"\\n"} 1' in registry.render()
+    assert 'test_total{endpoint=""} 2' in registry.render()
+    with pytest.raises(ValueError):
+        counter.inc(provider="openai")
+    with pytest.raises(ValueError):
+        counter.inc(-1, endpoint="x")
+    with pytest.raises(ValueError):
+        registry.counter("test_total", "Again")
+
+
+def test_pipeline_helpers():
+    config = {"provider": "kokoro", "base_url": "http://127.0.0.1:8880/v1"}
+    record_tts({"ttfa": 0.3, "generation": 0.8, "underruns": 2}, config, "local")
+    record_request_error("stt", "whisper", "http://127.0.0.1:2022/v1", failover=True)
+    record_request_error("stt", "openai", "https://api.openai.com/v1", failover=False)
+
+    labels = {"provider": "kokoro", "endpoint": "http://127.0.0.1:8880/v1", "transport": "local"}
+    assert metrics.TTFA_SECONDS.count(**labels) == 1
+    assert metrics.PLAYBACK_UNDERRUNS.value(**labels) == 2
+    assert metrics.FAILOVERS.value(service="stt", provider="whisper", endpoint="http://127.0.0.1:2022/v1") == 1
+    assert metrics.FAILOVERS.value(service="stt", provider="openai", endpoint="https://api.openai.com/v1") == 0
+    assert metrics.ERRORS.value(stage="stt", provider="openai", endpoint="https://api.openai.com/v1") == 1
+
+
+def test_probe_cache_counts_hits_and_misses(tmp_path):
+    from voice_mode.utils.probe_cache import ProbeCache
+
+    cache = ProbeCache(tmp_path / "probes.json")
+    assert cache.lookup("ffmpeg", ["fp"]) == (False, None)
+    cache.set("ffmpeg", ["fp"], "7.0")
+    assert cache.lookup("ffmpeg", ["fp"]) == (True, "7.0")
+    assert metrics.CACHE_HITS.value(cache="probe") == 1
+    assert metrics.CACHE_MISSES.value(cache="probe") == 1
+
+
+def test_http_endpoint():
+    metrics.TURN_SECONDS.observe(4.2, transport="local")
+    server = start_metrics_server(0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            body = response.read().decode()
+        assert 'voicemode_turn_seconds_count{transport="local"} 1' in body
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/other")
+        # A second server on the same port is refused, not fatal
+        assert start_metrics_server(port) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_extra_labels():
+    registry = MetricsRegistry()
+    registry.histogram("test_seconds", "Test latency", ("provider",), buckets=(1.0,)).observe(0.2, provider="kokoro")
+    registry.counter("test_total", "Test counter").inc()
+
+    lines = registry.render('pid="42"').splitlines()
+    assert 'test_seconds_bucket{provider="kokoro",pid="42",le="1"} 1' in lines
+    assert 'test_seconds_count{provider="kokoro",pid="42"} 1' in lines
+    assert 'test_total{pid="42"} 1' in lines
+
+
+def _scrape(port):
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+        return response.read().decode()
+
+
+def test_endpoint_serves_other_processes(tmp_path):
+    metrics.TURN_SECONDS.observe(4.2, transport="local")
+    other = MetricsRegistry()
+    other.histogram("voicemode_turn_seconds", "Another process", ("transport",)).observe(1.0, transport="livekit")
+    # Another MCP process that is still running...
+    other_pid = os.getppid()
+    (tmp_path / f"{other_pid}.prom").write_text(other.render(f'pid="{other_pid}"'))
+    # ...and one that exited without removing its snapshot
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    (tmp_path / f"{exited.pid}.prom").write_text(other.render(f'pid="{exited.pid}"'))
+
+    server = start_metrics_server(0, snapshot_dir=tmp_path)
+    try:
+        body = _scrape(server.server_address[1])
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert f'voicemode_turn_seconds_count{{transport="local",pid="{os.getpid()}"}} 1' in body
+    assert f'voicemode_turn_seconds_count{{transport="livekit",pid="{other_pid}"}} 1' in body
+    assert body.count("# TYPE voicemode_turn_seconds histogram") == 1
+    assert f'pid="{exited.pid}"' not in body
+    assert not (tmp_path / f"{exited.pid}.prom").exists()
+
+
+def test_export_publishes_until_port_is_free(tmp_path):
+    holder = start_metrics_server(0)
+    port = holder.server_address[1]
+    metrics.TURN_SECONDS.observe(4.2, transport="local")
+    snapshot = tmp_path / str(port) / f"{os.getpid()}.prom"
+    stop = threading.Event()
+    thread = start_metrics_export(port, "127.0.0.1", tmp_path, interval=0.05, stop=stop)
+    try:
+        _wait_for(snapshot.exists)
+        assert f'pid="{os.getpid()}"' in snapshot.read_text()
+
+        # The serving process exits; this one takes over the port
+        holder.shutdown()
+        holder.server_close()
+        _wait_for(lambda: not snapshot.exists())
+        assert f'transport="local",pid="{os.getpid()}"' in _scrape(port)
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+    assert not snapshot.exists()
+
+
+def test_write_snapshot(tmp_path):
+    metrics.TURN_SECONDS.observe(4.2, transport="local")
+    path = write_snapshot(tmp_path)
+    assert path.name == f"{os.getpid()}.prom"
+    assert f'voicemode_turn_seconds_count{{transport="local",pid="{os.getpid()}"}} 1' in path.read_text()
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+def test_resource():
+    from voice_mode.resources import metrics as metrics_resource
+
+    resource = getattr(metrics_resource.voice_metrics, "fn", metrics_resource.voice_metrics)
+    metrics.RECORD_SECONDS.observe(2.0, transport="local")
+
+    assert "# TYPE voicemode_record_seconds histogram" in asyncio.run(resource("prometheus"))
+    data = json.loads(asyncio.run(resource("json")))
+    assert data["voicemode_record_seconds"]["samples"][0]["count"] == 1
+    assert "error" in json.loads(asyncio.run(resource("xml")))
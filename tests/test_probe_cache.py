@@ -0,0 +1,241 @@
+"""Tests for the persistent probe cache."""
+
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from voice_mode.utils.probe_cache import ProbeCache, fingerprint
+from voice_mode.utils.dependencies.cache import DependencyCache
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return tmp_path / "cache" / "probes.json"
+
+
+@pytest.fixture
+def binary(tmp_path):
+    path = tmp_path / "ffmpeg"
+    path.write_text("#!/bin/sh\n")
+    return path
+
+
+class TestFingerprint:
+    """Test fingerprint construction."""
+
+    def test_changes_with_file(self, binary):
+        before = fingerprint(binary)
+        binary.write_text("#!/bin/sh\necho changed\n")
+        os.utime(binary, ns=(1, 1))
+        assert fingerprint(binary) != before
+
+    def test_changes_with_path_env(self, binary, monkeypatch):
+        before = fingerprint(binary)
+        monkeypatch.setenv("PATH", "/somewhere/else")
+        assert fingerprint(binary) != before
+
+    def test_missing_file(self, tmp_path):
+        fp = fingerprint(tmp_path / "missing", None)
+        assert fp[1] == [str(tmp_path / "missing"), None, None]
+        assert fp[2] is None
+
+
+class TestProbeCache:
+    """Test ProbeCache persistence and invalidation."""
+
+    def test_get_or_probe_caches_across_instances(self, cache_file, binary):
+        probe = MagicMock(return_value="6.1")
+        fp = fingerprint(binary)
+
+        assert ProbeCache(cache_file).get_or_probe("ffmpeg_version", fp, probe) == "6.1"
+        # A new instance (e.g. another process) reads the persisted value
+        assert ProbeCache(cache_file).get_or_probe("ffmpeg_version", fp, probe) == "6.1"
+        assert probe.call_count == 1
+        assert "ffmpeg_version" in json.loads(cache_file.read_text())
+
+    def test_fingerprint_change_reprobes(self, cache_file, binary):
+        cache = ProbeCache(cache_file)
+        cache.get_or_probe("ffmpeg_version", fingerprint(binary), lambda: "6.0")
+
+        binary.write_text("#!/bin/sh\nnew build\n")
+        assert cache.get_or_probe("ffmpeg_version", fingerprint(binary), lambda: "6.1") == "6.1"
+
+    def test_none_result_is_cached(self, cache_file):
+        cache = ProbeCache(cache_file)
+        fp = fingerprint(None)
+        cache.set("ffmpeg_version", fp, None)
+        assert cache.lookup("ffmpeg_version", fp) == (True, None)
+
+    def test_invalidate_prefix(self, cache_file):
+        cache = ProbeCache(cache_file)
+        fp = fingerprint()
+        cache.set("dependency:gcc", fp, True)
+        cache.set("dependency:uv", fp, True)
+        cache.set("gpu:Linux", fp, [False, "cpu"])
+
+        assert cache.invalidate("dependency:") == 2
+        assert set(ProbeCache(cache_file).entries()) == {"gpu:Linux"}
+        assert cache.invalidate() == 1
+
+    def test_disabled_cache_always_probes(self, cache_file):
+        cache = ProbeCache(cache_file, enabled=False)
+        probe = MagicMock(return_value=True)
+        cache.get_or_probe("gpu:Linux", fingerprint(), probe)
+        cache.get_or_probe("gpu:Linux", fingerprint(), probe)
+        assert probe.call_count == 2
+        assert not cache_file.exists()
+
+    def test_corrupt_file_is_ignored(self, cache_file):
+        cache_file.parent.mkdir(parents=True)
+        cache_file.write_text("{not json")
+        cache = ProbeCache(cache_file)
+        assert cache.lookup("gpu:Linux", fingerprint()) == (False, None)
+        cache.set("gpu:Linux", fingerprint(), [False, "cpu"])
+        assert cache.lookup("gpu:Linux", fingerprint()) == (True, [False, "cpu"])
+
+    def test_clear_from_another_process_is_seen(self, cache_file):
+        running = ProbeCache(cache_file)
+        running.set("gpu:Linux", fingerprint(), [False, "cpu"])
+        assert running.lookup("gpu:Linux", fingerprint())[0]
+
+        # `voicemode diag probes --clear` in another process
+        ProbeCache(cache_file).invalidate()
+        assert running.lookup("gpu:Linux", fingerprint()) == (False, None)
+
+    def test_concurrent_writers_keep_each_others_entries(self, cache_file):
+        import multiprocessing
+
+        context = multiprocessing.get_context("fork")
+        writers = [context.Process(target=_write_entries, args=(cache_file, f"w{i}", 20)) for i in range(4)]
+        for process in writers:
+            process.start()
+        for process in writers:
+            process.join()
+        assert len(ProbeCache(cache_file).entries()) == 80
+
+
+def _write_entries(cache_file, prefix, count):
+    cache = ProbeCache(cache_file)
+    for i in range(count):
+        cache.set(f"{prefix}:{i}", fingerprint(), i)
+
+
+class TestPersistentDependencyCache:
+    """Test DependencyCache backed by a ProbeCache."""
+
+    def test_package_manager_fingerprint_is_tagged(self, binary, monkeypatch):
+        from voice_mode.utils.dependencies import checker
+
+        class AptManager:
+            def database_paths(self):
+                return [binary]
+
+        monkeypatch.setattr(checker, "get_package_manager", AptManager)
+        fp = checker._dependency_fingerprint({"name": "ffmpeg"})
+        # The manager's name is a tag, not a file to stat
+        assert fp == ["AptManager", *fingerprint(binary)]
+        assert fp[2][0] == str(binary) and fp[2][1] is not None
+
+    def test_positive_result_persists(self, cache_file, binary):
+        fp = fingerprint(binary)
+        DependencyCache(ProbeCache(cache_file)).set("gcc", True, fp)
+
+        assert DependencyCache(ProbeCache(cache_file)).get("gcc", fp) is True
+        binary.write_text("upgraded")
+        assert DependencyCache(ProbeCache(cache_file)).get("gcc", fingerprint(binary)) is None
+
+    def test_missing_persisted_until_fingerprint_changes(self, cache_file, tmp_path):
+        dpkg_status = tmp_path / "status"
+        dpkg_status.write_text("Package: gcc\n")
+        DependencyCache(ProbeCache(cache_file)).set("portaudio", False, fingerprint(dpkg_status))
+        assert DependencyCache(ProbeCache(cache_file)).get("portaudio", fingerprint(dpkg_status)) is False
+
+        dpkg_status.write_text("Package: gcc\nPackage: portaudio\n")
+        assert DependencyCache(ProbeCache(cache_file)).get("portaudio", fingerprint(dpkg_status)) is None
+
+    def test_missing_without_fingerprint_not_cached(self, cache_file):
+        cache = DependencyCache(ProbeCache(cache_file))
+        cache.set("portaudio", False)
+        assert cache.get("portaudio") is None
+
+    def test_clear_removes_persisted(self, cache_file):
+        fp = fingerprint()
+        cache = DependencyCache(ProbeCache(cache_file))
+        cache.set("gcc", True, fp)
+        cache.clear()
+        assert DependencyCache(ProbeCache(cache_file)).get("gcc", fp) is None
+
+
+class TestCachedProbes:
+    """Test that probes use the global cache."""
+
+    def test_ffmpeg_version_cached(self, cache_file, monkeypatch):
+        from voice_mode.utils import probe_cache
+        from voice_mode.utils.ffmpeg_check import get_ffmpeg_version
+
+        monkeypatch.setattr(probe_cache, "_probe_cache", ProbeCache(cache_file))
+        mock_result = MagicMock(returncode=0, stdout="ffmpeg version 6.1.1 Copyright\n")
+
+        with patch("subprocess.run", return_value=mock_result) as mock_run:
+            assert get_ffmpeg_version() == "6.1.1"
+            assert get_ffmpeg_version() == "6.1.1"
+            assert mock_run.call_count == 1
+
+    def test_detect_gpu_cached(self, cache_file, monkeypatch):
+        from voice_mode.utils import probe_cache
+        from voice_mode.utils.gpu_detection import detect_gpu
+
+        monkeypatch.setattr(probe_cache, "_probe_cache", ProbeCache(cache_file))
+
+        with patch("voice_mode.utils.gpu_detection.platform.system", return_value="Linux"), \
+             patch("voice_mode.utils.gpu_detection._probe_gpu", return_value=(True, "cuda")) as mock_probe:
+            assert detect_gpu() == (True, "cuda")
+            assert detect_gpu() == (True, "cuda")
+            assert mock_probe.call_count == 1
+
+    def test_git_version_reprobed_after_new_tag_or_commit(self, cache_file, tmp_path, monkeypatch):
+        from voice_mode.utils import probe_cache
+        from voice_mode.utils.services import version_info
+
+        monkeypatch.setattr(probe_cache, "_probe_cache", ProbeCache(cache_file))
+        install_dir = tmp_path / "whisper.cpp"
+        git_dir = install_dir / ".git"
+        (git_dir / "refs" / "heads").mkdir(parents=True)
+        (git_dir / "refs" / "tags").mkdir()
+        (git_dir / "HEAD").write_text("ref: refs/heads/master\n")
+        branch = git_dir / "refs" / "heads" / "master"
+        branch.write_text("a" * 40 + "\n")
+        versions = iter(["v1.7.0", "v1.7.1", "v1.7.1-1-gbbbbbbb"])
+
+        with patch.object(version_info, "get_current_version", side_effect=lambda path: next(versions)):
+            assert version_info._get_cached_version(install_dir) == "v1.7.0"
+            assert version_info._get_cached_version(install_dir) == "v1.7.0"
+
+            # A fetch adds a loose tag
+            (git_dir / "refs" / "tags" / "v1.7.1").write_text("a" * 40 + "\n")
+            os.utime(git_dir / "refs" / "tags", ns=(1, 1))
+            assert version_info._get_cached_version(install_dir) == "v1.7.1"
+
+            # A commit moves the branch without touching HEAD
+            branch.write_text("b" * 40 + "\n")
+            os.utime(branch, ns=(2, 2))
+            assert version_info._get_cached_version(install_dir) == "v1.7.1-1-gbbbbbbb"
+
+    def test_component_dependencies_checked_concurrently(self):
+        from voice_mode.utils.dependencies.checker import check_component_dependencies
+
+        deps = {"voicemode": {"core": {"debian": {"packages": [
+            {"name": "gcc", "required": True, "check_command": "gcc --version"},
+            {"name": "uv", "required": True, "check_command": "uv --version"},
+            {"name": "g++", "required": False, "check_command": "g++ --version"},
+        ]}}}}
+
+        with patch("voice_mode.utils.dependencies.checker.detect_platform", return_value="debian"), \
+             patch("voice_mode.utils.dependencies.checker.check_dependency",
+                   side_effect=lambda pkg, key: pkg["name"] == "gcc") as mock_check:
+            results = check_component_dependencies("core", deps)
+
+        assert list(results.items()) == [("gcc", True), ("uv", False)]
+        assert mock_check.call_count == 2
@@ -0,0 +1,137 @@
+"""Tests for per-turn sampling profiles."""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from voice_mode import config
+from voice_mode.profiling import (
+    NOOP_PROFILER, TurnProfiler, finish_turn_profile, list_profiles, prune, start_turn_profile, summarize,
+)
+
+
+def _busy(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        sum(range(100))
+
+
+@pytest.fixture
+def profiling(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_ENABLED", True)
+    monkeypatch.setattr(config, "PROFILE_DIR", tmp_path)
+    monkeypatch.setattr(config, "PROFILE_INTERVAL", 0.002)
+    monkeypatch.setattr(config, "PROFILE_KEEP", 100)
+    return tmp_path
+
+
+def _turn(seconds=0.1, conversation_id="conv_a"):
+    async def turn():
+        profiler = start_turn_profile()
+        await asyncio.sleep(seconds)
+        await asyncio.to_thread(_busy, seconds)
+        profiler.stop()
+        return await asyncio.to_thread(finish_turn_profile, profiler, conversation_id,
+                                       timings={"stt": seconds}, success=True)
+    return asyncio.run(turn())
+
+
+def test_disabled_returns_noop(monkeypatch):
+    monkeypatch.setattr(config, "PROFILE_ENABLED", False)
+    profiler = start_turn_profile()
+    assert profiler is NOOP_PROFILER
+    assert finish_turn_profile(profiler, "conv_a") is None
+
+
+def test_turn_profile_speedscope(profiling):
+    idle = threading.Event()
+    sleeper = threading.Thread(target=idle.wait, name="idle-thread")
+    sleeper.start()
+    try:
+        path = _turn()
+    finally:
+        idle.set()
+        sleeper.join()
+
+    assert path.parent == profiling and path.name.endswith("_conv_a.speedscope.json")
+    document = json.loads(path.read_text())
+    assert document["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+    assert document["metadata"]["conversation_id"] == "conv_a"
+    assert document["metadata"]["timings"] == {"stt": 0.1}
+    names = [profile["name"] for profile in document["profiles"]]
+    # The event loop first; the idle thread is left out
+    assert names[0].endswith("(event loop)")
+    assert "idle-thread" not in names
+    frames = document["shared"]["frames"]
+    worker = [profile for profile in document["profiles"][1:]
+              if any(frames[stack[-1]]["name"] == "_busy" for stack in profile["samples"])]
+    assert worker and worker[0]["endValue"] == pytest.approx(0.1, abs=0.05)
+
+
+def test_one_turn_profiled_at_a_time(profiling):
+    first = start_turn_profile()
+    try:
+        assert first.recording
+        assert start_turn_profile() is NOOP_PROFILER
+    finally:
+        first.stop()
+        finish_turn_profile(first, "conv_a")
+    second = start_turn_profile()
+    assert second.recording
+    second.stop()
+    finish_turn_profile(second, "conv_b")
+
+
+def test_prune_and_list(tmp_path):
+    for second in range(5):
+        (tmp_path / f"profile_20250701_00000{second}_000_conv.speedscope.json").write_text("{}")
+    assert prune(tmp_path, keep=3) == 2
+    assert [p.name for p in list_profiles(tmp_path)] == [
+        f"profile_20250701_00000{second}_000_conv.speedscope.json" for second in (4, 3, 2)
+    ]
+
+
+def test_summarize_hottest_frames(profiling):
+    _turn(conversation_id="conv_a")
+    _turn(conversation_id="conv_b")
+
+    result = summarize(list_profiles(profiling))
+    assert result["turns"] == 2
+    frames = {frame["name"]: frame for frame in result["frames"]}
+    assert frames["_busy"]["self"] == pytest.approx(0.2, abs=0.1)
+    assert frames["_busy"]["total"] >= frames["_busy"]["self"]
+
+    event_loop = summarize(list_profiles(profiling), event_loop_only=True)
+    assert "_busy" not in {frame["name"] for frame in event_loop["frames"]}
+
+
+def test_cli(profiling):
+    from voice_mode.cli_commands.profiles import profiles
+
+    _turn()
+    runner = CliRunner()
+    listing = runner.invoke(profiles, ["list"])
+    assert listing.exit_code == 0 and "conv_a" in listing.output
+    summary = runner.invoke(profiles, ["summary", "--json"])
+    assert summary.exit_code == 0
+    assert json.loads(summary.output)["turns"] == 1
+
+
+def test_profiler_merges_repeated_stacks():
+    profiler = TurnProfiler(interval=0.001)
+    done = threading.Event()
+    thread = threading.Thread(target=done.wait)
+    thread.start()
+    profiler.start()
+    time.sleep(0.05)
+    profiler.stop()
+    done.set()
+    thread.join()
+    # Blocked the whole time: one entry with all the weight
+    samples = profiler.samples[thread.ident]
+    assert len(samples) == 1
+    assert samples[0][1] == pytest.approx(0.05, abs=0.03)
@@ -0,0 +1,158 @@
+"""Tests for the background speech queue."""
+
+import asyncio
+
+import pytest
+
+from voice_mode.audio_scheduler import AudioPriority, AudioScheduler
+from voice_mode.speech_queue import SpeechQueue, SpeechQueueFull
+
+
+class FakeSpeaker:
+    """Plays jobs through a scheduler, holding the device until released."""
+
+    def __init__(self, scheduler=None, synthesis_time=None):
+        self.scheduler = scheduler or AudioScheduler()
+        self.synthesis_time = synthesis_time or {}
+        self.played = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, job):
+        async with self.scheduler.job(job.owner, "speak", AudioPriority.SPEAK,
+                                      after=job.after, started=job.started):
+            await asyncio.sleep(self.synthesis_time.get(job.message, 0))
+            async with self.scheduler.device("playback"):
+                self.played.append(job.message)
+                await self.release.wait()
+        return True, f"spoke {job.message}", {"generation": 0.1, "playback": 0.2}
+
+
+async def _settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+class TestSubmit:
+    """Test accepting and running jobs."""
+
+    async def test_returns_before_playback(self):
+        speaker = FakeSpeaker()
+        speaker.release.clear()
+        queue = SpeechQueue(speaker)
+        job = await queue.submit("session-a", "hello")
+        assert not job.done.is_set()
+        speaker.release.set()
+        assert await queue.wait([job], timeout=1)
+        assert job.state == "done"
+        assert job.result == "spoke hello"
+        assert job.metrics["playback"] == 0.2
+
+    async def test_session_order_kept_while_synthesizing_ahead(self):
+        # The first message takes longer to synthesize but must still play first
+        speaker = FakeSpeaker(synthesis_time={"first": 0.05})
+        queue = SpeechQueue(speaker)
+        jobs = [await queue.submit("session-a", text) for text in ("first", "second")]
+        assert await queue.wait(jobs, timeout=1)
+        assert speaker.played == ["first", "second"]
+
+    async def test_failure_reported(self):
+        async def broken(job):
+            raise RuntimeError("no TTS")
+
+        queue = SpeechQueue(broken)
+        job = await queue.submit("session-a", "hello")
+        await queue.wait([job], timeout=1)
+        assert job.state == "failed"
+        assert "no TTS" in job.result
+        assert queue.status()["failed"] == 1
+
+
+class TestBackPressure:
+    """Test the policies applied when the queue is full."""
+
+    async def _full_queue(self, policy, **kwargs):
+        speaker = FakeSpeaker()
+        speaker.release.clear()
+        queue = SpeechQueue(speaker, maxsize=1, policy=policy, workers=1, **kwargs)
+        await queue.submit("session-a", "playing")
+        await _settle()
+        await queue.submit("session-a", "queued")
+        return speaker, queue
+
+    async def test_drop(self):
+        speaker, queue = await self._full_queue("drop")
+        with pytest.raises(SpeechQueueFull):
+            await queue.submit("session-a", "extra")
+        assert queue.status()["dropped"] == 1
+        speaker.release.set()
+
+    async def test_coalesce(self):
+        speaker, queue = await self._full_queue("coalesce")
+        job = await queue.submit("session-a", "extra")
+        assert job.message == "queued extra"
+        assert job.coalesced == 1
+        speaker.release.set()
+        await queue.wait(queue.jobs(), timeout=1)
+        assert speaker.played == ["playing", "queued extra"]
+
+    async def test_coalesce_needs_matching_options(self):
+        speaker, queue = await self._full_queue("coalesce", block_timeout=0.05)
+        with pytest.raises(SpeechQueueFull):
+            await queue.submit("session-a", "extra", {"voice": "nova"})
+        speaker.release.set()
+
+    async def test_block_until_space(self):
+        speaker, queue = await self._full_queue("block", block_timeout=1)
+        submit = asyncio.create_task(queue.submit("session-a", "extra"))
+        await asyncio.sleep(0.01)
+        assert not submit.done()
+        speaker.release.set()
+        job = await asyncio.wait_for(submit, 1)
+        await queue.wait([job], timeout=1)
+        assert speaker.played == ["playing", "queued", "extra"]
+        assert queue.status()["blocked_seconds"] > 0
+
+    async def test_block_timeout(self):
+        speaker, queue = await self._full_queue("block", block_timeout=0.05)
+        with pytest.raises(SpeechQueueFull, match="stayed full"):
+            await queue.submit("session-a", "extra")
+        speaker.release.set()
+
+
+class TestCancel:
+    """Test cancelling queued and running jobs."""
+
+    async def test_cancel_queued_and_running(self):
+        speaker = FakeSpeaker()
+        speaker.release.clear()
+        queue = SpeechQueue(speaker, workers=1)
+        running = await queue.submit("session-a", "playing")
+        queued = await queue.submit("session-a", "queued")
+        await _settle()
+        assert queue.cancel(owner="session-a") == 2
+        assert await queue.wait([running, queued], timeout=1)
+        assert running.state == "cancelled"
+        assert queued.state == "cancelled"
+        assert speaker.scheduler.holder is None
+        assert queue.status()["cancelled"] == 2
+
+    async def test_cancel_unknown(self):
+        queue = SpeechQueue(FakeSpeaker())
+        assert queue.cancel(job_id=42) == 0
+        assert queue.cancel() == 0
+
+
+async def test_tail_orders_blocking_speech():
+    speaker = FakeSpeaker()
+    speaker.release.clear()
+    queue = SpeechQueue(speaker)
+    job = await queue.submit("session-a", "narration")
+    tail = queue.tail("session-a")
+    assert tail is job.started
+    assert queue.tail("session-b") is None
+    await _settle()
+    assert tail.is_set()
+    speaker.release.set()
+    await queue.wait([job], timeout=1)
+    assert queue.tail("session-a") is None
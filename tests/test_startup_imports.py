@@ -0,0 +1,121 @@
+"""Tests for lazy imports and startup timing diagnostics."""
+
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from voice_mode.utils.lazy_imports import LazyImport, lazy_import, is_loaded, get_lazy_load_times
+from voice_mode.utils.import_timing import parse_importtime, StartupReport, ImportTiming
+
+
+SAMPLE_IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2000 |       2500 |     voice_mode.config
+import time:       500 |       3000 |   voice_mode
+import time:      1000 |       1000 | fastmcp.settings
+Traceback noise that is not an importtime line
+"""
+
+
+class TestLazyImport:
+    """Test the LazyImport proxy."""
+
+    def test_module_not_imported_until_used(self):
+        sys.modules.pop("colorsys", None)
+        proxy = lazy_import("colorsys")
+
+        assert "colorsys" not in sys.modules
+        assert not is_loaded(proxy)
+
+        assert proxy.rgb_to_hsv(1.0, 0.0, 0.0)[0] == 0.0
+        assert is_loaded(proxy)
+        assert "colorsys" in sys.modules
+        assert "colorsys" in get_lazy_load_times()
+
+    def test_attribute_proxy_is_callable(self):
+        dumps = lazy_import("json", "dumps")
+        assert dumps({"a": 1}) == '{"a": 1}'
+        assert "json:dumps" in get_lazy_load_times()
+
+    def test_missing_module_raises_on_use(self):
+        proxy = lazy_import("voice_mode_definitely_missing_module")
+        with pytest.raises(ImportError):
+            proxy.anything
+
+    def test_repr_does_not_trigger_import(self):
+        proxy = LazyImport("voice_mode_definitely_missing_module")
+        assert "not loaded" in repr(proxy)
+
+    def test_non_proxy_is_loaded(self):
+        assert is_loaded(sys)
+
+
+class TestServerImport:
+    """Importing the server must not pull in the audio stack."""
+
+    def test_server_import_skips_heavy_modules(self):
+        code = (
+            "import sys, voice_mode.server; "
+            "print(','.join(m for m in ('numpy', 'scipy', 'pydub', 'openai', 'webrtcvad') if m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=120)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1:] in ([], [""])
+
+
+class TestImportTiming:
+    """Test -X importtime parsing."""
+
+    def test_parse_importtime(self):
+        timings = parse_importtime(SAMPLE_IMPORTTIME)
+
+        assert [t.module for t in timings] == ["_io", "voice_mode.config", "voice_mode", "fastmcp.settings"]
+        assert timings[1].self_us == 2000
+        assert timings[1].cumulative_us == 2500
+        assert timings[1].depth == 2
+        assert timings[3].depth == 0
+
+    def test_report_aggregates(self):
+        report = StartupReport(
+            target="voice_mode.server",
+            wall_time=0.1,
+            timings=parse_importtime(SAMPLE_IMPORTTIME),
+            returncode=0
+        )
+
+        assert report.total_us == 3620
+        assert list(report.by_package().items())[0] == ("voice_mode", 2500)
+        assert report.slowest(1)[0].module == "voice_mode"
+        assert [t.module for t in report.slowest(10, prefix="voice_mode")] == ["voice_mode", "voice_mode.config"]
+
+    def test_package_property(self):
+        assert ImportTiming("a.b.c", 1, 1, 0).package == "a"
+
+
+class TestBackgroundProbes:
+    """Test that FFmpeg probes run off the startup path."""
+
+    def test_probe_sets_ffmpeg_unavailable(self):
+        from voice_mode import config, server
+
+        with patch("voice_mode.utils.ffmpeg_check.check_ffmpeg", return_value=(False, None)), \
+             patch("voice_mode.utils.ffmpeg_check.check_ffprobe", return_value=(False, None)):
+            thread = server.start_background_probes()
+            thread.join(timeout=5)
+
+        assert thread.daemon
+        assert config.FFMPEG_AVAILABLE is False
+        config.FFMPEG_AVAILABLE = True
+
+    def test_probe_sets_ffmpeg_available(self):
+        from voice_mode import config, server
+
+        with patch("voice_mode.utils.ffmpeg_check.check_ffmpeg", return_value=(True, "/usr/bin/ffmpeg")), \
+             patch("voice_mode.utils.ffmpeg_check.check_ffprobe", return_value=(True, "/usr/bin/ffprobe")):
+            thread = server.start_background_probes()
+            thread.join(timeout=5)
+
+        assert config.FFMPEG_AVAILABLE is True
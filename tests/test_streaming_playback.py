@@ -0,0 +1,182 @@
+"""Streaming TTS takes the audio device only once audio is ready to play."""
+
+import asyncio
+import importlib
+import sys
+import time
+import types
+
+import pytest
+
+from voice_mode.audio_scheduler import AudioPriority, AudioScheduler
+
+CHUNKS = 4
+SYNTHESIS_DELAY = 0.05  # between chunks from the TTS service
+CHUNK_PLAY_TIME = 0.05  # a blocking write() per chunk
+
+
+class FakeOutputStream:
+    """Output stream whose write() blocks like a full device buffer."""
+
+    opened = []
+    latency = 0.01
+
+    def __init__(self, **kwargs):
+        self.started_at = self.stopped_at = None
+        FakeOutputStream.opened.append(self)
+
+    def start(self):
+        self.started_at = time.monotonic()
+
+    def write(self, samples):
+        time.sleep(CHUNK_PLAY_TIME)
+        return False
+
+    def stop(self):
+        if self.stopped_at is None:
+            self.stopped_at = time.monotonic()
+
+    def close(self):
+        self.stop()
+
+
+class FakeSpeechClient:
+    """Streams PCM chunks the way an OpenAI-compatible TTS service does."""
+
+    def __init__(self):
+        self.synthesized = {}
+        self.audio = types.SimpleNamespace(speech=types.SimpleNamespace(with_streaming_response=self))
+
+    def create(self, **params):
+        client = self
+
+        class Response:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def iter_bytes(self, chunk_size=None):
+                for _ in range(CHUNKS):
+                    await asyncio.sleep(SYNTHESIS_DELAY)
+                    yield b"\0\0" * 240
+                client.synthesized[params["input"]] = time.monotonic()
+
+        return Response()
+
+
+@pytest.fixture
+def streaming(monkeypatch):
+    """voice_mode.streaming playing to a fake output device."""
+    fake_sd = types.ModuleType("sounddevice")
+    fake_sd.OutputStream = FakeOutputStream
+    FakeOutputStream.opened = []
+    monkeypatch.setitem(sys.modules, "sounddevice", fake_sd)
+    monkeypatch.delitem(sys.modules, "voice_mode.streaming", raising=False)
+    module = importlib.import_module("voice_mode.streaming")
+    monkeypatch.setattr(module, "sd", fake_sd)
+    return module
+
+
+def _assert_played_one_at_a_time():
+    streams = sorted(FakeOutputStream.opened, key=lambda stream: stream.started_at)
+    for earlier, later in zip(streams, streams[1:]):
+        assert earlier.stopped_at <= later.started_at
+
+
+async def test_synthesis_overlaps_other_playback(streaming):
+    scheduler = AudioScheduler()
+    client = FakeSpeechClient()
+
+    async def speak(owner, text):
+        async with scheduler.job(owner, "speak", AudioPriority.SPEAK):
+            return await streaming.stream_tts_audio(
+                text, client, {"input": text, "response_format": "pcm"},
+                playback_device=scheduler.device("playback")
+            )
+
+    results = await asyncio.gather(speak("session-a", "first"), speak("session-b", "second"))
+
+    assert all(success for success, _ in results)
+    first, second = sorted(FakeOutputStream.opened, key=lambda stream: stream.started_at)
+    # Both were downloaded while the first one played
+    assert client.synthesized["second"] < first.stopped_at
+    _assert_played_one_at_a_time()
+    assert scheduler.holder is None
+
+
+async def test_device_released_when_stream_fails(streaming):
+    scheduler = AudioScheduler()
+
+    class BrokenClient(FakeSpeechClient):
+        def create(self, **params):
+            raise ConnectionError("refused")
+
+    async with scheduler.job("session-a", "speak", AudioPriority.SPEAK):
+        success, _ = await streaming.stream_tts_audio(
+            "hello", BrokenClient(), {"input": "hello", "response_format": "pcm"},
+            playback_device=scheduler.device("playback")
+        )
+
+    assert not success
+    assert FakeOutputStream.opened == []
+    assert scheduler.status()["grants"] == 0
+
+
+async def test_chime_does_not_block_event_loop(monkeypatch):
+    from voice_mode import audio_scheduler, core
+
+    fake_sd = types.ModuleType("sounddevice")
+    fake_sd.play = lambda samples, sample_rate: None
+    fake_sd.wait = lambda: time.sleep(0.1)
+    fake_sd.stop = lambda: None
+    monkeypatch.setitem(sys.modules, "sounddevice", fake_sd)
+    monkeypatch.setattr(audio_scheduler, "_scheduler", AudioScheduler())
+
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.create_task(tick())
+    try:
+        assert await core.play_chime_start()
+    finally:
+        ticker.cancel()
+    assert ticks >= 5
+
+
+async def test_speech_queue_synthesizes_next_message_while_streaming(streaming, monkeypatch):
+    from voice_mode import audio_scheduler, config, core
+    from voice_mode.speech_queue import SpeechQueue
+
+    scheduler = AudioScheduler()
+    monkeypatch.setattr(audio_scheduler, "_scheduler", scheduler)
+    monkeypatch.setattr(config, "STREAMING_ENABLED", True)
+    client = FakeSpeechClient()
+    played = []
+
+    async def speak(job):
+        # What speak_message does, minus the bookkeeping
+        async with scheduler.job(job.owner, "speak", AudioPriority.SPEAK, after=job.after, started=job.started):
+            success, metrics = await core.text_to_speech(
+                job.message, {"tts": client}, "tts-1", "af_sky", "http://127.0.0.1:8880/v1",
+                audio_format="pcm"
+            )
+            played.append(job.message)
+        return success, job.message, metrics
+
+    queue = SpeechQueue(speak)
+    jobs = [await queue.submit("session-a", text) for text in ("first", "second")]
+    assert await queue.wait(jobs, timeout=5)
+
+    assert [job.state for job in jobs] == ["done", "done"]
+    assert played == ["first", "second"]
+    first, second = sorted(FakeOutputStream.opened, key=lambda stream: stream.started_at)
+    # The second worker synthesized the next message while the first one played
+    assert client.synthesized["second"] < first.stopped_at
+    _assert_played_one_at_a_time()
@@ -3,6 +3,7 @@
 import os
 import tempfile
 import asyncio
+import wave
 from pathlib import Path
 import numpy as np
 import pytest
@@ -10,6 +11,7 @@ from unittest.mock import patch, MagicMock, AsyncMock
 from datetime import datetime
 
 from voice_mode.tools.converse import speech_to_text
+from voice_mode.utils.audio_saver import get_audio_saver
 from voice_mode import config
 
 
@@ -41,40 +43,41 @@ async def test_stt_audio_saved_with_simple_failover():
                     mock_conv_logger.conversation_id = "test123"
                     mock_logger.return_value = mock_conv_logger
                     
-                    # Mock the scipy write function to actually write a test file
-                    with patch('scipy.io.wavfile.write') as mock_write:
-                        def write_side_effect(filename, rate, data):
-                            # Actually create a dummy file so the test can verify it exists
-                            Path(filename).parent.mkdir(parents=True, exist_ok=True)
-                            Path(filename).write_bytes(b"dummy wav content")
-                        
-                        mock_write.side_effect = write_side_effect
-                        
-                        # Call the function with save_audio enabled
-                        result = await speech_to_text(
-                            audio_data=audio_data,
-                            save_audio=True,
-                            audio_dir=test_audio_dir,
-                            transport="local"
-                        )
-                        
-                        # Verify transcription was returned (now returns dict)
-                        assert isinstance(result, dict)
-                        assert result.get("text") == "Test transcription"
-                        
-                        # Check that audio file was saved in year/month structure
-                        now = datetime.now()
-                        expected_dir = test_audio_dir / str(now.year) / f"{now.month:02d}"
-                        assert expected_dir.exists()
-                        
-                        # Find the saved STT file
-                        stt_files = list(expected_dir.glob("*_stt.wav"))
-                        assert len(stt_files) == 1
-                        # Verify it's an STT file with proper naming format
-                        assert stt_files[0].name.endswith("_stt.wav")
-                        
-                        # Verify file exists and has content
-                        assert stt_files[0].stat().st_size > 0
+                    # Call the function with save_audio enabled
+                    result = await speech_to_text(
+                        audio_data=audio_data,
+                        save_audio=True,
+                        audio_dir=test_audio_dir,
+                        transport="local"
+                    )
+                    
+                    # Verify transcription was returned (now returns dict)
+                    assert isinstance(result, dict)
+                    assert result.get("text") == "Test transcription"
+                    
+                    # STT ran against the in-memory WAV
+                    uploaded = mock_stt.call_args.kwargs["audio_file"]
+                    assert uploaded.getvalue()[:4] == b"RIFF"
+                    
+                    # The file is written in the background
+                    assert get_audio_saver().flush()
+                    
+                    # Check that audio file was saved in year/month structure
+                    now = datetime.now()
+                    expected_dir = test_audio_dir / str(now.year) / f"{now.month:02d}"
+                    assert expected_dir.exists()
+                    
+                    # Find the saved STT file
+                    stt_files = list(expected_dir.glob("*_stt.wav"))
+                    assert len(stt_files) == 1
+                    # Verify it's an STT file with proper naming format
+                    assert stt_files[0].name.endswith("_stt.wav")
+                    # Its name is returned for the exchange log
+                    assert result["audio_file"] == stt_files[0].name
+                    
+                    # Verify it holds the recording
+                    with wave.open(str(stt_files[0])) as wav_file:
+                        assert wav_file.getnframes() == sample_rate
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,92 @@
+"""Tests for numeric pipeline timings (exchange schema v4)."""
+
+import json
+from datetime import date
+
+import pytest
+
+from voice_mode.conversation_logger import ConversationLogger
+from voice_mode.exchanges import Exchange, ExchangeReader, ExchangeStats
+from voice_mode.statistics import ConversationStatistics
+from voice_mode.timings import legacy_timings_ms, parse_timing_string, timings_ms
+
+
+def test_timings_ms():
+    assert timings_ms({'ttfa': 0.81234, 'tts_gen': None, 'stt': 2}) == {'ttfa': 812.3, 'stt': 2000.0}
+    assert timings_ms({}) is None
+    assert timings_ms({'ttfa': None}) is None
+
+
+def test_parse_timing_string_aliases():
+    assert parse_timing_string("ttfa 1.2s, gen 2.3s, play 5.6s") == {
+        'ttfa': 1.2, 'tts_gen': 2.3, 'tts_play': 5.6}
+    assert parse_timing_string("tts_gen 1.0s, record 3.0s, total 9.5s") == {
+        'tts_gen': 1.0, 'record': 3.0, 'total': 9.5}
+    assert parse_timing_string("ttfa: 1.2s, total: 3.5s") == {'ttfa': 1.2, 'total': 3.5}
+    assert parse_timing_string(None) == {}
+
+
+def test_legacy_fields_preferred_over_string():
+    metadata = {'timing': "ttfa 0.8s, gen 1.6s", 'time_to_first_audio': 0.8123, 'voice': 'af_sky'}
+    assert legacy_timings_ms(metadata) == {'ttfa': 812.3, 'tts_gen': 1600.0}
+    assert legacy_timings_ms({'voice': 'af_sky'}) is None
+
+
+def _v3_line(type, timing, **metadata):
+    return json.dumps({
+        "version": 3,
+        "timestamp": "2025-01-01T09:00:00+00:00",
+        "conversation_id": "conv_a",
+        "type": type,
+        "text": "hello",
+        "metadata": {"voice_mode_version": "1.0", "timing": timing, **metadata},
+    })
+
+
+def test_reader_accepts_old_versions():
+    exchange = Exchange.from_jsonl(_v3_line("stt", "record 3.2s, stt 1.4s", transcription_time=1.4321))
+    assert exchange.timings == {'record': 3200.0, 'stt': 1432.1}
+
+    v1 = json.loads(_v3_line("tts", "ttfa 1.0s"))
+    del v1["version"]
+    exchange = Exchange.from_jsonl(json.dumps(v1))
+    assert exchange.version == 1
+    assert exchange.timings == {'ttfa': 1000.0}
+
+
+@pytest.fixture
+def logger(tmp_path):
+    return ConversationLogger(base_dir=tmp_path / "logs" / "conversations")
+
+
+def test_logger_writes_v4(logger, tmp_path):
+    logger.log_tts("hi", provider="kokoro", timing="ttfa 0.8s",
+                   timings={'ttfa': 0.81234, 'tts_gen': 1.5, 'tts_play': 2.25, 'tts_total': 3.9})
+    logger.log_stt("yes", timings={'record': 3.2109, 'stt': 0.4})
+    assert logger.flush()
+
+    log_file = next(logger.base_dir.glob("exchanges_*.jsonl"))
+    entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [entry["version"] for entry in entries] == [4, 4]
+    assert entries[0]["timings"] == {'ttfa': 812.3, 'tts_gen': 1500.0, 'tts_play': 2250.0, 'tts_total': 3900.0}
+    # The human-readable summary is still logged for display
+    assert entries[0]["metadata"]["timing"] == "ttfa 0.8s"
+    assert "time_to_first_audio" not in entries[0]["metadata"]
+
+    stats = ExchangeStats(ExchangeReader(base_dir=tmp_path, use_index=False).read_date(date.today()))
+    timing = stats.timing_stats()
+    assert timing['tts']['ttfa']['avg'] == pytest.approx(0.8123)
+    assert timing['tts']['playback']['max'] == 2.25
+    assert timing['stt']['record']['avg'] == pytest.approx(3.2109)
+
+
+def test_session_statistics_use_numbers():
+    tracker = ConversationStatistics()
+    tracker.add_conversation_result("hi", "ok", timing_str="ttfa 0.8s, total 9.0s",
+                                    timings={'ttfa': 0.8123, 'tts_gen': 1.25, 'total': 9.0})
+    # Speak-only strings abbreviate stages; they still map to the same fields
+    tracker.add_conversation_result("hi", "[speak-only]", timing_str="ttfa 1.0s, gen 1.5s, play 2.0s")
+    stats = tracker.get_session_statistics()
+    assert stats.max_ttfa == 1.0
+    assert stats.min_ttfa == 0.8123
+    assert stats.avg_tts_generation == pytest.approx(1.375)
@@ -0,0 +1,144 @@
+"""Tests for per-turn trace spans."""
+
+import asyncio
+import contextvars
+import json
+import threading
+
+import pytest
+
+from voice_mode.tracing import NOOP_SPAN, SPAN_KIND_CLIENT, STATUS_ERROR, Tracer, current_span
+from voice_mode.utils.append_log import AppendLogWriter
+
+
+@pytest.fixture
+def writer():
+    writer = AppendLogWriter(flush_interval=0)
+    yield writer
+    writer.close()
+
+
+def _exported(writer, directory):
+    writer.flush()
+    return [json.loads(line) for path in sorted(directory.glob("traces_*.jsonl"))
+            for line in path.read_text().splitlines()]
+
+
+def _spans(record):
+    return record["resourceSpans"][0]["scopeSpans"][0]["spans"]
+
+
+def _attributes(span):
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+def test_disabled_tracer_returns_noop(tmp_path, writer):
+    tracer = Tracer(enabled=False, directory=tmp_path, writer=writer)
+    with tracer.start_span("converse") as span:
+        assert span is NOOP_SPAN
+        span.set_attribute("ignored", 1)
+        assert current_span() is NOOP_SPAN
+    assert _exported(writer, tmp_path) == []
+
+
+def test_nested_spans_exported_when_root_ends(tmp_path, writer):
+    tracer = Tracer(enabled=True, directory=tmp_path, writer=writer)
+
+    async def turn():
+        with tracer.start_span("converse", {"message.length": 5}):
+            with tracer.start_span("tts.request", {"endpoint": "http://x/v1/audio/speech"},
+                                   kind=SPAN_KIND_CLIENT) as request:
+                request.add_event("first_byte")
+                with tracer.start_span("tts.playback") as playback:
+                    playback.set_attributes(underruns=2, interrupted=False)
+            # Tasks inherit the current span
+            await asyncio.create_task(child())
+            assert not _exported(writer, tmp_path)
+
+    async def child():
+        with tracer.start_span("chime", {"chime": "listening"}):
+            pass
+
+    asyncio.run(turn())
+
+    records = _exported(writer, tmp_path)
+    assert len(records) == 1
+    assert records[0]["resourceSpans"][0]["resource"]["attributes"][0]["value"] == {"stringValue": "voicemode"}
+    spans = {span["name"]: span for span in _spans(records[0])}
+    root = spans["converse"]
+    assert "parentSpanId" not in root
+    assert {span["traceId"] for span in spans.values()} == {root["traceId"]}
+    assert spans["tts.request"]["parentSpanId"] == root["spanId"]
+    assert spans["tts.playback"]["parentSpanId"] == spans["tts.request"]["spanId"]
+    assert spans["chime"]["parentSpanId"] == root["spanId"]
+    assert spans["tts.request"]["kind"] == SPAN_KIND_CLIENT
+    assert spans["tts.request"]["events"][0]["name"] == "first_byte"
+    assert _attributes(spans["tts.playback"]) == {"underruns": "2", "interrupted": False}
+    assert int(root["startTimeUnixNano"]) <= int(spans["tts.request"]["startTimeUnixNano"])
+    assert int(spans["tts.playback"]["endTimeUnixNano"]) <= int(root["endTimeUnixNano"])
+
+
+def test_exception_marks_span_failed(tmp_path, writer):
+    tracer = Tracer(enabled=True, directory=tmp_path, writer=writer)
+    with pytest.raises(ConnectionError):
+        with tracer.start_span("stt.request"):
+            raise ConnectionError("refused")
+    span = _spans(_exported(writer, tmp_path)[0])[0]
+    assert span["status"] == {"code": STATUS_ERROR, "message": "refused"}
+    assert span["events"][0]["name"] == "exception"
+
+
+def test_thread_sees_span_through_copied_context(tmp_path, writer):
+    tracer = Tracer(enabled=True, directory=tmp_path, writer=writer)
+    with tracer.start_span("capture"):
+        context = contextvars.copy_context()
+        thread = threading.Thread(target=context.run,
+                                  args=(lambda: current_span().add_event("vad.endpoint", {"silence_ms": 800}),))
+        thread.start()
+        thread.join()
+    span = _spans(_exported(writer, tmp_path)[0])[0]
+    assert span["events"][0]["name"] == "vad.endpoint"
+
+
+def test_span_ending_after_root_is_exported_separately(tmp_path, writer):
+    tracer = Tracer(enabled=True, directory=tmp_path, writer=writer)
+    root = tracer.start_span("converse")
+    straggler = tracer.start_span("tts.playback")
+    root.end()
+    straggler.end()
+    records = _exported(writer, tmp_path)
+    assert [[s["name"] for s in _spans(r)] for r in records] == [["converse"], ["tts.playback"]]
+    assert _spans(records[1])[0]["traceId"] == _spans(records[0])[0]["traceId"]
+    # Not a child of the ended root, which is current again
+    with tracer.start_span("speak") as span:
+        assert span.parent_id is None
+        assert span.trace_id != root.trace_id
+
+
+def test_stt_spans(tmp_path, writer, monkeypatch):
+    from unittest.mock import AsyncMock, MagicMock
+
+    import numpy as np
+
+    from voice_mode import simple_failover, tracing
+    from voice_mode.tools.converse import speech_to_text
+
+    monkeypatch.setattr(tracing, "_tracer", Tracer(enabled=True, directory=tmp_path, writer=writer))
+    monkeypatch.setattr(simple_failover, "STT_BASE_URLS", ["http://127.0.0.1:2022/v1", "http://127.0.0.1:2023/v1"])
+    refused, working = MagicMock(), MagicMock()
+    refused.audio.transcriptions.create = AsyncMock(side_effect=ConnectionError("refused"))
+    working.audio.transcriptions.create = AsyncMock(return_value="hello there")
+    monkeypatch.setattr(simple_failover, "AsyncOpenAI", MagicMock(side_effect=[refused, working]))
+
+    with tracing.start_span("converse"):
+        result = asyncio.run(speech_to_text(np.zeros(24000, dtype=np.int16)))
+    assert result["text"] == "hello there"
+
+    spans = _spans(_exported(writer, tmp_path)[0])
+    assert [s["name"] for s in spans] == ["stt.request", "stt.request", "stt", "converse"]
+    failed, succeeded, stt = spans[:3]
+    assert failed["status"]["code"] == STATUS_ERROR
+    assert _attributes(succeeded)["endpoint"] == "http://127.0.0.1:2023/v1/audio/transcriptions"
+    assert _attributes(succeeded)["bytes"] == _attributes(stt)["bytes"] == str(44 + 48000)
+    assert _attributes(succeeded)["text.length"] == "11"
+    assert succeeded["parentSpanId"] == stt["spanId"]
@@ -0,0 +1,173 @@
+"""
+Mergeable streaming accumulators for timing statistics.
+
+Statistics are built one value at a time without keeping the values, and
+two accumulators built over different data (different log files, days or
+processes) can be merged into one that describes both.
+
+``QuantileSketch`` estimates percentiles with bounded relative error by
+counting values in logarithmically sized buckets (the DDSketch approach):
+a value ``x`` lands in bucket ``ceil(log(x) / log(gamma))``, so every
+estimate is within ``relative_accuracy`` of a true value from the data.
+Timings spanning a millisecond to a few hours fit in well under a thousand
+buckets, and merging is adding bucket counts.
+"""
+
+import math
+from typing import Dict, Iterable, Optional
+
+
+class QuantileSketch:
+    """Mergeable quantile estimator with bounded relative error."""
+
+    # Values at or below this are counted as zero
+    MIN_VALUE = 1e-9
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        """Create an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets: Dict[int, int] = {}
+        self._zeros = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Record a value (negative values are counted as zero)."""
+        if value <= self.MIN_VALUE:
+            self._zeros += count
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self._buckets[key] = self._buckets.get(key, 0) + count
+        self.count += count
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Add the values recorded by another sketch."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other._buckets.items():
+            self._buckets[key] = self._buckets.get(key, 0) + count
+        self._zeros += other._zeros
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate the q-quantile (0 <= q <= 1), or None if empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                # Midpoint (in relative terms) of the bucket's value range
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serializable form (see ``from_dict``)."""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'zeros': self._zeros,
+            'buckets': {str(key): count for key, count in self._buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> 'QuantileSketch':
+        """Restore a sketch saved with ``to_dict``."""
+        sketch = cls(float(data.get('relative_accuracy', 0.01)))
+        sketch._zeros = int(data.get('zeros', 0))
+        sketch._buckets = {int(key): int(count) for key, count in dict(data.get('buckets', {})).items()}
+        sketch.count = sketch._zeros + sum(sketch._buckets.values())
+        return sketch
+
+
+class RunningStats:
+    """Count, sum, min, max and percentiles of a stream of values."""
+
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, values: Iterable[float] = ()):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.sketch = QuantileSketch()
+        for value in values:
+            self.add(value)
+
+    def add(self, value: float) -> None:
+        """Record a value."""
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.sketch.add(value)
+
+    def merge(self, other: 'RunningStats') -> None:
+        """Add the values recorded by another accumulator."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated q-quantile, clamped to the observed range."""
+        value = self.sketch.quantile(q)
+        if value is None:
+            return None
+        return min(max(value, self.min), self.max)
+
+    def to_dict(self) -> Dict[str, float]:
+        """avg/min/max/count plus p50/p95/p99 (empty dict when no values)."""
+        if not self.count:
+            return {}
+        result = {
+            'avg': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'count': self.count,
+        }
+        for q in self.QUANTILES:
+            result[f"p{round(q * 100)}"] = self.quantile(q)
+        return result
+
+    def to_state(self) -> Dict[str, object]:
+        """Serializable state, including the sketch (see ``from_state``)."""
+        return {
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'sketch': self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_state(cls, data: Dict[str, object]) -> 'RunningStats':
+        """Restore an accumulator saved with ``to_state``."""
+        stats = cls()
+        stats.count = int(data.get('count', 0))
+        stats.total = float(data.get('total', 0.0))
+        stats.min = data.get('min')
+        stats.max = data.get('max')
+        stats.sketch = QuantileSketch.from_dict(data.get('sketch', {}))
+        return stats
@@ -0,0 +1,443 @@
+"""
+Archival and retention of saved audio.
+
+With ``SAVE_AUDIO`` on, every STT capture is kept as 24 kHz WAV and every
+TTS response in its output format under ``AUDIO_DIR/YYYY/MM``, which adds
+up quickly. ``AudioArchiver`` keeps that directory in check:
+
+1. Audio older than ``after_days`` is transcoded to Opus at a speech
+   bitrate by ffmpeg, in a pool of worker processes running at idle
+   priority. The ``.opus`` file keeps the original's modification time.
+2. Exchanges that reference a transcoded file are pointed at the ``.opus``
+   file. Each affected log file (the day of the recording and the next) is
+   rewritten atomically under the lock its writers take (see
+   ``rewrite_log``).
+3. Only then are the originals deleted.
+4. Retention: audio older than ``max_age_days`` is deleted, then the
+   oldest audio until the directory is within ``max_size`` bytes.
+
+Playback does not depend on step 2: ``get_audio_path`` and
+``find_audio_file`` fall back to the ``.opus`` copy of a file that is gone.
+
+Run it with ``voicemode audio archive``, or set
+``VOICEMODE_AUDIO_ARCHIVE_AUTO=true`` to have the server run it in the
+background once a day for as long as it runs (``archive_periodically``).
+"""
+
+import json
+import logging
+import multiprocessing
+import os
+import shutil
+import stat
+import subprocess
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from voice_mode.utils.append_log import rewrite_log
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs are not serialized
+    fcntl = None
+
+logger = logging.getLogger("voicemode")
+
+# Formats worth transcoding; Opus and Ogg files are left as they are
+TRANSCODE_SUFFIXES = ('.wav', '.pcm', '.flac', '.mp3', '.aac', '.m4a')
+AUDIO_SUFFIXES = TRANSCODE_SUFFIXES + ('.opus', '.ogg')
+
+# Raw PCM has no header; this is what the TTS providers send
+PCM_SAMPLE_RATE = 24000
+
+# Longest a single file may take to transcode, in seconds
+TRANSCODE_TIMEOUT = 600
+
+# Files next to the audio that serialize runs and remember the last one
+LOCK_FILE = '.archive.lock'
+STAMP_FILE = '.archive.stamp'
+
+# Shortest wait before checking again, e.g. after a failed run
+MIN_RECHECK = 3600
+
+
+class ArchiveInProgress(RuntimeError):
+    """Another process is archiving the same audio directory."""
+
+
+@dataclass
+class ArchiveReport:
+    """What an archive run did (or, in a dry run, would do)."""
+
+    dry_run: bool = False
+    transcoded: int = 0
+    failed: int = 0
+    # Files whose Opus version came out no smaller
+    kept: int = 0
+    references_updated: int = 0
+    deleted: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def reclaimed(self) -> int:
+        """Bytes freed in the audio directory."""
+        return self.bytes_before - self.bytes_after
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'dry_run': self.dry_run,
+            'transcoded': self.transcoded,
+            'failed': self.failed,
+            'kept': self.kept,
+            'references_updated': self.references_updated,
+            'deleted': self.deleted,
+            'bytes_before': self.bytes_before,
+            'bytes_after': self.bytes_after,
+            'reclaimed': self.reclaimed,
+            'errors': self.errors,
+        }
+
+
+def _lower_priority() -> None:
+    """Pool initializer: run workers (and their ffmpeg) only when the CPU is idle."""
+    try:
+        os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+    except (AttributeError, OSError):
+        try:
+            os.nice(19)
+        except (AttributeError, OSError):
+            pass
+
+
+def transcode(source: str, bitrate: int, ffmpeg: str = 'ffmpeg') -> Tuple[str, Optional[str], Optional[str]]:
+    """Transcode one file to Opus next to it.
+
+    The original is left in place. The Opus file is written under a
+    temporary name and renamed when complete, with the original's
+    modification time.
+
+    Returns:
+        ``(source, target, error)``: target is None if transcoding failed
+        (error says why) or the result was no smaller than the original
+    """
+    src = Path(source)
+    target = src.with_suffix('.opus')
+    tmp = target.with_name(target.name + '.tmp')
+    command = [ffmpeg, '-nostdin', '-hide_banner', '-loglevel', 'error', '-y']
+    if src.suffix.lower() == '.pcm':
+        command += ['-f', 's16le', '-ar', str(PCM_SAMPLE_RATE), '-ac', '1']
+    command += [
+        '-i', str(src), '-vn',
+        '-c:a', 'libopus', '-b:a', str(bitrate), '-application', 'voip',
+        '-f', 'ogg', str(tmp),
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, timeout=TRANSCODE_TIMEOUT)
+        if result.returncode != 0:
+            message = result.stderr.decode('utf-8', 'replace').strip().splitlines()
+            raise RuntimeError(message[-1] if message else f"ffmpeg exited with {result.returncode}")
+        info = src.stat()
+        if tmp.stat().st_size >= info.st_size:
+            tmp.unlink()
+            return source, None, None
+        os.utime(tmp, ns=(info.st_atime_ns, info.st_mtime_ns))
+        os.replace(tmp, target)
+        return source, str(target), None
+    except Exception as e:
+        tmp.unlink(missing_ok=True)
+        return source, None, f"{src.name}: {e}"
+
+
+def _relink(line: str, renamed: Dict[str, str]) -> str:
+    """Point an exchange log line at the transcoded audio file, if it has one."""
+    if '"audio_file"' not in line:
+        return line
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return line
+    audio_file = entry.get('audio_file') if isinstance(entry, dict) else None
+    if not isinstance(audio_file, str):
+        return line
+    name = Path(audio_file).name
+    if name not in renamed:
+        return line
+    entry['audio_file'] = audio_file[:len(audio_file) - len(name)] + renamed[name]
+    return json.dumps(entry)
+
+
+def _day(path: Path, mtime: float) -> date:
+    """Day an audio file was recorded, from its YYYYMMDD_ name or its mtime."""
+    try:
+        return datetime.strptime(path.name[:8], '%Y%m%d').date()
+    except ValueError:
+        return datetime.fromtimestamp(mtime).date()
+
+
+class AudioArchiver:
+    """Transcodes old audio to Opus and applies the retention policy."""
+
+    def __init__(
+        self,
+        audio_dir: Optional[Path] = None,
+        logs_dir: Optional[Path] = None,
+        after_days: Optional[float] = None,
+        bitrate: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+        max_size: Optional[int] = None,
+        workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            audio_dir: Saved audio (defaults to the configured AUDIO_DIR)
+            logs_dir: Exchange logs referencing it (defaults to logs/conversations)
+            after_days: Transcode audio older than this many days
+            bitrate: Opus bitrate in bits per second
+            max_age_days: Delete audio older than this many days (0: keep)
+            max_size: Delete the oldest audio beyond this many bytes (0: no limit)
+            workers: Transcoding processes; 0 transcodes in this process
+
+        Unset arguments come from the ``VOICEMODE_AUDIO_*`` settings.
+        """
+        from voice_mode import config
+
+        self.audio_dir = Path(audio_dir) if audio_dir else Path(config.AUDIO_DIR)
+        self.logs_dir = Path(logs_dir) if logs_dir else Path(config.LOGS_DIR) / "conversations"
+        self.after_days = config.AUDIO_ARCHIVE_AFTER_DAYS if after_days is None else after_days
+        self.bitrate = config.AUDIO_ARCHIVE_BITRATE if bitrate is None else bitrate
+        self.max_age_days = config.AUDIO_RETENTION_DAYS if max_age_days is None else max_age_days
+        self.max_size = config.AUDIO_MAX_SIZE if max_size is None else max_size
+        self.workers = config.AUDIO_ARCHIVE_WORKERS if workers is None else workers
+
+    def run(self, dry_run: bool = False) -> ArchiveReport:
+        """Archive and prune the audio directory.
+
+        Args:
+            dry_run: Only report what would be transcoded and deleted
+
+        Raises:
+            ArchiveInProgress: Another process is archiving this directory
+            RuntimeError: There is audio to transcode but ffmpeg is missing
+        """
+        report = ArchiveReport(dry_run=dry_run)
+        if not self.audio_dir.is_dir():
+            return report
+        with _RunLock(self.audio_dir / LOCK_FILE):
+            now = time.time()
+            files = dict(self._scan())
+            report.bytes_before = sum(size for size, _ in files.values())
+
+            cutoff = now - self.after_days * 86400
+            pending = sorted(
+                path for path, (_, mtime) in files.items()
+                if path.suffix.lower() in TRANSCODE_SUFFIXES and mtime < cutoff
+            )
+            if dry_run:
+                report.transcoded = len(pending)
+            elif pending:
+                self._archive(pending, files, report)
+
+            self._apply_retention(files, now, dry_run, report)
+            report.bytes_after = sum(size for size, _ in files.values())
+            if not dry_run:
+                (self.audio_dir / STAMP_FILE).touch()
+        return report
+
+    def _scan(self) -> Iterator[Tuple[Path, Tuple[int, float]]]:
+        """Audio files with their sizes and modification times."""
+        for path in self.audio_dir.rglob('*'):
+            suffix = path.suffix.lower()
+            if suffix == '.tmp' and path.name.endswith('.opus.tmp'):
+                # Left behind by an interrupted run (runs are serialized)
+                path.unlink(missing_ok=True)
+                continue
+            if suffix not in AUDIO_SUFFIXES:
+                continue
+            try:
+                info = path.stat()
+            except FileNotFoundError:
+                continue
+            if stat.S_ISREG(info.st_mode):
+                yield path, (info.st_size, info.st_mtime)
+
+    def _archive(self, pending: List[Path], files: Dict[Path, Tuple[int, float]], report: ArchiveReport) -> None:
+        ffmpeg = shutil.which('ffmpeg')
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg is required to transcode audio")
+
+        renamed: Dict[str, str] = {}
+        days: Dict[str, Set[date]] = {}
+        for source, target, error in self._transcode_all(pending, ffmpeg):
+            source = Path(source)
+            if error:
+                report.failed += 1
+                report.errors.append(error)
+                logger.warning(f"Could not transcode audio {error}")
+            elif target is None:
+                report.kept += 1
+            else:
+                target = Path(target)
+                report.transcoded += 1
+                renamed[source.name] = target.name
+                day = _day(source, files[source][1])
+                days.setdefault(source.name, set()).update((day, day + timedelta(days=1)))
+                info = target.stat()
+                files[target] = (info.st_size, info.st_mtime)
+        if not renamed:
+            return
+
+        # Exchanges are logged when the audio is saved, so its references
+        # are in that day's log or, past midnight, the next
+        failed_logs: Set[date] = set()
+        for day in sorted(set().union(*days.values())):
+            log_file = self.logs_dir / f"exchanges_{day.strftime('%Y-%m-%d')}.jsonl"
+            if not log_file.exists():
+                continue
+            try:
+                report.references_updated += rewrite_log(log_file, lambda line: _relink(line, renamed))
+            except OSError as e:
+                failed_logs.add(day)
+                report.errors.append(f"{log_file.name}: {e}")
+                logger.warning(f"Could not update audio references in {log_file}: {e}")
+
+        for source in pending:
+            if source.name not in renamed:
+                continue
+            if days[source.name] & failed_logs:
+                # Keep the original until its references are updated
+                continue
+            self._delete(source, files, report, count=False)
+
+    def _transcode_all(self, pending: List[Path], ffmpeg: str) -> Iterable[Tuple[str, Optional[str], Optional[str]]]:
+        if self.workers <= 0:
+            for path in pending:
+                yield transcode(str(path), self.bitrate, ffmpeg)
+            return
+        # spawn: the server may fork this from a process with other threads
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(pending)),
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_lower_priority,
+        ) as pool:
+            yield from pool.map(transcode, [str(path) for path in pending],
+                                [self.bitrate] * len(pending), [ffmpeg] * len(pending))
+
+    def _apply_retention(self, files: Dict[Path, Tuple[int, float]], now: float,
+                         dry_run: bool, report: ArchiveReport) -> None:
+        if self.max_age_days > 0:
+            cutoff = now - self.max_age_days * 86400
+            for path in [path for path, (_, mtime) in files.items() if mtime < cutoff]:
+                self._delete(path, files, report, dry_run=dry_run)
+
+        if self.max_size > 0:
+            total = sum(size for size, _ in files.values())
+            for path in sorted(files, key=lambda path: files[path][1]):
+                if total <= self.max_size:
+                    break
+                total -= files[path][0]
+                self._delete(path, files, report, dry_run=dry_run)
+
+    def _delete(self, path: Path, files: Dict[Path, Tuple[int, float]], report: ArchiveReport,
+                dry_run: bool = False, count: bool = True) -> None:
+        if not dry_run:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                report.errors.append(f"{path.name}: {e}")
+                return
+            self._remove_empty_dirs(path.parent)
+        files.pop(path, None)
+        if count:
+            report.deleted += 1
+
+    def _remove_empty_dirs(self, directory: Path) -> None:
+        while directory != self.audio_dir and self.audio_dir in directory.parents:
+            try:
+                directory.rmdir()
+            except OSError:
+                return
+            directory = directory.parent
+
+
+class _RunLock:
+    """Non-blocking lock that keeps two archive runs off the same directory."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def __enter__(self):
+        if fcntl is None:
+            return self
+        self._file = open(self.path, 'a')
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self._file.close()
+            self._file = None
+            raise ArchiveInProgress(f"Audio in {self.path.parent} is already being archived")
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+def archive_if_due(interval: float = 86400) -> Optional[ArchiveReport]:
+    """Run the archiver unless it ran less than ``interval`` seconds ago.
+
+    Used by the server when ``VOICEMODE_AUDIO_ARCHIVE_AUTO`` is on; errors
+    are logged rather than raised.
+
+    Returns:
+        The report, or None if no run was due or it could not run
+    """
+    archiver = AudioArchiver()
+    stamp = archiver.audio_dir / STAMP_FILE
+    try:
+        if time.time() - stamp.stat().st_mtime < interval:
+            return None
+    except FileNotFoundError:
+        pass
+    try:
+        report = archiver.run()
+    except ArchiveInProgress:
+        return None
+    except Exception as e:
+        logger.warning(f"Audio archiving failed: {e}")
+        return None
+    if report.transcoded or report.deleted:
+        logger.info(
+            f"Archived audio: {report.transcoded} transcoded, {report.deleted} deleted, "
+            f"{report.reclaimed / 1024 / 1024:.1f} MB reclaimed"
+        )
+    return report
+
+
+def archive_periodically(interval: float = 86400, stop: Optional[threading.Event] = None) -> None:
+    """Call :func:`archive_if_due` now and again whenever a run falls due.
+
+    The last run is read from the stamp file, so server processes sharing
+    the audio directory still archive at most once per ``interval``.
+    Returns when ``stop`` is set.
+    """
+    stop = stop or threading.Event()
+    while True:
+        archive_if_due(interval)
+        try:
+            next_run = (AudioArchiver().audio_dir / STAMP_FILE).stat().st_mtime + interval
+        except OSError:
+            next_run = 0
+        if stop.wait(max(MIN_RECHECK, next_run - time.time())):
+            return
@@ -0,0 +1,515 @@
+"""
+Catalogue of saved audio files.
+
+The catalogue is a sidecar SQLite database in ``AUDIO_DIR`` with one row
+per audio file: its path, size, duration, format, type (``stt``, ``tts``,
+...), recording time and, when known, conversation ID. It backs the
+``audio://`` MCP resources, so listings are paginated queries and looking
+a file up by name is a primary-key read, not a directory walk.
+
+It is kept up to date incrementally:
+
+- The audio saver records each file it writes, with the metadata it has
+  in memory (conversation ID, duration from the WAV header).
+- ``refresh()`` compares the modification time of the audio directory and
+  its ``YYYY/MM`` subdirectories with the last ones seen and rescans only
+  the directories that changed. That picks up files written by other
+  processes, transcoded by the archiver (the ``.opus`` copy inherits the
+  original's row) or deleted.
+
+Durations are read from file headers (WAV, raw PCM, Ogg/Opus, FLAC) and
+are unknown for MP3 and AAC.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import struct
+import threading
+import time
+import wave
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from voice_mode.exchanges.browser import decode_cursor, encode_cursor
+
+logger = logging.getLogger("voicemode")
+
+CATALOGUE_FILENAME = ".catalogue.sqlite"
+
+# Bump when the table layout changes; older catalogues are rebuilt
+CATALOGUE_SCHEMA_VERSION = 1
+
+AUDIO_FORMATS = ('wav', 'pcm', 'opus', 'ogg', 'flac', 'mp3', 'aac', 'm4a')
+
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Raw PCM as saved by TTS: 16-bit mono
+PCM_SAMPLE_RATE = 24000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    stem TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    created REAL NOT NULL,
+    duration REAL,
+    format TEXT NOT NULL,
+    type TEXT,
+    conversation_key TEXT,
+    conversation_id TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_dir ON files(dir);
+CREATE INDEX IF NOT EXISTS idx_files_name ON files(name);
+CREATE INDEX IF NOT EXISTS idx_files_stem ON files(stem);
+CREATE INDEX IF NOT EXISTS idx_files_created ON files(created, path);
+CREATE INDEX IF NOT EXISTS idx_files_conversation ON files(conversation_key, created, path);
+CREATE INDEX IF NOT EXISTS idx_files_type ON files(type, created, path);
+"""
+
+_COLUMNS = "path, name, size, mtime, created, duration, format, type, conversation_id, conversation_key"
+
+# 20250728_123456_789_4t8u0f_stt, 20250728_123456_789-tts-output, no_speech_20250728_123456
+_NAME = re.compile(
+    r'^(?:(?P<kind>[a-z_]+?)_)?(?P<date>\d{8})_(?P<time>\d{6})(?:_(?P<ms>\d{3}))?'
+    r'(?:_(?P<conversation>[A-Za-z0-9]+)_(?P<type>[a-z][a-z_-]*)|-(?P<plain_type>[a-z][a-z_-]*))?$'
+)
+
+
+def parse_name(name: str) -> Dict[str, Any]:
+    """Recording time, type and conversation suffix encoded in a saved file's name."""
+    match = _NAME.match(Path(name).stem)
+    if not match:
+        return {'created': None, 'type': None, 'conversation_key': None}
+    try:
+        created = datetime.strptime(match['date'] + match['time'], '%Y%m%d%H%M%S')
+    except ValueError:
+        return {'created': None, 'type': None, 'conversation_key': None}
+    if match['ms']:
+        created += timedelta(milliseconds=int(match['ms']))
+    return {
+        'created': created.timestamp(),
+        'type': match['type'] or match['plain_type'] or match['kind'],
+        'conversation_key': match['conversation'],
+    }
+
+
+def conversation_key(conversation_id: str) -> str:
+    """The part of a conversation ID that saved file names carry."""
+    return conversation_id.split('_')[-1]
+
+
+def audio_duration(path: Path) -> Optional[float]:
+    """Duration in seconds read from the file header, or None if unknown."""
+    suffix = path.suffix.lower()
+    try:
+        if suffix == '.wav':
+            with wave.open(str(path)) as f:
+                return f.getnframes() / f.getframerate()
+        if suffix == '.pcm':
+            return path.stat().st_size / (2 * PCM_SAMPLE_RATE)
+        if suffix in ('.opus', '.ogg'):
+            return _ogg_duration(path)
+        if suffix == '.flac':
+            return _flac_duration(path)
+    except (OSError, EOFError, wave.Error, struct.error, ZeroDivisionError):
+        pass
+    return None
+
+
+def _ogg_duration(path: Path) -> Optional[float]:
+    """From the granule position of the last Ogg page."""
+    with open(path, 'rb') as f:
+        head = f.read(512)
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - 65536))
+        tail = f.read()
+    last = tail.rfind(b'OggS')
+    if last < 0 or len(tail) < last + 14:
+        return None
+    granule = struct.unpack_from('<q', tail, last + 6)[0]
+    opus = head.find(b'OpusHead')
+    if opus >= 0:
+        # Opus always counts 48 kHz samples, after the encoder's pre-skip
+        pre_skip = struct.unpack_from('<H', head, opus + 10)[0]
+        return max(0, granule - pre_skip) / 48000
+    vorbis = head.find(b'\x01vorbis')
+    if vorbis >= 0:
+        rate = struct.unpack_from('<I', head, vorbis + 12)[0]
+        return granule / rate if rate else None
+    return None
+
+
+def _flac_duration(path: Path) -> Optional[float]:
+    """From the STREAMINFO block that follows the fLaC marker."""
+    with open(path, 'rb') as f:
+        head = f.read(26)
+    if head[:4] != b'fLaC':
+        return None
+    # 20 bits sample rate, 3 channels, 5 bits per sample, 36 total samples
+    packed = struct.unpack_from('>Q', head, 18)[0]
+    rate = packed >> 44
+    samples = packed & ((1 << 36) - 1)
+    return samples / rate if rate else None
+
+
+def _row(row: Tuple) -> Dict[str, Any]:
+    path, name, size, mtime, created, duration, format, type, conversation_id, key = row
+    return {
+        'name': name,
+        'path': path,
+        'size': size,
+        'duration': duration,
+        'format': format,
+        'type': type,
+        'conversation_id': conversation_id,
+        'conversation_key': key,
+        'created': datetime.fromtimestamp(created).isoformat(timespec='milliseconds'),
+        'modified': datetime.fromtimestamp(mtime).isoformat(timespec='seconds'),
+    }
+
+
+class AudioCatalogue:
+    """Sidecar SQLite catalogue of an audio directory.
+
+    Safe to share between threads; calls are serialized on one connection.
+    """
+
+    def __init__(self, audio_dir: Optional[Path] = None, path: Optional[Path] = None,
+                 refresh_interval: float = 1.0):
+        """
+        Args:
+            audio_dir: Directory with the saved audio. Defaults to AUDIO_DIR
+            path: Database path. Defaults to .catalogue.sqlite in audio_dir
+            refresh_interval: Minimum seconds between checks for changed directories
+        """
+        if audio_dir is None:
+            from voice_mode.config import AUDIO_DIR
+            audio_dir = AUDIO_DIR
+        self.audio_dir = Path(audio_dir)
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self.path = Path(path) if path else self.audio_dir / CATALOGUE_FILENAME
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._refreshed: Optional[float] = None
+        self._conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._ensure_schema()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> 'AudioCatalogue':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _ensure_schema(self) -> None:
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is not None and row[0] == str(CATALOGUE_SCHEMA_VERSION):
+            return
+        with self._transaction():
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM dirs")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(CATALOGUE_SCHEMA_VERSION),)
+            )
+
+    def _transaction(self):
+        return _Transaction(self._conn)
+
+    def record(self, path: Path, conversation_id: Optional[str] = None,
+               duration: Optional[float] = None) -> bool:
+        """Add or update one file, typically right after it was saved.
+
+        Args:
+            path: The audio file (must be inside the audio directory)
+            conversation_id: Conversation the audio belongs to
+            duration: Duration in seconds, if already known; read from the
+                header otherwise
+
+        Returns:
+            False if the file is missing or outside the audio directory
+        """
+        path = Path(path)
+        try:
+            relative = path.relative_to(self.audio_dir)
+            stat = path.stat()
+        except (ValueError, OSError):
+            return False
+        if duration is None:
+            duration = audio_duration(path)
+        with self._lock, self._transaction():
+            self._upsert(relative, stat, duration, conversation_id)
+        return True
+
+    def refresh(self, force: bool = False) -> int:
+        """Rescan the directories that changed since they were last scanned.
+
+        Returns:
+            Number of files added, updated or removed
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._refreshed is not None and now - self._refreshed < self.refresh_interval:
+                return 0
+            changed = 0
+            with self._transaction():
+                known = dict(self._conn.execute("SELECT path, mtime_ns FROM dirs"))
+                current = dict(self._directories())
+                for directory in known.keys() - current.keys():
+                    changed += self._conn.execute("DELETE FROM files WHERE dir = ?", (directory,)).rowcount
+                    self._conn.execute("DELETE FROM dirs WHERE path = ?", (directory,))
+                for directory, mtime_ns in current.items():
+                    if known.get(directory) != mtime_ns:
+                        changed += self._rescan(directory, mtime_ns)
+            self._refreshed = time.monotonic()
+            if changed:
+                logger.debug(f"Audio catalogue: {changed} files changed")
+            return changed
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """Metadata of a file by name.
+
+        A name whose file was transcoded by the archiver resolves to the
+        ``.opus`` copy.
+        """
+        name = Path(filename).name
+        with self._lock:
+            self.refresh()
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM files WHERE name = ? LIMIT 1", (name,)).fetchone()
+            if row is None:
+                row = self._conn.execute(
+                    f"SELECT {_COLUMNS} FROM files WHERE stem = ? ORDER BY format = 'opus' DESC LIMIT 1",
+                    (Path(name).stem,)
+                ).fetchone()
+        return _row(row) if row else None
+
+    def page(
+        self,
+        limit: int = PAGE_SIZE,
+        cursor: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        type: Optional[str] = None,
+        format: Optional[str] = None,
+        conversation_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """One page of files, most recently recorded first.
+
+        Args:
+            limit: Page size (capped at ``MAX_PAGE_SIZE``)
+            cursor: ``next_cursor`` of the previous page
+            start: Only files recorded at or after this time
+            end: Only files recorded before this time
+            type: Only this type (``stt``, ``tts``, ...)
+            format: Only this format (``wav``, ``opus``, ...)
+            conversation_id: Only files of this conversation
+
+        Returns:
+            ``files`` and ``next_cursor`` (None on the last page)
+
+        Raises:
+            ValueError: Invalid cursor
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        clauses: List[str] = []
+        params: List[Any] = []
+        if cursor:
+            created, path = decode_cursor(cursor)
+            clauses.append("(created, path) < (?, ?)")
+            params += [created, path]
+        if start is not None:
+            clauses.append("created >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            clauses.append("created < ?")
+            params.append(end.timestamp())
+        if type:
+            clauses.append("type = ?")
+            params.append(type)
+        if format:
+            clauses.append("format = ?")
+            params.append(format.lower().lstrip('.'))
+        if conversation_id:
+            clauses.append("conversation_key = ? AND (conversation_id IS NULL OR conversation_id = ?)")
+            params += [conversation_key(conversation_id), conversation_id]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            self.refresh()
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM files {where} ORDER BY created DESC, path DESC LIMIT ?",
+                params + [limit + 1]
+            ).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][4], rows[-1][0]) if more else None
+        return {'files': [_row(row) for row in rows], 'next_cursor': next_cursor}
+
+    def summary(self) -> Dict[str, Any]:
+        """File count, total size and duration per format."""
+        with self._lock:
+            self.refresh()
+            rows = self._conn.execute(
+                "SELECT format, COUNT(*), SUM(size), SUM(duration) FROM files GROUP BY format ORDER BY format"
+            ).fetchall()
+        return {
+            'files': sum(row[1] for row in rows),
+            'size': sum(row[2] or 0 for row in rows),
+            'formats': {
+                format: {'files': count, 'size': size or 0, 'duration': duration}
+                for format, count, size, duration in rows
+            },
+        }
+
+    def _directories(self) -> Iterable[Tuple[str, int]]:
+        """The audio directory and its year and month subdirectories, with mtimes."""
+        try:
+            yield '', self.audio_dir.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        for year in _subdirectories(self.audio_dir):
+            for month in _subdirectories(year):
+                yield month.relative_to(self.audio_dir).as_posix(), month.stat().st_mtime_ns
+
+    def _rescan(self, directory: str, mtime_ns: int) -> int:
+        """Bring the rows of one directory in line with its contents."""
+        full = self.audio_dir / directory
+        known = {
+            name: (size, mtime)
+            for name, size, mtime in self._conn.execute("SELECT name, size, mtime FROM files WHERE dir = ?", (directory,))
+        }
+        present = {}
+        try:
+            with os.scandir(full) as entries:
+                for entry in entries:
+                    if entry.name.startswith('.') or entry.name.rsplit('.', 1)[-1].lower() not in AUDIO_FORMATS:
+                        continue
+                    try:
+                        if entry.is_file():
+                            present[entry.name] = entry.stat()
+                    except FileNotFoundError:
+                        continue
+        except FileNotFoundError:
+            pass
+
+        changed = 0
+        removed = known.keys() - present.keys()
+        # Metadata of removed files, for the copies the archiver made of them
+        inherited = {}
+        for name in removed:
+            row = self._conn.execute(
+                "SELECT conversation_id FROM files WHERE dir = ? AND name = ?", (directory, name)
+            ).fetchone()
+            inherited[Path(name).stem] = row[0] if row else None
+            self._conn.execute("DELETE FROM files WHERE dir = ? AND name = ?", (directory, name))
+            changed += 1
+
+        for name, stat in present.items():
+            if known.get(name) == (stat.st_size, stat.st_mtime):
+                continue
+            relative = Path(directory) / name if directory else Path(name)
+            self._upsert(relative, stat, audio_duration(full / name), inherited.get(Path(name).stem))
+            changed += 1
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)", (directory, mtime_ns)
+        )
+        return changed
+
+    def _upsert(self, relative: Path, stat: os.stat_result, duration: Optional[float],
+                conversation_id: Optional[str]) -> None:
+        parsed = parse_name(relative.name)
+        key = parsed['conversation_key']
+        if conversation_id and not key:
+            key = conversation_key(conversation_id)
+        directory = relative.parent.as_posix()
+        self._conn.execute(
+            "INSERT INTO files (path, dir, name, stem, size, mtime, created, duration, format, type, "
+            "conversation_key, conversation_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime = excluded.mtime, "
+            "duration = excluded.duration, conversation_id = COALESCE(excluded.conversation_id, conversation_id)",
+            (
+                relative.as_posix(),
+                '' if directory == '.' else directory,
+                relative.name,
+                relative.stem,
+                stat.st_size,
+                stat.st_mtime,
+                parsed['created'] if parsed['created'] is not None else stat.st_mtime,
+                duration,
+                relative.suffix.lower().lstrip('.'),
+                parsed['type'],
+                key,
+                conversation_id,
+            )
+        )
+
+
+def _subdirectories(path: Path) -> List[Path]:
+    """Numbered (year or month) subdirectories."""
+    try:
+        return sorted(p for p in path.iterdir() if p.name.isdigit() and p.is_dir())
+    except FileNotFoundError:
+        return []
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on error."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._conn = conn
+
+    def __enter__(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, *exc_info):
+        self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+def month_range(month: str) -> Tuple[datetime, datetime]:
+    """Start and end of a ``YYYY-MM`` month, or of a ``YYYY-MM-DD`` day.
+
+    Raises:
+        ValueError: Neither format
+    """
+    try:
+        day = datetime.strptime(month, '%Y-%m-%d')
+        return day, day + timedelta(days=1)
+    except ValueError:
+        start = datetime.strptime(month, '%Y-%m')
+    end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start, datetime.combine(end, datetime.min.time())
+
+
+_catalogue: Optional[AudioCatalogue] = None
+_catalogue_lock = threading.Lock()
+
+
+def get_audio_catalogue() -> AudioCatalogue:
+    """Get the process-wide catalogue of AUDIO_DIR."""
+    global _catalogue
+    with _catalogue_lock:
+        if _catalogue is None:
+            _catalogue = AudioCatalogue()
+        return _catalogue
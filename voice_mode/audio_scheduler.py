@@ -0,0 +1,441 @@
+"""Scheduling of the local speaker/microphone between audio jobs.
+
+Every ``converse`` call runs as an :class:`AudioJob`. A job does not own the
+audio device for its whole lifetime: TTS synthesis, STT and logging run
+concurrently with other jobs, and only the device phases (``playback`` and
+``capture``) are exclusive. While one job is playing, the next one can
+already be synthesizing its audio.
+
+When several jobs wait for the device it is granted by priority
+(interactive converse, then speak-only, then notification sounds) and FIFO
+within a priority. Jobs from the same MCP session always keep their order.
+Waiting jobs can be cancelled, and with ``VOICEMODE_AUDIO_PREEMPTION``
+enabled a higher-priority job from another session interrupts lower-priority
+playback instead of waiting for it to finish.
+
+Code that touches the device only needs::
+
+    async with get_audio_scheduler().device("playback") as job:
+        job.on_stop(sd.stop)
+        ...
+
+The current job is found through a context variable, so the playback code
+in ``core`` and ``streaming`` does not need to know which tool called it.
+"""
+
+import asyncio
+import contextvars
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("voicemode")
+
+
+class AudioPriority(IntEnum):
+    """Device priority of a job (lower value is served first)."""
+    CONVERSE = 0
+    SPEAK = 1
+    NOTIFICATION = 2
+
+
+class AudioSchedulerError(RuntimeError):
+    """Base class for audio scheduling errors.
+
+    These are not provider failures, so TTS failover must not retry them.
+    """
+
+
+class AudioDeviceBusyError(AudioSchedulerError):
+    """Raised when the audio device could not be acquired in time."""
+
+
+class AudioJobCancelled(AudioSchedulerError):
+    """Raised in a job whose wait for the audio device was cancelled."""
+
+
+@dataclass
+class AudioJob:
+    """A unit of audio work (one converse or speak call)."""
+    id: int
+    owner: str
+    purpose: str
+    priority: AudioPriority
+    timeout: Optional[float] = None
+    hold_device: bool = False
+    created: float = field(default_factory=time.monotonic)
+    state: str = "pending"
+    phase: Optional[str] = None
+    device_since: Optional[float] = None
+    wait_time: float = 0.0
+    cancelled: bool = False
+    preempted: bool = False
+    after: Optional[asyncio.Event] = field(default=None, repr=False)
+    started: Optional[asyncio.Event] = field(default=None, repr=False)
+    _cancel_event: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _stop_callbacks: List[Callable[[], None]] = field(default_factory=list, repr=False)
+
+    @property
+    def stop_requested(self) -> bool:
+        """True when the current output should end early."""
+        return self.cancelled or self.preempted
+
+    def on_stop(self, callback: Callable[[], None]) -> None:
+        """Register how to stop the current device phase (e.g. ``sd.stop``)."""
+        self._stop_callbacks.append(callback)
+
+    def stop(self) -> None:
+        """Interrupt the current device phase."""
+        for callback in self._stop_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.debug(f"Audio job {self.id} stop callback failed: {e}")
+
+    def to_dict(self) -> Dict[str, object]:
+        now = time.monotonic()
+        data = {
+            "id": self.id,
+            "owner": self.owner,
+            "purpose": self.purpose,
+            "priority": self.priority.name.lower(),
+            "state": self.state,
+            "seconds": round(now - self.created, 3)
+        }
+        if self.phase:
+            data["phase"] = self.phase
+        if self.device_since is not None:
+            data["device_seconds"] = round(now - self.device_since, 3)
+        return data
+
+
+@dataclass
+class _WaitStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3) if self.count else 0.0,
+            "max": round(self.max, 3)
+        }
+
+
+_current_job: contextvars.ContextVar[Optional[AudioJob]] = contextvars.ContextVar(
+    "voicemode_audio_job", default=None
+)
+
+
+def current_audio_job() -> Optional[AudioJob]:
+    """The audio job of the running task, if any."""
+    return _current_job.get()
+
+
+class AudioScheduler:
+    """Priority scheduling of the audio device between jobs."""
+
+    def __init__(self, preemption: bool = False):
+        self.preemption = preemption
+        self.holder: Optional[AudioJob] = None
+        self._waiters: List[Tuple[AudioJob, asyncio.Future, float]] = []
+        self._jobs: Dict[int, AudioJob] = {}
+        self._ids = itertools.count(1)
+        self._wait_stats = {priority: _WaitStats() for priority in AudioPriority}
+        self.total_grants = 0
+        self.total_timeouts = 0
+        self.total_cancelled = 0
+        self.total_preempted = 0
+        self.max_queue_depth = 0
+
+    @asynccontextmanager
+    async def job(
+        self,
+        owner: str,
+        purpose: str = "converse",
+        priority: AudioPriority = AudioPriority.CONVERSE,
+        timeout: Optional[float] = None,
+        hold_device: bool = False,
+        after: Optional[asyncio.Event] = None,
+        started: Optional[asyncio.Event] = None
+    ) -> AsyncIterator[AudioJob]:
+        """Run the block as an audio job.
+
+        Args:
+            owner: Session identifier of the caller
+            purpose: Short description for status output (e.g. "converse", "speak")
+            priority: Device priority of the job
+            timeout: Seconds to wait for the device in each phase (None waits forever)
+            hold_device: Keep the device between phases until :meth:`release`
+                or the end of the job (converse keeps it from playback to capture)
+            after: Do not request the device before this event is set (used to
+                keep a session's queued speech in order while it synthesizes)
+            started: Set once this job first gets the device, or ends without it
+        """
+        job = AudioJob(
+            id=next(self._ids),
+            owner=owner,
+            purpose=purpose,
+            priority=priority,
+            timeout=timeout,
+            hold_device=hold_device,
+            after=after,
+            started=started
+        )
+        self._jobs[job.id] = job
+        token = _current_job.set(job)
+        try:
+            yield job
+        finally:
+            _current_job.reset(token)
+            if self.holder is job:
+                self._release_device(job)
+            self._jobs.pop(job.id, None)
+            job.state = "cancelled" if job.cancelled else "done"
+            if job.started is not None:
+                job.started.set()
+
+    @asynccontextmanager
+    async def device(
+        self,
+        phase: str = "playback",
+        priority: AudioPriority = AudioPriority.NOTIFICATION
+    ) -> AsyncIterator[AudioJob]:
+        """Hold the audio device for one playback or capture phase.
+
+        Uses the current job, or a short-lived job with ``priority`` when
+        called outside of one (e.g. a standalone chime). Nested use within a
+        job that already holds the device is a no-op.
+
+        Raises:
+            AudioDeviceBusyError: If the device is still held after the job's timeout
+            AudioJobCancelled: If the job was cancelled while waiting
+        """
+        job = current_audio_job()
+        if job is None:
+            from .config import AUDIO_DEVICE_WAIT_TIMEOUT
+            async with self.job(current_session_id(), phase, priority, AUDIO_DEVICE_WAIT_TIMEOUT):
+                async with self.device(phase) as held:
+                    yield held
+            return
+
+        if self.holder is job:
+            previous_phase = job.phase
+            job.phase = phase
+            try:
+                yield job
+            finally:
+                job.phase = previous_phase
+            return
+
+        if job.after is not None and not job.after.is_set():
+            await self._wait_for_predecessor(job)
+        await self._acquire(job)
+        job.phase = phase
+        job.state = phase
+        try:
+            yield job
+        finally:
+            job.phase = None
+            job._stop_callbacks.clear()
+            if self.holder is job:
+                if job.hold_device and not job.stop_requested:
+                    job.state = "holding"
+                else:
+                    self._release_device(job)
+
+    def release(self, job: AudioJob) -> None:
+        """Give up the device held by a ``hold_device`` job before it ends."""
+        if self.holder is job:
+            self._release_device(job)
+
+    def cancel(self, job_id: Optional[int] = None, owner: Optional[str] = None) -> int:
+        """Cancel jobs by id or by owner.
+
+        Waiting jobs fail with :class:`AudioJobCancelled`; a job on the
+        device has its current phase stopped.
+
+        Returns:
+            Number of jobs cancelled
+        """
+        cancelled = 0
+        for job in list(self._jobs.values()):
+            if job.cancelled:
+                continue
+            if (job_id is not None and job.id != job_id) or (owner is not None and job.owner != owner):
+                continue
+            if job_id is None and owner is None:
+                continue
+            job.cancelled = True
+            job._cancel_event.set()
+            cancelled += 1
+            for waiting_job, future, _ in self._waiters:
+                if waiting_job is job and not future.done():
+                    future.set_exception(AudioJobCancelled(f"Audio job {job.id} was cancelled"))
+            if self.holder is job:
+                job.stop()
+        self.total_cancelled += cancelled
+        return cancelled
+
+    async def _wait_for_predecessor(self, job: AudioJob) -> None:
+        job.state = "ordered"
+        predecessor = asyncio.ensure_future(job.after.wait())
+        cancelled = asyncio.ensure_future(job._cancel_event.wait())
+        try:
+            await asyncio.wait({predecessor, cancelled}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            predecessor.cancel()
+            cancelled.cancel()
+
+    async def _acquire(self, job: AudioJob) -> None:
+        if job.cancelled:
+            raise AudioJobCancelled(f"Audio job {job.id} was cancelled")
+
+        start = time.monotonic()
+        # Waiters whose future is done were cancelled or timed out and are
+        # only left until their own task prunes them
+        if self.holder is None and all(future.done() for _, future, _ in self._waiters):
+            self._grant(job, start)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((job, future, start))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._waiters))
+        job.state = "waiting"
+        self._maybe_preempt(job)
+        try:
+            if job.timeout is None:
+                await future
+            else:
+                await asyncio.wait_for(asyncio.shield(future), job.timeout)
+        except asyncio.TimeoutError:
+            if self.holder is job:
+                # Granted just as the timeout fired
+                return
+            self.total_timeouts += 1
+            holder = self.holder
+            detail = f" by session {holder.owner} ({holder.purpose})" if holder else ""
+            raise AudioDeviceBusyError(
+                f"Audio device is in use{detail}; gave up after waiting {job.timeout:.0f}s"
+            ) from None
+        except BaseException:
+            if self.holder is job:
+                self._release_device(job)
+            raise
+        finally:
+            self._waiters = [waiter for waiter in self._waiters if waiter[0] is not job]
+            if not future.done():
+                future.cancel()
+            # The device may have been released while this job was leaving
+            # the queue, with nobody else to hand it on
+            self._grant_next()
+
+        wait_time = time.monotonic() - start
+        if wait_time > 0.1:
+            logger.info(f"Audio job {job.id} ({job.purpose}, session {job.owner}) waited {wait_time:.1f}s for the device")
+
+    def _grant(self, job: AudioJob, start: float) -> None:
+        self.holder = job
+        job.device_since = time.monotonic()
+        job.wait_time = job.device_since - start
+        self._wait_stats[job.priority].add(job.wait_time)
+        self.total_grants += 1
+        if job.started is not None:
+            job.started.set()
+
+    def _release_device(self, job: AudioJob) -> None:
+        self.holder = None
+        job.device_since = None
+        job.state = "running"
+        self._grant_next()
+
+    def _grant_next(self) -> None:
+        """Hand the device to the most urgent waiter.
+
+        Only the oldest waiter of each session is eligible, so a session's
+        own jobs are never reordered by priority.
+        """
+        if self.holder is not None:
+            return
+        seen_owners = set()
+        best = None
+        for index, (job, future, _) in enumerate(self._waiters):
+            if future.done() or job.owner in seen_owners:
+                continue
+            seen_owners.add(job.owner)
+            if best is None or job.priority < self._waiters[best][0].priority:
+                best = index
+        if best is None:
+            return
+        job, future, start = self._waiters[best]
+        self._grant(job, start)
+        future.set_result(None)
+
+    def _maybe_preempt(self, job: AudioJob) -> None:
+        holder = self.holder
+        if (
+            self.preemption
+            and holder is not None
+            and holder.owner != job.owner
+            and holder.phase == "playback"
+            and job.priority < holder.priority
+            and not holder.preempted
+        ):
+            logger.info(f"Audio job {job.id} ({job.purpose}) preempts playback of job {holder.id} ({holder.purpose})")
+            holder.preempted = True
+            self.total_preempted += 1
+            holder.stop()
+
+    def status(self) -> Dict[str, object]:
+        """Current holder, queue, running jobs and wait statistics."""
+        waiting_ids = {job.id for job, _, _ in self._waiters}
+        return {
+            "holder": self.holder.to_dict() if self.holder else None,
+            "waiting": [job.to_dict() for job, future, _ in self._waiters if not future.done()],
+            "running": [
+                job.to_dict() for job in self._jobs.values()
+                if job is not self.holder and job.id not in waiting_ids
+            ],
+            "queue_depth": len(self._waiters),
+            "max_queue_depth": self.max_queue_depth,
+            "wait_seconds": {p.name.lower(): s.to_dict() for p, s in self._wait_stats.items()},
+            "grants": self.total_grants,
+            "timeouts": self.total_timeouts,
+            "cancelled": self.total_cancelled,
+            "preempted": self.total_preempted,
+            "preemption": self.preemption
+        }
+
+
+def current_session_id() -> str:
+    """Identify the MCP session making the current tool call.
+
+    Falls back to "local" outside of a request (CLI, tests).
+    """
+    try:
+        from fastmcp.server.dependencies import get_context
+        return get_context().session_id
+    except Exception:
+        return "local"
+
+
+_scheduler: Optional[AudioScheduler] = None
+
+
+def get_audio_scheduler() -> AudioScheduler:
+    """Get the process-wide audio scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        from .config import AUDIO_PREEMPTION
+        _scheduler = AudioScheduler(preemption=AUDIO_PREEMPTION)
+    return _scheduler
@@ -1594,6 +1594,139 @@ def deps(component, yes, dry_run, verbose):
         click.echo(f"\n❌ Installation failed: {message}")
 
 
+# Daemon group
+@voice_mode_main_cli.group()
+@click.help_option('-h', '--help', help='Show this message and exit')
+def daemon():
+    """Run a resident MCP server shared by all clients."""
+    pass
+
+
+@daemon.command("start")
+@click.help_option('-h', '--help')
+@click.option('--host', help='Serve on TCP, binding this host (default: VOICEMODE_DAEMON_HOST or 127.0.0.1)')
+@click.option('--port', type=int, help='Serve on TCP, binding this port (default: VOICEMODE_DAEMON_PORT or 8765)')
+@click.option('--socket', 'socket_path', help='Unix socket to serve on (default: VOICEMODE_DAEMON_SOCKET or ~/.voicemode/daemon.sock)')
+@click.option('--detach', is_flag=True, help='Run in the background, logging to ~/.voicemode/logs/daemon.log')
+def daemon_start(host, port, socket_path, detach):
+    """Start the daemon.
+
+    With VOICEMODE_DAEMON_AUTO_CONNECT=true, `voicemode` stdio sessions
+    forward to it while it runs. Forwarded sessions use the daemon's
+    environment, not VOICEMODE_* settings from the client's MCP config.
+
+    The daemon serves on a Unix socket only you can open, or on TCP when
+    --host/--port is given. Either way requests must send the bearer token
+    recorded in ~/.voicemode/daemon.json.
+    """
+    from voice_mode.daemon import find_running_daemon, run_daemon
+
+    existing = find_running_daemon()
+    if existing:
+        click.echo(f"✅ Daemon already running (pid {existing.pid}) at {existing.address}")
+        return
+
+    if detach:
+        import time
+        from voice_mode.config import LOGS_DIR
+
+        args = [sys.executable, "-c", "from voice_mode.cli import voice_mode; voice_mode()", "daemon", "start"]
+        if host:
+            args += ["--host", host]
+        if port:
+            args += ["--port", str(port)]
+        if socket_path:
+            args += ["--socket", socket_path]
+
+        log_path = LOGS_DIR / "daemon.log"
+        with open(log_path, "a") as log_file:
+            process = subprocess.Popen(
+                args,
+                stdin=subprocess.DEVNULL,
+                stdout=log_file,
+                stderr=subprocess.STDOUT,
+                start_new_session=True
+            )
+
+        # Wait for the daemon to start accepting connections
+        for _ in range(100):
+            running = find_running_daemon()
+            if running:
+                click.echo(f"✅ Daemon started (pid {running.pid}) at {running.address}")
+                return
+            if process.poll() is not None:
+                break
+            time.sleep(0.2)
+        click.echo(f"❌ Daemon failed to start, see {log_path}", err=True)
+        sys.exit(1)
+
+    try:
+        run_daemon(host=host, port=port, socket_path=socket_path)
+    except RuntimeError as e:
+        click.echo(f"❌ {e}", err=True)
+        sys.exit(1)
+
+
+@daemon.command("stop")
+@click.help_option('-h', '--help')
+def daemon_stop():
+    """Stop the running daemon."""
+    from voice_mode.daemon import stop_daemon
+
+    try:
+        stopped = stop_daemon()
+    except RuntimeError as e:
+        click.echo(f"❌ {e}", err=True)
+        sys.exit(1)
+
+    if stopped:
+        click.echo(f"✅ Daemon (pid {stopped.pid}) stopped")
+    else:
+        click.echo("Daemon is not running")
+
+
+@daemon.command("status")
+@click.help_option('-h', '--help')
+def daemon_status():
+    """Show daemon address, uptime and audio device holder."""
+    import json
+    import time
+    from voice_mode.daemon import find_running_daemon, _create_transport
+
+    info = find_running_daemon()
+    if not info:
+        click.echo("Daemon is not running")
+        return
+
+    click.echo(f"✅ Daemon running (pid {info.pid}, v{info.version})")
+    click.echo(f"   Address: {info.address}")
+    click.echo(f"   Uptime:  {time.time() - info.started_at:.0f}s")
+
+    async def read_device_status():
+        from fastmcp import Client
+        async with Client(_create_transport(info)) as client:
+            contents = await client.read_resource("voice://audio/device")
+            return json.loads(contents[0].text)
+
+    try:
+        device = asyncio.run(read_device_status())
+    except Exception as e:
+        click.echo(f"   Audio device: unavailable ({e})")
+        return
+
+    holder = device.get("holder")
+    if holder:
+        click.echo(f"   Audio device: {holder.get('phase', 'held')} for {holder['owner']} "
+                   f"({holder['purpose']}, {holder.get('device_seconds', 0):.1f}s)")
+    else:
+        click.echo("   Audio device: idle")
+    click.echo(f"   Queue:        {device.get('queue_depth', 0)} waiting, "
+               f"{len(device.get('running', []))} synthesizing/transcribing")
+    for priority, stats in device.get("wait_seconds", {}).items():
+        if stats["count"]:
+            click.echo(f"   Wait ({priority}): avg {stats['avg']:.2f}s, max {stats['max']:.2f}s over {stats['count']}")
+
+
 # Diagnostics group
 @voice_mode_main_cli.group()
 @click.help_option('-h', '--help', help='Show this message and exit')
@@ -1673,6 +1806,69 @@ def dependencies():
         click.echo(str(result))
 
 
+@diag.command()
+@click.option('--clear', is_flag=True, help='Remove all cached probe results')
+def probes(clear):
+    """Show or clear cached ffmpeg, GPU, version and dependency probes."""
+    from datetime import datetime
+    from voice_mode.utils.probe_cache import get_probe_cache
+
+    cache = get_probe_cache()
+    if clear:
+        removed = cache.invalidate()
+        click.echo(f"✅ Cleared {removed} cached probe result(s)")
+        return
+
+    if not cache.enabled:
+        click.echo("Probe cache is disabled (VOICEMODE_PROBE_CACHE=false)")
+        return
+
+    entries = cache.entries()
+    click.echo(f"Probe cache: {cache.path}")
+    if not entries:
+        click.echo("  (empty)")
+        return
+
+    for key, entry in sorted(entries.items()):
+        cached_at = datetime.fromtimestamp(entry.get("cached_at", 0)).strftime("%Y-%m-%d %H:%M:%S")
+        value = entry.get("value")
+        if isinstance(value, dict):
+            value = ", ".join(f"{k}={v}" for k, v in value.items() if v not in (None, False))
+        click.echo(f"  {key}: {value}  [{cached_at}]")
+
+
+@diag.command()
+@click.option('--module', '-m', default='voice_mode.server', help='Module to import (default: voice_mode.server)')
+@click.option('--limit', '-n', default=20, type=int, help='Number of modules to show')
+@click.option('--by-package', is_flag=True, help='Aggregate self time by top-level package')
+@click.option('--filter', 'prefix', help='Only show modules under this package (e.g. voice_mode)')
+def startup(module, limit, by_package, prefix):
+    """Show import-time breakdown of MCP server startup."""
+    from voice_mode.utils.import_timing import measure_startup
+
+    report = measure_startup(module)
+    if report.error:
+        click.echo(f"❌ Import failed: {report.error}", err=True)
+        if not report.timings:
+            raise SystemExit(1)
+
+    click.echo(f"Startup import profile: {report.target}")
+    click.echo("=" * 50)
+    click.echo(f"Wall time (incl. interpreter): {report.wall_time * 1000:.0f}ms")
+    click.echo(f"Total import time:             {report.total_us / 1000:.0f}ms")
+    click.echo(f"Modules imported:              {len(report.timings)}")
+    click.echo()
+
+    if by_package:
+        click.echo(f"{'self (ms)':>10}  package")
+        for package, self_us in list(report.by_package().items())[:limit]:
+            click.echo(f"{self_us / 1000:>10.1f}  {package}")
+    else:
+        click.echo(f"{'cumul (ms)':>10}  {'self (ms)':>9}  module")
+        for timing in report.slowest(limit, prefix=prefix):
+            click.echo(f"{timing.cumulative_us / 1000:>10.1f}  {timing.self_us / 1000:>9.1f}  {timing.module}")
+
+
 # Legacy CLI for voicemode-cli command
 @click.group()
 @click.version_option()
@@ -1688,6 +1884,7 @@ from voice_mode.cli_commands import transcribe as transcribe_cmd
 from voice_mode.cli_commands import pronounce_commands
 from voice_mode.cli_commands import claude
 from voice_mode.cli_commands import hook as hook_cmd
+from voice_mode.cli_commands import profiles as profiles_cmd
 
 # Add subcommands to legacy CLI
 cli.add_command(exchanges_cmd.exchanges)
@@ -1698,6 +1895,7 @@ cli.add_command(claude.claude_group)
 # Add exchanges to main CLI
 voice_mode_main_cli.add_command(exchanges_cmd.exchanges)
 voice_mode_main_cli.add_command(claude.claude_group)
+voice_mode_main_cli.add_command(profiles_cmd.profiles)
 
 # Note: We'll add these commands after the groups are defined
 # audio group will get transcribe and play commands
@@ -2102,6 +2300,72 @@ def update(force):
                 click.echo("Try running: pip install --upgrade voice-mode")
 
 
+@audio.command("archive")
+@click.help_option('-h', '--help')
+@click.option('--older-than', type=float, help='Transcode audio older than this many days (default: VOICEMODE_AUDIO_ARCHIVE_AFTER_DAYS)')
+@click.option('--bitrate', type=int, help='Opus bitrate in bits per second (default: VOICEMODE_AUDIO_ARCHIVE_BITRATE)')
+@click.option('--max-age', type=float, help='Delete audio older than this many days, 0 to keep (default: VOICEMODE_AUDIO_RETENTION_DAYS)')
+@click.option('--max-size', help='Delete the oldest audio beyond this size, e.g. 2G, 0 for no limit (default: VOICEMODE_AUDIO_MAX_SIZE)')
+@click.option('--workers', type=int, help='Transcoding processes, 0 to transcode in this process')
+@click.option('-n', '--dry-run', is_flag=True, help='Only show what would be transcoded and deleted')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON')
+def archive_audio(older_than, bitrate, max_age, max_size, workers, dry_run, as_json):
+    """Transcode saved audio to Opus and apply the retention policy.
+    
+    Audio older than --older-than days is transcoded to Opus at a speech
+    bitrate and the exchange logs are updated to point at it. Then audio
+    older than --max-age days, and the oldest audio beyond --max-size, is
+    deleted.
+    
+    \b
+    Examples:
+        voicemode audio archive --dry-run
+        voicemode audio archive --older-than 3 --max-size 5G
+    """
+    import json
+    from voice_mode.audio_archive import AudioArchiver
+    from voice_mode.config import parse_size
+    
+    if max_size is not None:
+        try:
+            max_size = parse_size(max_size)
+        except ValueError:
+            raise click.BadParameter(f"Invalid size: {max_size}", param_hint='--max-size')
+    
+    archiver = AudioArchiver(
+        after_days=older_than,
+        bitrate=bitrate,
+        max_age_days=max_age,
+        max_size=max_size,
+        workers=workers,
+    )
+    try:
+        report = archiver.run(dry_run=dry_run)
+    except RuntimeError as e:
+        # Another run in progress, or ffmpeg missing
+        click.echo(f"❌ {e}", err=True)
+        sys.exit(1)
+    
+    if as_json:
+        click.echo(json.dumps(report.to_dict(), indent=2))
+        return
+    
+    mb = 1024 * 1024
+    if dry_run:
+        click.echo(f"Would transcode {report.transcoded} files and delete {report.deleted} files")
+        click.echo(f"Deleting would reclaim {report.reclaimed / mb:.1f} MB of {report.bytes_before / mb:.1f} MB")
+        return
+    click.echo(f"Transcoded {report.transcoded} files to Opus, updated {report.references_updated} exchanges")
+    if report.kept:
+        click.echo(f"Kept {report.kept} files that Opus did not make smaller")
+    click.echo(f"Deleted {report.deleted} files under the retention policy")
+    click.echo(f"Reclaimed {report.reclaimed / mb:.1f} MB ({report.bytes_before / mb:.1f} MB -> {report.bytes_after / mb:.1f} MB)")
+    for error in report.errors:
+        click.echo(f"⚠️  {error}", err=True)
+    if report.failed:
+        sys.exit(1)
+
+
 # Sound Fonts command
 @audio.command("play")
 @click.help_option('-h', '--help')
@@ -3,7 +3,6 @@ Exchanges command group for voice-mode CLI.
 """
 
 import sys
-import json
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
@@ -147,12 +146,17 @@ def view(lines, conversation, today, yesterday, date, format, reverse, no_color)
 @click.argument('query')
 @click.option('-n', '--max-results', type=int, default=50,
               help='Maximum results to show')
+@click.option('--offset', type=int, default=0,
+              help='Skip this many results (for paging)')
 @click.option('-d', '--days', type=int, default=7,
-              help='Number of days to search')
+              help='Number of days to search (0 for all history)')
 @click.option('--type', 'exchange_type',
               type=click.Choice(['stt', 'tts', 'all']),
               default='all',
               help='Search specific type')
+@click.option('--provider', help='Filter by provider')
+@click.option('--sort', type=click.Choice(['rank', 'time', 'newest']), default='rank',
+              help='Order results by relevance, oldest first or newest first')
 @click.option('--regex', is_flag=True, help='Use regex search')
 @click.option('-i', '--ignore-case', is_flag=True, default=True,
               help='Case insensitive search')
@@ -163,27 +167,35 @@ def view(lines, conversation, today, yesterday, date, format, reverse, no_color)
               default='simple',
               help='Output format')
 @click.option('--no-color', is_flag=True, help='Disable colored output')
-def search(query, max_results, days, exchange_type, regex, ignore_case, 
-           conversation, format, no_color):
-    """Search through exchange logs."""
+def search(query, max_results, offset, days, exchange_type, provider, sort, regex,
+           ignore_case, conversation, format, no_color):
+    """Search through exchange logs.
+    
+    With an index (see `exchanges index`), QUERY matches whole words:
+    all words must appear, "quoted words" match as a phrase and word*
+    matches a prefix, and results are ranked by relevance. Without an
+    index, or with --regex, the log files are scanned for QUERY as text.
+    """
     reader = ExchangeReader()
     formatter = ExchangeFormatter()
-    filter_obj = ExchangeFilter()
     grouper = ConversationGrouper()
     
-    # Set up filters
-    filter_obj.by_text(query, regex=regex, ignore_case=ignore_case)
-    if exchange_type != 'all':
-        filter_obj.by_type(exchange_type)
-    
-    # Read exchanges from recent days
-    exchanges = list(filter_obj.apply(reader.read_recent(days)))
+    total_found, exchanges = reader.search(
+        query,
+        exchange_type=exchange_type if exchange_type != 'all' else None,
+        provider=provider,
+        days=days or None,
+        limit=max_results,
+        offset=offset,
+        regex=regex,
+        ignore_case=ignore_case,
+        order=sort
+    )
     
     if conversation:
         # Group by conversation and show full conversations
         conversations = grouper.group_exchanges(exchanges)
         shown_conversations = set()
-        results_count = 0
         
         for exchange in exchanges:
             if exchange.conversation_id not in shown_conversations:
@@ -204,13 +216,9 @@ def search(query, max_results, days, exchange_type, regex, ignore_case,
                     print(output)
                 
                 shown_conversations.add(exchange.conversation_id)
-                results_count += 1
-                
-                if results_count >= max_results:
-                    break
     else:
         # Show individual matching exchanges
-        for i, exchange in enumerate(exchanges[:max_results]):
+        for exchange in exchanges:
             if format == 'simple':
                 output = formatter.simple(exchange, 
                                         color=not no_color and sys.stdout.isatty())
@@ -219,9 +227,10 @@ def search(query, max_results, days, exchange_type, regex, ignore_case,
             print(output)
     
     # Summary
-    total_found = len(exchanges)
-    shown = min(total_found, max_results)
-    print(f"\n{shown} of {total_found} results shown", file=sys.stderr)
+    if exchanges:
+        print(f"\n{offset + 1}-{offset + len(exchanges)} of {total_found} results shown", file=sys.stderr)
+    else:
+        print(f"\n0 of {total_found} results shown", file=sys.stderr)
 
 
 @exchanges.command()
@@ -235,24 +244,27 @@ def search(query, max_results, days, exchange_type, regex, ignore_case,
 @click.option('--errors', is_flag=True, help='Show error statistics')
 @click.option('--silence', is_flag=True, help='Show silence detection stats')
 @click.option('--all', 'show_all', is_flag=True, help='Show all statistics')
+@click.option('--no-cache', is_flag=True,
+              help='Parse the logs instead of using cached daily rollups (exact N*24h window)')
 def stats(days, by_hour, by_provider, by_transport, timing, conversations, 
-          errors, silence, show_all):
-    """Show statistics about exchanges."""
+          errors, silence, show_all, no_cache):
+    """Show statistics about exchanges.
+    
+    Covers today and the previous N days (default 7). Past days are read
+    from cached per-day rollups, so long ranges are fast.
+    """
     reader = ExchangeReader()
     
-    # Read exchanges
-    if days:
-        exchanges = list(reader.read_recent(days))
+    if no_cache:
+        # Statistics are accumulated while reading; exchanges are not kept
+        stats_obj = ExchangeStats(reader.read_recent(days or 7))
     else:
-        # Default to last 7 days
-        exchanges = list(reader.read_recent(7))
+        stats_obj = reader.daily_stats(days or 7)
     
-    if not exchanges:
+    if not stats_obj.total:
         click.echo("No exchanges found in the specified period.", err=True)
         return
     
-    stats_obj = ExchangeStats(exchanges)
-    
     # If no specific stats requested, show summary
     if not any([by_hour, by_provider, by_transport, timing, conversations, 
                 errors, silence]) or show_all:
@@ -288,21 +300,26 @@ def stats(days, by_hour, by_provider, by_transport, timing, conversations,
         if 'overall' in timing_stats and timing_stats['overall']:
             print("Overall:")
             if 'avg_turnaround' in timing_stats['overall']:
-                print(f"  Avg Turnaround: {timing_stats['overall']['avg_turnaround']:.2f}s")
+                overall = timing_stats['overall']
+                print(f"  Avg Turnaround: {overall['avg_turnaround']:.2f}s "
+                      f"(p50={overall['p50_turnaround']:.2f}s, p95={overall['p95_turnaround']:.2f}s, "
+                      f"p99={overall['p99_turnaround']:.2f}s)")
         
         if 'tts' in timing_stats and timing_stats['tts']:
             print("\nTTS:")
             for metric, values in timing_stats['tts'].items():
                 if isinstance(values, dict) and 'avg' in values:
                     print(f"  {metric}: avg={values['avg']:.2f}s, "
-                          f"min={values['min']:.2f}s, max={values['max']:.2f}s")
+                          f"min={values['min']:.2f}s, max={values['max']:.2f}s, "
+                          f"p50={values['p50']:.2f}s, p95={values['p95']:.2f}s, p99={values['p99']:.2f}s")
         
         if 'stt' in timing_stats and timing_stats['stt']:
             print("\nSTT:")
             for metric, values in timing_stats['stt'].items():
                 if isinstance(values, dict) and 'avg' in values:
                     print(f"  {metric}: avg={values['avg']:.2f}s, "
-                          f"min={values['min']:.2f}s, max={values['max']:.2f}s")
+                          f"min={values['min']:.2f}s, max={values['max']:.2f}s, "
+                          f"p50={values['p50']:.2f}s, p95={values['p95']:.2f}s, p99={values['p99']:.2f}s")
     
     if conversations or show_all:
         print("\nConversation Statistics:")
@@ -344,97 +361,127 @@ def stats(days, by_hour, by_provider, by_transport, timing, conversations,
               help='Export date range')
 @click.option('--days', type=int, help='Export last N days')
 @click.option('--format', 
-              type=click.Choice(['json', 'csv', 'markdown', 'html']),
+              type=click.Choice(['json', 'jsonl', 'csv', 'markdown', 'html']),
               default='json',
               help='Export format')
 @click.option('--include-audio', is_flag=True, 
-              help='Include audio files (creates zip)')
-@click.option('--output', '-o', type=click.Path(),
-              help='Output file/directory')
-def export(conversation, date, days, format, include_audio, output):
-    """Export conversations in various formats."""
+              help='Bundle the referenced audio files into an archive')
+@click.option('--archive', type=click.Choice(['zip', 'tar']), default='zip',
+              help='Archive format for --include-audio')
+@click.option('--output', '-o', type=click.Path(allow_dash=True),
+              help="Output file/directory ('-' for stdout)")
+def export(conversation, date, days, format, include_audio, archive, output):
+    """Export conversations in various formats.
+    
+    Conversations are written one at a time as they are read from the logs,
+    so any amount of history can be exported. With --include-audio the
+    export and its audio files are streamed into a zip or tar archive.
+    """
+    from voice_mode.exchanges.export import ConversationExporter, EXTENSIONS
+    
     reader = ExchangeReader()
-    formatter = ExchangeFormatter()
     grouper = ConversationGrouper()
     
     # Determine what to export
     if conversation:
         exchanges = reader.read_conversation(conversation)
     elif date:
-        exchanges = list(reader.read_date(date.date()))
+        exchanges = reader.read_date(date.date())
     elif days:
-        exchanges = list(reader.read_recent(days))
+        exchanges = reader.read_recent(days)
     else:
         # Default to today
-        exchanges = list(reader.read_date(datetime.now().date()))
-    
-    if not exchanges:
-        click.echo("No exchanges found to export.", err=True)
-        return
-    
-    # Group into conversations
-    conversations = grouper.group_exchanges(exchanges)
+        exchanges = reader.read_date(datetime.now().date())
     
     # Determine output file
     if not output:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        if format == 'csv':
-            output = f"exchanges_{timestamp}.csv"
-        elif format == 'markdown':
-            output = f"conversations_{timestamp}.md"
-        elif format == 'html':
-            output = f"conversations_{timestamp}.html"
+        if include_audio:
+            output = f"conversations_{timestamp}.{archive}"
+        elif format in ('json', 'jsonl', 'csv'):
+            output = f"exchanges_{timestamp}.{EXTENSIONS[format]}"
         else:
-            output = f"exchanges_{timestamp}.json"
+            output = f"conversations_{timestamp}.{EXTENSIONS[format]}"
     
-    # Export based on format
-    if format == 'json':
-        data = []
-        for conv in conversations.values():
-            data.append(conv.to_dict())
-        
-        with open(output, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+    exporter = ConversationExporter(format, archive=archive if include_audio else None)
+    try:
+        summary = exporter.export(grouper.stream_conversations(exchanges), output)
+    except ValueError as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
     
-    elif format == 'csv':
-        with open(output, 'w') as f:
-            # Write header
-            f.write(formatter.csv_header() + '\n')
-            
-            # Write exchanges
-            for exchange in exchanges:
-                f.write(formatter.csv(exchange) + '\n')
-    
-    elif format == 'markdown':
-        with open(output, 'w') as f:
-            for conv in conversations.values():
-                f.write(formatter.markdown(conv, include_metadata=True))
-                f.write('\n\n---\n\n')
-    
-    elif format == 'html':
-        # If multiple conversations, create an index
-        if len(conversations) > 1:
-            # Create directory for multiple files
-            output_dir = Path(output).with_suffix('')
-            output_dir.mkdir(exist_ok=True)
-            
-            # Write individual conversation files
-            for conv in conversations.values():
-                conv_file = output_dir / f"{conv.id}.html"
-                with open(conv_file, 'w') as f:
-                    f.write(formatter.html(conv))
-            
-            click.echo(f"Exported {len(conversations)} conversations to {output_dir}/")
-        else:
-            # Single conversation
-            conv = list(conversations.values())[0]
-            with open(output, 'w') as f:
-                f.write(formatter.html(conv))
+    if not summary['conversations']:
+        click.echo("No exchanges found to export.", err=True)
+        if output != '-':
+            Path(summary['output']).unlink(missing_ok=True)
+        return
     
+    message = f"Exported {summary['conversations']} conversations ({summary['exchanges']} exchanges)"
     if include_audio:
-        click.echo("Audio export not yet implemented", err=True)
+        message += f" and {summary['audio_files']} audio files"
+        if summary['missing_audio']:
+            message += f" ({summary['missing_audio']} missing)"
+    click.echo(f"{message} to {summary['output']}", err=output == '-')
+
+
+@exchanges.command()
+@click.help_option('-h', '--help')
+@click.option('--rebuild', is_flag=True, help='Discard the index and re-read every log file')
+@click.option('--drop', is_flag=True, help='Delete the index; commands go back to scanning log files')
+def index(rebuild, drop):
+    """Build or update the SQLite index used to speed up lookups.
+    
+    Once built, view, search, stats and export read through the index and
+    keep it up to date by ingesting only lines appended since the last run.
+    """
+    reader = ExchangeReader()
+    index_path = reader.index_path
+    
+    if drop:
+        removed = False
+        for path in (index_path, Path(f"{index_path}-wal"), Path(f"{index_path}-shm")):
+            if path.exists():
+                path.unlink()
+                removed = True
+        click.echo(f"Removed {index_path}" if removed else "No exchange index to remove")
+        return
+    
+    created = not index_path.exists()
+    start = datetime.now()
+    with reader.open_index() as exchange_index:
+        added = exchange_index.rebuild() if rebuild else exchange_index.update()
+        info = exchange_index.stats()
+    elapsed = (datetime.now() - start).total_seconds()
+    
+    action = "Built" if created or rebuild else "Updated"
+    click.echo(f"{action} exchange index in {elapsed:.2f}s: {added} exchanges added")
+    click.echo(f"  Path:          {info['path']}")
+    click.echo(f"  Log files:     {info['files']}")
+    click.echo(f"  Exchanges:     {info['exchanges']}")
+    click.echo(f"  Conversations: {info['conversations']}")
+    click.echo(f"  Size:          {info['size_bytes'] / 1024:.1f} KB")
+
+
+
+@exchanges.command()
+@click.help_option('-h', '--help')
+@click.option('--host', default='127.0.0.1', show_default=True, help='Address to listen on')
+@click.option('--port', type=int, default=5000, show_default=True, help='Port to listen on')
+def browse(host, port):
+    """Browse conversations and play their audio in a web browser.
+    
+    Serves a paginated, index-backed view of the exchange logs. The index
+    is built on first start and kept up to date as exchanges are logged.
+    Requires Flask (pip install voice-mode[scripts]).
+    """
+    try:
+        from voice_mode.conversation_browser import main
+    except ImportError as e:
+        click.echo(f"Error: the conversation browser needs Flask ({e}). "
+                   "Install it with: pip install voice-mode[scripts]", err=True)
+        sys.exit(1)
     
-    click.echo(f"Exported to {output}")
+    main(host=host, port=port)
 
 
 if __name__ == '__main__':
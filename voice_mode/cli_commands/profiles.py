@@ -0,0 +1,100 @@
+"""
+Profiles command group for voice-mode CLI.
+"""
+
+import json
+import os
+from datetime import datetime
+
+import click
+
+from voice_mode.profiling import list_profiles, read_metadata, summarize
+
+
+def _profile_dir():
+    from voice_mode.config import PROFILE_DIR
+    return PROFILE_DIR
+
+
+def _short_path(filename: str) -> str:
+    """Last two components of a source path."""
+    parts = filename.replace(os.sep, '/').rsplit('/', 2)
+    return '/'.join(parts[-2:])
+
+
+@click.group()
+@click.help_option('-h', '--help', help='Show this message and exit')
+def profiles():
+    """List and summarize converse turn profiles (VOICEMODE_PROFILE=true)."""
+    pass
+
+
+@profiles.command("list")
+@click.help_option('-h', '--help')
+@click.option('-n', '--limit', default=20, help='Number of recent turns to list (default: 20)')
+def list_command(limit):
+    """List recent turn profiles with their timings."""
+    paths = list_profiles(_profile_dir(), limit)
+    if not paths:
+        click.echo(f"No profiles in {_profile_dir()}. Set VOICEMODE_PROFILE=true to record them.", err=True)
+        return
+
+    print(f"{'Started':19s}  {'Turn':>6s}  {'TTS':>6s}  {'Record':>6s}  {'STT':>6s}  {'OK':3s}  Conversation / file")
+    print("-" * 90)
+    for path in paths:
+        try:
+            meta = read_metadata(path)
+        except (OSError, ValueError) as e:
+            print(f"{'?':19s}  {path.name}: {e}")
+            continue
+        timings = meta.get('timings') or {}
+
+        def seconds(value):
+            return f"{value:5.1f}s" if isinstance(value, (int, float)) else f"{'-':>6s}"
+
+        started = meta.get('started', '')
+        try:
+            started = datetime.fromisoformat(started).strftime('%Y-%m-%d %H:%M:%S')
+        except (TypeError, ValueError):
+            pass
+        print(f"{started:19s}  {seconds(meta.get('duration'))}  {seconds(timings.get('tts_total'))}  "
+              f"{seconds(timings.get('record'))}  {seconds(timings.get('stt'))}  "
+              f"{'yes' if meta.get('success') else 'no':3s}  {meta.get('conversation_id') or '-'}")
+        print(f"{'':19s}  {path}")
+
+
+@profiles.command()
+@click.help_option('-h', '--help')
+@click.option('-n', '--turns', default=10, help='Number of recent turns to aggregate (default: 10)')
+@click.option('-t', '--top', default=25, help='Number of frames to show (default: 25)')
+@click.option('--event-loop', is_flag=True, help='Only the event loop thread (skip capture and worker threads)')
+@click.option('--json', 'as_json', is_flag=True, help='Output as JSON')
+def summary(turns, top, event_loop, as_json):
+    """Show the hottest frames across recent turns.
+
+    Self time is time spent in the frame itself (running Python code, or
+    blocked in a C call such as a device read); total time includes its
+    callees. Event loop time in selectors' select() is time spent waiting
+    on providers and timers.
+    """
+    paths = list_profiles(_profile_dir(), turns)
+    if not paths:
+        click.echo(f"No profiles in {_profile_dir()}. Set VOICEMODE_PROFILE=true to record them.", err=True)
+        return
+
+    result = summarize(paths, event_loop_only=event_loop)
+    result['frames'] = result['frames'][:top]
+    if as_json:
+        print(json.dumps(result, indent=2))
+        return
+
+    wall = result['wall'] or 1.0
+    print(f"Hottest frames over {result['turns']} turns ({result['wall']:.1f}s of turn time)")
+    print("Percentages are of turn time; threads run concurrently, so they can add up to more than 100%")
+    print()
+    print(f"{'Self':>7s} {'Self%':>6s} {'Total':>7s} {'Total%':>6s}  Function")
+    print("-" * 90)
+    for frame in result['frames']:
+        print(f"{frame['self']:6.2f}s {frame['self'] / wall * 100:5.1f}% "
+              f"{frame['total']:6.2f}s {frame['total'] / wall * 100:5.1f}%  "
+              f"{frame['name']} ({_short_path(frame['file'])}:{frame['line']})")
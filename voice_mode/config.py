@@ -104,6 +104,28 @@ def load_voicemode_env():
 # Save transcription files (true/false)
 # VOICEMODE_SAVE_TRANSCRIPTIONS=false
 
+# Store saved WAV recordings as Opus, compressed in the background (true/false)
+# VOICEMODE_SAVE_AUDIO_COMPRESS=false
+
+# Saved audio is archived by 'voicemode audio archive'
+# Transcode audio older than this many days to Opus (default: 7)
+# VOICEMODE_AUDIO_ARCHIVE_AFTER_DAYS=7
+
+# Opus bitrate of archived and compressed audio in bits per second (default: 24000)
+# VOICEMODE_AUDIO_ARCHIVE_BITRATE=24000
+
+# Delete audio older than this many days (default: 0, keep forever)
+# VOICEMODE_AUDIO_RETENTION_DAYS=0
+
+# Delete the oldest audio beyond this total size, e.g. 500M or 2G (default: 0, no limit)
+# VOICEMODE_AUDIO_MAX_SIZE=0
+
+# Transcoding worker processes (default: half the CPUs)
+# VOICEMODE_AUDIO_ARCHIVE_WORKERS=
+
+# Archive in the background once a day while the server runs (true/false)
+# VOICEMODE_AUDIO_ARCHIVE_AUTO=false
+
 # Skip TTS for faster text-only responses (true/false)
 # VOICEMODE_SKIP_TTS=false
 
@@ -277,6 +299,61 @@ def load_voicemode_env():
 # Log rotation policy (currently only 'daily' supported)
 # VOICEMODE_EVENT_LOG_ROTATION=daily
 
+# Exchange and event logs are written in batches by a background thread
+# Longest a record waits in memory before it is written, in seconds (default: 0.1)
+# VOICEMODE_LOG_FLUSH_INTERVAL=0.1
+
+# Records written per batch (default: 64)
+# VOICEMODE_LOG_BATCH_SIZE=64
+
+# fsync policy: never (leave it to the OS), batch or always (default: never)
+# VOICEMODE_LOG_FSYNC=never
+
+# Records queued before new ones are dropped (default: 10000)
+# VOICEMODE_LOG_QUEUE_SIZE=10000
+
+#############
+# Tracing
+#############
+
+# Record each converse turn as a trace of nested spans (TTS request, playback,
+# chimes, capture, STT) in OTLP-JSON files (true/false, default: false)
+# VOICEMODE_TRACE=false
+
+# Trace directory (default: ~/.voicemode/logs/traces)
+# VOICEMODE_TRACE_DIR=~/.voicemode/logs/traces
+
+#############
+# Metrics
+#############
+
+# Serve Prometheus metrics (latency histograms, failover, underrun, cache and
+# error counters) on http://<host>:<port>/metrics; 0 disables (default: 0).
+# They are also available as the voice://metrics/prometheus resource.
+# Every MCP process on the host is exported, labelled by pid: the process
+# holding the port serves snapshots the others write to ~/.voicemode/metrics.
+# VOICEMODE_METRICS_PORT=0
+
+# Address the metrics endpoint binds to (default: 127.0.0.1)
+# VOICEMODE_METRICS_HOST=127.0.0.1
+
+#############
+# Profiling
+#############
+
+# Sample each converse turn's stacks (all threads) and write a speedscope
+# profile per turn; see `voicemode profiles` (true/false, default: false)
+# VOICEMODE_PROFILE=false
+
+# Profile directory (default: ~/.voicemode/logs/profiles)
+# VOICEMODE_PROFILE_DIR=~/.voicemode/logs/profiles
+
+# Milliseconds between samples (default: 10)
+# VOICEMODE_PROFILE_INTERVAL=10
+
+# Number of turn profiles to keep (default: 100)
+# VOICEMODE_PROFILE_KEEP=100
+
 #############
 # Pronunciation System
 #############
@@ -309,6 +386,47 @@ def load_voicemode_env():
 # Announce which voice is speaking (true/false, default: true)
 # VOICEMODE_THINKING_ANNOUNCE_VOICE=true
 
+#############
+# Daemon Mode
+#############
+
+# Unix socket 'voicemode daemon start' serves on (only the owner can connect).
+# Set to an empty value to serve on TCP instead.
+# VOICEMODE_DAEMON_SOCKET=~/.voicemode/daemon.sock
+
+# TCP address (streamable HTTP at http://HOST:PORT/mcp). Requests need the
+# bearer token recorded in ~/.voicemode/daemon.json.
+# VOICEMODE_DAEMON_HOST=127.0.0.1
+# VOICEMODE_DAEMON_PORT=8765
+
+# Forward stdio MCP sessions to a running daemon (true/false, default: false).
+# Forwarded sessions run with the daemon's environment, so VOICEMODE_* settings
+# from the client's MCP config are not applied.
+# VOICEMODE_DAEMON_AUTO_CONNECT=false
+
+# Seconds a session waits for the speaker/microphone held by another session
+# VOICEMODE_AUDIO_DEVICE_WAIT_TIMEOUT=300
+
+# Let interactive converse interrupt speak-only playback from another session
+# VOICEMODE_AUDIO_PREEMPTION=false
+
+#############
+# Background Speech
+#############
+
+# Return from speak-only converse calls (wait_for_response=false) only after
+# playback has finished (true/false, default: true). Set to false to queue the
+# message and return immediately. Progress is reported by the speak_status tool
+# (VOICEMODE_TOOLS_ENABLED=converse,service,speak_status)
+# VOICEMODE_WAIT_FOR_PLAYBACK=true
+
+# Maximum number of messages waiting for background playback
+# VOICEMODE_SPEAK_QUEUE_SIZE=8
+
+# What to do when the queue is full: block (wait for space), drop (reject the
+# new message) or coalesce (append it to the session's last queued message)
+# VOICEMODE_SPEAK_QUEUE_POLICY=block
+
 #############
 # Service Management
 #############
@@ -316,6 +434,10 @@ def load_voicemode_env():
 # Auto-enable services after installation (true/false, default: true)
 # VOICEMODE_SERVICE_AUTO_ENABLE=true
 
+# Cache ffmpeg/GPU/version/dependency probe results across runs (true/false, default: true)
+# Entries are invalidated automatically when the probed binaries or PATH change
+# VOICEMODE_PROBE_CACHE=true
+
 #############
 # Advanced Configuration
 #############
@@ -369,6 +491,19 @@ def env_bool(env_var: str, default: bool = False) -> bool:
     value = os.getenv(env_var, "").lower()
     return value in ("true", "1", "yes", "on") if value else default
 
+# Helper function to parse sizes such as 500M or 2G
+def parse_size(value: str) -> int:
+    """Parse a size in bytes, with an optional K, M, G or T suffix (powers of 1024)."""
+    value = value.strip().upper().removesuffix("B")
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    multiplier = units.get(value[-1:], 1)
+    if value[-1:] in units:
+        value = value[:-1]
+    size = int(float(value) * multiplier)
+    if size < 0:
+        raise ValueError(f"Negative size: {value}")
+    return size
+
 # Helper function to expand paths with tilde
 def expand_path(path_str: str) -> Path:
     """Expand tilde and environment variables in path strings."""
@@ -401,6 +536,19 @@ SAVE_ALL = os.getenv("VOICEMODE_SAVE_ALL", "").lower() in ("true", "1", "yes", "
 # Enable if SAVE_ALL is true, DEBUG is true, or individually enabled
 SAVE_AUDIO = SAVE_ALL or DEBUG or os.getenv("VOICEMODE_SAVE_AUDIO", "").lower() in ("true", "1", "yes", "on")
 SAVE_TRANSCRIPTIONS = SAVE_ALL or DEBUG or os.getenv("VOICEMODE_SAVE_TRANSCRIPTIONS", "").lower() in ("true", "1", "yes", "on")
+SAVE_AUDIO_COMPRESS = env_bool("VOICEMODE_SAVE_AUDIO_COMPRESS", False)
+
+# Archival of saved audio (see voice_mode.audio_archive)
+AUDIO_ARCHIVE_AFTER_DAYS = max(0.0, float(os.getenv("VOICEMODE_AUDIO_ARCHIVE_AFTER_DAYS", "7")))
+AUDIO_ARCHIVE_BITRATE = max(6000, int(os.getenv("VOICEMODE_AUDIO_ARCHIVE_BITRATE", "24000")))
+AUDIO_RETENTION_DAYS = max(0.0, float(os.getenv("VOICEMODE_AUDIO_RETENTION_DAYS", "0")))
+try:
+    AUDIO_MAX_SIZE = parse_size(os.getenv("VOICEMODE_AUDIO_MAX_SIZE", "0") or "0")
+except ValueError:
+    _invalid_audio_max_size = os.getenv("VOICEMODE_AUDIO_MAX_SIZE")
+    AUDIO_MAX_SIZE = 0
+AUDIO_ARCHIVE_WORKERS = int(os.getenv("VOICEMODE_AUDIO_ARCHIVE_WORKERS") or max(1, (os.cpu_count() or 2) // 2))
+AUDIO_ARCHIVE_AUTO = env_bool("VOICEMODE_AUDIO_ARCHIVE_AUTO", False)
 
 # Audio feedback configuration
 AUDIO_FEEDBACK_ENABLED = os.getenv("VOICEMODE_AUDIO_FEEDBACK", "true").lower() in ("true", "1", "yes", "on")
@@ -420,6 +568,10 @@ ALWAYS_TRY_LOCAL = os.getenv("VOICEMODE_ALWAYS_TRY_LOCAL", "true").lower() in ("
 # Auto-start configuration
 AUTO_START_KOKORO = os.getenv("VOICEMODE_AUTO_START_KOKORO", "").lower() in ("true", "1", "yes", "on")
 
+# Persistent probe cache (ffmpeg, GPU, service versions, system dependencies)
+PROBE_CACHE_ENABLED = env_bool("VOICEMODE_PROBE_CACHE", True)
+PROBE_CACHE_FILE = BASE_DIR / "cache" / "probes.json"
+
 # ==================== SERVICE CONFIGURATION ====================
 
 # OpenAI configuration
@@ -534,6 +686,38 @@ LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET", "secret")
 FRONTEND_HOST = os.getenv("VOICEMODE_FRONTEND_HOST", "127.0.0.1")
 FRONTEND_PORT = int(os.getenv("VOICEMODE_FRONTEND_PORT", "3000"))
 
+# ==================== DAEMON CONFIGURATION ====================
+
+# Resident MCP server shared by all clients (voicemode daemon start)
+DAEMON_HOST = os.getenv("VOICEMODE_DAEMON_HOST", "127.0.0.1")
+DAEMON_PORT = int(os.getenv("VOICEMODE_DAEMON_PORT", "8765"))
+# Unix socket (mode 0600) the daemon serves on unless a TCP host/port is
+# requested explicitly; set to an empty string to always use TCP
+_daemon_socket = os.getenv("VOICEMODE_DAEMON_SOCKET", "" if os.name == "nt" else str(BASE_DIR / "daemon.sock"))
+DAEMON_SOCKET = str(expand_path(_daemon_socket)) if _daemon_socket else ""
+# Let the stdio server forward to a running daemon instead of starting its own
+DAEMON_AUTO_CONNECT = env_bool("VOICEMODE_DAEMON_AUTO_CONNECT", False)
+DAEMON_STATE_FILE = BASE_DIR / "daemon.json"
+
+# Seconds a session waits for the speaker/microphone before giving up
+AUDIO_DEVICE_WAIT_TIMEOUT = float(os.getenv("VOICEMODE_AUDIO_DEVICE_WAIT_TIMEOUT", "300"))
+
+# Interrupt lower-priority playback from another session instead of waiting for it
+AUDIO_PREEMPTION = env_bool("VOICEMODE_AUDIO_PREEMPTION", False)
+
+# ==================== BACKGROUND SPEECH CONFIGURATION ====================
+
+# Default for converse(wait_for_playback=...) in speak-only mode
+WAIT_FOR_PLAYBACK = env_bool("VOICEMODE_WAIT_FOR_PLAYBACK", True)
+
+# Bounded queue for background speech and its back-pressure policy
+SPEAK_QUEUE_SIZE = max(1, int(os.getenv("VOICEMODE_SPEAK_QUEUE_SIZE", "8")))
+SPEAK_QUEUE_POLICIES = ("block", "drop", "coalesce")
+SPEAK_QUEUE_POLICY = os.getenv("VOICEMODE_SPEAK_QUEUE_POLICY", "block").lower()
+if SPEAK_QUEUE_POLICY not in SPEAK_QUEUE_POLICIES:
+    _invalid_speak_queue_policy = SPEAK_QUEUE_POLICY
+    SPEAK_QUEUE_POLICY = "block"
+
 # ==================== SERVICE MANAGEMENT CONFIGURATION ====================
 
 # Auto-enable services after installation
@@ -615,13 +799,39 @@ EVENT_LOG_ENABLED = SAVE_ALL or os.getenv("VOICEMODE_EVENT_LOG_ENABLED", "true")
 EVENT_LOG_DIR = os.getenv("VOICEMODE_EVENT_LOG_DIR", str(LOGS_DIR / "events"))
 EVENT_LOG_ROTATION = os.getenv("VOICEMODE_EVENT_LOG_ROTATION", "daily")  # Currently only daily is supported
 
+# Buffered writing of exchange and event logs (see voice_mode.utils.append_log)
+LOG_FLUSH_INTERVAL = max(0.0, float(os.getenv("VOICEMODE_LOG_FLUSH_INTERVAL", "0.1")))
+LOG_BATCH_SIZE = max(1, int(os.getenv("VOICEMODE_LOG_BATCH_SIZE", "64")))
+LOG_QUEUE_SIZE = max(1, int(os.getenv("VOICEMODE_LOG_QUEUE_SIZE", "10000")))
+LOG_FSYNC_POLICIES = ("never", "batch", "always")
+LOG_FSYNC = os.getenv("VOICEMODE_LOG_FSYNC", "never").lower()
+if LOG_FSYNC not in LOG_FSYNC_POLICIES:
+    _invalid_log_fsync = LOG_FSYNC
+    LOG_FSYNC = "never"
+
+# Per-turn trace spans exported as OTLP-JSON (see voice_mode.tracing)
+TRACE_ENABLED = env_bool("VOICEMODE_TRACE", False)
+TRACE_DIR = Path(os.path.expanduser(os.getenv("VOICEMODE_TRACE_DIR", str(LOGS_DIR / "traces"))))
+
+# Prometheus metrics endpoint (see voice_mode.metrics)
+METRICS_PORT = int(os.getenv("VOICEMODE_METRICS_PORT", "0"))
+METRICS_HOST = os.getenv("VOICEMODE_METRICS_HOST", "127.0.0.1")
+METRICS_SNAPSHOT_DIR = BASE_DIR / "metrics"
+
+# Per-turn sampling profiles (see voice_mode.profiling)
+PROFILE_ENABLED = env_bool("VOICEMODE_PROFILE", False)
+PROFILE_DIR = Path(os.path.expanduser(os.getenv("VOICEMODE_PROFILE_DIR", str(LOGS_DIR / "profiles"))))
+PROFILE_INTERVAL = max(1, int(os.getenv("VOICEMODE_PROFILE_INTERVAL", "10"))) / 1000
+PROFILE_KEEP = max(1, int(os.getenv("VOICEMODE_PROFILE_KEEP", "100")))
+
 # ==================== GLOBAL STATE ====================
 
 # Service management
 service_processes: Dict[str, subprocess.Popen] = {}
 
 # Concurrency control for audio operations
-# This prevents multiple audio operations from interfering with stdio
+# Deprecated: converse schedules the audio device through
+# voice_mode.audio_scheduler; kept for external callers
 audio_operation_lock = asyncio.Lock()
 
 # Flag to track if startup initialization has run
@@ -968,6 +1178,13 @@ if 'TTS_AUDIO_FORMAT' in locals() and '_invalid_tts_format' in locals():
 if 'STT_AUDIO_FORMAT' in locals() and '_invalid_stt_format' in locals():
     logger.warning(f"Unsupported STT audio format '{_invalid_stt_format}', falling back to '{AUDIO_FORMAT}'")
 
+if '_invalid_speak_queue_policy' in locals():
+    logger.warning(f"Unsupported speak queue policy '{_invalid_speak_queue_policy}', falling back to 'block'")
+if '_invalid_log_fsync' in locals():
+    logger.warning(f"Unsupported log fsync policy '{_invalid_log_fsync}', falling back to 'never'")
+if '_invalid_audio_max_size' in locals():
+    logger.warning(f"Invalid VOICEMODE_AUDIO_MAX_SIZE '{_invalid_audio_max_size}', not limiting audio size")
+
 # ==================== AUDIO FORMAT UTILITIES ====================
 
 def get_provider_supported_formats(provider: str, operation: str = "tts") -> list:
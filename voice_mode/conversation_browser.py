@@ -0,0 +1,185 @@
+"""
+Conversation browser web app.
+
+A small Flask app for browsing logged conversations and playing their
+audio. The page itself is static; it pages through the JSON API:
+
+- ``GET /api/conversations?limit=&cursor=&project=&day=YYYY-MM-DD``:
+  conversations, most recently active first, with ``next_cursor`` for the
+  following page
+- ``GET /api/conversations/<id>``: one conversation with its exchanges
+- ``GET /api/projects``: projects with their conversation counts
+- ``GET /api/stats?days=N``: exchange and conversation statistics, merged
+  from the cached daily rollups
+- ``GET /api/tail``: new exchanges as server-sent events
+- ``GET /audio/<filename>``: audio files, with HTTP Range support so long
+  recordings can be seeked without downloading them
+
+API responses carry an ETag derived from the state of the exchange index,
+so unchanged data is answered with ``304 Not Modified`` without querying.
+
+Requires Flask (``pip install voice-mode[scripts]``). Run it with
+``voicemode exchanges browse``.
+"""
+
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from flask import Flask, Response, jsonify, request, send_file
+
+from voice_mode.core import find_audio_file
+from voice_mode.exchanges.browser import PAGE_SIZE, ConversationBrowser, decode_cursor
+from voice_mode.exchanges.follow import ExchangeFollower
+
+
+# Seconds between keep-alive comments on the live tail stream
+TAIL_KEEPALIVE = 15
+
+# Audio files never change once written, so browsers may reuse them this long
+AUDIO_MAX_AGE = 24 * 60 * 60
+
+# Formats mimetypes does not know everywhere
+AUDIO_MIMETYPES = {
+    '.opus': 'audio/ogg',
+    '.ogg': 'audio/ogg',
+    '.flac': 'audio/flac',
+    '.aac': 'audio/aac',
+    '.m4a': 'audio/mp4',
+    '.pcm': 'application/octet-stream',
+}
+
+TEMPLATE = Path(__file__).parent / "templates" / "browser" / "index.html"
+
+
+def create_app(base_dir: Optional[Path] = None) -> Flask:
+    """Create the browser app.
+
+    Args:
+        base_dir: Base directory with the logs and audio. Defaults to ~/.voicemode
+    """
+    from voice_mode.config import BASE_DIR
+
+    base_dir = Path(base_dir) if base_dir else Path(BASE_DIR)
+    audio_dir = base_dir / "audio"
+    browser = ConversationBrowser(base_dir)
+
+    app = Flask(__name__)
+    app.extensions['conversation_browser'] = browser
+
+    def conditional_json(build: Callable[[], Any]) -> Response:
+        """JSON response with an ETag, or 304 if the client's copy is current."""
+        etag = browser.etag(request.full_path)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            data = build()
+            if data is None:
+                return jsonify(error="Not found"), 404
+            response = jsonify(data)
+        response.set_etag(etag)
+        # Always revalidate; the ETag makes that cheap
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    @app.route('/')
+    def index():
+        """The browser page; its data comes from the API."""
+        response = send_file(TEMPLATE, mimetype='text/html', conditional=True, max_age=0)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    @app.route('/api/conversations')
+    def api_conversations():
+        """A page of conversations, most recently active first."""
+        try:
+            limit = int(request.args.get('limit', PAGE_SIZE))
+            day = request.args.get('day')
+            day = datetime.strptime(day, '%Y-%m-%d').date() if day else None
+            cursor = request.args.get('cursor') or None
+            if cursor:
+                decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify(error=str(e)), 400
+        project = request.args.get('project')
+        return conditional_json(lambda: browser.page(limit, cursor, project, day))
+
+    @app.route('/api/conversations/<conversation_id>')
+    def api_conversation(conversation_id):
+        """One conversation with all of its exchanges."""
+        return conditional_json(lambda: browser.conversation(conversation_id))
+
+    @app.route('/api/projects')
+    def api_projects():
+        """Projects with their conversation counts."""
+        return conditional_json(browser.projects)
+
+    @app.route('/api/stats')
+    def api_stats():
+        """Statistics for the last N days, or all history."""
+        try:
+            days = request.args.get('days')
+            days = int(days) if days else None
+        except ValueError as e:
+            return jsonify(error=str(e)), 400
+        return conditional_json(lambda: browser.stats(days))
+
+    @app.route('/api/tail')
+    def api_tail():
+        """Stream new exchanges as server-sent events while they are logged."""
+        def stream():
+            follower = ExchangeFollower(browser.reader.logs_dir)
+            follower.start(at_end=True)
+            idle_since = time.monotonic()
+            try:
+                while True:
+                    exchanges = follower.read_new()
+                    if exchanges:
+                        idle_since = time.monotonic()
+                    for exchange in exchanges:
+                        yield f"data: {json.dumps(browser.exchange(exchange), default=str)}\n\n"
+                    if time.monotonic() - idle_since > TAIL_KEEPALIVE:
+                        # Lets the server notice clients that have gone away
+                        idle_since = time.monotonic()
+                        yield ": keep-alive\n\n"
+                    follower.wait()
+            finally:
+                follower.close()
+
+        return Response(stream(), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache'})
+
+    @app.route('/audio/<filename>')
+    def serve_audio(filename):
+        """Serve an audio file, honouring Range and conditional requests."""
+        # Archived files are served as their Opus copy under the original name
+        audio_path = find_audio_file(filename, audio_dir)
+        if audio_path is None:
+            return "Audio file not found", 404
+
+        # send_file answers Range requests with 206 Partial Content (or 416)
+        # and If-None-Match / If-Modified-Since with 304
+        response = send_file(
+            audio_path,
+            mimetype=AUDIO_MIMETYPES.get(audio_path.suffix.lower()),
+            conditional=True,
+            etag=True,
+            max_age=AUDIO_MAX_AGE,
+        )
+        response.headers['Accept-Ranges'] = 'bytes'
+        return response
+
+    return app
+
+
+def main(host: str = '127.0.0.1', port: int = 5000, base_dir: Optional[Path] = None) -> None:
+    """Run the browser with Flask's threaded development server."""
+    app = create_app(base_dir)
+    browser = app.extensions['conversation_browser']
+    added = browser.refresh(force=True)
+    print("Starting Voice Mode Conversation Browser...")
+    print(f"Logs: {browser.reader.logs_dir} ({added} exchanges newly indexed)")
+    print(f"\nOpen http://{host}:{port} in your browser\n")
+    app.run(host=host, port=port, threaded=True)
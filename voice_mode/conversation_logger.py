@@ -2,9 +2,25 @@
 Conversation logging system using JSONL format.
 
 Tracks all utterances (STT and TTS) in a structured, append-only format
-for real-time conversation tracking and analysis.
+for real-time conversation tracking and analysis. Entries are written in
+batches by the shared background log writer (voice_mode.utils.append_log),
+so logging never blocks the caller; call ``flush()`` before reading the log
+back in the same process.
+
+Several server processes may log to the same daily file at once. Each entry
+records the writing process and a per-process sequence number (``pid`` and
+``seq``), and a process only continues a conversation found in the log if
+the process that logged it has exited.
+
+A daemon (voice_mode.daemon) serves many clients from one process, so it
+keeps one logger per client with that client's project path and records
+the client's pid as ``client_pid``; continuity then works as if each client
+were its own server process.
 """
 
+import itertools
+import threading
+from collections import OrderedDict
 import json
 import os
 import random
@@ -15,25 +31,39 @@ from typing import Dict, Any, Optional
 
 from voice_mode.__version__ import __version__
 from voice_mode.config import BASE_DIR
+from voice_mode.timings import timings_ms
+from voice_mode.utils.append_log import AppendLogWriter, get_append_log_writer
 
 
 class ConversationLogger:
     """Handles JSONL-based conversation logging."""
     
-    SCHEMA_VERSION = 3
+    # v4: numeric "timings" object (milliseconds per pipeline stage)
+    SCHEMA_VERSION = 4
     CONVERSATION_GAP_MINUTES = 5
+    # How far back from the end of a log to look for a previous entry
+    LAST_ENTRY_SEARCH_BYTES = 256 * 1024
     
-    def __init__(self, base_dir: Optional[Path] = None):
+    def __init__(self, base_dir: Optional[Path] = None, writer: Optional[AppendLogWriter] = None,
+                 project_path: Optional[str] = None, client_pid: Optional[int] = None):
         """Initialize the conversation logger.
         
         Args:
             base_dir: Base directory for logs. Defaults to ~/.voicemode/logs/conversations/
+            writer: Log writer (defaults to the shared one)
+            project_path: Project being worked on (defaults to the working directory)
+            client_pid: Process this logger logs for when it is not this one (daemon clients)
         """
         self.base_dir = base_dir or Path(BASE_DIR) / "logs" / "conversations"
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = writer or get_append_log_writer()
         
         self.conversation_id = None
-        self.current_project_path = os.getcwd()
+        self.current_project_path = project_path or os.getcwd()
+        self.client_pid = client_pid
+        # Last entry this logger wrote (it may not be on disk yet)
+        self._last_entry: Optional[Dict[str, Any]] = None
+        self._seq = itertools.count(1)
         
         # Initialize conversation ID on startup
         self._initialize_conversation_id()
@@ -61,12 +91,16 @@ class ConversationLogger:
         self.conversation_id = self._generate_conversation_id()
     
     def _get_last_log_entry(self) -> Optional[Dict[str, Any]]:
-        """Get the last entry from today's or yesterday's log file."""
+        """Get the last entry from today's or yesterday's log file.
+        
+        Entries from this project logged by other running processes are
+        skipped: those belong to concurrent sessions, not to this one.
+        """
         # Try today's log first
         today = datetime.now().date()
         log_file = self._get_log_file_path(today)
         
-        last_entry = self._read_last_line(log_file)
+        last_entry = self._read_last_entry(log_file)
         if last_entry:
             return last_entry
         
@@ -74,32 +108,44 @@ class ConversationLogger:
         yesterday = today - timedelta(days=1)
         yesterday_log = self._get_log_file_path(yesterday)
         
-        return self._read_last_line(yesterday_log)
+        return self._read_last_entry(yesterday_log)
     
-    def _read_last_line(self, file_path: Path) -> Optional[Dict[str, Any]]:
-        """Read the last line from a log file."""
-        if not file_path.exists() or file_path.stat().st_size == 0:
-            return None
+    def _read_last_entry(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Read the last usable entry of a log file, searching backwards.
         
+        Torn or partially written lines are skipped.
+        """
         try:
-            # Read file backwards to get last line efficiently
             with open(file_path, 'rb') as f:
-                # Go to end of file
                 f.seek(0, 2)
                 file_size = f.tell()
-                
-                # Read backwards until we find a newline
-                buffer_size = min(file_size, 1024)
-                f.seek(max(0, file_size - buffer_size))
-                
-                lines = f.read().decode('utf-8').strip().split('\n')
-                if lines:
-                    return json.loads(lines[-1])
-        except Exception:
+                start = max(0, file_size - self.LAST_ENTRY_SEARCH_BYTES)
+                f.seek(start)
+                data = f.read()
+        except OSError:
             return None
         
+        lines = data.split(b'\n')
+        if start > 0:
+            # First line is probably cut off
+            lines = lines[1:]
+        for line in reversed(lines):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and self._is_own_session(entry):
+                return entry
         return None
     
+    def _is_own_session(self, entry: Dict[str, Any]) -> bool:
+        """Whether a logged entry could belong to this process's session."""
+        if entry.get('project_path') != self.current_project_path:
+            # Only the latest entry of this project matters
+            return False
+        pid = entry.get('client_pid') or entry.get('pid')
+        return pid is None or pid == (self.client_pid or os.getpid()) or not _process_running(pid)
+    
     def _generate_conversation_id(self) -> str:
         """Generate a new conversation ID."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -116,7 +162,8 @@ class ConversationLogger:
                      text: str,
                      audio_file: Optional[str] = None,
                      duration_ms: Optional[int] = None,
-                     metadata: Optional[Dict[str, Any]] = None) -> None:
+                     metadata: Optional[Dict[str, Any]] = None,
+                     timings: Optional[Dict[str, float]] = None) -> None:
         """Log an utterance to the JSONL file.
         
         Args:
@@ -125,6 +172,7 @@ class ConversationLogger:
             audio_file: Path to the audio file (relative to base_dir)
             duration_ms: Duration of the audio in milliseconds
             metadata: Additional metadata about the utterance
+            timings: Pipeline stage timings in milliseconds (see voice_mode.timings)
         """
         # Check if we need to start a new conversation
         self._check_conversation_continuity()
@@ -133,12 +181,16 @@ class ConversationLogger:
         entry = {
             "version": self.SCHEMA_VERSION,
             "timestamp": datetime.now().astimezone().isoformat(),
+            "pid": os.getpid(),
+            "seq": next(self._seq),
+            "client_pid": self.client_pid,
             "conversation_id": self.conversation_id,
             "type": utterance_type,
             "text": text,
             "project_path": self.current_project_path,
             "audio_file": audio_file,
             "duration_ms": duration_ms,
+            "timings": timings,
             "metadata": {
                 "voice_mode_version": __version__,
                 **(metadata or {})
@@ -150,16 +202,19 @@ class ConversationLogger:
         if "metadata" in entry:
             entry["metadata"] = {k: v for k, v in entry["metadata"].items() if v is not None}
         
-        # Write to today's log file
-        log_file = self._get_log_file_path(datetime.now().date())
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(entry) + '\n')
+        # Queue for today's log file; the writer thread serializes and appends it
+        self._last_entry = entry
+        self.writer.write(self._get_log_file_path(datetime.now().date()), entry)
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until logged utterances have been written to disk."""
+        return self.writer.flush(timeout)
     
     def _check_conversation_continuity(self):
         """Check if we need to start a new conversation based on time gap."""
         # This could be called periodically to ensure conversations
         # are properly segmented even during long sessions
-        last_entry = self._get_last_log_entry()
+        last_entry = self._last_entry or self._get_last_log_entry()
         
         if last_entry and last_entry['conversation_id'] == self.conversation_id:
             try:
@@ -177,7 +232,11 @@ class ConversationLogger:
     
     def log_stt(self, text: str, audio_file: Optional[str] = None,
                 duration_ms: Optional[int] = None, **kwargs) -> None:
-        """Log a speech-to-text utterance."""
+        """Log a speech-to-text utterance.
+        
+        ``timings`` holds stage timings in seconds (e.g. record, stt) and is
+        logged in milliseconds; ``timing`` is the human-readable summary.
+        """
         metadata = {
             "model": kwargs.get("model"),
             "provider": kwargs.get("provider"),
@@ -192,16 +251,18 @@ class ConversationLogger:
             # Fallback information
             "is_fallback": kwargs.get("is_fallback"),
             "fallback_reason": kwargs.get("fallback_reason"),
-            # Timing metrics
-            "transcription_time": kwargs.get("transcription_time"),
-            "total_turnaround_time": kwargs.get("total_turnaround_time"),
         }
         
-        self.log_utterance("stt", text, audio_file, duration_ms, metadata)
+        self.log_utterance("stt", text, audio_file, duration_ms, metadata,
+                           timings=timings_ms(kwargs.get("timings")))
     
     def log_tts(self, text: str, audio_file: Optional[str] = None,
                 duration_ms: Optional[int] = None, **kwargs) -> None:
-        """Log a text-to-speech utterance."""
+        """Log a text-to-speech utterance.
+        
+        ``timings`` holds stage timings in seconds (e.g. ttfa, tts_gen,
+        tts_play) and is logged in milliseconds.
+        """
         metadata = {
             "model": kwargs.get("model"),
             "voice": kwargs.get("voice"),
@@ -216,23 +277,62 @@ class ConversationLogger:
             "transport": kwargs.get("transport"),
             "emotion": kwargs.get("emotion"),
             "error": kwargs.get("error"),
-            # Timing metrics
-            "time_to_first_audio": kwargs.get("time_to_first_audio"),
-            "generation_time": kwargs.get("generation_time"),
-            "playback_time": kwargs.get("playback_time"),
-            "total_turnaround_time": kwargs.get("total_turnaround_time"),
         }
         
-        self.log_utterance("tts", text, audio_file, duration_ms, metadata)
+        self.log_utterance("tts", text, audio_file, duration_ms, metadata,
+                           timings=timings_ms(kwargs.get("timings")))
+
+
+def _process_running(pid: int) -> bool:
+    """Whether a process with this ID exists."""
+    if os.name == 'nt':
+        # os.kill would terminate the process on Windows
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
 
 
 # Global instance for easy access
 _conversation_logger = None
 
+# Per-client loggers, keyed by voice_mode.daemon.current_client(); None unless
+# this process is a daemon
+_client_loggers: Optional["OrderedDict[str, ConversationLogger]"] = None
+_client_loggers_lock = threading.Lock()
+MAX_CLIENT_LOGGERS = 64
+
+
+def enable_client_loggers() -> None:
+    """Keep a separate logger for each daemon client."""
+    global _client_loggers
+    _client_loggers = OrderedDict()
+
 
 def get_conversation_logger() -> ConversationLogger:
-    """Get the global conversation logger instance."""
+    """Get the conversation logger for the current session.
+    
+    This is the global instance, except in a daemon serving a client request.
+    """
     global _conversation_logger
+    if _client_loggers is not None:
+        from voice_mode.daemon import current_client
+        client = current_client()
+        if client is not None:
+            with _client_loggers_lock:
+                logger = _client_loggers.get(client.key)
+                if logger is None:
+                    logger = ConversationLogger(project_path=client.project_path, client_pid=client.pid)
+                    _client_loggers[client.key] = logger
+                    while len(_client_loggers) > MAX_CLIENT_LOGGERS:
+                        _client_loggers.popitem(last=False)
+                else:
+                    _client_loggers.move_to_end(client.key)
+                return logger
     if _conversation_logger is None:
         _conversation_logger = ConversationLogger()
     return _conversation_logger
\ No newline at end of file
@@ -5,6 +5,8 @@ This module contains the main functions used by the voice-mode script,
 extracted to allow for easier testing and reuse.
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
 import os
@@ -15,13 +17,17 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-import numpy as np
-from pydub import AudioSegment
-from openai import AsyncOpenAI
 from .provider_discovery import is_local_provider
-import httpx
+from .utils.lazy_imports import lazy_import
+
+np = lazy_import("numpy")
+AudioSegment = lazy_import("pydub", "AudioSegment")
+AsyncOpenAI = lazy_import("openai", "AsyncOpenAI")
+httpx = lazy_import("httpx")
 
+from .audio_scheduler import AudioPriority, AudioSchedulerError, get_audio_scheduler
 from .config import SAMPLE_RATE
+from .tracing import current_span, start_span
 from .utils import (
     get_event_logger,
     log_tts_start,
@@ -41,7 +47,8 @@ def get_audio_path(filename: str, base_dir: Path, timestamp: Optional[datetime]
                    will be extracted from filename or use current date.
         
     Returns:
-        Full path with year/month structure
+        Full path with year/month structure. If the file was archived (see
+        voice_mode.audio_archive), the path of its ``.opus`` copy.
     """
     # Try to extract date from filename if timestamp not provided
     if timestamp is None:
@@ -63,7 +70,35 @@ def get_audio_path(filename: str, base_dir: Path, timestamp: Optional[datetime]
     year_dir = base_dir / str(timestamp.year)
     month_dir = year_dir / f"{timestamp.month:02d}"
     
-    return month_dir / filename
+    return _archived(month_dir / filename)
+
+
+def _archived(path: Path) -> Path:
+    """Where a saved audio file that is not at ``path`` went, else the path itself.
+    
+    The archiver replaces files with an Opus copy; when compression on save
+    fails, the WAV a ``.opus`` reference was meant to come from is kept.
+    """
+    if not path.exists():
+        for suffix in ('.opus', '.wav'):
+            if path.suffix != suffix and path.with_suffix(suffix).exists():
+                return path.with_suffix(suffix)
+    return path
+
+
+def find_audio_file(filename: str, base_dir: Path) -> Optional[Path]:
+    """Find a saved audio file by the name recorded in the exchange logs.
+    
+    Looks in the year/month layout first, then in the flat layout of older
+    files, in both cases also for an archived ``.opus`` copy.
+    
+    Returns:
+        The path of the file, or None if it no longer exists
+    """
+    for path in (get_audio_path(filename, base_dir), _archived(base_dir / filename)):
+        if path.is_file():
+            return path
+    return None
 
 
 def get_debug_filename(prefix: str, extension: str, conversation_id: Optional[str] = None) -> str:
@@ -92,6 +127,9 @@ def get_debug_filename(prefix: str, extension: str, conversation_id: Optional[st
 def save_debug_file(data: bytes, prefix: str, extension: str, debug_dir: Path, debug: bool = False, conversation_id: Optional[str] = None) -> Optional[str]:
     """Save debug file if debug mode is enabled.
     
+    The file is written by a background thread (see
+    voice_mode.utils.audio_saver), so this returns before it is on disk.
+    
     Args:
         data: File data to save
         prefix: File prefix (e.g., 'tts', 'stt')
@@ -101,27 +139,21 @@ def save_debug_file(data: bytes, prefix: str, extension: str, debug_dir: Path, d
         conversation_id: Optional conversation ID to include in filename
         
     Returns:
-        Path to saved file or None
+        Path the file is saved to or None
     """
     if not debug:
         return None
     
     try:
-        # Get current date for directory structure
-        now = datetime.now()
-        year_dir = debug_dir / str(now.year)
-        month_dir = year_dir / f"{now.month:02d}"
-        
-        # Create year/month directory structure
-        month_dir.mkdir(parents=True, exist_ok=True)
+        from .utils.audio_saver import get_audio_saver
         
+        # Year/month directory structure, created by the saver
+        now = datetime.now()
+        month_dir = debug_dir / str(now.year) / f"{now.month:02d}"
         filename = get_debug_filename(prefix, extension, conversation_id)
-        filepath = month_dir / filename
         
-        with open(filepath, 'wb') as f:
-            f.write(data)
-        
-        logger.debug(f"Debug file saved: {filepath}")
+        filepath = get_audio_saver().save(data, month_dir / filename, conversation_id)
+        logger.debug(f"Debug file queued: {filepath}")
         return str(filepath)
     except Exception as e:
         logger.error(f"Failed to save debug file: {e}")
@@ -231,6 +263,7 @@ async def text_to_speech(
         validated_format = validate_audio_format(format_to_use, provider, "tts")
         
         logger.debug("Making TTS API request...")
+        current_span().set_attribute("format", validated_format)
         # Build request parameters
         request_params = {
             "model": tts_model,
@@ -266,7 +299,8 @@ async def text_to_speech(
             logger.info(f"Using streaming playback for {validated_format}")
             from .streaming import stream_tts_audio
             
-            # Pass the client directly
+            # Streaming takes the device when the first audio arrives, so
+            # synthesis overlaps another job's playback
             success, stream_metrics = await stream_tts_audio(
                 text=text,
                 openai_client=openai_clients[client_key],
@@ -274,13 +308,19 @@ async def text_to_speech(
                 debug=debug,
                 save_audio=save_audio,
                 audio_dir=audio_dir,
-                conversation_id=conversation_id
+                conversation_id=conversation_id,
+                playback_device=get_audio_scheduler().device("playback")
             )
             
+            current_span().set_attributes(streaming=True, underruns=stream_metrics.buffer_underruns)
             if success:
                 metrics['ttfa'] = stream_metrics.ttfa
                 metrics['generation'] = stream_metrics.generation_time
                 metrics['playback'] = stream_metrics.playback_time - stream_metrics.generation_time
+                metrics['underruns'] = stream_metrics.buffer_underruns
+                metrics['output_latency'] = stream_metrics.output_latency
+                if stream_metrics.interrupted:
+                    metrics['interrupted'] = True
                 
                 # Pass through audio path if it exists
                 if stream_metrics.audio_path:
@@ -306,6 +346,10 @@ async def text_to_speech(
             
         metrics['generation'] = time.perf_counter() - generation_start
         logger.debug(f"TTS API response received, content length: {len(response_content)} bytes")
+        # The whole body is read at once, so the first byte is the last
+        request_span = current_span()
+        request_span.add_event("first_byte")
+        request_span.set_attributes(bytes=len(response_content), streaming=False)
         
         # Log TTS first audio event
         if event_logger:
@@ -387,89 +431,105 @@ async def text_to_speech(
                 
                 logger.debug(f"Playing audio with sounddevice at {audio.frame_rate}Hz...")
                 
-                # Try to ensure sounddevice doesn't interfere with stdout/stderr
-                try:
-                    import sounddevice as sd
-                    import sys
+                # Only the playback itself needs the audio device; synthesis above
+                # runs while other jobs are still playing
+                async with get_audio_scheduler().device("playback") as playback:
+                    # Try to ensure sounddevice doesn't interfere with stdout/stderr
+                    try:
+                        import sounddevice as sd
+                        import sys
                     
-                    # Save current stdio state
-                    original_stdin = sys.stdin
-                    original_stdout = sys.stdout
-                    original_stderr = sys.stderr
+                        # Save current stdio state
+                        original_stdin = sys.stdin
+                        original_stdout = sys.stdout
+                        original_stderr = sys.stderr
                     
-                    try:
-                        # Force initialization before playing
-                        sd.default.samplerate = audio.frame_rate
-                        sd.default.channels = audio.channels
+                        try:
+                            # Force initialization before playing
+                            sd.default.samplerate = audio.frame_rate
+                            sd.default.channels = audio.channels
                         
-                        # Log TTS playback start event
-                        if event_logger:
-                            event_logger.log_event(event_logger.TTS_PLAYBACK_START)
-
-                        # Add configurable silence at the beginning to prevent clipping
-                        from .config import CHIME_LEADING_SILENCE
-                        silence_duration = CHIME_LEADING_SILENCE  # seconds
-                        silence_samples = int(audio.frame_rate * silence_duration)
-                        # Match the shape of the samples array exactly
-                        if samples.ndim == 1:
-                            silence = np.zeros(silence_samples, dtype=np.float32)
-                            samples_with_buffer = np.concatenate([silence, samples])
-                        else:
-                            silence = np.zeros((silence_samples, samples.shape[1]), dtype=np.float32)
-                            samples_with_buffer = np.vstack([silence, samples])
+                            # Log TTS playback start event
+                            if event_logger:
+                                event_logger.log_event(event_logger.TTS_PLAYBACK_START)
+
+                            # Add configurable silence at the beginning to prevent clipping
+                            from .config import CHIME_LEADING_SILENCE
+                            silence_duration = CHIME_LEADING_SILENCE  # seconds
+                            silence_samples = int(audio.frame_rate * silence_duration)
+                            # Match the shape of the samples array exactly
+                            if samples.ndim == 1:
+                                silence = np.zeros(silence_samples, dtype=np.float32)
+                                samples_with_buffer = np.concatenate([silence, samples])
+                            else:
+                                silence = np.zeros((silence_samples, samples.shape[1]), dtype=np.float32)
+                                samples_with_buffer = np.vstack([silence, samples])
                         
-                        sd.play(samples_with_buffer, audio.frame_rate)
-                        sd.wait()
+                            playback.on_stop(sd.stop)
+                            with start_span("tts.playback", {"sample_rate": audio.frame_rate,
+                                                             "duration": len(audio) / 1000}) as playback_span:
+                                sd.play(samples_with_buffer, audio.frame_rate)
+                                try:
+                                    await asyncio.to_thread(sd.wait)
+                                except asyncio.CancelledError:
+                                    sd.stop()
+                                    raise
+                                playback_span.set_attribute("interrupted", playback.stop_requested)
+                            if playback.stop_requested:
+                                metrics['interrupted'] = True
                         
-                        # Log TTS playback end event
-                        if event_logger:
-                            event_logger.log_event(event_logger.TTS_PLAYBACK_END)
+                            # Log TTS playback end event
+                            if event_logger:
+                                event_logger.log_event(event_logger.TTS_PLAYBACK_END)
                         
-                        logger.info("✓ TTS played successfully")
-                        os.unlink(tmp_file.name)
-                        metrics['playback'] = time.perf_counter() - playback_start
-                        return True, metrics
-                    finally:
-                        # Restore stdio if it was changed
-                        if sys.stdin != original_stdin:
-                            sys.stdin = original_stdin
-                        if sys.stdout != original_stdout:
-                            sys.stdout = original_stdout
-                        if sys.stderr != original_stderr:
-                            sys.stderr = original_stderr
-                except Exception as sd_error:
-                    logger.error(f"Sounddevice playback failed: {sd_error}")
+                            logger.info("✓ TTS played successfully")
+                            os.unlink(tmp_file.name)
+                            metrics['playback'] = time.perf_counter() - playback_start
+                            return True, metrics
+                        finally:
+                            # Restore stdio if it was changed
+                            if sys.stdin != original_stdin:
+                                sys.stdin = original_stdin
+                            if sys.stdout != original_stdout:
+                                sys.stdout = original_stdout
+                            if sys.stderr != original_stderr:
+                                sys.stderr = original_stderr
+                    except Exception as sd_error:
+                        logger.error(f"Sounddevice playback failed: {sd_error}")
                     
-                    # Fallback to file-based playback methods
-                    logger.info("Attempting alternative playback methods...")
+                        # Fallback to file-based playback methods
+                        logger.info("Attempting alternative playback methods...")
                     
-                    # Try using PyDub's playback (requires simpleaudio or pyaudio)
-                    try:
-                        from pydub.playback import play as pydub_play
-                        logger.debug("Using PyDub playback...")
-                        pydub_play(audio)
-                        logger.info("✓ TTS played successfully with PyDub")
-                        os.unlink(tmp_file.name)
-                        metrics['playback'] = time.perf_counter() - playback_start
-                        return True, metrics
-                    except Exception as pydub_error:
-                        logger.error(f"PyDub playback failed: {pydub_error}")
+                        # Try using PyDub's playback (requires simpleaudio or pyaudio)
+                        try:
+                            from pydub.playback import play as pydub_play
+                            logger.debug("Using PyDub playback...")
+                            pydub_play(audio)
+                            logger.info("✓ TTS played successfully with PyDub")
+                            os.unlink(tmp_file.name)
+                            metrics['playback'] = time.perf_counter() - playback_start
+                            return True, metrics
+                        except Exception as pydub_error:
+                            logger.error(f"PyDub playback failed: {pydub_error}")
                     
-                    # Last resort: save to user's home directory for manual playback
-                    try:
-                        fallback_path = Path.home() / f"voice-mode-audio-{datetime.now().strftime('%Y%m%d_%H%M%S')}.{validated_format}"
-                        import shutil
-                        shutil.copy(tmp_file.name, fallback_path)
-                        logger.warning(f"Audio saved to {fallback_path} for manual playback")
-                        os.unlink(tmp_file.name)
-                        metrics['playback'] = time.perf_counter() - playback_start
-                        return False, metrics
-                    except Exception as save_error:
-                        logger.error(f"Failed to save audio file: {save_error}")
-                        os.unlink(tmp_file.name)
-                        metrics['playback'] = time.perf_counter() - playback_start
-                        return False, metrics
+                        # Last resort: save to user's home directory for manual playback
+                        try:
+                            fallback_path = Path.home() / f"voice-mode-audio-{datetime.now().strftime('%Y%m%d_%H%M%S')}.{validated_format}"
+                            import shutil
+                            shutil.copy(tmp_file.name, fallback_path)
+                            logger.warning(f"Audio saved to {fallback_path} for manual playback")
+                            os.unlink(tmp_file.name)
+                            metrics['playback'] = time.perf_counter() - playback_start
+                            return False, metrics
+                        except Exception as save_error:
+                            logger.error(f"Failed to save audio file: {save_error}")
+                            os.unlink(tmp_file.name)
+                            metrics['playback'] = time.perf_counter() - playback_start
+                            return False, metrics
                 
+            except (AudioSchedulerError, asyncio.CancelledError):
+                os.unlink(tmp_file.name)
+                raise
             except Exception as e:
                 logger.error(f"Error playing audio: {e}")
                 logger.error(f"Audio format - Channels: {audio.channels if 'audio' in locals() else 'unknown'}, Frame rate: {audio.frame_rate if 'audio' in locals() else 'unknown'}")
@@ -609,6 +669,18 @@ def generate_chime(
     return chime_int16
 
 
+async def _play_chime(sd, chime, sample_rate: int) -> None:
+    """Play a chime on the scheduled device without blocking the event loop."""
+    async with get_audio_scheduler().device("playback", AudioPriority.NOTIFICATION) as playback:
+        playback.on_stop(sd.stop)
+        sd.play(chime, sample_rate)
+        try:
+            await asyncio.to_thread(sd.wait)
+        except asyncio.CancelledError:
+            sd.stop()
+            raise
+
+
 async def play_chime_start(
     sample_rate: int = SAMPLE_RATE,
     leading_silence: Optional[float] = None,
@@ -633,8 +705,7 @@ async def play_chime_start(
             leading_silence=leading_silence,
             trailing_silence=trailing_silence
         )
-        sd.play(chime, sample_rate)
-        sd.wait()
+        await _play_chime(sd, chime, sample_rate)
         return True
     except Exception as e:
         logger.debug(f"Could not play start chime: {e}")
@@ -665,8 +736,7 @@ async def play_chime_end(
             leading_silence=leading_silence,
             trailing_silence=trailing_silence
         )
-        sd.play(chime, sample_rate)
-        sd.wait()
+        await _play_chime(sd, chime, sample_rate)
         return True
     except Exception as e:
         logger.debug(f"Could not play end chime: {e}")
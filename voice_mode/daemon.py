@@ -0,0 +1,368 @@
+"""Resident VoiceMode daemon.
+
+``voicemode daemon start`` runs one long-lived MCP server over streamable
+HTTP that every editor session can share. Because all sessions live in one
+process they share the warm audio stack, the provider registry and HTTP
+clients, caches, and a single audio device scheduled by
+``voice_mode.audio_scheduler``.
+
+By default the daemon listens on a Unix socket under ``BASE_DIR`` that only
+its owner can open. Every request must also carry the bearer token recorded
+in daemon.json (mode 0600), which is what protects a TCP listener.
+
+With ``VOICEMODE_DAEMON_AUTO_CONNECT=true`` the regular stdio entry point
+(``voicemode`` with no arguments) becomes a thin proxy that forwards to a
+running daemon; see :func:`run_stdio_shim`. The proxy tells the daemon its
+working directory and pid so that conversation logging stays per client
+(see :func:`current_client`). Everything else runs with the daemon's own
+environment: ``VOICEMODE_*`` settings in a client's MCP config are not
+applied to forwarded sessions.
+"""
+
+import asyncio
+import hmac
+import json
+import logging
+import os
+import secrets
+import signal
+import socket
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import NamedTuple, Optional
+from urllib.parse import quote, unquote
+
+logger = logging.getLogger("voicemode")
+
+# Path of the MCP endpoint on the daemon
+DAEMON_PATH = "/mcp"
+
+# Seconds to wait when checking that a daemon accepts connections
+CONNECT_TIMEOUT = 0.5
+
+# Headers the stdio proxy sends to identify the client it forwards for
+PROJECT_HEADER = "x-voicemode-project"
+CLIENT_PID_HEADER = "x-voicemode-client-pid"
+
+
+@dataclass
+class DaemonInfo:
+    """Where a running daemon can be reached (persisted in daemon.json)."""
+    pid: int
+    version: str
+    started_at: float
+    host: Optional[str] = None
+    port: Optional[int] = None
+    socket: Optional[str] = None
+    # Bearer token required on every request
+    token: Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        """HTTP URL of the MCP endpoint (host is nominal for Unix sockets)."""
+        if self.socket:
+            return f"http://localhost{DAEMON_PATH}"
+        return f"http://{self.host}:{self.port}{DAEMON_PATH}"
+
+    @property
+    def address(self) -> str:
+        """Human readable address for status output."""
+        return f"unix:{self.socket}" if self.socket else self.url
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DaemonInfo":
+        known = {k: v for k, v in data.items() if k in cls.__annotations__}
+        return cls(**known)
+
+
+def _state_file(state_file: Optional[Path] = None) -> Path:
+    if state_file is not None:
+        return Path(state_file)
+    from .config import DAEMON_STATE_FILE
+    return DAEMON_STATE_FILE
+
+
+def read_daemon_info(state_file: Optional[Path] = None) -> Optional[DaemonInfo]:
+    """Read daemon.json without checking whether the daemon is alive."""
+    try:
+        with open(_state_file(state_file)) as f:
+            return DaemonInfo.from_dict(json.load(f))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def write_daemon_info(info: DaemonInfo, state_file: Optional[Path] = None) -> None:
+    """Record the running daemon's address."""
+    path = _state_file(state_file)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    # Holds the token, so only the owner may read it
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with open(fd, "w") as f:
+        json.dump(asdict(info), f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def remove_daemon_info(state_file: Optional[Path] = None, pid: Optional[int] = None) -> None:
+    """Remove daemon.json, but only if it still belongs to ``pid`` (when given)."""
+    path = _state_file(state_file)
+    info = read_daemon_info(path)
+    if info is None or pid is None or info.pid == pid:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _accepts_connections(info: DaemonInfo) -> bool:
+    try:
+        if info.socket:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(CONNECT_TIMEOUT)
+                sock.connect(info.socket)
+        else:
+            with socket.create_connection((info.host, info.port), timeout=CONNECT_TIMEOUT):
+                pass
+    except OSError:
+        return False
+    return True
+
+
+def find_running_daemon(state_file: Optional[Path] = None) -> Optional[DaemonInfo]:
+    """Return the running daemon, or None.
+
+    Stale state files (dead pid) are cleaned up.
+    """
+    path = _state_file(state_file)
+    info = read_daemon_info(path)
+    if info is None:
+        return None
+    if not _pid_alive(info.pid):
+        logger.debug(f"Removing stale daemon state for pid {info.pid}")
+        remove_daemon_info(path, info.pid)
+        return None
+    if not _accepts_connections(info):
+        logger.debug(f"Daemon pid {info.pid} is not accepting connections at {info.address}")
+        return None
+    return info
+
+
+def _warm_up() -> None:
+    """Import the audio stack up front so the first tool call is fast."""
+    start = time.perf_counter()
+    try:
+        from .tools import converse
+        for proxy in (converse.np, converse.sd, converse.write, converse.AudioSegment, converse.AsyncOpenAI):
+            getattr(proxy, "__name__", None)
+        logger.info(f"Daemon warm-up finished in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        logger.warning(f"Daemon warm-up failed: {e}")
+
+
+class ClientInfo(NamedTuple):
+    """The client a daemon request was forwarded for."""
+    key: str
+    project_path: Optional[str]
+    pid: Optional[int]
+
+
+def current_client() -> Optional[ClientInfo]:
+    """Identify the client of the current daemon request.
+
+    Requests forwarded by :func:`run_stdio_shim` carry the proxy's working
+    directory and pid; the proxy opens a new MCP session for every request,
+    so the pid is what ties them together. Clients connecting directly are
+    told apart by their MCP session. Returns None outside an HTTP request.
+    """
+    from fastmcp.server.dependencies import get_http_headers
+    from .audio_scheduler import current_session_id
+
+    headers = get_http_headers()
+    if not headers:
+        return None
+    try:
+        pid = int(headers[CLIENT_PID_HEADER])
+    except (KeyError, ValueError):
+        pid = None
+    key = f"pid:{pid}" if pid is not None else f"session:{current_session_id()}"
+    project_path = unquote(headers.get(PROJECT_HEADER, "")) or None
+    return ClientInfo(key, project_path, pid)
+
+
+class _TokenAuth:
+    """ASGI middleware rejecting requests without the daemon's bearer token."""
+
+    def __init__(self, app, token: str):
+        self.app = app
+        self.expected = f"Bearer {token}".encode()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            supplied = dict(scope["headers"]).get(b"authorization", b"")
+            if not hmac.compare_digest(supplied, self.expected):
+                from starlette.responses import PlainTextResponse
+                await PlainTextResponse("Unauthorized", status_code=401)(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def _bind_unix_socket(path: str) -> socket.socket:
+    """Bind a Unix socket that only the current user can connect to."""
+    # A leftover socket from a crashed daemon would make bind() fail
+    if os.path.exists(path):
+        os.unlink(path)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # Create it with the final mode so there is no window where others can connect
+    old_umask = os.umask(0o177)
+    try:
+        sock.bind(path)
+    finally:
+        os.umask(old_umask)
+    os.chmod(path, 0o600)
+    return sock
+
+
+def run_daemon(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    socket_path: Optional[str] = None,
+    state_file: Optional[Path] = None
+) -> None:
+    """Run the MCP server as a resident daemon until interrupted.
+
+    Serves on VOICEMODE_DAEMON_SOCKET unless ``host`` or ``port`` is given
+    (or the socket setting is empty), in which case it listens on TCP.
+
+    Args:
+        host: TCP host (defaults to VOICEMODE_DAEMON_HOST)
+        port: TCP port (defaults to VOICEMODE_DAEMON_PORT)
+        socket_path: Serve on this Unix socket instead of TCP
+        state_file: Where to record the daemon address (defaults to ~/.voicemode/daemon.json)
+    """
+    from starlette.middleware import Middleware
+    from .config import DAEMON_HOST, DAEMON_PORT, DAEMON_SOCKET
+    from .conversation_logger import enable_client_loggers
+    from .server import mcp, initialize_server
+    from .version import __version__
+
+    if not socket_path and host is None and port is None:
+        socket_path = DAEMON_SOCKET or None
+    host = host or DAEMON_HOST
+    port = port or DAEMON_PORT
+
+    existing = find_running_daemon(state_file)
+    if existing:
+        raise RuntimeError(f"VoiceMode daemon already running (pid {existing.pid}) at {existing.address}")
+
+    initialize_server()
+    enable_client_loggers()
+    threading.Thread(target=_warm_up, name="voicemode-daemon-warmup", daemon=True).start()
+
+    uvicorn_config = {}
+    listener = None
+    if socket_path:
+        listener = _bind_unix_socket(socket_path)
+        uvicorn_config["fd"] = listener.fileno()
+
+    info = DaemonInfo(
+        pid=os.getpid(),
+        version=__version__,
+        started_at=time.time(),
+        host=None if socket_path else host,
+        port=None if socket_path else port,
+        socket=socket_path,
+        token=secrets.token_urlsafe(32)
+    )
+    write_daemon_info(info, state_file)
+    logger.info(f"VoiceMode daemon listening on {info.address}")
+
+    # uvicorn shuts down gracefully on SIGTERM and then re-raises it; turn
+    # that into SystemExit so the state file and socket are cleaned up below
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    try:
+        asyncio.run(mcp.run_http_async(
+            show_banner=False,
+            transport="http",
+            host=host,
+            port=port,
+            path=DAEMON_PATH,
+            uvicorn_config=uvicorn_config,
+            middleware=[Middleware(_TokenAuth, token=info.token)]
+        ))
+    finally:
+        remove_daemon_info(state_file, info.pid)
+        if listener is not None:
+            listener.close()
+        if socket_path and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def _create_transport(info: DaemonInfo, headers: Optional[dict] = None):
+    """Client transport for talking to the daemon."""
+    from fastmcp.client.transports import StreamableHttpTransport
+
+    headers = dict(headers or {})
+    if info.token:
+        headers["Authorization"] = f"Bearer {info.token}"
+
+    if not info.socket:
+        return StreamableHttpTransport(info.url, headers=headers)
+
+    import httpx
+
+    def uds_client_factory(headers=None, timeout=None, auth=None):
+        return httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(uds=info.socket),
+            headers=headers,
+            timeout=timeout or httpx.Timeout(30.0, read=300.0),
+            auth=auth
+        )
+
+    return StreamableHttpTransport(info.url, headers=headers, httpx_client_factory=uds_client_factory)
+
+
+def run_stdio_shim(info: DaemonInfo) -> None:
+    """Serve MCP on stdio by forwarding every request to the daemon."""
+    from fastmcp import FastMCP
+
+    logger.info(f"Forwarding MCP session to VoiceMode daemon (pid {info.pid}) at {info.address}")
+    client_headers = {PROJECT_HEADER: quote(os.getcwd()), CLIENT_PID_HEADER: str(os.getpid())}
+    proxy = FastMCP.as_proxy(_create_transport(info, client_headers), name="voicemode")
+    proxy.run(transport="stdio", show_banner=False)
+
+
+def stop_daemon(state_file: Optional[Path] = None, timeout: float = 10.0) -> Optional[DaemonInfo]:
+    """Send SIGTERM to the running daemon and wait for it to exit.
+
+    Returns:
+        The daemon that was stopped, or None if none was running
+    """
+    info = read_daemon_info(state_file)
+    if info is None or not _pid_alive(info.pid):
+        remove_daemon_info(state_file)
+        return None
+
+    os.kill(info.pid, signal.SIGTERM)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and _pid_alive(info.pid):
+        time.sleep(0.1)
+    if _pid_alive(info.pid):
+        raise RuntimeError(f"Daemon pid {info.pid} did not exit within {timeout:.0f}s")
+    remove_daemon_info(state_file, info.pid)
+    return info
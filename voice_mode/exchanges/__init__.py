@@ -7,18 +7,26 @@ Used by CLI commands, web browser, and MCP tools.
 
 from voice_mode.exchanges.models import Exchange, ExchangeMetadata, Conversation
 from voice_mode.exchanges.reader import ExchangeReader
+from voice_mode.exchanges.index import ExchangeIndex
 from voice_mode.exchanges.formatters import ExchangeFormatter
 from voice_mode.exchanges.filters import ExchangeFilter
 from voice_mode.exchanges.conversations import ConversationGrouper
 from voice_mode.exchanges.stats import ExchangeStats
+from voice_mode.exchanges.rollups import DailyRollups
+from voice_mode.exchanges.export import ConversationExporter
+from voice_mode.exchanges.browser import ConversationBrowser
 
 __all__ = [
     'Exchange',
     'ExchangeMetadata',
     'Conversation',
     'ExchangeReader',
+    'ExchangeIndex',
     'ExchangeFormatter',
     'ExchangeFilter',
     'ConversationGrouper',
     'ExchangeStats',
+    'DailyRollups',
+    'ConversationExporter',
+    'ConversationBrowser',
 ]
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""
+Data behind the conversation browser.
+
+``ConversationBrowser`` answers the browser's JSON endpoints from the
+exchange index (see ``ExchangeIndex``) rather than from the log files:
+conversations are listed newest first a page at a time, each page picking
+up after an opaque cursor, and a conversation's exchanges are read straight
+from their byte offsets. The index is brought up to date at most once per
+``refresh_interval``, and only the lines appended since are ingested, so a
+page costs the same with a week or with years of history.
+
+``etag`` changes whenever the indexed logs do, which lets the web layer
+answer repeated requests with ``304 Not Modified`` without querying.
+
+This module has no web framework dependency; the Flask app lives in
+``voice_mode.conversation_browser``.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from datetime import date as date_type
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from voice_mode.__version__ import __version__
+from voice_mode.exchanges.index import ExchangeIndex
+from voice_mode.exchanges.models import Exchange
+from voice_mode.exchanges.reader import ExchangeReader
+
+
+# Conversations per page unless the client asks for another size
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# The summary shown for a conversation: the start of its first few exchanges
+SUMMARY_EXCHANGES = 3
+SUMMARY_WORDS = 10
+
+
+def encode_cursor(last_timestamp: float, conversation_id: str) -> str:
+    """Opaque cursor pointing just past a conversation in the listing."""
+    raw = json.dumps([last_timestamp, conversation_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    """Inverse of ``encode_cursor``.
+
+    Raises:
+        ValueError: The cursor was not produced by ``encode_cursor``
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        last_timestamp, conversation_id = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(last_timestamp, (int, float)) or not isinstance(conversation_id, str):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return float(last_timestamp), conversation_id
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).astimezone().isoformat()
+
+
+def _summary(exchanges: List[Exchange]) -> str:
+    parts = []
+    for exchange in exchanges:
+        words = exchange.text.split()[:SUMMARY_WORDS]
+        if words:
+            parts.append(" ".join(words) + "...")
+    return " | ".join(parts)
+
+
+class ConversationBrowser:
+    """Index-backed queries for the conversation browser.
+
+    Safe to share between threads: queries are serialized on one index
+    connection, which suits a local, single-user web server.
+    """
+
+    def __init__(self, base_dir: Optional[Path] = None, refresh_interval: float = 1.0):
+        """
+        Args:
+            base_dir: Base directory for logs. Defaults to ~/.voicemode
+            refresh_interval: Minimum seconds between checks for new log lines
+        """
+        self.reader = ExchangeReader(base_dir, use_index=False)
+        self.refresh_interval = refresh_interval
+        self._index: Optional[ExchangeIndex] = None
+        self._lock = threading.RLock()
+        self._refreshed = 0.0
+
+    @property
+    def index(self) -> ExchangeIndex:
+        """The exchange index, created and filled on first use."""
+        with self._lock:
+            if self._index is None:
+                self._index = ExchangeIndex(self.reader.logs_dir, check_same_thread=False)
+            return self._index
+
+    def close(self) -> None:
+        with self._lock:
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+
+    def refresh(self, force: bool = False) -> int:
+        """Ingest lines logged since the last refresh.
+
+        Returns:
+            Number of exchanges added to the index
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._index is not None and now - self._refreshed < self.refresh_interval:
+                return 0
+            added = self.index.update()
+            self._refreshed = time.monotonic()
+            return added
+
+    def etag(self, *parts: str) -> str:
+        """Entity tag for a response built from the current logs.
+
+        Args:
+            *parts: What else the response depends on (path, query, ...)
+        """
+        with self._lock:
+            self.refresh()
+            fingerprint = self.index.fingerprint()
+        digest = hashlib.sha1(f"{__version__}\0{fingerprint}".encode('utf-8'))
+        for part in parts:
+            digest.update(b"\0" + part.encode('utf-8'))
+        return digest.hexdigest()[:32]
+
+    def page(
+        self,
+        limit: int = PAGE_SIZE,
+        cursor: Optional[str] = None,
+        project: Optional[str] = None,
+        day: Optional[date_type] = None
+    ) -> Dict[str, Any]:
+        """One page of conversations, most recently active first.
+
+        Args:
+            limit: Page size (capped at ``MAX_PAGE_SIZE``)
+            cursor: ``next_cursor`` of the previous page
+            project: Exact project path, or "" for conversations without one
+            day: Only conversations active on this (local) day
+
+        Returns:
+            ``conversations`` (without their exchanges) and ``next_cursor``,
+            which is None on the last page
+
+        Raises:
+            ValueError: Invalid cursor
+        """
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        before = decode_cursor(cursor) if cursor else None
+        start = end = None
+        if day is not None:
+            start = datetime.combine(day, datetime.min.time()).astimezone()
+            end = start + timedelta(days=1)
+
+        with self._lock:
+            self.refresh()
+            # One extra row tells whether there is another page
+            rows = self.index.conversations(limit + 1, before=before, project=project, start=start, end=end)
+            more = len(rows) > limit
+            rows = rows[:limit]
+            conversations = [self._conversation(row) for row in rows]
+
+        next_cursor = encode_cursor(rows[-1][2], rows[-1][0]) if more else None
+        return {'conversations': conversations, 'next_cursor': next_cursor}
+
+    def conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """A conversation with all of its exchanges, or None if it is unknown."""
+        with self._lock:
+            self.refresh()
+            row = self.index.conversation(conversation_id)
+            if row is None:
+                return None
+            exchanges = list(self.index.load(self.index.locate(conversation_id=conversation_id)))
+        result = self._conversation(row, exchanges[:SUMMARY_EXCHANGES])
+        result['exchanges'] = [self.exchange(exchange) for exchange in exchanges]
+        return result
+
+    def projects(self) -> List[Dict[str, Any]]:
+        """Projects with their conversation counts, most recently active first."""
+        with self._lock:
+            self.refresh()
+            rows = self.index.projects()
+        return [
+            {'project': project, 'conversations': count, 'last_time': _iso(last)}
+            for project, count, last in rows
+        ]
+
+    def stats(self, days: Optional[int] = None) -> Dict[str, Any]:
+        """Statistics for today and the previous ``days`` days (all history if None).
+
+        Merged from the cached daily rollups (see voice_mode.exchanges.rollups),
+        so only today's log is parsed.
+        """
+        data = self.reader.daily_stats(days).to_dict()
+        data['days'] = days
+        return data
+
+    def _conversation(self, row: Tuple, first: Optional[List[Exchange]] = None) -> Dict[str, Any]:
+        conversation_id, first_timestamp, last_timestamp, count, project = row
+        if first is None:
+            first = list(self.index.load(
+                self.index.locate(conversation_id=conversation_id, limit=SUMMARY_EXCHANGES)
+            ))
+        return {
+            'id': conversation_id,
+            'start_time': _iso(first_timestamp),
+            'end_time': _iso(last_timestamp),
+            'exchange_count': count,
+            'project': project,
+            'summary': _summary(first),
+        }
+
+    @staticmethod
+    def exchange(exchange: Exchange) -> Dict[str, Any]:
+        """JSON form of an exchange, with the URL of its audio if it has any."""
+        data = exchange.to_dict()
+        data['audio_url'] = f"/audio/{Path(exchange.audio_file).name}" if exchange.audio_file else None
+        return data
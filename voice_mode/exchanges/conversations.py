@@ -4,7 +4,7 @@ Conversation grouping and analysis.
 
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 from voice_mode.exchanges.models import Exchange, Conversation
 
@@ -45,26 +45,64 @@ class ConversationGrouper:
         result = {}
         for conv_id, conv_exchanges in conversations.items():
             if conv_exchanges:
-                # Sort by timestamp
-                conv_exchanges.sort(key=lambda e: e.timestamp)
-                
-                # Get project path from first exchange
-                project_path = None
-                for exchange in conv_exchanges:
-                    if exchange.project_path:
-                        project_path = exchange.project_path
-                        break
-                
-                result[conv_id] = Conversation(
-                    id=conv_id,
-                    start_time=conv_exchanges[0].timestamp,
-                    end_time=conv_exchanges[-1].timestamp,
-                    project_path=project_path,
-                    exchanges=conv_exchanges
-                )
+                result[conv_id] = self._build_conversation(conv_id, conv_exchanges)
         
         return result
     
+    def stream_conversations(self, exchanges: Iterable[Exchange]) -> Iterator[Conversation]:
+        """Group exchanges read in log order, yielding each conversation once it has ended.
+        
+        A conversation has ended when none of its exchanges has been seen
+        for ``gap_minutes`` of log time (the logger starts a new
+        conversation ID after such a gap). Only conversations still in
+        progress are held in memory, so this works on any amount of
+        history. Whatever is still open when the exchanges run out is
+        yielded at the end.
+        
+        Args:
+            exchanges: Exchanges in log order
+            
+        Yields:
+            Conversations, as they end
+        """
+        gap = timedelta(minutes=self.gap_minutes)
+        in_progress: Dict[str, List[Exchange]] = {}
+        last_seen: Dict[str, datetime] = {}
+        
+        for exchange in exchanges:
+            timestamp = exchange.timestamp
+            ended = [conv_id for conv_id, seen in last_seen.items() if timestamp - seen > gap]
+            for conv_id in ended:
+                del last_seen[conv_id]
+                yield self._build_conversation(conv_id, in_progress.pop(conv_id))
+            
+            in_progress.setdefault(exchange.conversation_id, []).append(exchange)
+            seen = last_seen.get(exchange.conversation_id)
+            if seen is None or timestamp > seen:
+                last_seen[exchange.conversation_id] = timestamp
+        
+        for conv_id, conv_exchanges in in_progress.items():
+            yield self._build_conversation(conv_id, conv_exchanges)
+    
+    def _build_conversation(self, conv_id: str, conv_exchanges: List[Exchange]) -> Conversation:
+        # Sort by timestamp
+        conv_exchanges.sort(key=lambda e: e.timestamp)
+        
+        # Get project path from first exchange
+        project_path = None
+        for exchange in conv_exchanges:
+            if exchange.project_path:
+                project_path = exchange.project_path
+                break
+        
+        return Conversation(
+            id=conv_id,
+            start_time=conv_exchanges[0].timestamp,
+            end_time=conv_exchanges[-1].timestamp,
+            project_path=project_path,
+            exchanges=conv_exchanges
+        )
+    
     def find_conversations(self, 
                           exchanges: List[Exchange],
                           project_path: Optional[str] = None,
@@ -0,0 +1,305 @@
+"""
+Streaming export of conversations.
+
+``ConversationExporter`` writes conversations one at a time as they are
+grouped from the logs (see ``ConversationGrouper.stream_conversations``), so
+exporting months of history only holds the conversations still in progress
+in memory:
+
+- ``json``: a JSON array of conversations; ``jsonl``: one per line
+- ``csv``: one row per exchange
+- ``markdown``: one transcript per conversation
+- ``html``: one page per conversation plus an ``index.html`` (a single page
+  when there is only one conversation)
+
+With an archive format the export is a zip or tar file that also holds the
+audio files the exchanges reference, stored under ``audio/YYYY/MM/``. Audio
+is copied from disk into the archive as each conversation is written; the
+transcript file is spooled to a temporary file and added last. Archives and
+the single-file formats can be written to standard output (``-``).
+"""
+
+import io
+import json
+import logging
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, TextIO, Union
+
+from voice_mode.exchanges.formatters import ExchangeFormatter
+from voice_mode.exchanges.models import Conversation, Exchange
+
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('json', 'jsonl', 'csv', 'markdown', 'html')
+ARCHIVE_FORMATS = ('zip', 'tar')
+
+# File extension for each export format
+EXTENSIONS = {'json': 'json', 'jsonl': 'jsonl', 'csv': 'csv', 'markdown': 'md', 'html': 'html'}
+
+
+class ConversationWriter:
+    """Writes conversations to a text stream as JSON, JSON Lines, CSV or Markdown."""
+
+    def __init__(self, format: str, stream: TextIO):
+        if format not in EXPORT_FORMATS or format == 'html':
+            raise ValueError(f"Unsupported stream format: {format}")
+        self.format = format
+        self.stream = stream
+        self.count = 0
+        if format == 'csv':
+            stream.write(ExchangeFormatter.csv_header() + '\n')
+
+    def write(self, conversation: Conversation) -> None:
+        """Append one conversation."""
+        if self.format == 'json':
+            self.stream.write('[\n' if not self.count else ',\n')
+            text = json.dumps(conversation.to_dict(), indent=2, default=str)
+            # Nest the conversation one level into the array
+            self.stream.write('  ' + text.replace('\n', '\n  '))
+        elif self.format == 'jsonl':
+            self.stream.write(json.dumps(conversation.to_dict(), default=str) + '\n')
+        elif self.format == 'csv':
+            for exchange in conversation.exchanges:
+                self.stream.write(ExchangeFormatter.csv(exchange) + '\n')
+        else:
+            self.stream.write(ExchangeFormatter.markdown(conversation, include_metadata=True))
+            self.stream.write('\n\n---\n\n')
+        self.count += 1
+
+    def close(self) -> None:
+        """Finish the document (the stream is left open)."""
+        if self.format == 'json':
+            self.stream.write('\n]\n' if self.count else '[]\n')
+
+
+class _Directory:
+    """Files written to a directory."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+
+    def add_text(self, name: str, text: str) -> None:
+        (self.path / name).write_text(text, encoding='utf-8')
+
+    def close(self) -> None:
+        pass
+
+
+class _Archive:
+    """Members written to a zip or tar file, which may be a pipe."""
+
+    def __init__(self, kind: str, output: Union[str, Path]):
+        if kind not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unsupported archive format: {kind}")
+        self.kind = kind
+        target = sys.stdout.buffer if str(output) == '-' else str(output)
+        if kind == 'zip':
+            # zipfile writes data descriptors when the target can't seek
+            self._zip = zipfile.ZipFile(target, 'w', zipfile.ZIP_DEFLATED)
+        elif target is sys.stdout.buffer:
+            self._tar = tarfile.open(fileobj=target, mode='w|')
+        else:
+            self._tar = tarfile.open(target, 'w')
+
+    def add_text(self, name: str, text: str) -> None:
+        data = text.encode('utf-8')
+        if self.kind == 'zip':
+            self._zip.writestr(name, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._tar.addfile(info, io.BytesIO(data))
+
+    def add_file(self, path: Path, name: str, compress: bool = True) -> None:
+        """Copy a file into the archive without reading it into memory."""
+        if self.kind == 'zip':
+            compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            self._zip.write(path, name, compress_type=compress_type)
+        else:
+            self._tar.add(str(path), arcname=name)
+
+    def close(self) -> None:
+        if self.kind == 'zip':
+            self._zip.close()
+        else:
+            self._tar.close()
+
+
+class _HtmlPages:
+    """One HTML page per conversation, plus an index of them."""
+
+    def __init__(self, files: Union[_Directory, _Archive]):
+        self.files = files
+        self.rows: List[str] = []
+
+    def write(self, conversation: Conversation) -> None:
+        name = f"{conversation.id}.html"
+        self.files.add_text(name, ExchangeFormatter.html(conversation))
+        project = f" - <code>{escape(conversation.project_path)}</code>" if conversation.project_path else ""
+        self.rows.append(
+            f'<li><a href="{escape(name)}">{conversation.start_time.strftime("%Y-%m-%d %H:%M:%S")}</a> '
+            f'({conversation.exchange_count} exchanges){project}</li>'
+        )
+
+    def close(self) -> None:
+        self.files.add_text('index.html', (
+            '<!DOCTYPE html>\n<html>\n<head><meta charset="UTF-8"><title>Conversations</title></head>\n'
+            '<body>\n<h1>Conversations</h1>\n<ul>\n' + '\n'.join(self.rows) + '\n</ul>\n</body>\n</html>\n'
+        ))
+
+
+class ConversationExporter:
+    """Export a stream of conversations, optionally bundled with their audio."""
+
+    def __init__(self, format: str = 'json', archive: Optional[str] = None,
+                 audio_dir: Optional[Path] = None):
+        """
+        Args:
+            format: One of ``EXPORT_FORMATS``
+            archive: One of ``ARCHIVE_FORMATS`` to bundle the export with its
+                audio files, or None for a plain export
+            audio_dir: Audio directory (defaults to the configured one)
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        if archive is not None and archive not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unsupported archive format: {archive}")
+        if audio_dir is None:
+            from voice_mode.config import AUDIO_DIR
+            audio_dir = AUDIO_DIR
+        self.format = format
+        self.archive = archive
+        self.audio_dir = Path(audio_dir)
+
+        self.conversations = 0
+        self.exchanges = 0
+        self.audio_files = 0
+        self.missing_audio = 0
+        self._audio_added: Set[str] = set()
+
+    def export(self, conversations: Iterable[Conversation], output: Union[str, Path]) -> Dict[str, Any]:
+        """Write the conversations to ``output`` (``-`` for standard output).
+
+        Returns:
+            Summary with the counts written and where they went
+        """
+        if self.archive:
+            written = self._export_archive(conversations, output)
+        elif self.format == 'html':
+            written = self._export_html(conversations, output)
+        else:
+            written = self._export_stream(conversations, output)
+        return {
+            'output': str(written),
+            'conversations': self.conversations,
+            'exchanges': self.exchanges,
+            'audio_files': self.audio_files,
+            'missing_audio': self.missing_audio,
+        }
+
+    def _counted(self, conversations: Iterable[Conversation]) -> Iterable[Conversation]:
+        for conversation in conversations:
+            self.conversations += 1
+            self.exchanges += conversation.exchange_count
+            yield conversation
+
+    def _export_stream(self, conversations: Iterable[Conversation], output: Union[str, Path]) -> Union[str, Path]:
+        stream = sys.stdout if str(output) == '-' else open(output, 'w', encoding='utf-8')
+        try:
+            writer = ConversationWriter(self.format, stream)
+            for conversation in self._counted(conversations):
+                writer.write(conversation)
+            writer.close()
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        return output
+
+    def _export_html(self, conversations: Iterable[Conversation], output: Union[str, Path]) -> Union[str, Path]:
+        # A single conversation is one page; more become a directory of pages
+        first = None
+        pages = None
+        directory = Path(output).with_suffix('')
+        for conversation in self._counted(conversations):
+            if pages is None and first is None:
+                first = conversation
+                continue
+            if pages is None:
+                if str(output) == '-':
+                    raise ValueError("HTML export of several conversations needs an output directory")
+                pages = _HtmlPages(_Directory(directory))
+                pages.write(first)
+                first = None
+            pages.write(conversation)
+
+        if pages is not None:
+            pages.close()
+            return directory
+        if first is not None:
+            html = ExchangeFormatter.html(first)
+            if str(output) == '-':
+                sys.stdout.write(html)
+            else:
+                Path(output).write_text(html, encoding='utf-8')
+        return output
+
+    def _export_archive(self, conversations: Iterable[Conversation], output: Union[str, Path]) -> Union[str, Path]:
+        archive = _Archive(self.archive, output)
+        try:
+            if self.format == 'html':
+                pages = _HtmlPages(archive)
+                for conversation in self._counted(conversations):
+                    pages.write(conversation)
+                    self._add_audio(archive, conversation)
+                pages.close()
+            else:
+                name = f"conversations.{EXTENSIONS[self.format]}"
+                with tempfile.TemporaryDirectory(prefix="voicemode-export-") as tmp:
+                    spool = Path(tmp) / name
+                    with open(spool, 'w', encoding='utf-8') as stream:
+                        writer = ConversationWriter(self.format, stream)
+                        for conversation in self._counted(conversations):
+                            writer.write(conversation)
+                            self._add_audio(archive, conversation)
+                        writer.close()
+                    archive.add_file(spool, name)
+        finally:
+            archive.close()
+        return output
+
+    def _add_audio(self, archive: _Archive, conversation: Conversation) -> None:
+        for exchange in conversation.exchanges:
+            if not exchange.audio_file:
+                continue
+            path = self._find_audio(exchange)
+            if path is None:
+                self.missing_audio += 1
+                logger.debug(f"Audio file not found: {exchange.audio_file}")
+                continue
+            try:
+                name = "audio/" + path.relative_to(self.audio_dir).as_posix()
+            except ValueError:
+                name = f"audio/{path.name}"
+            if name in self._audio_added:
+                continue
+            # Audio is already compressed or barely compresses; store it as is
+            archive.add_file(path, name, compress=False)
+            self._audio_added.add(name)
+            self.audio_files += 1
+
+    def _find_audio(self, exchange: Exchange) -> Optional[Path]:
+        from voice_mode.core import find_audio_file
+
+        audio_file = Path(exchange.audio_file)
+        if audio_file.is_absolute():
+            return audio_file if audio_file.is_file() else None
+        return find_audio_file(audio_file.name, self.audio_dir)
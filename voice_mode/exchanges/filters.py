@@ -4,7 +4,7 @@ Filters for searching and filtering exchanges.
 
 import re
 from datetime import datetime
-from typing import Iterator, Callable, Optional, List
+from typing import Any, Dict, Iterator, Callable, Optional, List
 
 from voice_mode.exchanges.models import Exchange
 
@@ -15,6 +15,8 @@ class ExchangeFilter:
     def __init__(self):
         """Initialize empty filter."""
         self.filters: List[Callable[[Exchange], bool]] = []
+        # Criteria the exchange index can answer (see ExchangeReader.query)
+        self.criteria: Dict[str, Any] = {}
     
     def by_type(self, exchange_type: str) -> 'ExchangeFilter':
         """Filter by STT/TTS type.
@@ -27,8 +29,10 @@ class ExchangeFilter:
         """
         if exchange_type.lower() == "stt":
             self.filters.append(lambda e: e.is_stt)
+            self.criteria['type'] = "stt"
         elif exchange_type.lower() == "tts":
             self.filters.append(lambda e: e.is_tts)
+            self.criteria['type'] = "tts"
         # "all" doesn't add a filter
         
         return self
@@ -68,9 +72,9 @@ class ExchangeFilter:
         """
         transport_lower = transport.lower()
         self.filters.append(
-            lambda e: e.metadata and e.metadata.transport and 
-                     e.metadata.transport.lower() == transport_lower
+            lambda e: (e.metadata_value('transport') or '').lower() == transport_lower
         )
+        self.criteria['transport'] = transport_lower
         
         return self
     
@@ -85,9 +89,9 @@ class ExchangeFilter:
         """
         provider_lower = provider.lower()
         self.filters.append(
-            lambda e: e.metadata and e.metadata.provider and 
-                     e.metadata.provider.lower() == provider_lower
+            lambda e: (e.metadata_value('provider') or '').lower() == provider_lower
         )
+        self.criteria['provider'] = provider_lower
         
         return self
     
@@ -102,8 +106,7 @@ class ExchangeFilter:
         """
         voice_lower = voice.lower()
         self.filters.append(
-            lambda e: e.is_tts and e.metadata and e.metadata.voice and 
-                     e.metadata.voice.lower() == voice_lower
+            lambda e: e.is_tts and (e.metadata_value('voice') or '').lower() == voice_lower
         )
         
         return self
@@ -119,8 +122,7 @@ class ExchangeFilter:
         """
         model_lower = model.lower()
         self.filters.append(
-            lambda e: e.metadata and e.metadata.model and 
-                     e.metadata.model.lower() == model_lower
+            lambda e: (e.metadata_value('model') or '').lower() == model_lower
         )
         
         return self
@@ -135,6 +137,7 @@ class ExchangeFilter:
             Self for chaining
         """
         self.filters.append(lambda e: e.conversation_id == conversation_id)
+        self.criteria['conversation_id'] = conversation_id
         
         return self
     
@@ -150,6 +153,7 @@ class ExchangeFilter:
         self.filters.append(
             lambda e: e.project_path and project_path in e.project_path
         )
+        self.criteria['project'] = project_path
         
         return self
     
@@ -165,8 +169,10 @@ class ExchangeFilter:
         """
         if start:
             self.filters.append(lambda e: e.timestamp >= start)
+            self.criteria['start'] = start
         if end:
             self.filters.append(lambda e: e.timestamp <= end)
+            self.criteria['end'] = end
         
         return self
     
@@ -187,7 +193,7 @@ class ExchangeFilter:
             Self for chaining
         """
         self.filters.append(
-            lambda e: e.metadata and e.metadata.error is not None
+            lambda e: e.metadata_value('error') is not None
         )
         
         return self
@@ -204,13 +210,13 @@ class ExchangeFilter:
         if enabled is None:
             # Has any silence detection settings
             self.filters.append(
-                lambda e: e.is_stt and e.metadata and e.metadata.silence_detection is not None
+                lambda e: e.is_stt and e.metadata_value('silence_detection') is not None
             )
         else:
             # Specific enabled/disabled state
             self.filters.append(
-                lambda e: e.is_stt and e.metadata and e.metadata.silence_detection and
-                         e.metadata.silence_detection.get('enabled') == enabled
+                lambda e: e.is_stt and bool(e.metadata_value('silence_detection')) and
+                         e.metadata_value('silence_detection').get('enabled') == enabled
             )
         
         return self
@@ -253,6 +259,7 @@ class ExchangeFilter:
             Self for chaining
         """
         self.filters.clear()
+        self.criteria.clear()
         return self
     
     def __len__(self) -> int:
@@ -0,0 +1,244 @@
+"""
+Live following of the daily exchange logs.
+
+``ExchangeFollower`` is an in-process ``tail -f`` for the
+``exchanges_YYYY-MM-DD.jsonl`` files. It remembers the byte offset it has
+read up to and, when woken, reads only the bytes appended since. Only
+complete lines are parsed; a line still being written by another process is
+kept until its newline arrives. When the date changes, the rest of
+yesterday's file is read before moving on to today's.
+
+On Linux it waits on an inotify watch of the logs directory, so new entries
+are picked up as soon as they are written. Elsewhere (or if inotify is
+unavailable) it polls the file size every ``poll_interval`` seconds.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import sys
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from voice_mode.exchanges.models import Exchange, recover_records
+
+
+logger = logging.getLogger(__name__)
+
+# inotify(7) event masks
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+
+# Longest wait between checks for a date change when no events arrive
+_ROLLOVER_CHECK_INTERVAL = 1.0
+
+_READ_SIZE = 1 << 16
+
+
+class _InotifyWatch:
+    """inotify watch on a directory, through libc."""
+
+    def __init__(self, directory: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(str(directory)), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: float) -> None:
+        """Wait until something in the directory changes, or the timeout."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if ready:
+            # The events themselves don't matter; the follower re-checks the file
+            try:
+                while os.read(self.fd, _READ_SIZE):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _PollWatch:
+    """Fallback for platforms without inotify: wake up periodically."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+    def wait(self, timeout: float) -> None:
+        time.sleep(min(timeout, self.interval))
+
+    def close(self) -> None:
+        pass
+
+
+class ExchangeFollower:
+    """Follow the daily exchange logs, yielding entries as they are appended."""
+
+    def __init__(self, logs_dir: Path, poll_interval: float = 0.05, use_inotify: bool = True):
+        """
+        Args:
+            logs_dir: Directory holding the exchanges_*.jsonl files
+            poll_interval: Seconds between checks when polling
+            use_inotify: Use inotify where available (otherwise always poll)
+        """
+        self.logs_dir = Path(logs_dir)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.path: Optional[Path] = None
+        self.offset = 0
+        self._inode = None
+        self._partial = b""
+        self._watch = None
+
+    def log_file(self, day: date) -> Path:
+        """Log file for a day."""
+        return self.logs_dir / f"exchanges_{day.strftime('%Y-%m-%d')}.jsonl"
+
+    def start(self, at_end: bool = True) -> None:
+        """Start at today's log, from its end or from its beginning.
+
+        Starting at the end means just after the last complete line, so a
+        line that is still being written is read once it is finished.
+        """
+        self.path = self.log_file(datetime.now().date())
+        self._partial = b""
+        self.offset = 0
+        self._inode = None
+        try:
+            with open(self.path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                self._inode = stat.st_ino
+                if at_end:
+                    self.offset = _after_last_newline(f, stat.st_size)
+        except FileNotFoundError:
+            pass
+
+    def read_new(self) -> List[Exchange]:
+        """Entries appended since the last read, moving to a new day's log."""
+        if self.path is None:
+            self.start()
+        exchanges = self._read_available()
+        today = self.log_file(datetime.now().date())
+        if today != self.path:
+            logger.debug(f"Following {today.name}")
+            self.path = today
+            self.offset = 0
+            self._inode = None
+            self._partial = b""
+            exchanges.extend(self._read_available())
+        return exchanges
+
+    def follow(self, stop: Optional[threading.Event] = None) -> Iterator[Exchange]:
+        """Yield entries as they are appended, until ``stop`` is set.
+
+        Call ``start()`` first to choose where to begin; by default
+        following starts at the current end of today's log.
+        """
+        if self.path is None:
+            self.start()
+        try:
+            while stop is None or not stop.is_set():
+                yield from self.read_new()
+                self.wait()
+        finally:
+            self.close()
+
+    def wait(self, timeout: float = _ROLLOVER_CHECK_INTERVAL) -> None:
+        """Block until the logs directory changes, or the timeout."""
+        self._open_watch()
+        self._watch.wait(timeout)
+
+    def close(self) -> None:
+        """Release the directory watch."""
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+
+    def _open_watch(self) -> None:
+        if self._watch is not None:
+            return
+        self.logs_dir.mkdir(parents=True, exist_ok=True)
+        if self.use_inotify and sys.platform.startswith("linux"):
+            try:
+                self._watch = _InotifyWatch(self.logs_dir)
+                return
+            except (OSError, AttributeError) as e:
+                # AttributeError: libc without inotify symbols
+                logger.debug(f"inotify unavailable, polling {self.logs_dir}: {e}")
+        self._watch = _PollWatch(self.poll_interval)
+
+    def _read_available(self) -> List[Exchange]:
+        try:
+            with open(self.path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                if stat.st_ino != self._inode or stat.st_size < self.offset:
+                    if self._inode is not None:
+                        # Replaced or truncated: start again from the top
+                        logger.debug(f"{self.path.name} was replaced, reading from the start")
+                        self.offset = 0
+                        self._partial = b""
+                    self._inode = stat.st_ino
+                if stat.st_size == self.offset:
+                    return []
+                f.seek(self.offset)
+                data = f.read(stat.st_size - self.offset)
+        except FileNotFoundError:
+            return []
+        except OSError as e:
+            logger.error(f"Error reading {self.path}: {e}")
+            return []
+
+        self.offset += len(data)
+        data = self._partial + data
+        end = data.rfind(b"\n") + 1
+        self._partial = data[end:]
+        return self._parse(data[:end])
+
+    def _parse(self, data: bytes) -> List[Exchange]:
+        exchanges = []
+        for raw_line in data.splitlines():
+            line = raw_line.decode("utf-8", errors="replace").strip()
+            if not line:
+                continue
+            try:
+                exchanges.append(Exchange.from_jsonl(line))
+            except json.JSONDecodeError as e:
+                # Torn line: keep any complete entries on it
+                recovered = recover_records(line)
+                if not recovered:
+                    logger.warning(f"Failed to parse line in {self.path}: {e}")
+                for start, end in recovered:
+                    try:
+                        exchanges.append(Exchange.from_jsonl(line[start:end]))
+                    except Exception as e:
+                        logger.error(f"Error processing line in {self.path}: {e}")
+            except Exception as e:
+                logger.error(f"Error processing line in {self.path}: {e}")
+        return exchanges
+
+
+def _after_last_newline(f, size: int) -> int:
+    """Offset just after the last newline in a binary file (0 if none)."""
+    position = size
+    while position > 0:
+        block_start = max(0, position - _READ_SIZE)
+        f.seek(block_start)
+        newline = f.read(position - block_start).rfind(b"\n")
+        if newline >= 0:
+            return block_start + newline + 1
+        position = block_start
+    return 0
@@ -0,0 +1,617 @@
+"""
+SQLite index over exchange JSONL logs.
+
+The index is a sidecar database next to the daily ``exchanges_*.jsonl``
+files. It stores, for every line, the columns commonly filtered on
+(conversation ID, timestamp, type, provider, transport, project) plus the
+byte offset of the line, so matching exchanges can be read straight from
+the JSONL files without parsing everything else.
+
+Ingestion is incremental: the index remembers how far into each file it
+has read and only parses lines appended since. A file that shrank or was
+replaced is re-ingested from the start, and deleted files are dropped.
+
+Exchange text also goes into an FTS5 full-text table (when the SQLite build
+has FTS5), which backs ranked ``voicemode exchanges search``.
+
+A ``conversations`` table keeps per-conversation totals (first and last
+timestamp, exchange count, project) up to date as lines are ingested, so
+conversations can be listed newest first a page at a time without grouping
+every exchange.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from voice_mode.exchanges.models import Exchange, recover_records
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = "exchanges_index.sqlite"
+
+# Bump when the table layout changes; older indexes are rebuilt
+INDEX_SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    inode INTEGER,
+    offset INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS exchanges (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    timestamp REAL NOT NULL,
+    conversation_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    provider TEXT,
+    transport TEXT,
+    project_path TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_exchanges_location ON exchanges(file, offset);
+CREATE INDEX IF NOT EXISTS idx_exchanges_conversation ON exchanges(conversation_id);
+CREATE INDEX IF NOT EXISTS idx_exchanges_timestamp ON exchanges(timestamp);
+CREATE INDEX IF NOT EXISTS idx_exchanges_type ON exchanges(type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_exchanges_provider ON exchanges(provider, timestamp);
+CREATE INDEX IF NOT EXISTS idx_exchanges_project ON exchanges(project_path);
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    first_timestamp REAL NOT NULL,
+    last_timestamp REAL NOT NULL,
+    exchange_count INTEGER NOT NULL,
+    project_path TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_conversations_last ON conversations(last_timestamp, id);
+CREATE INDEX IF NOT EXISTS idx_conversations_project ON conversations(project_path, last_timestamp, id);
+"""
+
+# Totals of one or more conversations recomputed from their exchanges. The
+# project is that of the earliest exchange that has one.
+_CONVERSATION_TOTALS = """
+SELECT conversation_id, MIN(timestamp), MAX(timestamp), COUNT(*), (
+    SELECT p.project_path FROM exchanges p
+    WHERE p.conversation_id = e.conversation_id AND p.project_path IS NOT NULL
+    ORDER BY p.file, p.offset LIMIT 1
+)
+FROM exchanges e
+WHERE conversation_id IN (SELECT id FROM temp.changed_conversations)
+GROUP BY conversation_id
+"""
+
+# rowid matches exchanges.id
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS exchanges_fts
+USING fts5(text, tokenize = 'unicode61 remove_diacritics 2')
+"""
+
+# Rows inserted per executemany batch during ingestion
+_BATCH_SIZE = 1000
+
+
+def _parse_timestamp(value: str) -> float:
+    """Convert an exchange timestamp to epoch seconds."""
+    if value.endswith('Z'):
+        value = value.replace('Z', '+00:00')
+    return datetime.fromisoformat(value).timestamp()
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    return value.lower() if isinstance(value, str) else None
+
+
+def fts_query(text: str) -> Optional[str]:
+    """Translate a search string into an FTS5 MATCH expression.
+
+    Words must all appear (in any order), ``"quoted words"`` must appear as
+    a phrase and a trailing ``*`` makes a word a prefix (``deploy*``). All
+    other FTS5 syntax is treated as literal text, so user input can never
+    produce a query syntax error.
+
+    Returns:
+        The MATCH expression, or None if the text has nothing searchable
+    """
+    terms = []
+    for phrase, word in re.findall(r'"([^"]*)"?|(\S+)', text):
+        if phrase:
+            if re.search(r'\w', phrase):
+                terms.append(f'"{phrase}"')
+            continue
+        prefix = word.endswith('*')
+        word = word.rstrip('*').replace('"', '')
+        if re.search(r'\w', word):
+            terms.append(f'"{word}"' + ('*' if prefix else ''))
+    return " ".join(terms) or None
+
+
+class ExchangeIndex:
+    """Sidecar SQLite index for a directory of exchange logs."""
+
+    def __init__(self, logs_dir: Path, path: Optional[Path] = None, check_same_thread: bool = True):
+        """Open (and create if needed) the index.
+
+        Args:
+            logs_dir: Directory containing the exchanges_*.jsonl files
+            path: Index database path. Defaults to exchanges_index.sqlite in logs_dir
+            check_same_thread: Passed to sqlite3; set False to share the index
+                between threads (callers must then serialize access themselves)
+        """
+        self.logs_dir = Path(logs_dir)
+        self.path = Path(path) if path else self.logs_dir / INDEX_FILENAME
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=10, isolation_level=None, check_same_thread=check_same_thread
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self.has_fts = False
+        self._next_id = 1
+        self._ensure_schema()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> 'ExchangeIndex':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _ensure_schema(self) -> None:
+        self._conn.executescript(_SCHEMA)
+        try:
+            self._conn.execute(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError as e:
+            logger.info(f"SQLite FTS5 unavailable ({e}); exchange search will scan log files")
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is not None and row[0] == str(INDEX_SCHEMA_VERSION):
+            return
+        if row is not None:
+            logger.info(f"Exchange index schema changed ({row[0]} -> {INDEX_SCHEMA_VERSION}), rebuilding")
+        self._begin()
+        try:
+            self._clear()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(INDEX_SCHEMA_VERSION),)
+            )
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _begin(self) -> None:
+        # Take the write lock up front so concurrent updaters queue instead of deadlocking
+        self._conn.execute("BEGIN IMMEDIATE")
+
+    def update(self) -> int:
+        """Ingest lines appended to the log files since the last update.
+
+        Returns:
+            Number of exchanges added to the index
+        """
+        files = {path.name: path for path in self.logs_dir.glob("exchanges_*.jsonl")}
+        added = 0
+
+        self._begin()
+        try:
+            known = {
+                name: (inode, offset)
+                for name, inode, offset in self._conn.execute("SELECT name, inode, offset FROM files")
+            }
+            # Ids are assigned here so the full-text rows can share them
+            self._next_id = self._conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM exchanges").fetchone()[0]
+
+            for name in known.keys() - files.keys():
+                self._forget(name)
+
+            for name in sorted(files):
+                try:
+                    stat = files[name].stat()
+                except FileNotFoundError:
+                    continue
+                inode, offset = known.get(name, (None, 0))
+                if name in known and (inode != stat.st_ino or stat.st_size < offset):
+                    # Rotated, rewritten or truncated: start over
+                    logger.debug(f"Exchange log {name} was replaced, re-indexing")
+                    self._forget(name)
+                    offset = 0
+                if stat.st_size == offset and name in known:
+                    continue
+                added += self._ingest(name, files[name], offset, stat.st_ino)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+        if added:
+            logger.debug(f"Indexed {added} new exchanges")
+        return added
+
+    def rebuild(self) -> int:
+        """Drop everything and re-ingest all log files.
+
+        Returns:
+            Number of exchanges indexed
+        """
+        self._begin()
+        try:
+            self._clear()
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        return self.update()
+
+    def _clear(self) -> None:
+        self._conn.execute("DELETE FROM exchanges")
+        self._conn.execute("DELETE FROM conversations")
+        self._conn.execute("DELETE FROM files")
+        if self.has_fts:
+            self._conn.execute("DELETE FROM exchanges_fts")
+
+    def _forget(self, name: str) -> None:
+        if self.has_fts:
+            self._conn.execute(
+                "DELETE FROM exchanges_fts WHERE rowid IN (SELECT id FROM exchanges WHERE file = ?)",
+                (name,)
+            )
+        self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS changed_conversations (id TEXT PRIMARY KEY)")
+        self._conn.execute("DELETE FROM temp.changed_conversations")
+        self._conn.execute(
+            "INSERT OR IGNORE INTO temp.changed_conversations SELECT conversation_id FROM exchanges WHERE file = ?",
+            (name,)
+        )
+        self._conn.execute("DELETE FROM exchanges WHERE file = ?", (name,))
+        self._conn.execute("DELETE FROM files WHERE name = ?", (name,))
+        # Conversations that spanned other files keep the rest of their exchanges
+        self._conn.execute("DELETE FROM conversations WHERE id IN (SELECT id FROM temp.changed_conversations)")
+        self._conn.execute(
+            "INSERT INTO conversations (id, first_timestamp, last_timestamp, exchange_count, project_path) "
+            + _CONVERSATION_TOTALS
+        )
+
+    def _ingest(self, name: str, path: Path, offset: int, inode: int) -> int:
+        """Index complete lines of one file starting at a byte offset."""
+        rows = []
+        added = 0
+        position = offset
+
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Partially written line; picked up by the next update
+                    break
+                start = position
+                position += len(line)
+                if not line.strip():
+                    continue
+
+                try:
+                    entries = [(start, len(line), json.loads(line))]
+                except ValueError as e:
+                    entries = self._recover(line, start)
+                    if not entries:
+                        logger.warning(f"Skipping unparseable line at byte {start} in {path}: {e}")
+                        continue
+
+                for entry_offset, length, data in entries:
+                    try:
+                        metadata = data.get('metadata') or {}
+                        rows.append((
+                            self._next_id,
+                            name,
+                            entry_offset,
+                            length,
+                            _parse_timestamp(data['timestamp']),
+                            data['conversation_id'],
+                            data['type'],
+                            _lower(metadata.get('provider')),
+                            _lower(metadata.get('transport')),
+                            data.get('project_path'),
+                            data['text'],
+                        ))
+                        self._next_id += 1
+                    except (ValueError, KeyError, TypeError, AttributeError) as e:
+                        logger.warning(f"Skipping unparseable entry at byte {entry_offset} in {path}: {e}")
+
+                if len(rows) >= _BATCH_SIZE:
+                    added += self._insert(rows)
+                    rows = []
+
+        added += self._insert(rows)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (name, inode, offset) VALUES (?, ?, ?)",
+            (name, inode, position)
+        )
+        return added
+
+    @staticmethod
+    def _recover(line: bytes, start: int) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """Complete entries on a torn line, as (offset, length, data)."""
+        text = line.decode('utf-8', errors='replace')
+        entries = []
+        for begin, end in recover_records(text):
+            offset = start + len(text[:begin].encode('utf-8'))
+            segment = text[begin:end]
+            entries.append((offset, len(segment.encode('utf-8')), json.loads(segment)))
+        return entries
+
+    def _insert(self, rows: List[Tuple]) -> int:
+        if rows:
+            self._conn.executemany(
+                "INSERT INTO exchanges (id, file, offset, length, timestamp, conversation_id, type, "
+                "provider, transport, project_path) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [row[:-1] for row in rows]
+            )
+            if self.has_fts:
+                self._conn.executemany(
+                    "INSERT INTO exchanges_fts (rowid, text) VALUES (?, ?)",
+                    [(row[0], row[-1]) for row in rows]
+                )
+            self._add_to_conversations(rows)
+        return len(rows)
+
+    def _add_to_conversations(self, rows: List[Tuple]) -> None:
+        """Fold a batch of newly inserted exchange rows into the conversation totals."""
+        totals: Dict[str, List[Any]] = {}
+        for row in rows:
+            timestamp, conversation_id, project_path = row[4], row[5], row[9]
+            total = totals.get(conversation_id)
+            if total is None:
+                totals[conversation_id] = [conversation_id, timestamp, timestamp, 1, project_path]
+                continue
+            total[1] = min(total[1], timestamp)
+            total[2] = max(total[2], timestamp)
+            total[3] += 1
+            if total[4] is None:
+                total[4] = project_path
+        self._conn.executemany(
+            "INSERT INTO conversations (id, first_timestamp, last_timestamp, exchange_count, project_path) "
+            "VALUES (?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+            "first_timestamp = MIN(first_timestamp, excluded.first_timestamp), "
+            "last_timestamp = MAX(last_timestamp, excluded.last_timestamp), "
+            "exchange_count = exchange_count + excluded.exchange_count, "
+            "project_path = COALESCE(project_path, excluded.project_path)",
+            list(totals.values())
+        )
+
+    @staticmethod
+    def _where(
+        conversation_id: Optional[str] = None,
+        type: Optional[str] = None,
+        provider: Optional[str] = None,
+        transport: Optional[str] = None,
+        project: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Tuple[List[str], List[Any]]:
+        """SQL conditions on the exchanges table for the given criteria."""
+        clauses = []
+        params: List[Any] = []
+        if conversation_id is not None:
+            clauses.append("e.conversation_id = ?")
+            params.append(conversation_id)
+        if type is not None:
+            clauses.append("e.type = ?")
+            params.append(type.lower())
+        if provider is not None:
+            clauses.append("e.provider = ?")
+            params.append(provider.lower())
+        if transport is not None:
+            clauses.append("e.transport = ?")
+            params.append(transport.lower())
+        if project is not None:
+            clauses.append("instr(e.project_path, ?) > 0")
+            params.append(project)
+        if start is not None:
+            clauses.append("e.timestamp >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            clauses.append("e.timestamp <= ?")
+            params.append(end.timestamp())
+        return clauses, params
+
+    def locate(
+        self,
+        conversation_id: Optional[str] = None,
+        type: Optional[str] = None,
+        provider: Optional[str] = None,
+        transport: Optional[str] = None,
+        project: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False
+    ) -> List[Tuple[str, int, int]]:
+        """Find matching exchanges.
+
+        Args:
+            conversation_id: Exact conversation ID
+            type: "stt" or "tts"
+            provider: Provider name (case insensitive)
+            transport: Transport type (case insensitive)
+            project: Substring of the project path
+            start: Earliest timestamp (inclusive)
+            end: Latest timestamp (inclusive)
+            limit: Maximum number of results
+            newest_first: Return the most recent exchanges first
+
+        Returns:
+            (file name, byte offset, length) of each matching line, in log order
+        """
+        clauses, params = self._where(conversation_id, type, provider, transport, project, start, end)
+
+        sql = "SELECT e.file, e.offset, e.length FROM exchanges e"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY e.file DESC, e.offset DESC" if newest_first else " ORDER BY e.file, e.offset"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return self._conn.execute(sql, params).fetchall()
+
+    def search(
+        self,
+        match: str,
+        limit: int = 50,
+        offset: int = 0,
+        order: str = "rank",
+        **criteria: Any
+    ) -> Tuple[int, List[Tuple[str, int, int]]]:
+        """Full-text search over exchange text.
+
+        Args:
+            match: FTS5 MATCH expression (see ``fts_query``)
+            limit: Page size
+            offset: Number of results to skip
+            order: "rank" (best match first), "time" (log order) or "newest"
+            **criteria: Additional ``locate`` criteria (type, provider, start, ...)
+
+        Returns:
+            (total number of matches, locations of the requested page)
+        """
+        if not self.has_fts:
+            raise sqlite3.OperationalError("FTS5 is not available in this SQLite build")
+
+        clauses, params = self._where(**criteria)
+        where = " AND ".join(["exchanges_fts MATCH ?"] + clauses)
+        params = [match] + params
+        # CROSS JOIN keeps the full-text match as the outer loop; letting the
+        # planner start from a metadata index re-runs the match for every row
+        join = "FROM exchanges_fts CROSS JOIN exchanges e ON e.id = exchanges_fts.rowid"
+
+        total = self._conn.execute(f"SELECT COUNT(*) {join} WHERE {where}", params).fetchone()[0]
+        if order == "time":
+            order_by = "e.file, e.offset"
+        elif order == "newest":
+            order_by = "e.file DESC, e.offset DESC"
+        else:
+            order_by = "exchanges_fts.rank, e.file DESC, e.offset DESC"
+        page = self._conn.execute(
+            f"SELECT e.file, e.offset, e.length {join} WHERE {where} ORDER BY {order_by} LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        ).fetchall()
+        return total, page
+
+    def exchanges(self, **criteria: Any) -> List[Exchange]:
+        """Read the exchanges matching ``locate`` criteria from the log files."""
+        return list(self.load(self.locate(**criteria)))
+
+    def load(self, locations: List[Tuple[str, int, int]]) -> Iterator[Exchange]:
+        """Read exchanges at the given locations, in the order given."""
+        handles: Dict[str, Any] = {}
+        try:
+            for name, offset, length in locations:
+                f = handles.get(name)
+                if f is None:
+                    try:
+                        f = handles[name] = open(self.logs_dir / name, 'rb')
+                    except OSError as e:
+                        logger.warning(f"Indexed exchange log {name} is unreadable: {e}")
+                        continue
+                f.seek(offset)
+                line = f.read(length)
+                try:
+                    yield Exchange.from_jsonl(line.decode('utf-8'))
+                except Exception as e:
+                    logger.warning(f"Indexed line at byte {offset} in {name} no longer parses: {e}")
+        finally:
+            for f in handles.values():
+                f.close()
+
+    def conversations(
+        self,
+        limit: int = 50,
+        before: Optional[Tuple[float, str]] = None,
+        project: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Tuple[str, float, float, int, Optional[str]]]:
+        """List conversations, most recently active first.
+
+        Pages are keyed on (last timestamp, conversation ID) rather than an
+        offset, so each page costs the same however far back it is.
+
+        Args:
+            limit: Maximum number of conversations
+            before: (last timestamp, conversation ID) of the last conversation
+                on the previous page; only conversations after it are listed
+            project: Exact project path, or "" for conversations without one
+            start: Only conversations active at or after this time
+            end: Only conversations that started before this time
+
+        Returns:
+            (id, first timestamp, last timestamp, exchange count, project path)
+            of each conversation
+        """
+        clauses = []
+        params: List[Any] = []
+        if project is not None:
+            clauses.append("project_path IS ?")
+            params.append(project or None)
+        if start is not None:
+            clauses.append("last_timestamp >= ?")
+            params.append(start.timestamp())
+        if end is not None:
+            clauses.append("first_timestamp < ?")
+            params.append(end.timestamp())
+        if before is not None:
+            clauses.append("(last_timestamp, id) < (?, ?)")
+            params.extend(before)
+
+        sql = "SELECT id, first_timestamp, last_timestamp, exchange_count, project_path FROM conversations"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY last_timestamp DESC, id DESC LIMIT ?"
+        params.append(limit)
+        return self._conn.execute(sql, params).fetchall()
+
+    def conversation(self, conversation_id: str) -> Optional[Tuple[str, float, float, int, Optional[str]]]:
+        """Totals of one conversation, in the form ``conversations`` returns."""
+        return self._conn.execute(
+            "SELECT id, first_timestamp, last_timestamp, exchange_count, project_path "
+            "FROM conversations WHERE id = ?",
+            (conversation_id,)
+        ).fetchone()
+
+    def projects(self) -> List[Tuple[Optional[str], int, float]]:
+        """(project path, conversation count, last timestamp) per project, most recent first."""
+        return self._conn.execute(
+            "SELECT project_path, COUNT(*), MAX(last_timestamp) FROM conversations "
+            "GROUP BY project_path ORDER BY MAX(last_timestamp) DESC"
+        ).fetchall()
+
+    def fingerprint(self) -> str:
+        """A value that changes whenever the indexed content changes."""
+        digest = hashlib.sha1(str(INDEX_SCHEMA_VERSION).encode())
+        for name, inode, offset in self._conn.execute("SELECT name, inode, offset FROM files ORDER BY name"):
+            digest.update(f"{name}:{inode}:{offset};".encode())
+        return digest.hexdigest()
+
+    def stats(self) -> Dict[str, Any]:
+        """Summary of what the index holds."""
+        files, exchanges, conversations = self._conn.execute(
+            "SELECT (SELECT COUNT(*) FROM files), COUNT(*), COUNT(DISTINCT conversation_id) FROM exchanges"
+        ).fetchone()
+        return {
+            'path': str(self.path),
+            'files': files,
+            'exchanges': exchanges,
+            'conversations': conversations,
+            'size_bytes': self.path.stat().st_size if self.path.exists() else 0,
+        }
@@ -3,12 +3,45 @@ Exchange data models for voice mode conversation logs.
 """
 
 import json
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
-from typing import Optional, Literal, Dict, Any, List
+from typing import Optional, Literal, Dict, Any, List, Tuple, Union
 
+from voice_mode.timings import legacy_timings_ms
 
-@dataclass
+
+_intern = sys.intern
+
+# Every logged entry starts with its schema version
+_RECORD_START = '{"version"'
+
+
+def recover_records(line: str) -> List[Tuple[int, int]]:
+    """Find complete entries in a log line that does not parse as a whole.
+    
+    A writer that dies part way through a line leaves a torn entry, and the
+    next entry appended (possibly by another process) ends up on the same
+    line. Entries are located by where they start.
+    
+    Returns:
+        (start, end) character ranges of the entries that parse
+    """
+    decoder = json.JSONDecoder()
+    found = []
+    position = line.find(_RECORD_START)
+    while position != -1:
+        try:
+            _, end = decoder.raw_decode(line, position)
+        except ValueError:
+            position = line.find(_RECORD_START, position + 1)
+            continue
+        found.append((position, end))
+        position = line.find(_RECORD_START, end)
+    return found
+
+
+@dataclass(slots=True)
 class ExchangeMetadata:
     """Metadata for an exchange."""
     voice_mode_version: str
@@ -17,14 +50,14 @@ class ExchangeMetadata:
     provider: Optional[str] = None
     provider_url: Optional[str] = None  # Full URL of the provider endpoint
     provider_type: Optional[str] = None  # e.g., "openai", "local", "kokoro"
-    timing: Optional[str] = None
+    timing: Optional[str] = None  # Human-readable; use Exchange.timings for numbers
     transport: Optional[str] = None
     audio_format: Optional[str] = None
     silence_detection: Optional[Dict[str, Any]] = None
     language: Optional[str] = None
     emotion: Optional[str] = None
     error: Optional[str] = None
-    # Detailed timing metrics
+    # Timing metrics in seconds (v1-v3; v4 logs use Exchange.timings)
     time_to_first_audio: Optional[float] = None  # TTFA in seconds
     generation_time: Optional[float] = None  # Total generation time
     playback_time: Optional[float] = None  # Playback duration
@@ -34,54 +67,162 @@ class ExchangeMetadata:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ExchangeMetadata':
         """Create from dictionary."""
-        return cls(**{k: v for k, v in data.items() if k in cls.__annotations__})
+        # Providers, models, voices etc. repeat across exchanges; keep one copy of each
+        return cls(**{
+            k: _intern(v) if v.__class__ is str and len(v) < 64 else v
+            for k, v in data.items() if k in _METADATA_FIELDS
+        })
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary, excluding None values."""
-        return {k: v for k, v in self.__dict__.items() if v is not None}
+        return {
+            name: value for name in _METADATA_FIELDS
+            if (value := getattr(self, name)) is not None
+        }
+
+
+_METADATA_FIELDS = tuple(f.name for f in fields(ExchangeMetadata))
+
+# Exchange.timings not worked out yet
+_UNDECODED = object()
+
+
+def _parse_timestamp(value: str) -> datetime:
+    # Handle both formats: with Z suffix and with timezone offset
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
 
 
-@dataclass
 class Exchange:
-    """Single exchange (STT or TTS) entry."""
-    version: int
-    timestamp: datetime
-    conversation_id: str
-    type: Literal["stt", "tts"]
-    text: str
-    project_path: Optional[str] = None
-    audio_file: Optional[str] = None
-    duration_ms: Optional[int] = None
-    metadata: Optional[ExchangeMetadata] = None
+    """Single exchange (STT or TTS) entry.
+    
+    Exchanges parsed from a log keep their timestamp string and metadata
+    dict as logged, and only build the ``datetime`` and ``ExchangeMetadata``
+    when those attributes are first read. Filters that only look at the
+    type, text, conversation or a single metadata value (through
+    ``metadata_value``) never pay for decoding them.
+    """
+    
+    __slots__ = (
+        'version', 'conversation_id', 'type', 'text', 'project_path',
+        'audio_file', 'duration_ms', 'pid', 'seq',
+        '_timestamp', '_metadata', '_timings',
+    )
+    
+    def __init__(self, version: int, timestamp: Union[datetime, str], conversation_id: str,
+                 type: Literal["stt", "tts"], text: str,
+                 project_path: Optional[str] = None,
+                 audio_file: Optional[str] = None,
+                 duration_ms: Optional[int] = None,
+                 metadata: Union[ExchangeMetadata, Dict[str, Any], None] = None,
+                 timings: Optional[Dict[str, float]] = None,
+                 pid: Optional[int] = None,
+                 seq: Optional[int] = None):
+        """
+        Args:
+            timestamp: datetime, or an ISO 8601 string decoded on first access
+            metadata: ExchangeMetadata, or a logged metadata dict decoded on
+                first access
+            timings: Pipeline stage -> milliseconds; recovered from the
+                metadata for v1-v3 entries when not given
+            pid: Writing process (v4)
+            seq: Per-process sequence number (v4)
+        """
+        self.version = version
+        self.conversation_id = conversation_id
+        self.type = type
+        self.text = text
+        self.project_path = project_path
+        self.audio_file = audio_file
+        self.duration_ms = duration_ms
+        self.pid = pid
+        self.seq = seq
+        self._timestamp = timestamp
+        self._metadata = metadata or None
+        self._timings = timings if timings is not None else _UNDECODED
+    
+    @property
+    def timestamp(self) -> datetime:
+        timestamp = self._timestamp
+        if isinstance(timestamp, str):
+            timestamp = self._timestamp = _parse_timestamp(timestamp)
+        return timestamp
+    
+    @timestamp.setter
+    def timestamp(self, value: datetime) -> None:
+        self._timestamp = value
+    
+    @property
+    def metadata(self) -> Optional[ExchangeMetadata]:
+        metadata = self._metadata
+        if isinstance(metadata, dict):
+            metadata = self._metadata = ExchangeMetadata.from_dict(metadata)
+        return metadata
+    
+    @metadata.setter
+    def metadata(self, value: Optional[ExchangeMetadata]) -> None:
+        self._metadata = value
+    
+    @property
+    def timings(self) -> Optional[Dict[str, float]]:
+        timings = self._timings
+        if timings is _UNDECODED:
+            # v4 logs stage timings as numbers; recover them for v1-v3 entries
+            metadata = self._metadata
+            if isinstance(metadata, ExchangeMetadata):
+                metadata = metadata.to_dict()
+            timings = self._timings = legacy_timings_ms(metadata) if metadata else None
+        return timings
+    
+    @timings.setter
+    def timings(self, value: Optional[Dict[str, float]]) -> None:
+        self._timings = value
+    
+    @property
+    def has_metadata(self) -> bool:
+        """Whether the entry has metadata (without decoding it)."""
+        return self._metadata is not None
+    
+    def metadata_value(self, key: str) -> Any:
+        """One metadata value, without decoding the rest of the metadata."""
+        metadata = self._metadata
+        if metadata is None:
+            return None
+        if isinstance(metadata, dict):
+            return metadata.get(key)
+        return getattr(metadata, key, None)
     
     @classmethod
     def from_jsonl(cls, line: str) -> 'Exchange':
-        """Parse from JSONL line."""
-        data = json.loads(line)
+        """Parse from JSONL line.
         
-        # Parse timestamp
-        timestamp_str = data['timestamp']
-        # Handle both formats: with Z suffix and with timezone offset
-        if timestamp_str.endswith('Z'):
-            timestamp = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-        else:
-            timestamp = datetime.fromisoformat(timestamp_str)
+        The timestamp and metadata are decoded when first accessed.
+        """
+        data = json.loads(line)
         
-        # Parse metadata
-        metadata = None
-        if 'metadata' in data and data['metadata']:
-            metadata = ExchangeMetadata.from_dict(data['metadata'])
+        metadata = data.get('metadata')
+        if metadata and (not isinstance(metadata, dict) or 'voice_mode_version' not in metadata):
+            raise ValueError("metadata without voice_mode_version")
+        timestamp = data['timestamp']
+        if not isinstance(timestamp, str):
+            raise ValueError(f"invalid timestamp {timestamp!r}")
         
+        project_path = data.get('project_path')
         return cls(
             version=data.get('version', 1),  # Default to v1 for backward compatibility
             timestamp=timestamp,
-            conversation_id=data['conversation_id'],
-            type=data['type'],
+            # Shared by many exchanges; keep one copy of each
+            conversation_id=_intern(data['conversation_id']),
+            type=_intern(data['type']),
             text=data['text'],
-            project_path=data.get('project_path'),
+            project_path=_intern(project_path) if project_path.__class__ is str else project_path,
             audio_file=data.get('audio_file'),
             duration_ms=data.get('duration_ms'),
-            metadata=metadata
+            metadata=metadata,
+            timings=data.get('timings'),
+            pid=data.get('pid'),
+            seq=data.get('seq')
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -103,6 +244,11 @@ class Exchange:
             result['duration_ms'] = self.duration_ms
         if self.metadata:
             result['metadata'] = self.metadata.to_dict()
+        if self.timings:
+            result['timings'] = self.timings
+        if self.pid is not None:
+            result['pid'] = self.pid
+            result['seq'] = self.seq
         
         return result
     
@@ -110,6 +256,22 @@ class Exchange:
         """Convert to JSONL string."""
         return json.dumps(self.to_dict())
     
+    def _fields(self) -> Tuple:
+        return (self.version, self.timestamp, self.conversation_id, self.type, self.text,
+                self.project_path, self.audio_file, self.duration_ms, self.metadata,
+                self.timings, self.pid, self.seq)
+    
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return (f"Exchange(version={self.version!r}, timestamp={self.timestamp!r}, "
+                f"conversation_id={self.conversation_id!r}, type={self.type!r}, text={self.text!r})")
+    
     @property
     def is_stt(self) -> bool:
         """Check if this is an STT entry."""
@@ -142,7 +304,7 @@ class Exchange:
         return " | ".join(parts) if parts else "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class Conversation:
     """A complete conversation with multiple exchanges."""
     id: str
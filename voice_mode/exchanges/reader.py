@@ -6,32 +6,93 @@ import json
 import logging
 import os
 from datetime import datetime, date, timedelta
+from itertools import islice
 from pathlib import Path
-from typing import Iterator, List, Optional, Union, Dict
-import subprocess
+from typing import Iterator, List, Optional, Union, Dict, Tuple, TYPE_CHECKING
 
-from voice_mode.exchanges.models import Exchange
+from voice_mode.exchanges.models import Exchange, recover_records
+from voice_mode.exchanges.filters import ExchangeFilter
 from voice_mode.config import BASE_DIR
 
+if TYPE_CHECKING:
+    from voice_mode.exchanges.index import ExchangeIndex
+    from voice_mode.exchanges.stats import ExchangeStats
+
 
 logger = logging.getLogger(__name__)
 
+# Bytes read per seek when reading a log backwards
+REVERSE_BLOCK_SIZE = 64 * 1024
+
 
 class ExchangeReader:
     """Read and parse exchange JSONL files."""
     
-    def __init__(self, base_dir: Optional[Path] = None):
+    def __init__(self, base_dir: Optional[Path] = None, use_index: bool = True):
         """Initialize reader with base directory.
         
         Args:
             base_dir: Base directory for logs. Defaults to ~/.voicemode
+            use_index: Use the SQLite index when one has been built
+                (``voicemode exchanges index``); otherwise always scan the files
         """
         self.base_dir = Path(base_dir) if base_dir else Path(BASE_DIR)
         self.logs_dir = self.base_dir / "logs" / "conversations"
+        self.use_index = use_index
+        self._index: Optional['ExchangeIndex'] = None
+        self._index_failed = False
         
         # Ensure logs directory exists
         self.logs_dir.mkdir(parents=True, exist_ok=True)
     
+    @property
+    def index_path(self) -> Path:
+        """Location of the sidecar SQLite index."""
+        from voice_mode.exchanges.index import INDEX_FILENAME
+        return self.logs_dir / INDEX_FILENAME
+    
+    def open_index(self) -> 'ExchangeIndex':
+        """Open the index, creating it if it does not exist yet."""
+        from voice_mode.exchanges.index import ExchangeIndex
+        if self._index is None:
+            self._index = ExchangeIndex(self.logs_dir)
+        return self._index
+    
+    def _updated_index(self) -> Optional['ExchangeIndex']:
+        """The index brought up to date, or None if there is no usable index."""
+        if not self.use_index or self._index_failed:
+            return None
+        if self._index is None and not self.index_path.exists():
+            return None
+        
+        try:
+            index = self.open_index()
+            index.update()
+            return index
+        except Exception as e:
+            # A locked, corrupt or unsupported index must never break reading logs
+            logger.warning(f"Exchange index unavailable, scanning log files: {e}")
+            self._index_failed = True
+            return None
+    
+    def _indexed(self, **criteria) -> Optional[Iterator[Exchange]]:
+        """Query the index.
+        
+        Returns:
+            Matching exchanges (read lazily from the log files), or None when
+            there is no usable index and the caller should scan the log files
+            instead
+        """
+        index = self._updated_index()
+        if index is None:
+            return None
+        try:
+            return index.load(index.locate(**criteria))
+        except Exception as e:
+            logger.warning(f"Exchange index query failed, scanning log files: {e}")
+            self._index_failed = True
+            return None
+
     def _get_log_file_path(self, date: Union[date, datetime]) -> Path:
         """Get the log file path for a given date."""
         if isinstance(date, datetime):
@@ -67,6 +128,11 @@ class ExchangeReader:
         Yields:
             Exchange objects within the date range
         """
+        indexed = self._indexed(start=start, end=end)
+        if indexed is not None:
+            yield from indexed
+            return
+        
         current_date = start.date()
         end_date = end.date()
         
@@ -81,8 +147,8 @@ class ExchangeReader:
     def read_conversation(self, conversation_id: str) -> List[Exchange]:
         """Read all exchanges for a conversation.
         
-        This searches through all log files to find exchanges with the
-        matching conversation ID.
+        Uses the index when available; otherwise searches through all log
+        files to find exchanges with the matching conversation ID.
         
         Args:
             conversation_id: Conversation ID to search for
@@ -90,6 +156,10 @@ class ExchangeReader:
         Returns:
             List of exchanges for that conversation
         """
+        indexed = self._indexed(conversation_id=conversation_id)
+        if indexed is not None:
+            return list(indexed)
+        
         exchanges = []
         
         # Search all log files
@@ -103,6 +173,10 @@ class ExchangeReader:
     def tail(self, follow: bool = True, lines: int = 0) -> Iterator[Exchange]:
         """Tail exchanges in real-time.
         
+        Following happens in-process (see ``ExchangeFollower``): new entries
+        are picked up as they are written and the tail moves on to the next
+        day's log at midnight.
+        
         Args:
             follow: Whether to follow the file for new entries
             lines: Number of recent lines to show first (0 for all)
@@ -113,37 +187,21 @@ class ExchangeReader:
         today_file = self._get_log_file_path(datetime.now())
         
         if follow:
-            # Use tail -f for real-time following
-            cmd = ["tail", "-n", str(lines) if lines > 0 else "+1", "-f", str(today_file)]
+            from voice_mode.exchanges.follow import ExchangeFollower
             
-            try:
-                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-                
-                for line in process.stdout:
-                    line = line.strip()
-                    if line:
-                        try:
-                            yield Exchange.from_jsonl(line)
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Failed to parse line: {e}")
-                        except Exception as e:
-                            logger.error(f"Error processing line: {e}")
-            
-            except KeyboardInterrupt:
-                process.terminate()
-                process.wait()
-            except Exception as e:
-                logger.error(f"Error tailing file: {e}")
+            follower = ExchangeFollower(self.logs_dir)
+            follower.start(at_end=lines > 0)
+            if lines > 0:
+                # Show the last N entries, then follow from where they end
+                recent = list(islice(self._read_file_reverse(today_file, end=follower.offset), lines))
+                yield from reversed(recent)
+            yield from follower.follow()
+        elif lines > 0:
+            # Only parse the last N entries
+            recent = list(islice(self._read_file_reverse(today_file), lines))
+            yield from reversed(recent)
         else:
-            # Just read the file once
-            if today_file.exists():
-                exchanges = list(self._read_file(today_file))
-                
-                # Return last N lines if specified
-                if lines > 0 and len(exchanges) > lines:
-                    exchanges = exchanges[-lines:]
-                
-                yield from exchanges
+            yield from self._read_file(today_file)
     
     def read_recent(self, days: int = 7) -> Iterator[Exchange]:
         """Read exchanges from recent days.
@@ -160,6 +218,130 @@ class ExchangeReader:
         
         yield from self.read_range(start_date, end_date)
     
+    def query(self, exchange_filter: Optional['ExchangeFilter'] = None,
+              days: Optional[int] = None) -> Iterator[Exchange]:
+        """Read exchanges matching a filter.
+        
+        With an index, the filter's conversation, type, provider, transport,
+        project and time criteria are answered by the index so only candidate
+        lines are parsed. The full filter is still applied to the results.
+        
+        Args:
+            exchange_filter: Filter to apply (None for all exchanges)
+            days: Number of days to look back (None for all)
+            
+        Yields:
+            Matching exchanges in log order
+        """
+        criteria = dict(exchange_filter.criteria) if exchange_filter else {}
+        if days is not None:
+            from datetime import timezone
+            end = datetime.now(timezone.utc)
+            criteria['start'] = end - timedelta(days=days)
+            criteria['end'] = end
+        
+        exchanges = self._indexed(**criteria)
+        if exchanges is None:
+            exchanges = self.read_recent(days) if days is not None else self._read_all()
+        
+        if exchange_filter is not None:
+            exchanges = exchange_filter.apply(exchanges)
+        yield from exchanges
+    
+    def search(self, text: str, exchange_type: Optional[str] = None,
+               provider: Optional[str] = None, days: Optional[int] = None,
+               limit: int = 50, offset: int = 0, regex: bool = False,
+               ignore_case: bool = True, order: str = "rank") -> Tuple[int, List[Exchange]]:
+        """Search exchange text.
+        
+        With the full-text index, all words must appear, ``"quoted words"``
+        match as a phrase and ``word*`` matches as a prefix; results are
+        ranked by relevance. Regular expressions, case-sensitive searches
+        and searches without an index scan the log files for the text as a
+        substring, in log order.
+        
+        Args:
+            text: Search text or regex pattern
+            exchange_type: "stt" or "tts" (None for both)
+            provider: Provider name
+            days: Number of days to look back (None for all)
+            limit: Page size
+            offset: Number of results to skip
+            regex: Treat text as a regular expression
+            ignore_case: Case insensitive matching
+            order: "rank", "time" (oldest first) or "newest"
+            
+        Returns:
+            (total number of matches, exchanges on the requested page)
+        """
+        from datetime import timezone
+        from voice_mode.exchanges.index import fts_query
+        
+        criteria = {}
+        if exchange_type:
+            criteria['type'] = exchange_type
+        if provider:
+            criteria['provider'] = provider
+        if days is not None:
+            criteria['end'] = datetime.now(timezone.utc)
+            criteria['start'] = criteria['end'] - timedelta(days=days)
+        
+        match = fts_query(text) if not regex and ignore_case else None
+        index = self._updated_index() if match else None
+        if index is not None and index.has_fts:
+            try:
+                total, locations = index.search(match, limit=limit, offset=offset, order=order, **criteria)
+                return total, list(index.load(locations))
+            except Exception as e:
+                logger.warning(f"Full-text search failed, scanning log files: {e}")
+        
+        exchange_filter = ExchangeFilter().by_text(text, regex=regex, ignore_case=ignore_case)
+        if exchange_type:
+            exchange_filter.by_type(exchange_type)
+        if provider:
+            exchange_filter.by_provider(provider)
+        
+        # Stream the matches, keeping only as many as the requested page needs
+        total = 0
+        if order == "newest":
+            from collections import deque
+            tail = deque(maxlen=offset + limit)
+            for exchange in self.query(exchange_filter, days=days):
+                total += 1
+                tail.append(exchange)
+            return total, list(reversed(tail))[offset:offset + limit]
+        
+        page = []
+        for exchange in self.query(exchange_filter, days=days):
+            if offset <= total < offset + limit:
+                page.append(exchange)
+            total += 1
+        return total, page
+    
+    def daily_stats(self, days: Optional[int] = None) -> 'ExchangeStats':
+        """Statistics for today and the previous N days, by whole days.
+        
+        Past days come from cached per-day rollups (rebuilt if their log
+        changed); only today's log is parsed.
+        
+        Args:
+            days: Number of days to look back (None for all history)
+            
+        Returns:
+            Merged ExchangeStats for the period
+        """
+        from voice_mode.exchanges.rollups import DailyRollups
+        
+        rollups = DailyRollups(self)
+        if days is not None:
+            return rollups.recent(days)
+        
+        log_files = sorted(self.logs_dir.glob("exchanges_*.jsonl"))
+        if not log_files:
+            return rollups.recent(0)
+        first = datetime.strptime(log_files[0].stem[len("exchanges_"):], "%Y-%m-%d").date()
+        return rollups.range(first, max(first, datetime.now().date()))
+    
     def get_all_conversations(self, days: Optional[int] = None) -> Dict[str, List[Exchange]]:
         """Get all conversations grouped by ID.
         
@@ -197,21 +379,76 @@ class ExchangeReader:
         
         try:
             with open(file_path, 'r') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
+                for line_num, raw_line in enumerate(f, 1):
+                    line = raw_line.strip()
                     if not line:
                         continue
                     
-                    try:
-                        yield Exchange.from_jsonl(line)
-                    except json.JSONDecodeError as e:
-                        logger.warning(f"Failed to parse line {line_num} in {file_path}: {e}")
-                    except Exception as e:
-                        logger.error(f"Error processing line {line_num} in {file_path}: {e}")
+                    yield from self._parse_line(line, f"line {line_num} in {file_path}",
+                                                last=not raw_line.endswith('\n'))
+        
+        except Exception as e:
+            logger.error(f"Error reading file {file_path}: {e}")
+    
+    def _read_file_reverse(self, file_path: Path, end: Optional[int] = None) -> Iterator[Exchange]:
+        """Read exchanges from a single file, newest first.
+        
+        Seeks backwards from the end of the file a block at a time, so
+        only the lines actually consumed are read and parsed.
         
+        Args:
+            file_path: Path to the JSONL file
+            end: Byte offset to read back from (default: end of file)
+            
+        Yields:
+            Exchange objects from the file, last entry first
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                if end is None:
+                    end = os.fstat(f.fileno()).st_size
+                last = True
+                for raw_line in _reverse_lines(f, end):
+                    # The first piece is the text after the final newline, if any
+                    line = raw_line.decode('utf-8', errors='replace').strip()
+                    if line:
+                        yield from reversed(self._parse_line(line, f"line in {file_path}", last=last))
+                    last = False
+        except FileNotFoundError:
+            return
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {e}")
     
+    def _parse_line(self, line: str, where: str, last: bool = False) -> List[Exchange]:
+        """Parse a log line, recovering entries from torn lines.
+        
+        Args:
+            line: Stripped line text
+            where: Location for log messages
+            last: The line has no newline yet (it may still be being written)
+        """
+        try:
+            return [Exchange.from_jsonl(line)]
+        except json.JSONDecodeError as e:
+            if last:
+                # Another process is still writing this line
+                logger.debug(f"Skipping partial last line in {where}")
+                return []
+            # Torn line: keep any complete entries on it
+            recovered = recover_records(line)
+            if not recovered:
+                logger.warning(f"Failed to parse {where}: {e}")
+            exchanges = []
+            for start, end in recovered:
+                try:
+                    exchanges.append(Exchange.from_jsonl(line[start:end]))
+                except Exception as e:
+                    logger.error(f"Error processing {where}: {e}")
+            return exchanges
+        except Exception as e:
+            logger.error(f"Error processing {where}: {e}")
+            return []
+    
     def _read_all(self) -> Iterator[Exchange]:
         """Read all exchanges from all log files.
         
@@ -233,21 +470,17 @@ class ExchangeReader:
         Returns:
             List of the most recent exchanges
         """
-        # Read from today and work backwards if needed
+        indexed = self._indexed(limit=count, newest_first=True)
+        if indexed is not None:
+            return list(indexed)[::-1]
+        
+        # Read today's log backwards, then earlier days, until we have enough
         exchanges = []
         current_date = datetime.now().date()
         
         while len(exchanges) < count:
-            # Try to read from current date
-            daily_exchanges = list(self.read_date(current_date))
-            
-            if daily_exchanges:
-                # Add to beginning since we're going backwards
-                exchanges = daily_exchanges + exchanges
-                
-                # Trim to requested count
-                if len(exchanges) > count:
-                    exchanges = exchanges[-count:]
+            log_file = self._get_log_file_path(current_date)
+            exchanges.extend(islice(self._read_file_reverse(log_file), count - len(exchanges)))
             
             # Go to previous day
             current_date -= timedelta(days=1)
@@ -256,4 +489,24 @@ class ExchangeReader:
             if (datetime.now().date() - current_date).days > 30:
                 break
         
-        return exchanges
\ No newline at end of file
+        return exchanges[::-1]
+
+
+def _reverse_lines(f, end: int, block_size: int = REVERSE_BLOCK_SIZE) -> Iterator[bytes]:
+    """Lines of a binary file before ``end``, last line first.
+    
+    The first piece yielded is whatever follows the final newline: empty,
+    or a line that has not been finished.
+    """
+    position = end
+    pending = b''
+    while position > 0:
+        size = min(block_size, position)
+        position -= size
+        f.seek(position)
+        lines = (f.read(size) + pending).split(b'\n')
+        pending = lines[0]
+        for line in reversed(lines[1:]):
+            yield line
+    if pending:
+        yield pending
@@ -0,0 +1,122 @@
+"""
+Cached per-day statistics rollups.
+
+Past days' exchange logs never change, so their statistics are computed
+once and saved next to the log as ``exchanges_YYYY-MM-DD.rollup.json``.
+A rollup holds the complete mergeable ``ExchangeStats`` state (timing
+accumulators, provider/voice/transport/model counts, errors, silence
+detection and per-conversation summaries) together with the size and
+mtime of the log it was built from; if the log changes, the rollup is
+rebuilt.
+
+Statistics over a range of days merge the rollups, so a year-long report
+reads 365 small JSON files. Today's log is still being written and is
+always parsed live.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from voice_mode.exchanges.stats import ExchangeStats
+from voice_mode.metrics import CACHE_HITS, CACHE_MISSES
+
+if TYPE_CHECKING:
+    from voice_mode.exchanges.reader import ExchangeReader
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the saved ExchangeStats state changes; older rollups are rebuilt
+ROLLUP_VERSION = 2
+
+
+def rollup_path(log_file: Path) -> Path:
+    """Rollup file for a daily exchanges_*.jsonl log."""
+    return log_file.with_name(log_file.stem + ".rollup.json")
+
+
+class DailyRollups:
+    """Per-day statistics for the logs read by an ExchangeReader."""
+
+    def __init__(self, reader: 'ExchangeReader'):
+        self.reader = reader
+        self.hits = 0
+        self.misses = 0
+
+    def day(self, day: date) -> ExchangeStats:
+        """Statistics for one day's log (empty if there is none)."""
+        log_file = self.reader._get_log_file_path(day)
+        try:
+            stat = log_file.stat()
+        except FileNotFoundError:
+            return ExchangeStats()
+
+        if day >= datetime.now().date():
+            # Still being appended to
+            return ExchangeStats(self.reader.read_date(day))
+
+        source = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+        cache_file = rollup_path(log_file)
+        stats = self._load(cache_file, source)
+        if stats is not None:
+            self.hits += 1
+            CACHE_HITS.inc(cache="rollups")
+            return stats
+
+        self.misses += 1
+        CACHE_MISSES.inc(cache="rollups")
+        stats = ExchangeStats(self.reader.read_date(day))
+        self._save(cache_file, source, stats)
+        return stats
+
+    def range(self, start: date, end: date) -> ExchangeStats:
+        """Statistics for whole days from start to end (inclusive)."""
+        stats = ExchangeStats()
+        current = start
+        while current <= end:
+            stats.merge(self.day(current))
+            current += timedelta(days=1)
+        return stats
+
+    def recent(self, days: int) -> ExchangeStats:
+        """Statistics for today and the previous ``days`` days."""
+        today = datetime.now().date()
+        return self.range(today - timedelta(days=days), today)
+
+    def _load(self, cache_file: Path, source: Dict[str, int]) -> Optional[ExchangeStats]:
+        try:
+            with open(cache_file) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable rollup {cache_file}: {e}")
+            return None
+
+        if data.get('version') != ROLLUP_VERSION or data.get('source') != source:
+            return None
+        try:
+            return ExchangeStats.from_state(data['stats'])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Ignoring invalid rollup {cache_file}: {e}")
+            return None
+
+    def _save(self, cache_file: Path, source: Dict[str, int], stats: ExchangeStats) -> None:
+        data: Dict[str, Any] = {'version': ROLLUP_VERSION, 'source': source, 'stats': stats.to_state()}
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, prefix=".rollup-", suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, cache_file)
+        except OSError as e:
+            # Caching is an optimization; read-only log directories still work
+            logger.debug(f"Could not save rollup {cache_file}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except (OSError, UnboundLocalError):
+                pass
@@ -2,424 +2,522 @@
 Statistics calculation for exchanges.
 """
 
-from collections import defaultdict, Counter
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-import re
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Any, Optional, Tuple
 
+from voice_mode.accumulators import RunningStats
 from voice_mode.exchanges.models import Exchange
 
 
+# Pipeline stage -> report name, per exchange type
+_TIMING_METRICS = {
+    'stt': {'record': 'record', 'stt': 'processing'},
+    'tts': {'ttfa': 'ttfa', 'tts_gen': 'generation', 'tts_play': 'playback'},
+}
+
+
+def _categorize_error(error: str) -> str:
+    error_msg = error.lower()
+    if 'timeout' in error_msg:
+        return 'timeout'
+    if 'auth' in error_msg or 'unauthorized' in error_msg:
+        return 'authentication'
+    if 'rate' in error_msg:
+        return 'rate_limit'
+    if 'network' in error_msg or 'connection' in error_msg:
+        return 'network'
+    return 'other'
+
+
 class ExchangeStats:
-    """Calculate statistics from exchanges."""
-    
-    def __init__(self, exchanges: List[Exchange]):
-        """Initialize with list of exchanges.
-        
+    """Calculate statistics from exchanges.
+
+    Exchanges are consumed one at a time and only running totals are kept,
+    so statistics over any number of exchanges use constant memory (plus
+    one small record per conversation). Statistics built separately, e.g.
+    per log file, can be combined with ``merge``.
+    """
+
+    def __init__(self, exchanges: Iterable[Exchange] = ()):
+        """Initialize and consume exchanges.
+
         Args:
-            exchanges: List of exchanges to analyze
+            exchanges: Exchanges to analyze, in chronological order. Any
+                iterable works; it is only iterated once.
+        """
+        self.total = 0
+        self.stt_count = 0
+        self.tts_count = 0
+        self.first_timestamp: Optional[datetime] = None
+        self.last_timestamp: Optional[datetime] = None
+
+        self.providers = Counter()
+        self.transports = Counter()
+        self.voices = Counter()
+        self.models = {'stt': Counter(), 'tts': Counter()}
+        self.hours = Counter()
+        self.days = Counter()
+
+        self.timings: Dict[str, Dict[str, RunningStats]] = {'stt': {}, 'tts': {}}
+        self.turnaround = RunningStats()
+        # (type, timestamp) of the first and last exchange, for turnarounds
+        # across merge boundaries
+        self._first: Optional[Tuple[str, datetime]] = None
+        self._last: Optional[Tuple[str, datetime]] = None
+
+        # conversation_id -> [exchange count, first timestamp, last timestamp, words]
+        self.conversations: Dict[str, list] = {}
+
+        self.errors = Counter()
+        self.errors_by_type = Counter()
+
+        self.vad_enabled = 0
+        self.vad_disabled = 0
+        self.record_with_vad = RunningStats()
+        self.record_without_vad = RunningStats()
+
+        self.update(exchanges)
+
+    def update(self, exchanges: Iterable[Exchange]) -> 'ExchangeStats':
+        """Consume more exchanges (following those already seen).
+
+        Returns:
+            Self for chaining
+        """
+        for exchange in exchanges:
+            self.add(exchange)
+        return self
+
+    def add(self, exchange: Exchange) -> None:
+        """Account for one exchange."""
+        self.total += 1
+        if exchange.is_stt:
+            self.stt_count += 1
+        else:
+            self.tts_count += 1
+
+        timestamp = exchange.timestamp
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            self.first_timestamp = timestamp
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+        self.hours[timestamp.hour] += 1
+        self.days[timestamp.date().isoformat()] += 1
+
+        # Only count when switching between STT and TTS
+        if self._last is not None and self._last[0] != exchange.type:
+            self.turnaround.add((timestamp - self._last[1]).total_seconds())
+        self._last = (exchange.type, timestamp)
+        if self._first is None:
+            self._first = self._last
+
+        conversation = self.conversations.get(exchange.conversation_id)
+        words = len(exchange.text.split())
+        if conversation is None:
+            self.conversations[exchange.conversation_id] = [1, timestamp, timestamp, words]
+        else:
+            conversation[0] += 1
+            conversation[1] = min(conversation[1], timestamp)
+            conversation[2] = max(conversation[2], timestamp)
+            conversation[3] += words
+
+        # Individual values, so the full metadata is never decoded
+        meta = exchange.metadata_value
+        self.providers[meta('provider') or 'unknown'] += 1
+        self.transports[meta('transport') or 'unknown'] += 1
+        self.models['stt' if exchange.is_stt else 'tts'][meta('model') or 'unknown'] += 1
+        if exchange.is_tts:
+            self.voices[meta('voice') or 'unknown'] += 1
+
+        if not exchange.has_metadata:
+            return
+
+        error = meta('error')
+        if error:
+            self.errors[_categorize_error(error)] += 1
+            self.errors_by_type[exchange.type] += 1
+
+        timings = {}
+        if exchange.timings:
+            for stage, name in _TIMING_METRICS.get(exchange.type, {}).items():
+                value = exchange.timings.get(stage)
+                if value is not None:
+                    # Reported in seconds
+                    timings[name] = value / 1000
+        for name, value in timings.items():
+            stats = self.timings[exchange.type].get(name)
+            if stats is None:
+                stats = self.timings[exchange.type][name] = RunningStats()
+            stats.add(value)
+
+        silence_detection = meta('silence_detection') if exchange.is_stt else None
+        if silence_detection:
+            record = timings.get('record')
+            if silence_detection.get('enabled'):
+                self.vad_enabled += 1
+                if record is not None:
+                    self.record_with_vad.add(record)
+            else:
+                self.vad_disabled += 1
+                if record is not None:
+                    self.record_without_vad.add(record)
+
+    def merge(self, other: 'ExchangeStats') -> 'ExchangeStats':
+        """Combine with statistics over exchanges that follow these.
+
+        Turnaround between the last exchange here and the first exchange of
+        ``other`` is counted as if both had been consumed in one pass.
+
+        Returns:
+            Self for chaining
+        """
+        if not other.total:
+            return self
+
+        if self._last is not None and other._first is not None and self._last[0] != other._first[0]:
+            self.turnaround.add((other._first[1] - self._last[1]).total_seconds())
+        self.turnaround.merge(other.turnaround)
+        if self._first is None:
+            self._first = other._first
+        self._last = other._last
+
+        self.total += other.total
+        self.stt_count += other.stt_count
+        self.tts_count += other.tts_count
+        for timestamp in (other.first_timestamp, other.last_timestamp):
+            if self.first_timestamp is None or timestamp < self.first_timestamp:
+                self.first_timestamp = timestamp
+            if self.last_timestamp is None or timestamp > self.last_timestamp:
+                self.last_timestamp = timestamp
+
+        for mine, theirs in (
+            (self.providers, other.providers),
+            (self.transports, other.transports),
+            (self.voices, other.voices),
+            (self.models['stt'], other.models['stt']),
+            (self.models['tts'], other.models['tts']),
+            (self.hours, other.hours),
+            (self.days, other.days),
+            (self.errors, other.errors),
+            (self.errors_by_type, other.errors_by_type),
+        ):
+            mine.update(theirs)
+
+        for exchange_type, metrics in other.timings.items():
+            for name, stats in metrics.items():
+                self.timings[exchange_type].setdefault(name, RunningStats()).merge(stats)
+
+        for conversation_id, (count, first, last, words) in other.conversations.items():
+            conversation = self.conversations.get(conversation_id)
+            if conversation is None:
+                self.conversations[conversation_id] = [count, first, last, words]
+            else:
+                conversation[0] += count
+                conversation[1] = min(conversation[1], first)
+                conversation[2] = max(conversation[2], last)
+                conversation[3] += words
+
+        self.vad_enabled += other.vad_enabled
+        self.vad_disabled += other.vad_disabled
+        self.record_with_vad.merge(other.record_with_vad)
+        self.record_without_vad.merge(other.record_without_vad)
+        return self
+
+    def to_state(self) -> Dict[str, Any]:
+        """Complete accumulator state as JSON-serializable data.
+
+        Unlike ``to_dict`` this keeps everything needed to ``merge`` later,
+        e.g. for caching statistics of a log file that no longer changes.
         """
-        self.exchanges = exchanges
-        
-        # Separate by type for convenience
-        self.stt_exchanges = [e for e in exchanges if e.is_stt]
-        self.tts_exchanges = [e for e in exchanges if e.is_tts]
-    
+        def moment(value: Optional[Tuple[str, datetime]]) -> Optional[list]:
+            return [value[0], value[1].isoformat()] if value else None
+
+        return {
+            'total': self.total,
+            'stt_count': self.stt_count,
+            'tts_count': self.tts_count,
+            'first_timestamp': self.first_timestamp.isoformat() if self.first_timestamp else None,
+            'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp else None,
+            'providers': dict(self.providers),
+            'transports': dict(self.transports),
+            'voices': dict(self.voices),
+            'models': {key: dict(counts) for key, counts in self.models.items()},
+            'hours': {str(hour): count for hour, count in self.hours.items()},
+            'days': dict(self.days),
+            'timings': {
+                exchange_type: {name: stats.to_state() for name, stats in metrics.items()}
+                for exchange_type, metrics in self.timings.items()
+            },
+            'turnaround': self.turnaround.to_state(),
+            'first': moment(self._first),
+            'last': moment(self._last),
+            'conversations': {
+                conversation_id: [count, first.isoformat(), last.isoformat(), words]
+                for conversation_id, (count, first, last, words) in self.conversations.items()
+            },
+            'errors': dict(self.errors),
+            'errors_by_type': dict(self.errors_by_type),
+            'vad_enabled': self.vad_enabled,
+            'vad_disabled': self.vad_disabled,
+            'record_with_vad': self.record_with_vad.to_state(),
+            'record_without_vad': self.record_without_vad.to_state(),
+        }
+
+    @classmethod
+    def from_state(cls, data: Dict[str, Any]) -> 'ExchangeStats':
+        """Restore statistics saved with ``to_state``."""
+        def timestamp(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        def moment(value: Optional[list]) -> Optional[Tuple[str, datetime]]:
+            return (value[0], datetime.fromisoformat(value[1])) if value else None
+
+        stats = cls()
+        stats.total = data['total']
+        stats.stt_count = data['stt_count']
+        stats.tts_count = data['tts_count']
+        stats.first_timestamp = timestamp(data['first_timestamp'])
+        stats.last_timestamp = timestamp(data['last_timestamp'])
+        stats.providers.update(data['providers'])
+        stats.transports.update(data['transports'])
+        stats.voices.update(data['voices'])
+        for key, counts in data['models'].items():
+            stats.models[key].update(counts)
+        stats.hours.update({int(hour): count for hour, count in data['hours'].items()})
+        stats.days.update(data['days'])
+        for exchange_type, metrics in data['timings'].items():
+            stats.timings[exchange_type] = {
+                name: RunningStats.from_state(state) for name, state in metrics.items()
+            }
+        stats.turnaround = RunningStats.from_state(data['turnaround'])
+        stats._first = moment(data['first'])
+        stats._last = moment(data['last'])
+        stats.conversations = {
+            conversation_id: [count, datetime.fromisoformat(first), datetime.fromisoformat(last), words]
+            for conversation_id, (count, first, last, words) in data['conversations'].items()
+        }
+        stats.errors.update(data['errors'])
+        stats.errors_by_type.update(data['errors_by_type'])
+        stats.vad_enabled = data['vad_enabled']
+        stats.vad_disabled = data['vad_disabled']
+        stats.record_with_vad = RunningStats.from_state(data['record_with_vad'])
+        stats.record_without_vad = RunningStats.from_state(data['record_without_vad'])
+        return stats
+
     def timing_stats(self) -> Dict[str, Any]:
         """Calculate timing statistics.
-        
+
         Returns:
-            Dictionary with timing metrics
+            Dictionary with timing metrics (avg/min/max/count and p50/p95/p99)
         """
         stats = {
-            'stt': self._calculate_stt_timing_stats(),
-            'tts': self._calculate_tts_timing_stats(),
+            'stt': {name: s.to_dict() for name, s in self.timings['stt'].items()},
+            'tts': {name: s.to_dict() for name, s in self.timings['tts'].items()},
             'overall': {}
         }
-        
-        # Calculate overall turnaround times
-        turnaround_times = []
-        
-        for i in range(len(self.exchanges) - 1):
-            current = self.exchanges[i]
-            next_ex = self.exchanges[i + 1]
-            
-            # Only count when switching between STT and TTS
-            if current.type != next_ex.type:
-                turnaround = (next_ex.timestamp - current.timestamp).total_seconds()
-                turnaround_times.append(turnaround)
-        
-        if turnaround_times:
-            stats['overall']['avg_turnaround'] = sum(turnaround_times) / len(turnaround_times)
-            stats['overall']['min_turnaround'] = min(turnaround_times)
-            stats['overall']['max_turnaround'] = max(turnaround_times)
-            stats['overall']['turnaround_count'] = len(turnaround_times)
-        
-        return stats
-    
-    def _calculate_stt_timing_stats(self) -> Dict[str, Any]:
-        """Calculate STT-specific timing stats."""
-        record_times = []
-        stt_times = []
-        
-        for exchange in self.stt_exchanges:
-            if exchange.metadata and exchange.metadata.timing:
-                # Parse timing string: "record 3.2s, stt 1.4s"
-                timing_match = re.findall(r'(\w+)\s+([\d.]+)s', exchange.metadata.timing)
-                for metric, value in timing_match:
-                    if metric == 'record':
-                        record_times.append(float(value))
-                    elif metric == 'stt':
-                        stt_times.append(float(value))
-        
-        stats = {}
-        
-        if record_times:
-            stats['record'] = {
-                'avg': sum(record_times) / len(record_times),
-                'min': min(record_times),
-                'max': max(record_times),
-                'count': len(record_times)
-            }
-        
-        if stt_times:
-            stats['processing'] = {
-                'avg': sum(stt_times) / len(stt_times),
-                'min': min(stt_times),
-                'max': max(stt_times),
-                'count': len(stt_times)
-            }
-        
-        return stats
-    
-    def _calculate_tts_timing_stats(self) -> Dict[str, Any]:
-        """Calculate TTS-specific timing stats."""
-        ttfa_times = []
-        gen_times = []
-        play_times = []
-        
-        for exchange in self.tts_exchanges:
-            if exchange.metadata and exchange.metadata.timing:
-                # Parse timing string: "ttfa 1.2s, gen 2.3s, play 5.6s"
-                timing_match = re.findall(r'(\w+)\s+([\d.]+)s', exchange.metadata.timing)
-                for metric, value in timing_match:
-                    if metric == 'ttfa':
-                        ttfa_times.append(float(value))
-                    elif metric == 'gen':
-                        gen_times.append(float(value))
-                    elif metric == 'play':
-                        play_times.append(float(value))
-        
-        stats = {}
-        
-        if ttfa_times:
-            stats['ttfa'] = {
-                'avg': sum(ttfa_times) / len(ttfa_times),
-                'min': min(ttfa_times),
-                'max': max(ttfa_times),
-                'count': len(ttfa_times)
-            }
-        
-        if gen_times:
-            stats['generation'] = {
-                'avg': sum(gen_times) / len(gen_times),
-                'min': min(gen_times),
-                'max': max(gen_times),
-                'count': len(gen_times)
-            }
-        
-        if play_times:
-            stats['playback'] = {
-                'avg': sum(play_times) / len(play_times),
-                'min': min(play_times),
-                'max': max(play_times),
-                'count': len(play_times)
-            }
-        
+
+        if self.turnaround:
+            turnaround = self.turnaround.to_dict()
+            stats['overall']['avg_turnaround'] = turnaround['avg']
+            stats['overall']['min_turnaround'] = turnaround['min']
+            stats['overall']['max_turnaround'] = turnaround['max']
+            stats['overall']['p50_turnaround'] = turnaround['p50']
+            stats['overall']['p95_turnaround'] = turnaround['p95']
+            stats['overall']['p99_turnaround'] = turnaround['p99']
+            stats['overall']['turnaround_count'] = turnaround['count']
+
         return stats
-    
+
     def provider_breakdown(self) -> Dict[str, int]:
         """Count exchanges by provider.
-        
+
         Returns:
             Dictionary mapping provider names to counts
         """
-        provider_counts = Counter()
-        
-        for exchange in self.exchanges:
-            if exchange.metadata and exchange.metadata.provider:
-                provider_counts[exchange.metadata.provider] += 1
-            else:
-                provider_counts['unknown'] += 1
-        
-        return dict(provider_counts)
-    
+        return dict(self.providers)
+
     def model_breakdown(self) -> Dict[str, Dict[str, int]]:
         """Count exchanges by model, separated by type.
-        
+
         Returns:
             Dictionary with 'stt' and 'tts' sub-dictionaries of model counts
         """
-        stt_models = Counter()
-        tts_models = Counter()
-        
-        for exchange in self.exchanges:
-            model = 'unknown'
-            if exchange.metadata and exchange.metadata.model:
-                model = exchange.metadata.model
-            
-            if exchange.is_stt:
-                stt_models[model] += 1
-            else:
-                tts_models[model] += 1
-        
         return {
-            'stt': dict(stt_models),
-            'tts': dict(tts_models)
+            'stt': dict(self.models['stt']),
+            'tts': dict(self.models['tts'])
         }
-    
+
     def voice_breakdown(self) -> Dict[str, int]:
         """Count TTS exchanges by voice.
-        
+
         Returns:
             Dictionary mapping voice names to counts
         """
-        voice_counts = Counter()
-        
-        for exchange in self.tts_exchanges:
-            if exchange.metadata and exchange.metadata.voice:
-                voice_counts[exchange.metadata.voice] += 1
-            else:
-                voice_counts['unknown'] += 1
-        
-        return dict(voice_counts)
-    
+        return dict(self.voices)
+
     def transport_breakdown(self) -> Dict[str, int]:
         """Count exchanges by transport type.
-        
+
         Returns:
             Dictionary mapping transport types to counts
         """
-        transport_counts = Counter()
-        
-        for exchange in self.exchanges:
-            if exchange.metadata and exchange.metadata.transport:
-                transport_counts[exchange.metadata.transport] += 1
-            else:
-                transport_counts['unknown'] += 1
-        
-        return dict(transport_counts)
-    
+        return dict(self.transports)
+
     def hourly_distribution(self) -> Dict[int, int]:
         """Distribution of exchanges by hour of day.
-        
+
         Returns:
             Dictionary mapping hour (0-23) to count
         """
-        hour_counts = defaultdict(int)
-        
-        for exchange in self.exchanges:
-            hour = exchange.timestamp.hour
-            hour_counts[hour] += 1
-        
         # Ensure all hours are represented
-        return {hour: hour_counts.get(hour, 0) for hour in range(24)}
-    
+        return {hour: self.hours.get(hour, 0) for hour in range(24)}
+
     def daily_distribution(self) -> Dict[str, int]:
         """Distribution of exchanges by date.
-        
+
         Returns:
             Dictionary mapping date string (YYYY-MM-DD) to count
         """
-        daily_counts = defaultdict(int)
-        
-        for exchange in self.exchanges:
-            date_str = exchange.timestamp.date().isoformat()
-            daily_counts[date_str] += 1
-        
-        return dict(sorted(daily_counts.items()))
-    
+        return dict(sorted(self.days.items()))
+
     def conversation_stats(self) -> Dict[str, Any]:
         """Conversation-level statistics.
-        
+
         Returns:
             Dictionary with conversation metrics
         """
-        # Group by conversation ID
-        conversations = defaultdict(list)
-        for exchange in self.exchanges:
-            conversations[exchange.conversation_id].append(exchange)
-        
-        # Calculate stats per conversation
-        conv_lengths = []
-        conv_durations = []
-        conv_exchange_counts = []
-        
-        for conv_id, conv_exchanges in conversations.items():
-            if len(conv_exchanges) > 0:
-                conv_exchange_counts.append(len(conv_exchanges))
-                
-                # Sort by timestamp
-                conv_exchanges.sort(key=lambda e: e.timestamp)
-                
-                # Calculate duration
-                duration = (conv_exchanges[-1].timestamp - conv_exchanges[0].timestamp).total_seconds()
-                conv_durations.append(duration)
-                
-                # Calculate total word count
-                total_words = sum(len(e.text.split()) for e in conv_exchanges)
-                conv_lengths.append(total_words)
-        
-        stats = {
-            'total_conversations': len(conversations),
-            'exchanges_per_conversation': {
-                'avg': sum(conv_exchange_counts) / len(conv_exchange_counts) if conv_exchange_counts else 0,
-                'min': min(conv_exchange_counts) if conv_exchange_counts else 0,
-                'max': max(conv_exchange_counts) if conv_exchange_counts else 0,
-            },
-            'duration_seconds': {
-                'avg': sum(conv_durations) / len(conv_durations) if conv_durations else 0,
-                'min': min(conv_durations) if conv_durations else 0,
-                'max': max(conv_durations) if conv_durations else 0,
-            },
-            'word_count': {
-                'avg': sum(conv_lengths) / len(conv_lengths) if conv_lengths else 0,
-                'min': min(conv_lengths) if conv_lengths else 0,
-                'max': max(conv_lengths) if conv_lengths else 0,
+        exchange_counts = RunningStats()
+        durations = RunningStats()
+        word_counts = RunningStats()
+
+        for count, first, last, words in self.conversations.values():
+            exchange_counts.add(count)
+            durations.add((last - first).total_seconds())
+            word_counts.add(words)
+
+        def summary(stats: RunningStats) -> Dict[str, float]:
+            return {
+                'avg': stats.mean or 0,
+                'min': stats.min or 0,
+                'max': stats.max or 0,
+                'p50': stats.quantile(0.5) or 0,
+                'p95': stats.quantile(0.95) or 0,
             }
+
+        return {
+            'total_conversations': len(self.conversations),
+            'exchanges_per_conversation': summary(exchange_counts),
+            'duration_seconds': summary(durations),
+            'word_count': summary(word_counts),
         }
-        
-        return stats
-    
+
     def error_stats(self) -> Dict[str, Any]:
         """Statistics about errors.
-        
+
         Returns:
             Dictionary with error metrics
         """
-        error_exchanges = [e for e in self.exchanges if e.metadata and e.metadata.error]
-        
-        error_types = Counter()
-        for exchange in error_exchanges:
-            # Try to categorize error
-            error_msg = exchange.metadata.error.lower()
-            if 'timeout' in error_msg:
-                error_types['timeout'] += 1
-            elif 'auth' in error_msg or 'unauthorized' in error_msg:
-                error_types['authentication'] += 1
-            elif 'rate' in error_msg:
-                error_types['rate_limit'] += 1
-            elif 'network' in error_msg or 'connection' in error_msg:
-                error_types['network'] += 1
-            else:
-                error_types['other'] += 1
-        
+        total_errors = sum(self.errors.values())
         return {
-            'total_errors': len(error_exchanges),
-            'error_rate': len(error_exchanges) / len(self.exchanges) if self.exchanges else 0,
-            'error_types': dict(error_types),
+            'total_errors': total_errors,
+            'error_rate': total_errors / self.total if self.total else 0,
+            'error_types': dict(self.errors),
             'errors_by_type': {
-                'stt': sum(1 for e in error_exchanges if e.is_stt),
-                'tts': sum(1 for e in error_exchanges if e.is_tts),
+                'stt': self.errors_by_type.get('stt', 0),
+                'tts': self.errors_by_type.get('tts', 0),
             }
         }
-    
+
     def silence_detection_stats(self) -> Dict[str, Any]:
         """Statistics about silence detection usage.
-        
+
         Returns:
             Dictionary with silence detection metrics
         """
-        stt_with_vad = []
-        stt_without_vad = []
-        
-        for exchange in self.stt_exchanges:
-            if exchange.metadata and exchange.metadata.silence_detection:
-                if exchange.metadata.silence_detection.get('enabled'):
-                    stt_with_vad.append(exchange)
-                else:
-                    stt_without_vad.append(exchange)
-        
-        # Calculate average recording times
-        with_vad_times = []
-        without_vad_times = []
-        
-        for exchange in stt_with_vad:
-            if exchange.metadata and exchange.metadata.timing:
-                match = re.search(r'record\s+([\d.]+)s', exchange.metadata.timing)
-                if match:
-                    with_vad_times.append(float(match.group(1)))
-        
-        for exchange in stt_without_vad:
-            if exchange.metadata and exchange.metadata.timing:
-                match = re.search(r'record\s+([\d.]+)s', exchange.metadata.timing)
-                if match:
-                    without_vad_times.append(float(match.group(1)))
-        
         stats = {
-            'vad_enabled_count': len(stt_with_vad),
-            'vad_disabled_count': len(stt_without_vad),
-            'vad_usage_rate': len(stt_with_vad) / len(self.stt_exchanges) if self.stt_exchanges else 0,
+            'vad_enabled_count': self.vad_enabled,
+            'vad_disabled_count': self.vad_disabled,
+            'vad_usage_rate': self.vad_enabled / self.stt_count if self.stt_count else 0,
         }
-        
-        if with_vad_times:
-            stats['avg_record_time_with_vad'] = sum(with_vad_times) / len(with_vad_times)
-        
-        if without_vad_times:
-            stats['avg_record_time_without_vad'] = sum(without_vad_times) / len(without_vad_times)
-        
+
+        if self.record_with_vad:
+            stats['avg_record_time_with_vad'] = self.record_with_vad.mean
+
+        if self.record_without_vad:
+            stats['avg_record_time_without_vad'] = self.record_without_vad.mean
+
         return stats
-    
+
+    def to_dict(self) -> Dict[str, Any]:
+        """All statistics as one JSON-serializable dictionary."""
+        return {
+            'total_exchanges': self.total,
+            'stt_count': self.stt_count,
+            'tts_count': self.tts_count,
+            'first_timestamp': self.first_timestamp.isoformat() if self.first_timestamp else None,
+            'last_timestamp': self.last_timestamp.isoformat() if self.last_timestamp else None,
+            'timing': self.timing_stats(),
+            'providers': self.provider_breakdown(),
+            'transports': self.transport_breakdown(),
+            'models': self.model_breakdown(),
+            'voices': self.voice_breakdown(),
+            'conversations': self.conversation_stats(),
+            'errors': self.error_stats(),
+            'silence_detection': self.silence_detection_stats(),
+        }
+
     def get_summary_report(self) -> str:
         """Generate a human-readable summary report.
-        
+
         Returns:
             Formatted string report
         """
         lines = ["Exchange Statistics Summary", "=" * 40, ""]
-        
+
         # Basic counts
-        lines.append(f"Total Exchanges: {len(self.exchanges)}")
-        lines.append(f"  STT: {len(self.stt_exchanges)}")
-        lines.append(f"  TTS: {len(self.tts_exchanges)}")
+        lines.append(f"Total Exchanges: {self.total}")
+        lines.append(f"  STT: {self.stt_count}")
+        lines.append(f"  TTS: {self.tts_count}")
         lines.append("")
-        
+
         # Date range
-        if self.exchanges:
-            sorted_exchanges = sorted(self.exchanges, key=lambda e: e.timestamp)
-            start = sorted_exchanges[0].timestamp
-            end = sorted_exchanges[-1].timestamp
+        if self.total:
+            start = self.first_timestamp
+            end = self.last_timestamp
             lines.append(f"Date Range: {start.date()} to {end.date()}")
             lines.append(f"Duration: {end - start}")
             lines.append("")
-        
+
         # Providers
         lines.append("Providers:")
         for provider, count in self.provider_breakdown().items():
             lines.append(f"  {provider}: {count}")
         lines.append("")
-        
+
         # Transports
         lines.append("Transports:")
         for transport, count in self.transport_breakdown().items():
             lines.append(f"  {transport}: {count}")
         lines.append("")
-        
+
         # Timing
         timing = self.timing_stats()
         if timing.get('overall') and timing['overall'].get('avg_turnaround'):
             lines.append("Timing:")
-            lines.append(f"  Avg Turnaround: {timing['overall']['avg_turnaround']:.2f}s")
-            
+            lines.append(f"  Avg Turnaround: {timing['overall']['avg_turnaround']:.2f}s "
+                         f"(p95 {timing['overall']['p95_turnaround']:.2f}s)")
+
             if timing.get('tts') and timing['tts'].get('ttfa'):
-                lines.append(f"  Avg TTFA: {timing['tts']['ttfa']['avg']:.2f}s")
-            
+                ttfa = timing['tts']['ttfa']
+                lines.append(f"  Avg TTFA: {ttfa['avg']:.2f}s (p95 {ttfa['p95']:.2f}s)")
+
             lines.append("")
-        
+
         # Conversations
         conv_stats = self.conversation_stats()
         lines.append(f"Conversations: {conv_stats['total_conversations']}")
         lines.append(f"  Avg Exchanges: {conv_stats['exchanges_per_conversation']['avg']:.1f}")
         lines.append(f"  Avg Duration: {conv_stats['duration_seconds']['avg']:.1f}s")
-        
-        return "\n".join(lines)
\ No newline at end of file
+
+        return "\n".join(lines)
@@ -0,0 +1,481 @@
+"""
+Prometheus-style metrics for the voice pipeline.
+
+``ConversationStatistics`` keeps the last 1000 interactions of one process
+for the statistics tools; these metrics are the monitoring view. Every
+process keeps cumulative counters and histograms in memory (a few dict
+updates per turn), labeled by provider, endpoint and transport:
+
+- ``voicemode_ttfa_seconds``, ``voicemode_tts_generation_seconds``,
+  ``voicemode_stt_seconds``, ``voicemode_record_seconds`` and
+  ``voicemode_turn_seconds`` histograms
+- ``voicemode_failovers_total``, ``voicemode_errors_total``,
+  ``voicemode_playback_underruns_total``, ``voicemode_cache_hits_total``
+  and ``voicemode_cache_misses_total`` counters
+- ``voicemode_audio_callback_seconds`` and ``voicemode_audio_xruns_total``
+  for real-time audio callbacks (see ``utils.audio_callback_stats``)
+
+They are rendered in the Prometheus text exposition format by the
+``voice://metrics/prometheus`` MCP resource and, with
+``VOICEMODE_METRICS_PORT`` set, by a small HTTP server on
+``http://127.0.0.1:<port>/metrics`` for a Prometheus scraper.
+
+A host often runs several MCP servers (one per editor session), but only
+one process can bind the port. With ``start_metrics_export`` every process
+publishes a snapshot of its metrics to ``<pid>.prom`` in a shared directory
+every few seconds, and the process holding the port serves its own metrics
+merged with the snapshots of the other live processes. Each series carries
+a ``pid`` label. When the serving process exits, another process takes
+over the port.
+"""
+
+import atexit
+import bisect
+import logging
+import math
+import os
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("voicemode")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans sub-second TTFA to multi-minute recordings
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 7.5, 10.0, 20.0, 30.0, 60.0, 120.0)
+# Audio callback durations; block budgets are typically 10-50 ms
+CALLBACK_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05)
+
+# Seconds between snapshots published for the process serving /metrics, and
+# between attempts to take over the port
+PUBLISH_INTERVAL = 10.0
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if labels.keys() != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {', '.join(self.labels)}, got {', '.join(labels)}")
+        return tuple('' if labels[name] is None else str(labels[name]) for name in self.labels)
+
+    def render(self, extra_labels: str = "") -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._samples(extra_labels))
+        return lines
+
+    @abstractmethod
+    def _samples(self, extra_labels: str = "") -> List[str]:
+        """Sample lines, without the HELP and TYPE lines."""
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self, extra_labels: str = "") -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key, extra_labels)} {_format_value(value)}"
+                for key, value in values]
+
+    def to_dict(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"labels": dict(zip(self.labels, key)), "value": value}
+                    for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Counts of observations in cumulative buckets, with their sum."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (last is +Inf)], sum
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def add(self, bucket_counts: Sequence[int], total: float, **labels: Any) -> None:
+        """Add observations already counted per bucket (same buckets, plus +Inf)."""
+        if len(bucket_counts) != len(self.buckets) + 1:
+            raise ValueError(f"{self.name} has {len(self.buckets) + 1} buckets, got {len(bucket_counts)}")
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            for index, count in enumerate(bucket_counts):
+                entry[0][index] += count
+            entry[1] += total
+
+    def count(self, **labels: Any) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def _samples(self, extra_labels: str = "") -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                bucket_labels = f"{extra_labels},{le}" if extra_labels else le
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, bucket_labels)} {cumulative}")
+            labels = _format_labels(self.labels, key, extra_labels)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+    def to_dict(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        return [
+            {
+                "labels": dict(zip(self.labels, key)),
+                "count": sum(counts),
+                "sum": total,
+                "buckets": {_format_value(bound): count for bound, count in zip(self.buckets + (math.inf,), counts)},
+            }
+            for key, (counts, total) in values
+        ]
+
+
+class MetricsRegistry:
+    """A named set of metrics, rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labels))
+
+    def histogram(self, name: str, documentation: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self, extra_labels: str = "") -> str:
+        """All metrics in the Prometheus text exposition format.
+
+        Args:
+            extra_labels: Label pairs added to every sample, e.g. ``pid="42"``
+        """
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render(extra_labels))
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            name: {"type": metric.type, "help": metric.documentation, "samples": metric.to_dict()}
+            for name, metric in list(self._metrics.items())
+        }
+
+    def clear(self) -> None:
+        """Reset every metric (for tests)."""
+        for metric in list(self._metrics.values()):
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+_ENDPOINT_LABELS = ("provider", "endpoint", "transport")
+
+TTFA_SECONDS = REGISTRY.histogram(
+    "voicemode_ttfa_seconds", "Time from TTS request to first audio", _ENDPOINT_LABELS)
+TTS_GENERATION_SECONDS = REGISTRY.histogram(
+    "voicemode_tts_generation_seconds", "Time for the TTS service to return the audio", _ENDPOINT_LABELS)
+STT_SECONDS = REGISTRY.histogram(
+    "voicemode_stt_seconds", "Time to transcribe a recording, including failover", _ENDPOINT_LABELS)
+RECORD_SECONDS = REGISTRY.histogram(
+    "voicemode_record_seconds", "Duration of recorded responses", ("transport",))
+TURN_SECONDS = REGISTRY.histogram(
+    "voicemode_turn_seconds", "End-to-end converse turn time (speak, listen, transcribe)", ("transport",))
+
+FAILOVERS = REGISTRY.counter(
+    "voicemode_failovers_total", "Requests moved on to the next endpoint after one failed",
+    ("service", "provider", "endpoint"))
+ERRORS = REGISTRY.counter(
+    "voicemode_errors_total", "Failed TTS or STT requests and failed turns",
+    ("stage", "provider", "endpoint"))
+PLAYBACK_UNDERRUNS = REGISTRY.counter(
+    "voicemode_playback_underruns_total", "Times the output device ran out of audio during streaming playback",
+    _ENDPOINT_LABELS)
+CACHE_HITS = REGISTRY.counter("voicemode_cache_hits_total", "Cache lookups answered from the cache", ("cache",))
+CACHE_MISSES = REGISTRY.counter("voicemode_cache_misses_total", "Cache lookups that had to compute", ("cache",))
+AUDIO_CALLBACK_SECONDS = REGISTRY.histogram(
+    "voicemode_audio_callback_seconds", "Time spent in real-time audio callbacks", ("stream",), CALLBACK_BUCKETS)
+AUDIO_XRUNS = REGISTRY.counter(
+    "voicemode_audio_xruns_total", "Under- and overflows reported to audio callbacks", ("stream", "kind"))
+
+
+def record_tts(metrics: Optional[Dict[str, Any]], config: Optional[Dict[str, Any]], transport: str) -> None:
+    """Record a successful TTS request from its metrics and provider config."""
+    if not metrics or not config:
+        return
+    labels = {"provider": config.get("provider"), "endpoint": config.get("base_url"), "transport": transport}
+    if metrics.get("ttfa"):
+        TTFA_SECONDS.observe(metrics["ttfa"], **labels)
+    if metrics.get("generation"):
+        TTS_GENERATION_SECONDS.observe(metrics["generation"], **labels)
+    if metrics.get("underruns"):
+        PLAYBACK_UNDERRUNS.inc(metrics["underruns"], **labels)
+
+
+def record_request_error(service: str, provider: Optional[str], endpoint: str, failover: bool) -> None:
+    """Record a failed TTS or STT request, and the failover if another endpoint is tried."""
+    ERRORS.inc(stage=service, provider=provider, endpoint=endpoint)
+    if failover:
+        FAILOVERS.inc(service=service, provider=provider, endpoint=endpoint)
+
+
+def record_audio_callbacks(stats) -> None:
+    """Add a stopped stream's ``CallbackStats``."""
+    AUDIO_CALLBACK_SECONDS.add(stats.buckets, stats.total, stream=stats.stream)
+    if stats.underflows:
+        AUDIO_XRUNS.inc(stats.underflows, stream=stats.stream, kind="underflow")
+    if stats.overflows:
+        AUDIO_XRUNS.inc(stats.overflows, stream=stats.stream, kind="overflow")
+
+
+def merge_expositions(texts: Iterable[str]) -> str:
+    """Combine exposition texts so each metric family is declared once.
+
+    Samples are kept in order, grouped under the first HELP/TYPE lines seen
+    for their family; lines before any family header are dropped.
+    """
+    families: Dict[str, Dict[str, Any]] = {}
+    for text in texts:
+        family = None
+        for line in text.splitlines():
+            if line.startswith(("# HELP ", "# TYPE ")):
+                kind, name = line.split(" ", 3)[1:3]
+                family = families.setdefault(name, {"HELP": None, "TYPE": None, "samples": []})
+                family[kind] = family[kind] or line
+            elif line and not line.startswith("#") and family is not None:
+                family["samples"].append(line)
+    lines: List[str] = []
+    for family in families.values():
+        lines.extend(header for header in (family["HELP"], family["TYPE"]) if header)
+        lines.extend(family["samples"])
+    return "\n".join(lines) + "\n"
+
+
+def _process_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _pid_labels(pid: Optional[int] = None) -> str:
+    return f'pid="{pid or os.getpid()}"'
+
+
+def read_snapshots(snapshot_dir: Path, exclude: Optional[int] = None) -> List[str]:
+    """Snapshots published by other live processes; those of exited ones are removed."""
+    texts = []
+    for path in sorted(Path(snapshot_dir).glob("*.prom")):
+        try:
+            pid = int(path.stem)
+        except ValueError:
+            continue
+        if pid == exclude:
+            continue
+        try:
+            if not _process_running(pid):
+                path.unlink()
+                continue
+            texts.append(path.read_text(encoding="utf-8"))
+        except OSError:
+            continue
+    return texts
+
+
+def write_snapshot(snapshot_dir: Path, registry: MetricsRegistry = REGISTRY) -> Path:
+    """Publish this process's metrics to ``<snapshot_dir>/<pid>.prom``."""
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    path = snapshot_dir / f"{os.getpid()}.prom"
+    temp = path.with_suffix(".tmp")
+    temp.write_text(registry.render(_pid_labels()), encoding="utf-8")
+    # Atomic so the serving process never reads half a snapshot
+    os.replace(temp, path)
+    return path
+
+
+def _merged_render(registry: MetricsRegistry, snapshot_dir: Path):
+    def render():
+        own = registry.render(_pid_labels())
+        return merge_expositions([own, *read_snapshots(snapshot_dir, exclude=os.getpid())])
+    return render
+
+
+def _bind_metrics_server(port: int, host: str, render):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            # Scrapes would flood the log
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="voicemode-metrics", daemon=True)
+    thread.start()
+    logger.info(f"Serving metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY,
+                         snapshot_dir: Optional[Path] = None):
+    """Serve ``/metrics`` on a daemon thread.
+
+    Args:
+        snapshot_dir: Also serve the snapshots other processes publish there,
+            with every series labelled by ``pid``
+
+    Returns:
+        The ``ThreadingHTTPServer``, or None if the port could not be bound
+    """
+    render = registry.render if snapshot_dir is None else _merged_render(registry, snapshot_dir)
+    try:
+        return _bind_metrics_server(port, host, render)
+    except OSError as e:
+        logger.warning(f"Metrics endpoint not started on {host}:{port}: {e}")
+        return None
+
+
+def start_metrics_export(port: int, host: str, snapshot_dir: Path, registry: MetricsRegistry = REGISTRY,
+                         interval: float = PUBLISH_INTERVAL, stop: Optional[threading.Event] = None):
+    """Export this process's metrics on a port shared with other MCP processes.
+
+    The first process to bind the port serves it; the others publish a
+    snapshot to ``<snapshot_dir>/<port>/<pid>.prom`` every ``interval``
+    seconds and retry the port, so one of them takes over when the serving
+    process exits. Each snapshot is removed when its process exits.
+
+    Returns:
+        The export thread
+    """
+    snapshot_dir = Path(snapshot_dir) / str(port)
+    stop = stop or threading.Event()
+    snapshot = snapshot_dir / f"{os.getpid()}.prom"
+
+    def remove_snapshot():
+        try:
+            snapshot.unlink()
+        except OSError:
+            pass
+
+    def export():
+        server = None
+        first_attempt = True
+        while not stop.is_set():
+            if server is None:
+                try:
+                    server = _bind_metrics_server(port, host, _merged_render(registry, snapshot_dir))
+                except OSError as e:
+                    if first_attempt:
+                        logger.info(f"Metrics port {port} not available ({e}); publishing to {snapshot_dir}")
+                first_attempt = False
+            try:
+                if server is None:
+                    write_snapshot(snapshot_dir, registry)
+                else:
+                    remove_snapshot()
+            except OSError as e:
+                logger.debug(f"Could not publish metrics snapshot: {e}")
+            stop.wait(interval)
+        remove_snapshot()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    atexit.register(remove_snapshot)
+    thread = threading.Thread(target=export, name="voicemode-metrics-export", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,330 @@
+"""
+Opt-in sampling profiler for converse turns.
+
+Spans and metrics say how long a turn's stages took; they don't say where
+the time went inside one. With ``VOICEMODE_PROFILE=true`` each converse
+turn is sampled by a background thread that reads every thread's Python
+stack (``sys._current_frames``) every ``VOICEMODE_PROFILE_INTERVAL`` ms,
+weighted by the wall time since the previous sample. That covers the
+event loop and the worker threads (audio capture, decoding, the audio
+saver) alike, and separates:
+
+- Python CPU work: decoding, resampling, logging (the leaf is that code)
+- blocking calls: device I/O, file writes (the leaf is the caller of the
+  C function)
+- waiting on a provider: the event loop thread idle in ``select``
+
+Other threads' samples are only kept while they are doing something, so
+idle pool workers and the log writer drop out. The event loop thread is
+kept whole; its ``select`` time is the turn's waiting.
+
+Each turn is written to
+``PROFILE_DIR/profile_YYYYMMDD_HHMMSS_mmm_<conversation_id>.speedscope.json``
+in the speedscope format (open it at https://www.speedscope.app), with
+the conversation ID and the turn's timings under ``"metadata"``. Only the
+newest ``VOICEMODE_PROFILE_KEEP`` files are kept. ``voicemode profiles``
+lists them and summarizes the hottest frames across turns.
+
+Concurrent turns share the process, so only one is profiled at a time;
+its samples include whatever else the process was doing.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from voice_mode.__version__ import __version__
+
+logger = logging.getLogger("voicemode")
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+FILE_PATTERN = "profile_*.speedscope.json"
+
+# Leaf frames of a thread blocked waiting for work
+IDLE_FRAMES = frozenset({
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    # Executor worker between work items
+    ("thread.py", "_worker"),
+})
+
+Frame = Tuple[str, str, int]
+
+
+class TurnProfiler:
+    """Samples all threads' stacks until stopped."""
+
+    recording = True
+
+    def __init__(self, interval: float = 0.01):
+        """
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.main_thread = threading.get_ident()
+        self.frames: List[Frame] = []
+        self._frame_index: Dict[Any, int] = {}
+        # Per thread: [stack of frame indices (root first), weight in seconds].
+        # Runs of the same stack are merged, so a thread blocked for the
+        # whole turn costs one entry.
+        self.samples: Dict[int, List[list]] = defaultdict(list)
+        self.thread_names: Dict[int, str] = {}
+        self.started = datetime.now()
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="voicemode-profiler", daemon=True)
+
+    def start(self) -> "TurnProfiler":
+        self._start = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._start
+
+    def _index(self, code) -> int:
+        index = self._frame_index.get(code)
+        if index is None:
+            index = self._frame_index[code] = len(self.frames)
+            self.frames.append((code.co_qualname if hasattr(code, "co_qualname") else code.co_name,
+                                code.co_filename, code.co_firstlineno))
+        return index
+
+    def _sample(self, weight: float) -> None:
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if ident not in self.thread_names:
+                self.thread_names.update((thread.ident, thread.name) for thread in threading.enumerate())
+            stack = []
+            while frame is not None:
+                stack.append(self._index(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            stack = tuple(stack)
+            samples = self.samples[ident]
+            if samples and samples[-1][0] == stack:
+                samples[-1][1] += weight
+            else:
+                samples.append([stack, weight])
+
+    def _run(self) -> None:
+        last = self._start
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            self._sample(now - last)
+            last = now
+
+    def _is_idle(self, stack: Tuple[int, ...]) -> bool:
+        if not stack:
+            return True
+        name, filename, _ = self.frames[stack[-1]]
+        return (os.path.basename(filename), name.rpartition('.')[2]) in IDLE_FRAMES
+
+    def to_speedscope(self, name: str, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """The samples in speedscope's file format, one profile per thread."""
+        profiles = []
+        for ident, samples in self.samples.items():
+            if ident != self.main_thread:
+                samples = [sample for sample in samples if not self._is_idle(sample[0])]
+                if not samples:
+                    continue
+            thread = self.thread_names.get(ident, str(ident))
+            if ident == self.main_thread:
+                thread = f"{thread} (event loop)"
+            profiles.append({
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(weight for _, weight in samples),
+                "samples": [list(stack) for stack, _ in samples],
+                "weights": [weight for _, weight in samples],
+            })
+        # The event loop first: speedscope opens the first profile
+        profiles.sort(key=lambda profile: not profile["name"].endswith("(event loop)"))
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": f"voicemode {__version__}",
+            "activeProfileIndex": 0,
+            "shared": {"frames": [{"name": n, "file": f, "line": line} for n, f, line in self.frames]},
+            "profiles": profiles,
+            "metadata": metadata or {},
+        }
+
+    def save(self, directory: Path, conversation_id: Optional[str] = None, keep: int = 100,
+             **metadata: Any) -> Path:
+        """Write the profile and prune old ones.
+
+        Args:
+            directory: Profile directory
+            conversation_id: Conversation the turn belongs to
+            keep: Number of profiles to keep
+            **metadata: Timings and other details of the turn
+
+        Returns:
+            Path of the written file
+        """
+        self.stop()
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stamp = self.started.strftime("%Y%m%d_%H%M%S_") + f"{self.started.microsecond // 1000:03d}"
+        path = directory / f"profile_{stamp}_{conversation_id or 'none'}.speedscope.json"
+        metadata = {
+            "conversation_id": conversation_id,
+            "started": self.started.isoformat(),
+            "duration": self.duration,
+            "interval": self.interval,
+            "threads": len(self.samples),
+            **metadata,
+        }
+        document = self.to_speedscope(f"converse {stamp} {conversation_id or ''}".strip(), metadata)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(document, default=str))
+        os.replace(tmp, path)
+        prune(directory, keep)
+        return path
+
+
+class _NoopProfiler:
+    """Stands in for a profiler when profiling is off or busy."""
+
+    recording = False
+
+    def stop(self) -> None:
+        pass
+
+
+NOOP_PROFILER = _NoopProfiler()
+
+_active_lock = threading.Lock()
+_active: Optional[TurnProfiler] = None
+
+
+def start_turn_profile():
+    """Start profiling a turn if ``VOICEMODE_PROFILE`` is on and no turn is being profiled.
+
+    Returns:
+        A started ``TurnProfiler``, or ``NOOP_PROFILER``; hand it to
+        ``finish_turn_profile`` when the turn ends
+    """
+    global _active
+    from voice_mode.config import PROFILE_ENABLED, PROFILE_INTERVAL
+
+    if not PROFILE_ENABLED:
+        return NOOP_PROFILER
+    with _active_lock:
+        if _active is not None:
+            logger.debug("Another turn is being profiled; not profiling this one")
+            return NOOP_PROFILER
+        _active = TurnProfiler(PROFILE_INTERVAL)
+    return _active.start()
+
+
+def finish_turn_profile(profiler, conversation_id: Optional[str] = None, **metadata: Any) -> Optional[Path]:
+    """Stop a turn's profiler and write its profile (blocking; run it in a thread).
+
+    Returns:
+        Path of the profile, or None if the turn was not profiled
+    """
+    global _active
+    if not profiler.recording:
+        return None
+    from voice_mode.config import PROFILE_DIR, PROFILE_KEEP
+
+    try:
+        path = profiler.save(PROFILE_DIR, conversation_id, keep=PROFILE_KEEP, **metadata)
+        logger.info(f"Turn profile written to {path}")
+        return path
+    except Exception as e:
+        logger.warning(f"Failed to write turn profile: {e}")
+        return None
+    finally:
+        with _active_lock:
+            if _active is profiler:
+                _active = None
+
+
+def prune(directory: Path, keep: int) -> int:
+    """Delete all but the newest ``keep`` profiles.
+
+    Returns:
+        Number of files deleted
+    """
+    paths = sorted(Path(directory).glob(FILE_PATTERN))
+    removed = 0
+    for path in paths[:max(0, len(paths) - keep)]:
+        try:
+            path.unlink()
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def list_profiles(directory: Path, limit: Optional[int] = None) -> List[Path]:
+    """Profile files, newest first."""
+    paths = sorted(Path(directory).glob(FILE_PATTERN), reverse=True)
+    return paths[:limit] if limit else paths
+
+
+def read_metadata(path: Path) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f).get("metadata", {})
+
+
+def summarize(paths: Iterable[Path], event_loop_only: bool = False) -> Dict[str, Any]:
+    """Aggregate the hottest frames over several profiles.
+
+    Self time is time a frame was the leaf (running, or blocked in a C
+    call); total time is time it was anywhere on the stack.
+
+    Returns:
+        Dict with ``turns``, ``wall`` (summed turn durations) and ``frames``:
+        a list of ``{"name", "file", "line", "self", "total"}`` in seconds,
+        hottest self time first
+    """
+    self_time: Dict[Frame, float] = defaultdict(float)
+    total_time: Dict[Frame, float] = defaultdict(float)
+    turns, wall = 0, 0.0
+    for path in paths:
+        with open(path) as f:
+            document = json.load(f)
+        turns += 1
+        wall += document.get("metadata", {}).get("duration") or 0.0
+        frames = [(frame["name"], frame.get("file", ""), frame.get("line", 0))
+                  for frame in document["shared"]["frames"]]
+        for profile in document["profiles"]:
+            if event_loop_only and not profile["name"].endswith("(event loop)"):
+                continue
+            for stack, weight in zip(profile["samples"], profile["weights"]):
+                if not stack:
+                    continue
+                self_time[frames[stack[-1]]] += weight
+                for index in set(stack):
+                    total_time[frames[index]] += weight
+    ranked = sorted(total_time, key=lambda frame: (self_time.get(frame, 0.0), total_time[frame]), reverse=True)
+    return {
+        "turns": turns,
+        "wall": wall,
+        "frames": [
+            {"name": name, "file": filename, "line": line,
+             "self": self_time.get((name, filename, line), 0.0), "total": total_time[(name, filename, line)]}
+            for name, filename, line in ranked
+        ],
+    }
@@ -8,6 +8,8 @@ This module handles automatic discovery of TTS/STT endpoints, including:
 - Dynamic registry management
 """
 
+from __future__ import annotations
+
 import asyncio
 import logging
 import time
@@ -15,8 +17,10 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 
-import httpx
-from openai import AsyncOpenAI
+from .utils.lazy_imports import lazy_import
+
+httpx = lazy_import("httpx")
+AsyncOpenAI = lazy_import("openai", "AsyncOpenAI")
 
 from . import config
 from .config import TTS_BASE_URLS, STT_BASE_URLS, OPENAI_API_KEY
@@ -0,0 +1,30 @@
+"""Audio device scheduling status resource."""
+
+import json
+import os
+
+from voice_mode.server import mcp
+from voice_mode.audio_scheduler import get_audio_scheduler
+from voice_mode.speech_queue import get_speech_queue
+
+
+@mcp.resource("voice://audio/device")
+async def audio_device_status() -> str:
+    """Which job holds the speaker/microphone, the queue and wait times.
+
+    Mostly useful in daemon mode, where several MCP clients share one
+    audio device.
+    """
+    status = get_audio_scheduler().status()
+    status["pid"] = os.getpid()
+    return json.dumps(status, indent=2)
+
+
+@mcp.resource("voice://audio/speech-queue")
+async def speech_queue_status() -> str:
+    """Background speech queued with converse(wait_for_playback=false).
+
+    Queue depth, back-pressure counters and recent jobs with their results
+    and timing metrics.
+    """
+    return json.dumps(get_speech_queue().status(), indent=2)
@@ -1,56 +1,111 @@
-"""Resources for saved audio files."""
+"""Resources for saved audio files.
+
+Both resources read the audio catalogue (voice_mode.audio_catalogue), so a
+listing is one indexed query however many files are saved.
+"""
+
+import asyncio
+import json
+from typing import Any, Dict, Optional
 
-import os
-from pathlib import Path
-from typing import Optional
 from voice_mode.server import mcp
 from voice_mode.config import SAVE_AUDIO, AUDIO_DIR, logger
+from voice_mode.audio_catalogue import PAGE_SIZE, get_audio_catalogue, month_range
+
+NOT_ENABLED = "Audio saving is not enabled. Set VOICE_MODE_SAVE_AUDIO=1 to enable."
+
+FILTER_KEYS = ('month', 'day', 'type', 'format', 'conversation', 'limit', 'cursor')
+
+
+def parse_filters(filters: str) -> Dict[str, str]:
+    """Parse ``key=value,key=value`` (or ``all``) from a resource URI.
+
+    Raises:
+        ValueError: Unknown key or malformed pair
+    """
+    parsed: Dict[str, str] = {}
+    if filters in ('', 'all'):
+        return parsed
+    for pair in filters.split(','):
+        key, sep, value = pair.partition('=')
+        key = key.strip()
+        if not sep or key not in FILTER_KEYS:
+            raise ValueError(f"Invalid filter {pair!r}; use key=value with keys {', '.join(FILTER_KEYS)}")
+        parsed[key] = value.strip()
+    return parsed
+
 
-@mcp.resource("audio://files/{directory}")
-async def list_audio_files(directory: str = "all") -> Optional[str]:
+def list_page(filters: str) -> Dict[str, Any]:
+    """One page of the catalogue for a filter string."""
+    parsed = parse_filters(filters)
+    start = end = None
+    period = parsed.get('day') or parsed.get('month')
+    if period:
+        start, end = month_range(period)
+    page = get_audio_catalogue().page(
+        limit=int(parsed.get('limit', PAGE_SIZE)),
+        cursor=parsed.get('cursor'),
+        start=start,
+        end=end,
+        type=parsed.get('type'),
+        format=parsed.get('format'),
+        conversation_id=parsed.get('conversation'),
+    )
+    page['directory'] = str(AUDIO_DIR)
+    if page['next_cursor']:
+        following = {k: v for k, v in parsed.items() if k != 'cursor'}
+        following['cursor'] = page['next_cursor']
+        page['next'] = "audio://files/" + ",".join(f"{k}={v}" for k, v in following.items())
+    return page
+
+
+@mcp.resource("audio://files/{filters}")
+async def list_audio_files(filters: str = "all") -> Optional[str]:
     """List saved audio files if audio saving is enabled.
-    
-    Returns a list of audio files in the audio directory with their
-    creation times and sizes.
+
+    Returns a JSON page of audio files, most recent first, with their size,
+    duration, format, type and conversation. ``filters`` is ``all`` or
+    comma-separated ``key=value`` pairs:
+
+    - month: ``YYYY-MM``; day: ``YYYY-MM-DD``
+    - type: ``stt``, ``tts``, ...; format: ``wav``, ``opus``, ...
+    - conversation: conversation ID
+    - limit: page size (default 50)
+    - cursor: from ``next_cursor``; ``next`` is the URI of the next page
     """
     if not SAVE_AUDIO:
-        return "Audio saving is not enabled. Set VOICE_MODE_SAVE_AUDIO=1 to enable."
-    
-    if not os.path.exists(AUDIO_DIR):
-        return "No audio files found - directory does not exist."
-    
-    audio_files = []
-    for file in sorted(Path(AUDIO_DIR).glob("*.wav")):
-        stat = file.stat()
-        size_kb = stat.st_size / 1024
-        audio_files.append(f"- {file.name} ({size_kb:.1f} KB)")
-    
-    if not audio_files:
-        return "No audio files found."
-    
-    return f"Saved audio files in {AUDIO_DIR}:\n" + "\n".join(audio_files)
+        return NOT_ENABLED
+
+    try:
+        page = await asyncio.to_thread(list_page, filters)
+    except ValueError as e:
+        return json.dumps({"error": str(e)}, indent=2)
+    except Exception as e:
+        logger.error(f"Error listing audio files: {e}")
+        return json.dumps({"error": str(e)}, indent=2)
+    return json.dumps(page, indent=2)
+
 
 @mcp.resource("audio://file/{filename}")
 async def get_audio_file(filename: str) -> Optional[str]:
     """Get metadata about a specific audio file.
-    
+
     Args:
-        filename: Name of the audio file to get metadata for
-        
+        filename: Name of the audio file to get metadata for. The name
+            logged before the file was archived resolves to the Opus copy.
+
     Returns:
-        File metadata including size and creation time.
+        File metadata (JSON) including size, duration and recording time.
     """
     if not SAVE_AUDIO:
-        return "Audio saving is not enabled. Set VOICE_MODE_SAVE_AUDIO=1 to enable."
-    file_path = os.path.join(AUDIO_DIR, filename)
-    
-    if not os.path.exists(file_path):
+        return NOT_ENABLED
+
+    try:
+        entry = await asyncio.to_thread(get_audio_catalogue().get, filename)
+    except Exception as e:
+        logger.error(f"Error reading audio file metadata: {e}")
+        return json.dumps({"error": str(e)}, indent=2)
+    if entry is None:
         return f"Audio file not found: {filename}"
-    
-    stat = os.stat(file_path)
-    size_kb = stat.st_size / 1024
-    
-    return f"""Audio file: {filename}
-Size: {size_kb:.1f} KB
-Created: {stat.st_ctime}
-Path: {file_path}"""
\ No newline at end of file
+    entry['full_path'] = str(AUDIO_DIR / entry['path'])
+    return json.dumps(entry, indent=2)
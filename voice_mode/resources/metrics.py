@@ -0,0 +1,31 @@
+"""MCP resource for the voice pipeline metrics."""
+
+import json
+
+from ..server import mcp
+from ..metrics import REGISTRY
+from ..config import logger
+
+
+@mcp.resource("voice://metrics/{format}")
+async def voice_metrics(format: str = "prometheus") -> str:
+    """
+    Voice pipeline metrics since this server started.
+
+    Latency histograms (TTFA, TTS generation, STT, recording, whole turns)
+    and counters (failovers, errors, playback underruns, cache hits and
+    misses), labeled by provider, endpoint and transport.
+
+    Formats:
+    - prometheus: Prometheus text exposition format
+    - json: the same samples as JSON
+    """
+    try:
+        if format == "prometheus":
+            return REGISTRY.render()
+        if format == "json":
+            return json.dumps(REGISTRY.to_dict(), indent=2)
+        return json.dumps({"error": f"Unknown format {format!r}; use prometheus or json"}, indent=2)
+    except Exception as e:
+        logger.error(f"Error rendering metrics: {e}")
+        return json.dumps({"error": str(e)}, indent=2)
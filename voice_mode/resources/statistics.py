@@ -1,5 +1,6 @@
 """MCP resources for voice conversation statistics."""
 
+import asyncio
 import json
 from typing import Dict, Any
 
@@ -40,27 +41,32 @@ async def current_statistics(type: str = "current") -> str:
                 "ttfa": {
                     "average": stats.avg_ttfa,
                     "minimum": stats.min_ttfa,
-                    "maximum": stats.max_ttfa
+                    "maximum": stats.max_ttfa,
+                    **stats.percentiles.get("ttfa", {})
                 },
                 "tts_generation": {
                     "average": stats.avg_tts_generation,
                     "minimum": stats.min_tts_generation,
-                    "maximum": stats.max_tts_generation
+                    "maximum": stats.max_tts_generation,
+                    **stats.percentiles.get("tts_generation", {})
                 },
                 "tts_playback": {
                     "average": stats.avg_tts_playback,
                     "minimum": stats.min_tts_playback,
-                    "maximum": stats.max_tts_playback
+                    "maximum": stats.max_tts_playback,
+                    **stats.percentiles.get("tts_playback", {})
                 },
                 "stt_processing": {
                     "average": stats.avg_stt_processing,
                     "minimum": stats.min_stt_processing,
-                    "maximum": stats.max_stt_processing
+                    "maximum": stats.max_stt_processing,
+                    **stats.percentiles.get("stt_processing", {})
                 },
                 "total_turnaround": {
                     "average": stats.avg_total_time,
                     "minimum": stats.min_total_time,
-                    "maximum": stats.max_total_time
+                    "maximum": stats.max_total_time,
+                    **stats.percentiles.get("total_time", {})
                 }
             },
             "usage": {
@@ -175,4 +181,30 @@ async def statistics_export(timestamp: str = "latest") -> str:
         
     except Exception as e:
         logger.error(f"Error generating statistics export resource: {e}")
-        return json.dumps({"error": str(e)}, indent=2)
\ No newline at end of file
+        return json.dumps({"error": str(e)}, indent=2)
+
+
+@mcp.resource("voice://statistics/history/{days}")
+async def statistics_history(days: str = "7") -> str:
+    """
+    Voice exchange statistics over the last N days of conversation logs.
+    
+    Unlike the session resources, this covers every logged exchange from
+    today and the previous N days, across sessions:
+    - STT/TTS counts, providers, transports, models and voices
+    - Timing statistics with p50/p95/p99 (TTFA, generation, playback, STT)
+    - Conversation, error and silence detection statistics
+    
+    Use "all" for the complete history.
+    """
+    try:
+        from ..exchanges import ExchangeReader
+        
+        reader = ExchangeReader()
+        # Past days come from cached daily rollups; today's log is parsed
+        stats = await asyncio.to_thread(reader.daily_stats, None if days == "all" else int(days))
+        return json.dumps(stats.to_dict(), indent=2, default=str)
+        
+    except Exception as e:
+        logger.error(f"Error generating statistics history resource: {e}")
+        return json.dumps({"error": str(e)}, indent=2)
@@ -15,43 +15,75 @@ from . import tools
 from . import prompts 
 from . import resources
 
-# Main entry point
-def main():
-    """Run the VoiceMode MCP server."""
-    import os
-    import sys
-    import warnings
-    from .config import setup_logging, EVENT_LOG_ENABLED, EVENT_LOG_DIR
-    from .utils import initialize_event_logger
-    from .utils.ffmpeg_check import check_ffmpeg, check_ffprobe, get_install_instructions
-    from pathlib import Path
+def _run_startup_probes() -> None:
+    """Check FFmpeg availability and record the result in config."""
+    import logging
+    from .utils.ffmpeg_check import check_ffmpeg, check_ffprobe
     
-    # Suppress known deprecation warnings from dependencies
-    # These are upstream issues that don't affect functionality
-    warnings.filterwarnings("ignore", category=SyntaxWarning, module="pydub.utils")
-    warnings.filterwarnings("ignore", message="'audioop' is deprecated", category=DeprecationWarning)
-    warnings.filterwarnings("ignore", message="pkg_resources is deprecated", category=UserWarning)
+    logger = logging.getLogger("voicemode")
     
-    # For MCP mode (stdio transport), we need to let the server start
-    # so the LLM can see error messages in tool responses
-    # MCP servers use stdio with stdin/stdout connected to pipes, not terminals
-    is_mcp_mode = not sys.stdin.isatty() or not sys.stdout.isatty()
+    try:
+        ffmpeg_installed, _ = check_ffmpeg()
+        ffprobe_installed, _ = check_ffprobe()
+    except Exception as e:
+        logger.debug(f"FFmpeg probe failed: {e}")
+        return
+    
+    if ffmpeg_installed and ffprobe_installed:
+        config.FFMPEG_AVAILABLE = True
+    else:
+        logger.warning("FFmpeg is not installed - audio conversion features will not work")
+        logger.warning("Voice features will fail with helpful error messages")
+        # Store this globally so tools can check it
+        config.FFMPEG_AVAILABLE = False
+
+
+def start_background_probes():
+    """Run startup probes on a daemon thread.
+    
+    Returns:
+        The started thread (mainly useful for tests that want to join it)
+    """
+    import threading
+    
+    thread = threading.Thread(
+        target=_run_startup_probes,
+        name="voicemode-startup-probes",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def start_audio_archiver():
+    """Archive saved audio on a daemon thread, now if due and then daily (see voice_mode.audio_archive).
+    
+    Returns:
+        The started thread
+    """
+    import threading
+    from .audio_archive import archive_periodically
+    
+    thread = threading.Thread(
+        target=archive_periodically,
+        name="voicemode-audio-archiver",
+        daemon=True
+    )
+    thread.start()
+    return thread
+
+
+def initialize_server():
+    """Set up logging, background probes and the event logger.
     
-    # Check FFmpeg availability
-    ffmpeg_installed, _ = check_ffmpeg()
-    ffprobe_installed, _ = check_ffprobe()
-    ffmpeg_available = ffmpeg_installed and ffprobe_installed
-    
-    if not ffmpeg_available and not is_mcp_mode:
-        # Interactive mode - show error and exit
-        print("\n" + "="*60)
-        print("⚠️  FFmpeg Installation Required")
-        print("="*60)
-        print(get_install_instructions())
-        print("="*60 + "\n")
-        print("❌ Voice Mode cannot start without FFmpeg.")
-        print("Please install FFmpeg and try again.\n")
-        sys.exit(1)
+    Shared by the stdio server and the daemon.
+    
+    Returns:
+        The configured logger
+    """
+    from pathlib import Path
+    from .config import setup_logging, EVENT_LOG_ENABLED, EVENT_LOG_DIR, AUDIO_ARCHIVE_AUTO, METRICS_HOST, METRICS_PORT
+    from .utils import initialize_event_logger
     
     # Set up logging
     logger = setup_logging()
@@ -60,14 +92,9 @@ def main():
     from .version import __version__
     logger.info(f"Starting VoiceMode v{__version__}")
     
-    # Log FFmpeg status for MCP mode
-    if not ffmpeg_available:
-        logger.warning("FFmpeg is not installed - audio conversion features will not work")
-        logger.warning("Voice features will fail with helpful error messages")
-        # Store this globally so tools can check it
-        config.FFMPEG_AVAILABLE = False
-    else:
-        config.FFMPEG_AVAILABLE = True
+    # Probe FFmpeg in the background so the MCP handshake isn't delayed.
+    # Tools treat FFMPEG_AVAILABLE as True until the probe says otherwise.
+    start_background_probes()
     
     # Initialize event logger
     if EVENT_LOG_ENABLED:
@@ -79,8 +106,66 @@ def main():
     else:
         logger.info("Event logging disabled")
     
+    # Transcode and prune saved audio, at most once a day
+    if AUDIO_ARCHIVE_AUTO:
+        start_audio_archiver()
+    
+    # Prometheus scrape endpoint, shared with the other MCP processes on this host
+    if METRICS_PORT > 0:
+        from .config import METRICS_SNAPSHOT_DIR
+        from .metrics import start_metrics_export
+        start_metrics_export(METRICS_PORT, METRICS_HOST, METRICS_SNAPSHOT_DIR)
+    
+    return logger
+
+
+# Main entry point
+def main():
+    """Run the VoiceMode MCP server."""
+    import os
+    import sys
+    import warnings
+    from .config import DAEMON_AUTO_CONNECT
+    from .utils.ffmpeg_check import check_ffmpeg, check_ffprobe, get_install_instructions
+    
+    # Suppress known deprecation warnings from dependencies
+    # These are upstream issues that don't affect functionality
+    warnings.filterwarnings("ignore", category=SyntaxWarning, module="pydub.utils")
+    warnings.filterwarnings("ignore", message="'audioop' is deprecated", category=DeprecationWarning)
+    warnings.filterwarnings("ignore", message="pkg_resources is deprecated", category=UserWarning)
+    
+    # For MCP mode (stdio transport), we need to let the server start
+    # so the LLM can see error messages in tool responses
+    # MCP servers use stdio with stdin/stdout connected to pipes, not terminals
+    is_mcp_mode = not sys.stdin.isatty() or not sys.stdout.isatty()
+    
+    if not is_mcp_mode:
+        # Interactive mode - check FFmpeg up front so we can show error and exit
+        ffmpeg_installed, _ = check_ffmpeg()
+        ffprobe_installed, _ = check_ffprobe()
+        if not (ffmpeg_installed and ffprobe_installed):
+            print("\n" + "="*60)
+            print("⚠️  FFmpeg Installation Required")
+            print("="*60)
+            print(get_install_instructions())
+            print("="*60 + "\n")
+            print("❌ Voice Mode cannot start without FFmpeg.")
+            print("Please install FFmpeg and try again.\n")
+            sys.exit(1)
+    
+    # Forward to a resident daemon if one is running, so this session shares
+    # its warm audio stack, provider state and microphone arbitration
+    if is_mcp_mode and DAEMON_AUTO_CONNECT:
+        from .daemon import find_running_daemon, run_stdio_shim
+        daemon = find_running_daemon()
+        if daemon:
+            run_stdio_shim(daemon)
+            return
+    
+    initialize_server()
+    
     # Run the server
     mcp.run(transport="stdio")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
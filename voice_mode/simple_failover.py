@@ -7,16 +7,33 @@ Connection refused errors are instant, so there's no performance penalty.
 
 import logging
 from typing import Optional, Tuple, Dict, Any
-from openai import AsyncOpenAI
+from .utils.lazy_imports import lazy_import
+from .audio_scheduler import AudioSchedulerError
 from .openai_error_parser import OpenAIErrorParser
 from .provider_discovery import is_local_provider
 
 from .config import TTS_BASE_URLS, STT_BASE_URLS, OPENAI_API_KEY
 from .provider_discovery import detect_provider_type
+from .tracing import SPAN_KIND_CLIENT, start_span
+from .metrics import record_request_error
+
+AsyncOpenAI = lazy_import("openai", "AsyncOpenAI")
 
 logger = logging.getLogger("voicemode")
 
 
+async def _close_client(client) -> None:
+    """Release a per-request client's connection pool.
+
+    The clients are made for one request, so their sockets would otherwise
+    stay open until the garbage collector gets to them.
+    """
+    try:
+        await client.close()
+    except Exception as e:
+        logger.debug(f"Failed to close client: {e}")
+
+
 async def simple_tts_failover(
     text: str,
     voice: str,
@@ -44,7 +61,7 @@ async def simple_tts_failover(
 
     # Try each TTS endpoint in order
     logger.info(f"simple_tts_failover: Starting with TTS_BASE_URLS = {TTS_BASE_URLS}")
-    for base_url in TTS_BASE_URLS:
+    for i, base_url in enumerate(TTS_BASE_URLS):
         logger.info(f"Trying TTS endpoint: {base_url}")
 
         # Create client for this endpoint
@@ -89,15 +106,24 @@ async def simple_tts_failover(
         # Wrap in try/catch to get actual exception details
         last_exception = None
         try:
-            success, metrics = await text_to_speech(
-                text=text,
-                openai_clients=openai_clients,
-                tts_model=model,
-                tts_voice=selected_voice,
-                tts_base_url=base_url,
-                conversation_id=conversation_id,
-                **kwargs
-            )
+            # text_to_speech adds first_byte and the playback span to it
+            with start_span("tts.request", {
+                "endpoint": f"{base_url}/audio/speech",
+                "provider": provider_type,
+                "model": model,
+                "voice": selected_voice,
+            }, kind=SPAN_KIND_CLIENT) as request_span:
+                success, metrics = await text_to_speech(
+                    text=text,
+                    openai_clients=openai_clients,
+                    tts_model=model,
+                    tts_voice=selected_voice,
+                    tts_base_url=base_url,
+                    conversation_id=conversation_id,
+                    **kwargs
+                )
+                if not success:
+                    request_span.set_error("TTS request failed")
 
             if success:
                 config = {
@@ -114,14 +140,20 @@ async def simple_tts_failover(
                 # Create a generic error message
                 last_exception = Exception("TTS request failed")
 
+        except AudioSchedulerError:
+            # Waiting for the audio device is not a provider failure
+            raise
         except Exception as e:
             last_exception = e
+        finally:
+            await _close_client(client)
 
         # Handle the error (either from exception or False return)
         if last_exception:
             error_message = str(last_exception)
             logger.error(f"TTS failed for {base_url}: {error_message}")
             logger.debug(f"Exception type: {type(last_exception).__name__}")  # Debug logging
+            record_request_error("tts", provider_type, base_url, failover=i < len(TTS_BASE_URLS) - 1)
 
             # Parse OpenAI errors for better user feedback
             error_details = None
@@ -179,6 +211,7 @@ async def simple_stt_failover(
 
     # Try each STT endpoint in order
     for i, base_url in enumerate(STT_BASE_URLS):
+        client = None
         try:
             # Detect provider type for logging
             provider_type = detect_provider_type(base_url)
@@ -201,13 +234,20 @@ async def simple_stt_failover(
             )
 
             # Try STT with this endpoint
-            transcription = await client.audio.transcriptions.create(
-                model=model,
-                file=audio_file,
-                response_format="text"
-            )
-
-            text = transcription.strip() if isinstance(transcription, str) else transcription.text.strip()
+            with start_span("stt.request", {
+                "endpoint": f"{base_url}/audio/transcriptions",
+                "provider": provider_type,
+                "model": model,
+                "bytes": audio_file.getbuffer().nbytes if hasattr(audio_file, "getbuffer") else None,
+            }, kind=SPAN_KIND_CLIENT) as request_span:
+                transcription = await client.audio.transcriptions.create(
+                    model=model,
+                    file=audio_file,
+                    response_format="text"
+                )
+
+                text = transcription.strip() if isinstance(transcription, str) else transcription.text.strip()
+                request_span.set_attribute("text.length", len(text))
 
             if text:
                 logger.info(f"✓ STT succeeded with {provider_type} at {base_url}")
@@ -223,6 +263,7 @@ async def simple_stt_failover(
         except Exception as e:
             error_str = str(e)
             provider_type = detect_provider_type(base_url)
+            record_request_error("stt", provider_type, base_url, failover=i < len(STT_BASE_URLS) - 1)
 
             # Parse OpenAI errors for better user feedback
             error_details = None
@@ -253,6 +294,9 @@ async def simple_stt_failover(
 
             # Continue to next endpoint
             continue
+        finally:
+            if client is not None:
+                await _close_client(client)
 
     # Determine what to return based on results
     if successful_but_empty:
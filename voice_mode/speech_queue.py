@@ -0,0 +1,346 @@
+"""Background playback queue for speak-only messages.
+
+``converse(wait_for_response=False, wait_for_playback=False)`` hands the
+message to this queue and returns as soon as it is accepted, so agents can
+narrate progress without waiting for the speech to finish. Workers
+synthesize and play queued messages through the audio scheduler. Two
+workers run at once, so the next message is synthesized while the current
+one plays, and messages from one session are always played in the order
+they were queued.
+
+The queue is bounded. When it is full, ``VOICEMODE_SPEAK_QUEUE_POLICY``
+decides what happens:
+
+- ``block``: the caller waits for space (up to the device wait timeout)
+- ``drop``: the new message is rejected
+- ``coalesce``: the new message is appended to the same session's newest
+  queued message (when the voice settings match), otherwise it blocks
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("voicemode")
+
+# Jobs processed concurrently: one playing, one synthesizing ahead
+SYNTHESIS_WORKERS = 2
+
+# Finished jobs kept for status queries
+HISTORY_SIZE = 50
+
+FINISHED_STATES = ("done", "failed", "cancelled")
+
+
+class SpeechQueueFull(RuntimeError):
+    """Raised when a message is rejected by the queue's back-pressure policy."""
+
+
+@dataclass
+class SpeechJob:
+    """A message queued for background playback."""
+    id: int
+    owner: str
+    message: str
+    options: Dict[str, object] = field(default_factory=dict)
+    state: str = "queued"
+    queued_at: float = field(default_factory=time.monotonic)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    success: Optional[bool] = None
+    result: Optional[str] = None
+    metrics: Dict[str, float] = field(default_factory=dict)
+    coalesced: int = 0
+    after: Optional[asyncio.Event] = field(default=None, repr=False)
+    started: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def to_dict(self) -> Dict[str, object]:
+        now = time.monotonic()
+        data = {
+            "id": self.id,
+            "state": self.state,
+            "message": self.message if len(self.message) <= 80 else self.message[:77] + "...",
+            "queued_seconds": round((self.started_at or self.finished_at or now) - self.queued_at, 3)
+        }
+        if self.started_at is not None:
+            data["run_seconds"] = round((self.finished_at or now) - self.started_at, 3)
+        if self.coalesced:
+            data["coalesced"] = self.coalesced
+        if self.finished:
+            data["success"] = bool(self.success)
+            data["result"] = self.result
+        if self.metrics:
+            data["metrics"] = {k: round(v, 3) for k, v in self.metrics.items() if isinstance(v, (int, float))}
+        return data
+
+
+# Speaks one job: returns (success, result message, tts metrics)
+SpeakFunction = Callable[[SpeechJob], Awaitable[Tuple[bool, str, Optional[dict]]]]
+
+
+class SpeechQueue:
+    """Bounded queue of speak-only messages played in the background."""
+
+    def __init__(
+        self,
+        speak: SpeakFunction,
+        maxsize: int = 8,
+        policy: str = "block",
+        block_timeout: Optional[float] = None,
+        workers: int = SYNTHESIS_WORKERS
+    ):
+        self._speak = speak
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.worker_count = workers
+        self._ids = itertools.count(1)
+        self._pending: Deque[SpeechJob] = deque()
+        self._active: Dict[int, Tuple[SpeechJob, asyncio.Task]] = {}
+        self._finished: Deque[SpeechJob] = deque(maxlen=HISTORY_SIZE)
+        self._tails: Dict[str, asyncio.Event] = {}
+        self._changed: Optional[asyncio.Condition] = None
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.total_submitted = 0
+        self.total_completed = 0
+        self.total_failed = 0
+        self.total_dropped = 0
+        self.total_coalesced = 0
+        self.total_cancelled = 0
+        self.total_blocked_seconds = 0.0
+        self.max_depth = 0
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # First use, or the previous event loop is gone
+            self._loop = loop
+            self._changed = asyncio.Condition()
+            self._workers = []
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < self.worker_count:
+            self._workers.append(loop.create_task(self._worker(), name="voicemode-speech-worker"))
+
+    async def submit(self, owner: str, message: str, options: Optional[Dict[str, object]] = None) -> SpeechJob:
+        """Queue a message for background playback.
+
+        Returns:
+            The queued job (an existing job when the message was coalesced)
+
+        Raises:
+            SpeechQueueFull: If the queue is full and the policy rejects the message
+        """
+        options = dict(options or {})
+        self._ensure_workers()
+        async with self._changed:
+            if len(self._pending) >= self.maxsize:
+                if self.policy == "coalesce":
+                    target = self._coalesce_target(owner, options)
+                    if target is not None:
+                        target.message = f"{target.message} {message}"
+                        target.coalesced += 1
+                        self.total_coalesced += 1
+                        logger.info(f"Speech queue full, appended message to job {target.id}")
+                        return target
+                if self.policy == "drop":
+                    self.total_dropped += 1
+                    raise SpeechQueueFull(
+                        f"Speech queue is full ({len(self._pending)} messages waiting); message dropped"
+                    )
+                start = time.monotonic()
+                try:
+                    await asyncio.wait_for(
+                        self._changed.wait_for(lambda: len(self._pending) < self.maxsize),
+                        self.block_timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.total_dropped += 1
+                    raise SpeechQueueFull(
+                        f"Speech queue stayed full for {self.block_timeout:.0f}s; message dropped"
+                    ) from None
+                finally:
+                    self.total_blocked_seconds += time.monotonic() - start
+
+            job = SpeechJob(id=next(self._ids), owner=owner, message=message, options=options)
+            job.after = self.tail(owner)
+            self._tails[owner] = job.started
+            self._pending.append(job)
+            self.total_submitted += 1
+            self.max_depth = max(self.max_depth, len(self._pending))
+            self._changed.notify_all()
+            return job
+
+    def _coalesce_target(self, owner: str, options: Dict[str, object]) -> Optional[SpeechJob]:
+        for job in reversed(self._pending):
+            if job.owner == owner:
+                return job if job.options == options else None
+        return None
+
+    def tail(self, owner: str) -> Optional[asyncio.Event]:
+        """Event set once the owner's newest queued message has reached the speaker.
+
+        Blocking speech from the same session waits on it so it is not
+        heard before messages queued earlier.
+        """
+        event = self._tails.get(owner)
+        if event is None or event.is_set():
+            return None
+        return event
+
+    async def _worker(self) -> None:
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self._pending)
+                job = self._pending.popleft()
+                task = asyncio.get_running_loop().create_task(self._run(job))
+                self._active[job.id] = (job, task)
+                self._changed.notify_all()
+            try:
+                await asyncio.wait({task})
+            finally:
+                self._active.pop(job.id, None)
+                self._finished.append(job)
+
+    async def _run(self, job: SpeechJob) -> None:
+        job.state = "running"
+        job.started_at = time.monotonic()
+        try:
+            success, result, metrics = await self._speak(job)
+            job.success = success
+            job.result = result
+            job.metrics = dict(metrics or {})
+            job.state = "done" if success else "failed"
+        except asyncio.CancelledError:
+            job.state = "cancelled"
+            job.success = False
+            job.result = "Cancelled"
+        except Exception as e:
+            logger.error(f"Background speech job {job.id} failed: {e}")
+            job.state = "failed"
+            job.success = False
+            job.result = f"Error: {e}"
+        finally:
+            self._finish(job)
+
+    def _finish(self, job: SpeechJob) -> None:
+        job.finished_at = time.monotonic()
+        if job.state == "done":
+            self.total_completed += 1
+        elif job.state == "cancelled":
+            self.total_cancelled += 1
+        else:
+            self.total_failed += 1
+        job.started.set()
+        job.done.set()
+
+    def get(self, job_id: int) -> Optional[SpeechJob]:
+        """Look up a pending, running or recently finished job."""
+        for job in self._jobs():
+            if job.id == job_id:
+                return job
+        return None
+
+    def _jobs(self) -> Iterable[SpeechJob]:
+        yield from self._pending
+        for job, _ in self._active.values():
+            yield job
+        yield from self._finished
+
+    def jobs(self, owner: Optional[str] = None) -> List[SpeechJob]:
+        """Pending, running and recently finished jobs, oldest first."""
+        jobs = [job for job in self._jobs() if owner is None or job.owner == owner]
+        return sorted(jobs, key=lambda job: job.id)
+
+    def cancel(self, job_id: Optional[int] = None, owner: Optional[str] = None) -> int:
+        """Cancel queued or running jobs by id or owner.
+
+        Returns:
+            Number of jobs cancelled
+        """
+        if job_id is None and owner is None:
+            return 0
+
+        def matches(job: SpeechJob) -> bool:
+            return (job_id is None or job.id == job_id) and (owner is None or job.owner == owner)
+
+        cancelled = 0
+        for job in [job for job in self._pending if matches(job)]:
+            self._pending.remove(job)
+            job.state = "cancelled"
+            job.result = "Cancelled"
+            job.success = False
+            self._finish(job)
+            self._finished.append(job)
+            cancelled += 1
+        for job, task in list(self._active.values()):
+            if matches(job) and not task.done():
+                task.cancel()
+                cancelled += 1
+        if cancelled and self._changed is not None:
+            self._loop.create_task(self._notify())
+        return cancelled
+
+    async def _notify(self) -> None:
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def wait(self, jobs: List[SpeechJob], timeout: Optional[float] = None) -> bool:
+        """Wait for jobs to finish.
+
+        Returns:
+            True if all jobs finished within ``timeout``
+        """
+        waiting = [job.done.wait() for job in jobs if not job.done.is_set()]
+        if not waiting:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*waiting), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def status(self, owner: Optional[str] = None) -> Dict[str, object]:
+        """Queue depth, counters and jobs (of ``owner`` when given)."""
+        return {
+            "policy": self.policy,
+            "maxsize": self.maxsize,
+            "queue_depth": len(self._pending),
+            "max_depth": self.max_depth,
+            "running": len(self._active),
+            "submitted": self.total_submitted,
+            "completed": self.total_completed,
+            "failed": self.total_failed,
+            "dropped": self.total_dropped,
+            "coalesced": self.total_coalesced,
+            "cancelled": self.total_cancelled,
+            "blocked_seconds": round(self.total_blocked_seconds, 3),
+            "jobs": [job.to_dict() for job in self.jobs(owner)]
+        }
+
+
+_speech_queue: Optional[SpeechQueue] = None
+
+
+def get_speech_queue() -> SpeechQueue:
+    """Get the process-wide background speech queue."""
+    global _speech_queue
+    if _speech_queue is None:
+        from .config import AUDIO_DEVICE_WAIT_TIMEOUT, SPEAK_QUEUE_POLICY, SPEAK_QUEUE_SIZE
+        from .tools.converse import speak_queued_message
+        _speech_queue = SpeechQueue(
+            speak_queued_message,
+            maxsize=SPEAK_QUEUE_SIZE,
+            policy=SPEAK_QUEUE_POLICY,
+            block_timeout=AUDIO_DEVICE_WAIT_TIMEOUT
+        )
+    return _speech_queue
@@ -8,14 +8,17 @@ including turnaround times, processing speeds, and session statistics.
 import time
 import json
 import threading
-from typing import Dict, List, Optional, Any
+from collections import Counter, deque
+from typing import Deque, Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-from statistics import mean, median
 from pathlib import Path
 
 import logging
 
+from .accumulators import RunningStats
+from .timings import parse_timing_string
+
 logger = logging.getLogger("voice-mode")
 
 
@@ -78,6 +81,9 @@ class SessionStatistics:
     # Session duration
     session_duration: Optional[float] = None
     
+    # p50/p95/p99 per timing metric (ttfa, tts_generation, ...)
+    percentiles: Dict[str, Dict[str, float]] = None
+    
     def __post_init__(self):
         if self.voice_providers_used is None:
             self.voice_providers_used = {}
@@ -87,43 +93,64 @@ class SessionStatistics:
             self.voices_used = {}
         if self.models_used is None:
             self.models_used = {}
+        if self.percentiles is None:
+            self.percentiles = {}
 
 
 class ConversationStatistics:
-    """Thread-safe conversation statistics tracker."""
+    """Thread-safe conversation statistics tracker.
+    
+    Session statistics are kept as running accumulators updated with each
+    interaction, so they cover the whole session and reading them is O(1).
+    Only the most recent interactions are kept individually.
+    """
+    
+    # ConversationMetric timing fields with session accumulators
+    TIMING_FIELDS = ('ttfa', 'tts_generation', 'tts_playback', 'stt_processing', 'total_time')
     
     def __init__(self):
         self._lock = threading.Lock()
-        self._metrics: List[ConversationMetric] = []
-        self._session_start = time.time()
         self._max_metrics = 1000  # Keep last 1000 interactions
+        self._reset()
+    
+    def _reset(self) -> None:
+        self._metrics: Deque[ConversationMetric] = deque(maxlen=self._max_metrics)
+        self._session_start = time.time()
+        self._total = 0
+        self._successful = 0
+        self._timings: Dict[str, RunningStats] = {name: RunningStats() for name in self.TIMING_FIELDS}
+        self._voice_providers = Counter()
+        self._transports = Counter()
+        self._voices = Counter()
+        self._models = Counter()
         
     def add_metric(self, metric: ConversationMetric) -> None:
         """Add a new conversation metric."""
         with self._lock:
             self._metrics.append(metric)
             
-            # Keep only the most recent metrics to prevent memory bloat
-            if len(self._metrics) > self._max_metrics:
-                self._metrics = self._metrics[-self._max_metrics:]
+            self._total += 1
+            if metric.success:
+                self._successful += 1
+                # Timing statistics come from successful interactions only
+                for name in self.TIMING_FIELDS:
+                    value = getattr(metric, name)
+                    if value is not None:
+                        self._timings[name].add(value)
+            
+            if metric.voice_provider:
+                self._voice_providers[metric.voice_provider] += 1
+            if metric.transport:
+                self._transports[metric.transport] += 1
+            if metric.voice_name:
+                self._voices[metric.voice_name] += 1
+            if metric.model:
+                self._models[metric.model] += 1
                 
     def parse_timing_string(self, timing_str: str) -> Dict[str, float]:
         """Parse timing string from conversation tools response."""
-        timings = {}
-        if not timing_str:
-            return timings
-            
-        # Example: "ttfa 0.5s, tts_gen 1.2s, tts_play 2.1s, tts_total 3.3s, record 15.0s, stt 0.8s, total 19.1s"
-        parts = timing_str.split(", ")
-        for part in parts:
-            if " " in part:
-                key, value = part.split(" ", 1)
-                if value.endswith("s"):
-                    try:
-                        timings[key] = float(value[:-1])
-                    except ValueError:
-                        continue
-        return timings
+        # Example: "ttfa 0.5s, gen 1.2s, play 2.1s, record 15.0s, stt 0.8s, total 19.1s"
+        return parse_timing_string(timing_str)
         
     def add_conversation_result(self, 
                               message: str, 
@@ -134,11 +161,17 @@ class ConversationStatistics:
                               voice_name: Optional[str] = None,
                               model: Optional[str] = None,
                               success: bool = True,
-                              error_message: Optional[str] = None) -> None:
-        """Add a conversation result with parsed timing data."""
+                              error_message: Optional[str] = None,
+                              timings: Optional[Dict[str, float]] = None) -> None:
+        """Add a conversation result.
         
-        # Parse timing information
-        timings = self.parse_timing_string(timing_str) if timing_str else {}
+        Args:
+            timings: Stage timings in seconds (ttfa, tts_gen, tts_play,
+                tts_total, record, stt, total). If omitted, they are parsed
+                from timing_str.
+        """
+        if timings is None:
+            timings = self.parse_timing_string(timing_str)
         
         metric = ConversationMetric(
             timestamp=time.time(),
@@ -164,83 +197,55 @@ class ConversationStatistics:
     def get_session_statistics(self) -> SessionStatistics:
         """Calculate current session statistics."""
         with self._lock:
-            if not self._metrics:
+            if not self._total:
                 return SessionStatistics(start_time=self._session_start)
-                
-            successful_metrics = [m for m in self._metrics if m.success]
-            
-            def safe_stat(values: List[float], stat_func):
-                """Safely calculate statistics, handling empty lists."""
-                if not values:
-                    return None
-                return stat_func(values)
             
-            def safe_values(metrics: List[ConversationMetric], attr: str) -> List[float]:
-                """Extract non-None values for an attribute."""
-                return [getattr(m, attr) for m in metrics if getattr(m, attr) is not None]
-            
-            # Calculate timing statistics from successful interactions
-            ttfa_values = safe_values(successful_metrics, 'ttfa')
-            tts_gen_values = safe_values(successful_metrics, 'tts_generation')
-            tts_play_values = safe_values(successful_metrics, 'tts_playback')
-            stt_values = safe_values(successful_metrics, 'stt_processing')
-            total_values = safe_values(successful_metrics, 'total_time')
-            
-            # Count provider usage
-            voice_providers = {}
-            transports = {}
-            voices = {}
-            models = {}
-            
-            for metric in self._metrics:
-                if metric.voice_provider:
-                    voice_providers[metric.voice_provider] = voice_providers.get(metric.voice_provider, 0) + 1
-                if metric.transport:
-                    transports[metric.transport] = transports.get(metric.transport, 0) + 1
-                if metric.voice_name:
-                    voices[metric.voice_name] = voices.get(metric.voice_name, 0) + 1
-                if metric.model:
-                    models[metric.model] = models.get(metric.model, 0) + 1
+            timings = self._timings
             
             stats = SessionStatistics(
                 start_time=self._session_start,
-                total_interactions=len(self._metrics),
-                successful_interactions=len(successful_metrics),
-                failed_interactions=len(self._metrics) - len(successful_metrics),
+                total_interactions=self._total,
+                successful_interactions=self._successful,
+                failed_interactions=self._total - self._successful,
                 
                 # TTFA statistics
-                avg_ttfa=safe_stat(ttfa_values, mean),
-                min_ttfa=safe_stat(ttfa_values, min),
-                max_ttfa=safe_stat(ttfa_values, max),
+                avg_ttfa=timings['ttfa'].mean,
+                min_ttfa=timings['ttfa'].min,
+                max_ttfa=timings['ttfa'].max,
                 
                 # TTS generation statistics
-                avg_tts_generation=safe_stat(tts_gen_values, mean),
-                min_tts_generation=safe_stat(tts_gen_values, min),
-                max_tts_generation=safe_stat(tts_gen_values, max),
+                avg_tts_generation=timings['tts_generation'].mean,
+                min_tts_generation=timings['tts_generation'].min,
+                max_tts_generation=timings['tts_generation'].max,
                 
                 # TTS playback statistics
-                avg_tts_playback=safe_stat(tts_play_values, mean),
-                min_tts_playback=safe_stat(tts_play_values, min),
-                max_tts_playback=safe_stat(tts_play_values, max),
+                avg_tts_playback=timings['tts_playback'].mean,
+                min_tts_playback=timings['tts_playback'].min,
+                max_tts_playback=timings['tts_playback'].max,
                 
                 # STT statistics
-                avg_stt_processing=safe_stat(stt_values, mean),
-                min_stt_processing=safe_stat(stt_values, min),
-                max_stt_processing=safe_stat(stt_values, max),
+                avg_stt_processing=timings['stt_processing'].mean,
+                min_stt_processing=timings['stt_processing'].min,
+                max_stt_processing=timings['stt_processing'].max,
                 
                 # Total time statistics
-                avg_total_time=safe_stat(total_values, mean),
-                min_total_time=safe_stat(total_values, min),
-                max_total_time=safe_stat(total_values, max),
+                avg_total_time=timings['total_time'].mean,
+                min_total_time=timings['total_time'].min,
+                max_total_time=timings['total_time'].max,
                 
                 # Provider usage
-                voice_providers_used=voice_providers,
-                transports_used=transports,
-                voices_used=voices,
-                models_used=models,
+                voice_providers_used=dict(self._voice_providers),
+                transports_used=dict(self._transports),
+                voices_used=dict(self._voices),
+                models_used=dict(self._models),
                 
                 # Session duration
-                session_duration=time.time() - self._session_start
+                session_duration=time.time() - self._session_start,
+                
+                percentiles={
+                    name: {key: value for key, value in accumulator.to_dict().items() if key.startswith('p')}
+                    for name, accumulator in timings.items() if accumulator
+                }
             )
             
             return stats
@@ -248,21 +253,22 @@ class ConversationStatistics:
     def get_recent_metrics(self, limit: int = 10) -> List[ConversationMetric]:
         """Get the most recent conversation metrics."""
         with self._lock:
-            return self._metrics[-limit:] if self._metrics else []
+            return list(self._metrics)[-limit:] if self._metrics else []
     
     def clear_statistics(self) -> None:
         """Clear all statistics and restart the session."""
         with self._lock:
-            self._metrics.clear()
-            self._session_start = time.time()
+            self._reset()
     
     def export_metrics(self) -> Dict[str, Any]:
         """Export all metrics and statistics as a dictionary."""
+        # Computed before taking the lock; get_session_statistics takes it too
+        statistics = asdict(self.get_session_statistics())
         with self._lock:
             return {
                 'session_start': self._session_start,
                 'metrics': [asdict(m) for m in self._metrics],
-                'statistics': asdict(self.get_session_statistics())
+                'statistics': statistics
             }
     
     def format_dashboard(self) -> str:
@@ -290,25 +296,30 @@ class ConversationStatistics:
             lines.append(f"\n⚡ PERFORMANCE METRICS (seconds)")
             lines.append("-" * 30)
             
-            def format_stat(label: str, avg: Optional[float], min_val: Optional[float], max_val: Optional[float]):
+            def format_stat(label: str, avg: Optional[float], min_val: Optional[float], max_val: Optional[float],
+                            metric: str):
                 if avg is not None:
-                    return f"{label:20} {avg:6.2f}s  (min: {min_val:5.2f}s, max: {max_val:5.2f}s)"
+                    line = f"{label:20} {avg:6.2f}s  (min: {min_val:5.2f}s, max: {max_val:5.2f}s"
+                    p95 = stats.percentiles.get(metric, {}).get('p95')
+                    if p95 is not None:
+                        line += f", p95: {p95:5.2f}s"
+                    return line + ")"
                 return f"{label:20} No data"
             
             if stats.avg_ttfa is not None:
-                lines.append(format_stat("Time to First Audio:", stats.avg_ttfa, stats.min_ttfa, stats.max_ttfa))
+                lines.append(format_stat("Time to First Audio:", stats.avg_ttfa, stats.min_ttfa, stats.max_ttfa, 'ttfa'))
             
             if stats.avg_tts_generation is not None:
-                lines.append(format_stat("TTS Generation:", stats.avg_tts_generation, stats.min_tts_generation, stats.max_tts_generation))
+                lines.append(format_stat("TTS Generation:", stats.avg_tts_generation, stats.min_tts_generation, stats.max_tts_generation, 'tts_generation'))
             
             if stats.avg_tts_playback is not None:
-                lines.append(format_stat("TTS Playback:", stats.avg_tts_playback, stats.min_tts_playback, stats.max_tts_playback))
+                lines.append(format_stat("TTS Playback:", stats.avg_tts_playback, stats.min_tts_playback, stats.max_tts_playback, 'tts_playback'))
             
             if stats.avg_stt_processing is not None:
-                lines.append(format_stat("STT Processing:", stats.avg_stt_processing, stats.min_stt_processing, stats.max_stt_processing))
+                lines.append(format_stat("STT Processing:", stats.avg_stt_processing, stats.min_stt_processing, stats.max_stt_processing, 'stt_processing'))
             
             if stats.avg_total_time is not None:
-                lines.append(format_stat("Total Turnaround:", stats.avg_total_time, stats.min_total_time, stats.max_total_time))
+                lines.append(format_stat("Total Turnaround:", stats.avg_total_time, stats.min_total_time, stats.max_total_time, 'total_time'))
         
         # Provider usage
         if any([stats.voice_providers_used, stats.transports_used, stats.voices_used]):
@@ -332,7 +343,7 @@ class ConversationStatistics:
         
         # Recent interactions
         if recent:
-            lines.append(f"\n📝 RECENT INTERACTIONS ({len(recent)} of {len(self._metrics)})")
+            lines.append(f"\n📝 RECENT INTERACTIONS ({len(recent)} of {stats.total_interactions})")
             lines.append("-" * 30)
             
             for i, metric in enumerate(reversed(recent), 1):
@@ -362,7 +373,8 @@ def track_conversation(message: str,
                       voice_name: Optional[str] = None,
                       model: Optional[str] = None,
                       success: bool = True,
-                      error_message: Optional[str] = None) -> None:
+                      error_message: Optional[str] = None,
+                      timings: Optional[Dict[str, float]] = None) -> None:
     """
     Convenience function to track a conversation interaction.
     
@@ -377,5 +389,6 @@ def track_conversation(message: str,
         voice_name=voice_name,
         model=model,
         success=success,
-        error_message=error_message
+        error_message=error_message,
+        timings=timings
     )
\ No newline at end of file
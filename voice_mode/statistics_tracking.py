@@ -4,7 +4,7 @@ This module contains tracking functions that can be imported by tools
 without causing the statistics tools themselves to be loaded.
 """
 
-from typing import Optional
+from typing import Dict, Optional
 from .statistics import track_conversation
 from .config import logger
 
@@ -17,11 +17,14 @@ def track_voice_interaction(message: str,
                            voice_name: Optional[str] = None,
                            model: Optional[str] = None,
                            success: bool = True,
-                           error_message: Optional[str] = None) -> None:
+                           error_message: Optional[str] = None,
+                           timings: Optional[Dict[str, float]] = None) -> None:
     """
     Track a voice interaction for statistics.
     
     This function should be called from conversation tools to record metrics.
+    ``timings`` are stage timings in seconds, as measured; ``timing_str`` is
+    only parsed when they are not given.
     """
     try:
         track_conversation(
@@ -33,7 +36,8 @@ def track_voice_interaction(message: str,
             voice_name=voice_name,
             model=model,
             success=success,
-            error_message=error_message
+            error_message=error_message,
+            timings=timings
         )
         logger.debug(f"Tracked voice interaction: {len(message)} chars, success={success}")
         
@@ -3,6 +3,11 @@ Streaming audio playback for voice-mode.
 
 This module provides progressive audio playback to reduce latency
 by playing audio chunks as they arrive from the TTS service.
+
+The streaming functions take the audio device (``playback_device``, e.g.
+``AudioScheduler.device("playback")``) only once the first audio is ready,
+and keep downloading while they wait for it, so synthesis overlaps another
+job's playback.
 """
 
 import asyncio
@@ -11,7 +16,8 @@ import logging
 import time
 import queue
 import threading
-from typing import Optional, Tuple, AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncContextManager, Optional, Tuple, AsyncIterator
 from dataclasses import dataclass
 from pathlib import Path
 import numpy as np
@@ -26,7 +32,10 @@ from .config import (
     SAMPLE_RATE,
     logger
 )
+from .audio_scheduler import AudioSchedulerError, current_audio_job
+from .tracing import current_span, start_span
 from .utils import get_event_logger
+from .utils.audio_callback_stats import CallbackStats
 
 # Opus decoder support (optional)
 try:
@@ -47,6 +56,9 @@ class StreamMetrics:
     chunks_received: int = 0
     chunks_played: int = 0
     audio_path: Optional[str] = None  # Path to saved audio file
+    output_latency: Optional[float] = None  # Output latency reported by the stream (seconds)
+    callback_stats: Optional[dict] = None  # CallbackStats.to_dict() for callback-driven playback
+    interrupted: bool = False  # Playback was stopped by the audio scheduler
 
 
 class AudioStreamPlayer:
@@ -77,6 +89,7 @@ class AudioStreamPlayer:
         # Sounddevice stream
         self.stream = None
         self._lock = threading.Lock()
+        self.callback_stats = CallbackStats("output", sample_rate)
         
     def _get_decoder(self):
         """Get appropriate decoder for the audio format."""
@@ -92,6 +105,7 @@ class AudioStreamPlayer:
     
     def _audio_callback(self, outdata, frames, time_info, status):
         """Sounddevice callback for audio playback."""
+        started = time.perf_counter()
         if status:
             logger.debug(f"Sounddevice status: {status}")
             
@@ -114,6 +128,7 @@ class AudioStreamPlayer:
         except Exception as e:
             logger.error(f"Error in audio callback: {e}")
             outdata.fill(0)
+        self.callback_stats.record(started, frames, time_info, status, self.audio_queue.qsize())
     
     async def start(self):
         """Start the audio stream."""
@@ -125,6 +140,7 @@ class AudioStreamPlayer:
             dtype='float32'
         )
         self.stream.start()
+        self.metrics.output_latency = self.callback_stats.reported_latency = self.stream.latency
         logger.debug("Audio stream started")
     
     async def add_chunk(self, chunk: bytes) -> bool:
@@ -239,9 +255,54 @@ class AudioStreamPlayer:
         if self.stream:
             self.stream.stop()
             self.stream.close()
+            self.metrics.callback_stats = self.callback_stats.finish(current_span())
         logger.debug("Audio stream stopped")
 
 
+@asynccontextmanager
+async def _read_ahead(response) -> AsyncIterator[AsyncIterator[bytes]]:
+    """Iterate over a response's chunks while a task keeps downloading them.
+
+    The download does not stall while the consumer waits for the audio device.
+    """
+    chunks: asyncio.Queue = asyncio.Queue()
+
+    async def download():
+        try:
+            async for chunk in response.iter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+                if chunk:
+                    chunks.put_nowait(chunk)
+        finally:
+            chunks.put_nowait(None)
+
+    task = asyncio.create_task(download())
+
+    async def iterate():
+        while (chunk := await chunks.get()) is not None:
+            yield chunk
+        # Raise download errors
+        await task
+
+    try:
+        yield iterate()
+    finally:
+        task.cancel()
+
+
+async def _open_output_stream(device: AsyncExitStack, playback_device: Optional[AsyncContextManager], **stream_args):
+    """Take the audio device (when scheduled) and start an output stream.
+
+    Returns:
+        Tuple of (audio job holding the device or None, started stream)
+    """
+    job = None
+    if playback_device is not None:
+        job = await device.enter_async_context(playback_device)
+    stream = sd.OutputStream(**stream_args)
+    stream.start()
+    return job or current_audio_job(), stream
+
+
 async def stream_pcm_audio(
     text: str,
     openai_client,
@@ -249,17 +310,24 @@ async def stream_pcm_audio(
     debug: bool = False,
     save_audio: bool = False,
     audio_dir: Optional[Path] = None,
-    conversation_id: Optional[str] = None
+    conversation_id: Optional[str] = None,
+    playback_device: Optional[AsyncContextManager] = None
 ) -> Tuple[bool, StreamMetrics]:
     """Stream PCM audio with true HTTP streaming for minimal latency.
     
     Uses the OpenAI SDK's streaming response with iter_bytes() for real-time playback.
+    ``playback_device`` is entered when the first chunk arrives.
     """
     metrics = StreamMetrics()
     start_time = time.perf_counter()
     stream = None
+    device = AsyncExitStack()
+    audio_job = current_audio_job()
     first_chunk_time = None
     save_buffer = io.BytesIO() if save_audio else None
+    # Playback overlaps the download: it starts with the first chunk
+    request_span = current_span()
+    playback_span = None
     
     try:
         # Setup sounddevice stream for PCM playback
@@ -274,18 +342,7 @@ async def stream_pcm_audio(
                 audio_started = True
                 audio_start_time = time.perf_counter()
         
-        stream = sd.OutputStream(
-            samplerate=SAMPLE_RATE,  # Standard TTS sample rate (24kHz)
-            channels=1,
-            dtype='int16'  # PCM is 16-bit integers
-            # Note: Can't use callback and write() together
-        )
-        stream.start()
-        
-        # Log TTS playback start when we start the stream
         event_logger = get_event_logger()
-        if event_logger:
-            event_logger.log_event(event_logger.TTS_PLAYBACK_START)
         
         # Don't add stream parameter - Kokoro defaults to true, OpenAI doesn't support it
         
@@ -294,12 +351,15 @@ async def stream_pcm_audio(
         # Use the streaming response API
         async with openai_client.audio.speech.with_streaming_response.create(
             **request_params
-        ) as response:
+        ) as response, _read_ahead(response) as chunks:
             chunk_count = 0
             bytes_received = 0
             
             # Stream chunks as they arrive
-            async for chunk in response.iter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+            async for chunk in chunks:
+                if audio_job and audio_job.stop_requested:
+                    logger.info("Streaming playback interrupted by the audio scheduler")
+                    break
                 if chunk:
                     # Track first chunk received
                     if first_chunk_time is None:
@@ -308,16 +368,32 @@ async def stream_pcm_audio(
                         logger.info(f"First audio chunk received after {chunk_receive_time:.3f}s")
                         
                         # Log TTS first audio event
-                        event_logger = get_event_logger()
                         if event_logger:
                             event_logger.log_event(event_logger.TTS_FIRST_AUDIO)
+                        request_span.add_event("first_byte")
+                        
+                        # Only now wait for the speaker; later chunks keep downloading meanwhile
+                        audio_job, stream = await _open_output_stream(
+                            device, playback_device,
+                            samplerate=SAMPLE_RATE,  # Standard TTS sample rate (24kHz)
+                            channels=1,
+                            dtype='int16'  # PCM is 16-bit integers
+                            # Note: Can't use callback and write() together
+                        )
+                        metrics.output_latency = stream.latency
+                        if event_logger:
+                            event_logger.log_event(event_logger.TTS_PLAYBACK_START)
+                        playback_span = start_span("tts.playback", {"sample_rate": SAMPLE_RATE})
                     
                     # Convert bytes to numpy array for sounddevice
                     # PCM data is already in the right format
                     audio_array = np.frombuffer(chunk, dtype=np.int16)
                     
-                    # Play the chunk immediately
-                    stream.write(audio_array)
+                    # Play the chunk immediately; True if the device ran dry before it.
+                    # write() blocks while the device buffer is full, so keep it
+                    # off the event loop
+                    if await asyncio.to_thread(stream.write, audio_array) is True:
+                        metrics.buffer_underruns += 1
                     
                     # Save chunk if enabled
                     if save_buffer:
@@ -332,11 +408,20 @@ async def stream_pcm_audio(
                         logger.debug(f"Streamed {chunk_count} chunks, {bytes_received} bytes")
         
         # Wait for playback to finish
-        stream.stop()
+        if stream:
+            await asyncio.to_thread(stream.stop)
+        metrics.interrupted = bool(audio_job and audio_job.stop_requested)
         
         # Log TTS playback end
-        if event_logger:
-            event_logger.log_event(event_logger.TTS_PLAYBACK_END)
+        if event_logger and stream:
+            event_logger.log_event(event_logger.TTS_PLAYBACK_END, {
+                "underruns": metrics.buffer_underruns,
+                "output_latency": metrics.output_latency
+            })
+        request_span.set_attribute("bytes", bytes_received)
+        if playback_span is not None:
+            playback_span.set_attributes(chunks=metrics.chunks_played, underruns=metrics.buffer_underruns,
+                                         output_latency=metrics.output_latency)
         
         end_time = time.perf_counter()
         metrics.generation_time = first_chunk_time - start_time if first_chunk_time else 0
@@ -360,41 +445,36 @@ async def stream_pcm_audio(
         if save_audio and save_buffer and audio_dir:
             try:
                 from .core import save_debug_file
-                save_buffer.seek(0)
-                audio_data = save_buffer.read()
+                from .utils.audio_saver import wav_bytes
+                audio_data = save_buffer.getvalue()
                 # PCM format needs special handling - save as WAV
                 if audio_data:
-                    # For PCM, we need to save as WAV with proper headers
-                    import wave
-                    import tempfile
-                    with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_wav:
-                        with wave.open(tmp_wav.name, 'wb') as wav_file:
-                            wav_file.setnchannels(1)
-                            wav_file.setsampwidth(2)  # 16-bit
-                            wav_file.setframerate(SAMPLE_RATE)
-                            wav_file.writeframes(audio_data)
-                        # Read back the WAV file
-                        with open(tmp_wav.name, 'rb') as f:
-                            wav_data = f.read()
-                        import os
-                        os.unlink(tmp_wav.name)
-                        audio_path = save_debug_file(wav_data, "tts", "wav", audio_dir, True, conversation_id)
-                        if audio_path:
-                            logger.info(f"TTS audio saved to: {audio_path}")
-                            # Store audio path in metrics for the caller
-                            metrics.audio_path = audio_path
+                    # Add WAV headers in memory; the file is written in the background
+                    wav_data = wav_bytes(audio_data, SAMPLE_RATE)
+                    audio_path = save_debug_file(wav_data, "tts", "wav", audio_dir, True, conversation_id)
+                    if audio_path:
+                        logger.info(f"TTS audio saved to: {audio_path}")
+                        # Store audio path in metrics for the caller
+                        metrics.audio_path = audio_path
             except Exception as e:
                 logger.error(f"Failed to save TTS audio: {e}")
         
         return True, metrics
         
+    except AudioSchedulerError:
+        raise
     except Exception as e:
         logger.error(f"PCM streaming failed: {e}")
+        # text_to_speech falls back to buffered playback
+        request_span.add_event("streaming_failed", {"error": str(e)})
         return False, metrics
         
     finally:
+        if playback_span is not None:
+            playback_span.end()
         if stream:
             stream.close()
+        await device.aclose()
 
 
 async def stream_tts_audio(
@@ -404,7 +484,8 @@ async def stream_tts_audio(
     debug: bool = False,
     save_audio: bool = False,
     audio_dir: Optional[Path] = None,
-    conversation_id: Optional[str] = None
+    conversation_id: Optional[str] = None,
+    playback_device: Optional[AsyncContextManager] = None
 ) -> Tuple[bool, StreamMetrics]:
     """Stream TTS audio with progressive playback.
     
@@ -413,6 +494,7 @@ async def stream_tts_audio(
         openai_client: OpenAI client instance
         request_params: Parameters for TTS request
         debug: Enable debug logging
+        playback_device: Audio device context to enter once audio is ready to play
         
     Returns:
         Tuple of (success, metrics)
@@ -430,7 +512,8 @@ async def stream_tts_audio(
             debug=debug,
             save_audio=save_audio,
             audio_dir=audio_dir,
-            conversation_id=conversation_id
+            conversation_id=conversation_id,
+            playback_device=playback_device
         )
     else:
         # Use buffered streaming for formats that need decoding
@@ -441,7 +524,8 @@ async def stream_tts_audio(
             debug=debug,
             save_audio=save_audio,
             audio_dir=audio_dir,
-            conversation_id=conversation_id
+            conversation_id=conversation_id,
+            playback_device=playback_device
         )
 
 
@@ -454,12 +538,14 @@ async def stream_with_buffering(
     debug: bool = False,
     save_audio: bool = False,
     audio_dir: Optional[Path] = None,
-    conversation_id: Optional[str] = None
+    conversation_id: Optional[str] = None,
+    playback_device: Optional[AsyncContextManager] = None
 ) -> Tuple[bool, StreamMetrics]:
     """Fallback streaming that buffers enough data to decode reliably.
     
     This is used for formats like MP3, Opus, etc where frame boundaries are critical.
     For Opus, we download the complete audio before playing.
+    ``playback_device`` is entered once the first audio is decoded.
     """
     format = request_params.get('response_format', 'pcm')
     logger.info(f"Using buffered streaming for format: {format}")
@@ -473,35 +559,38 @@ async def stream_with_buffering(
     save_buffer = io.BytesIO() if save_audio else None
     audio_started = False
     stream = None
+    device = AsyncExitStack()
+    audio_job = current_audio_job()
+    request_span = current_span()
+    playback_span = None
+    bytes_received = 0
+    stream_args = dict(samplerate=sample_rate, channels=1, dtype='float32')
     
     try:
-        # Setup sounddevice stream
-        stream = sd.OutputStream(
-            samplerate=sample_rate,
-            channels=1,
-            dtype='float32'
-        )
-        stream.start()
-        
         # Don't add stream parameter - Kokoro defaults to true, OpenAI doesn't support it
         
         # Use the streaming response API for true HTTP streaming
         async with openai_client.audio.speech.with_streaming_response.create(
             **request_params
-        ) as response:
+        ) as response, _read_ahead(response) as chunks:
             first_chunk_time = None
             
             # Stream chunks as they arrive
-            async for chunk in response.iter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+            async for chunk in chunks:
+                if audio_job and audio_job.stop_requested:
+                    logger.info("Streaming playback interrupted by the audio scheduler")
+                    break
                 if chunk:
                     # Track first chunk for TTFA
                     if first_chunk_time is None:
                         first_chunk_time = time.perf_counter()
                         metrics.ttfa = first_chunk_time - start_time
                         logger.info(f"First chunk received - TTFA: {metrics.ttfa:.3f}s")
+                        request_span.add_event("first_byte")
                     
                     buffer.write(chunk)
                     metrics.chunks_received += 1
+                    bytes_received += len(chunk)
                     
                     # Also accumulate in save buffer if saving is enabled
                     if save_buffer:
@@ -515,18 +604,24 @@ async def stream_with_buffering(
                             audio = AudioSegment.from_file(buffer, format=format)
                             samples = np.array(audio.get_array_of_samples()).astype(np.float32) / 32768.0
                             
-                            # Start playback
+                            # Start playback once the device is ours
+                            audio_job, stream = await _open_output_stream(device, playback_device, **stream_args)
+                            metrics.output_latency = stream.latency
                             metrics.ttfa = time.perf_counter() - start_time
                             audio_started = True
                             logger.info(f"Buffered streaming started - TTFA: {metrics.ttfa:.3f}s")
+                            playback_span = start_span("tts.playback", {"sample_rate": sample_rate})
                             
                             # Play audio
-                            stream.write(samples)
+                            if await asyncio.to_thread(stream.write, samples) is True:
+                                metrics.buffer_underruns += 1
                             metrics.chunks_played += len(samples) // 1024
                             
                             # Reset buffer for next batch
                             buffer = io.BytesIO()
                             
+                        except AudioSchedulerError:
+                            raise
                         except Exception as e:
                             # Not enough valid data yet
                             buffer.seek(0, io.SEEK_END)
@@ -539,16 +634,31 @@ async def stream_with_buffering(
                 samples = np.array(audio.get_array_of_samples()).astype(np.float32) / 32768.0
                 
                 if not audio_started:
+                    audio_job, stream = await _open_output_stream(device, playback_device, **stream_args)
+                    metrics.output_latency = stream.latency
                     metrics.ttfa = time.perf_counter() - start_time
+                    playback_span = start_span("tts.playback", {"sample_rate": sample_rate})
                     
-                stream.write(samples)
+
+                if await asyncio.to_thread(stream.write, samples) is True:
+                    metrics.buffer_underruns += 1
                 metrics.chunks_played += len(samples) // 1024
                 
+            except AudioSchedulerError:
+                raise
             except Exception as e:
                 logger.error(f"Failed to decode final buffer: {e}")
         
+        if stream:
+            # Let the device drain before it is handed on
+            await asyncio.to_thread(stream.stop)
+        metrics.interrupted = bool(audio_job and audio_job.stop_requested)
         metrics.generation_time = time.perf_counter() - start_time
         metrics.playback_time = metrics.generation_time  # Approximate
+        request_span.set_attribute("bytes", bytes_received)
+        if playback_span is not None:
+            playback_span.set_attributes(chunks=metrics.chunks_played, underruns=metrics.buffer_underruns,
+                                         output_latency=metrics.output_latency)
         
         # Save audio if enabled
         if save_audio and save_buffer and audio_dir:
@@ -564,11 +674,18 @@ async def stream_with_buffering(
         
         return True, metrics
         
+    except AudioSchedulerError:
+        raise
     except Exception as e:
         logger.error(f"Buffered streaming failed: {e}")
+        # text_to_speech falls back to buffered playback
+        request_span.add_event("streaming_failed", {"error": str(e)})
         return False, metrics
         
     finally:
         if stream:
             stream.stop()
-            stream.close()
\ No newline at end of file
+            stream.close()
+        if playback_span is not None:
+            playback_span.end()
+        await device.aclose()
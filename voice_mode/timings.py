@@ -0,0 +1,77 @@
+"""
+Pipeline stage timings.
+
+From exchange schema v4, each logged exchange has a ``timings`` object with
+the time spent in each stage of the voice pipeline, as numbers in
+milliseconds::
+
+    {"ttfa": 812.4, "tts_gen": 1630.2, "tts_play": 4102.9, "tts_total": 5921.0}
+    {"record": 3214.5, "stt": 1402.1}
+
+Stage names are the keys converse measures with (see ``TIMING_STAGES``).
+Logs from v1-v3 only have a human-readable ``metadata.timing`` string such as
+``"ttfa 0.8s, gen 1.6s, play 4.1s"`` (one decimal place) and a few
+per-field values in seconds; ``legacy_timings_ms`` recovers the same object
+from those so analytics only ever deal with numbers.
+"""
+
+import re
+from typing import Any, Dict, Mapping, Optional
+
+
+# Pipeline stages, in the order they happen
+TIMING_STAGES = ('ttfa', 'tts_gen', 'tts_play', 'tts_total', 'record', 'stt', 'total')
+
+# Abbreviations used in timing strings
+_STRING_ALIASES = {'gen': 'tts_gen', 'play': 'tts_play'}
+
+# "record 3.2s, stt 1.4s" / "ttfa 1.2s, gen 2.3s, play 5.6s"
+_TIMING_PATTERN = re.compile(r'(\w+):?\s+([\d.]+)s\b')
+
+# v1-v3 metadata fields holding seconds (more precise than the string)
+_LEGACY_FIELDS = {
+    'time_to_first_audio': 'ttfa',
+    'generation_time': 'tts_gen',
+    'playback_time': 'tts_play',
+    'transcription_time': 'stt',
+    'total_turnaround_time': 'total',
+}
+
+
+def timings_ms(seconds: Optional[Mapping[str, Optional[float]]]) -> Optional[Dict[str, float]]:
+    """Convert stage timings in seconds to milliseconds.
+
+    Returns:
+        Stage -> milliseconds (0.1ms resolution), or None if there are none
+    """
+    if not seconds:
+        return None
+    result = {
+        stage: round(float(value) * 1000, 1)
+        for stage, value in seconds.items()
+        if isinstance(value, (int, float))
+    }
+    return result or None
+
+
+def parse_timing_string(timing: Optional[str]) -> Dict[str, float]:
+    """Parse a human-readable timing string into stage timings in seconds."""
+    timings = {}
+    if not timing:
+        return timings
+    for name, value in _TIMING_PATTERN.findall(timing):
+        try:
+            timings[_STRING_ALIASES.get(name, name)] = float(value)
+        except ValueError:
+            continue
+    return timings
+
+
+def legacy_timings_ms(metadata: Mapping[str, Any]) -> Optional[Dict[str, float]]:
+    """Stage timings in milliseconds for a v1-v3 exchange's metadata."""
+    timings = parse_timing_string(metadata.get('timing'))
+    for field, stage in _LEGACY_FIELDS.items():
+        value = metadata.get(field)
+        if isinstance(value, (int, float)):
+            timings[stage] = value
+    return timings_ms(timings)
@@ -1,6 +1,9 @@
 """Conversation tools for interactive voice interactions."""
 
+from __future__ import annotations
+
 import asyncio
+import contextvars
 import logging
 import os
 import time
@@ -9,25 +12,23 @@ from typing import Optional, Literal, Tuple, Dict, Union
 from pathlib import Path
 from datetime import datetime
 
-import numpy as np
-import sounddevice as sd
-from scipy.io.wavfile import write
-from pydub import AudioSegment
-from openai import AsyncOpenAI
-import httpx
+from voice_mode.utils.lazy_imports import lazy_import, is_available
+
+# Audio and HTTP libraries are imported on first use so that registering the
+# converse tool does not pay for numpy/sounddevice/openai at startup
+np = lazy_import("numpy")
+sd = lazy_import("sounddevice")
+AudioSegment = lazy_import("pydub", "AudioSegment")
+AsyncOpenAI = lazy_import("openai", "AsyncOpenAI")
+httpx = lazy_import("httpx")
 
 # Optional webrtcvad for silence detection
-try:
-    import webrtcvad
-    VAD_AVAILABLE = True
-except ImportError as e:
-    webrtcvad = None
-    VAD_AVAILABLE = False
+VAD_AVAILABLE = is_available("webrtcvad")
+webrtcvad = lazy_import("webrtcvad") if VAD_AVAILABLE else None
 
 from voice_mode.server import mcp
 from voice_mode.conversation_logger import get_conversation_logger
 from voice_mode.config import (
-    audio_operation_lock,
     SAMPLE_RATE,
     CHANNELS,
     DEBUG,
@@ -54,8 +55,12 @@ from voice_mode.config import (
     INITIAL_SILENCE_GRACE_PERIOD,
     DEFAULT_LISTEN_DURATION,
     TTS_VOICES,
-    TTS_MODELS
+    TTS_MODELS,
+    AUDIO_DEVICE_WAIT_TIMEOUT,
+    WAIT_FOR_PLAYBACK
 )
+from voice_mode.audio_scheduler import AudioPriority, get_audio_scheduler, current_session_id
+from voice_mode.speech_queue import SpeechQueueFull, get_speech_queue
 import voice_mode.config
 from voice_mode.provider_discovery import provider_registry
 from voice_mode.core import (
@@ -79,6 +84,10 @@ from voice_mode.utils import (
     log_tool_request_end
 )
 from voice_mode.pronounce import get_manager as get_pronounce_manager, is_enabled as pronounce_enabled
+from voice_mode.tracing import current_span, start_span
+from voice_mode import metrics as voice_metrics
+from voice_mode.profiling import finish_turn_profile, start_turn_profile
+from voice_mode.utils.audio_callback_stats import CallbackStats
 
 logger = logging.getLogger("voice-mode")
 
@@ -88,8 +97,9 @@ logger.info(f"Module loaded with DISABLE_SILENCE_DETECTION={DISABLE_SILENCE_DETE
 # Track last session end time for measuring AI thinking time
 last_session_end_time = None
 
-# Initialize OpenAI clients - now using provider registry for endpoint discovery
-openai_clients = get_openai_clients(OPENAI_API_KEY or "dummy-key-for-local", None, None)
+# OpenAI clients are kept for play_audio_feedback compatibility only; the
+# provider registry creates the clients actually used for TTS/STT
+openai_clients: dict = {}
 
 # Provider-specific clients are now created dynamically by the provider registry
 
@@ -241,18 +251,24 @@ async def text_to_speech_with_failover(
 
     # Always use simple failover (the only mode now)
     from voice_mode.simple_failover import simple_tts_failover
-    return await simple_tts_failover(
-        text=message,
-        voice=voice or TTS_VOICES[0],
-        model=model or TTS_MODELS[0],
-        instructions=instructions,
-        audio_format=audio_format,
-        debug=DEBUG,
-        debug_dir=DEBUG_DIR if DEBUG else None,
-        save_audio=SAVE_AUDIO,
-        audio_dir=AUDIO_DIR if SAVE_AUDIO else None,
-        speed=speed
-    )
+    with start_span("tts", {"text.length": len(message), "format": audio_format}) as span:
+        success, metrics, config = await simple_tts_failover(
+            text=message,
+            voice=voice or TTS_VOICES[0],
+            model=model or TTS_MODELS[0],
+            instructions=instructions,
+            audio_format=audio_format,
+            debug=DEBUG,
+            debug_dir=DEBUG_DIR if DEBUG else None,
+            save_audio=SAVE_AUDIO,
+            audio_dir=AUDIO_DIR if SAVE_AUDIO else None,
+            speed=speed
+        )
+        if success and config:
+            span.set_attributes(endpoint=config.get('endpoint'), voice=config.get('voice'), model=config.get('model'))
+        elif not success:
+            span.set_error(config.get('error_type') if config else "TTS failed")
+        return success, metrics, config
 
 
 async def speech_to_text(
@@ -264,8 +280,9 @@ async def speech_to_text(
     """
     Convert audio to text with automatic failover.
 
-    Handles audio file preparation (saving permanently or using temp file) and
-    delegates to simple_stt_failover for the actual transcription attempts.
+    The audio is transcribed from memory. When it is to be kept, the file is
+    written by the background audio saver, off the transcription path, and
+    its name is returned with the result for the exchange log.
 
     Args:
         audio_data: Raw audio data as numpy array
@@ -278,54 +295,45 @@ async def speech_to_text(
         - Success: {"text": "...", "provider": "...", "endpoint": "..."}
         - No speech: {"error_type": "no_speech", "provider": "..."}
         - All failed: {"error_type": "connection_failed", "attempted_endpoints": [...]}
+        With saved audio, also "audio_file": the saved file's name.
     """
-    import tempfile
+    import io
     from voice_mode.conversation_logger import get_conversation_logger
-    from voice_mode.core import save_debug_file, get_debug_filename
     from voice_mode.simple_failover import simple_stt_failover
+    from voice_mode.utils.audio_saver import get_audio_saver, wav_bytes
 
-    # Determine if we should save the file permanently or use a temp file
-    if save_audio and audio_dir:
-        # Save directly to final location for debugging/analysis
-        conversation_logger = get_conversation_logger()
-        conversation_id = conversation_logger.conversation_id
+    wav_data = wav_bytes(audio_data.astype(np.int16, copy=False).tobytes(), SAMPLE_RATE, CHANNELS)
 
-        # Create year/month directory structure
+    saved_path = None
+    if save_audio and audio_dir:
+        # Queue it for the saver; the disk write overlaps transcription
+        conversation_id = get_conversation_logger().conversation_id
         now = datetime.now()
-        year_dir = audio_dir / str(now.year)
-        month_dir = year_dir / f"{now.month:02d}"
-        month_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate filename and path
         filename = get_debug_filename("stt", "wav", conversation_id)
-        wav_file_path = month_dir / filename
-
-        # Write audio data directly to final location
-        write(str(wav_file_path), SAMPLE_RATE, audio_data)
-        logger.info(f"STT audio saved to: {wav_file_path}")
-
-        # Use the saved file for STT
-        with open(wav_file_path, 'rb') as audio_file:
-            result = await simple_stt_failover(
-                audio_file=audio_file,
-                model="whisper-1"
-            )
-        # Don't delete - it's our saved audio file
-    else:
-        # Use temporary file that will be deleted
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-            write(tmp_file.name, SAMPLE_RATE, audio_data)
-            tmp_file.flush()
-
-            with open(tmp_file.name, 'rb') as audio_file:
-                result = await simple_stt_failover(
-                    audio_file=audio_file,
-                    model="whisper-1"
-                )
-
-            # Clean up temp file
-            os.unlink(tmp_file.name)
+        saved_path = get_audio_saver().save(
+            wav_data, audio_dir / str(now.year) / f"{now.month:02d}" / filename, conversation_id
+        )
+        logger.info(f"STT audio saving to: {saved_path}")
+
+    # The name tells the STT service the format
+    audio_file = io.BytesIO(wav_data)
+    audio_file.name = "speech.wav"
+    with start_span("stt", {"bytes": len(wav_data), "duration": len(audio_data) / SAMPLE_RATE}) as span:
+        stt_start = time.perf_counter()
+        result = await simple_stt_failover(
+            audio_file=audio_file,
+            model="whisper-1"
+        )
+        if isinstance(result, dict):
+            span.set_attributes(provider=result.get("provider"), endpoint=result.get("endpoint"))
+            if result.get("error_type") == "connection_failed":
+                span.set_error("connection_failed")
+            else:
+                voice_metrics.STT_SECONDS.observe(time.perf_counter() - stt_start, provider=result.get("provider"),
+                                                  endpoint=result.get("endpoint"), transport=transport)
 
+    if saved_path is not None and isinstance(result, dict):
+        result["audio_file"] = saved_path.name
     return result
 
 
@@ -367,16 +375,17 @@ async def play_audio_feedback(
     
     try:
         # Play appropriate chime with optional delay overrides
-        if text == "listening":
-            await play_chime_start(
-                leading_silence=chime_leading_silence,
-                trailing_silence=chime_trailing_silence
-            )
-        elif text == "finished":
-            await play_chime_end(
-                leading_silence=chime_leading_silence,
-                trailing_silence=chime_trailing_silence
-            )
+        with start_span("chime", {"chime": text}):
+            if text == "listening":
+                await play_chime_start(
+                    leading_silence=chime_leading_silence,
+                    trailing_silence=chime_trailing_silence
+                )
+            elif text == "finished":
+                await play_chime_end(
+                    leading_silence=chime_leading_silence,
+                    trailing_silence=chime_trailing_silence
+                )
     except Exception as e:
         logger.debug(f"Audio feedback failed: {e}")
         # Don't interrupt the main flow if feedback fails
@@ -576,8 +585,12 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
             logger.info(f"[VAD_DEBUG]   Sample rate: {SAMPLE_RATE}Hz (VAD using {vad_sample_rate}Hz)")
             logger.info(f"[VAD_DEBUG]   Chunk duration: {VAD_CHUNK_DURATION_MS}ms")
         
-        def audio_callback(indata, frames, time, status):
+        # Callback timings, overflows and queue depth (reported when the stream stops)
+        callback_stats = CallbackStats("input", SAMPLE_RATE)
+        
+        def audio_callback(indata, frames, time_info, status):
             """Callback for continuous audio stream"""
+            started = time.perf_counter()
             if status:
                 logger.warning(f"Audio stream status: {status}")
                 # Check for device-related errors
@@ -590,6 +603,7 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
                     return
             # Put the audio data in the queue for processing
             audio_queue.put(indata.copy())
+            callback_stats.record(started, frames, time_info, status, audio_queue.qsize())
         
         try:
             # Create continuous input stream
@@ -597,9 +611,10 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
                                channels=CHANNELS,
                                dtype=np.int16,
                                callback=audio_callback,
-                               blocksize=chunk_samples):
+                               blocksize=chunk_samples) as input_stream:
                 
                 logger.debug("Started continuous audio stream")
+                callback_stats.reported_latency = input_stream.latency
                 
                 while recording_duration < max_duration and not stop_recording:
                     try:
@@ -643,6 +658,7 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
                             # WAITING_FOR_SPEECH state
                             if is_speech:
                                 logger.info("🎤 Speech detected, starting active recording")
+                                current_span().add_event("vad.speech_start", {"offset": recording_duration})
                                 if VAD_DEBUG:
                                     logger.info(f"[VAD_DEBUG] STATE CHANGE: WAITING_FOR_SPEECH -> SPEECH_ACTIVE at t={recording_duration:.1f}s")
                                 speech_detected = True
@@ -667,6 +683,10 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
                                 effective_min_duration = max(MIN_RECORDING_DURATION, min_duration)
                                 if recording_duration >= effective_min_duration and silence_duration_ms >= SILENCE_THRESHOLD_MS:
                                     logger.info(f"✓ Silence threshold reached after {recording_duration:.1f}s of recording")
+                                    current_span().add_event("vad.endpoint", {
+                                        "offset": recording_duration,
+                                        "silence_ms": silence_duration_ms
+                                    })
                                     if VAD_DEBUG:
                                         logger.info(f"[VAD_DEBUG] STOP: silence_duration={silence_duration_ms}ms >= threshold={SILENCE_THRESHOLD_MS}ms")
                                         logger.info(f"[VAD_DEBUG] STOP: recording_duration={recording_duration:.1f}s >= min_duration={effective_min_duration}s")
@@ -769,6 +789,8 @@ def record_audio_with_silence_detection(max_duration: float, disable_silence_det
                 sys.stdout = original_stdout
             if sys.stderr != original_stderr:
                 sys.stderr = original_stderr
+            # The stream has stopped: report its callbacks on the capture span
+            callback_stats.finish(current_span())
     
     except Exception as e:
         logger.error(f"VAD initialization failed: {e}")
@@ -949,10 +971,215 @@ async def livekit_converse(message: str, room_name: str = "", timeout: float = 6
         return f"LiveKit error: {str(e)}"
 
 
+async def speak_message(
+    message: str,
+    owner: str,
+    voice: Optional[str] = None,
+    tts_provider: Optional[str] = None,
+    tts_model: Optional[str] = None,
+    tts_instructions: Optional[str] = None,
+    audio_format: Optional[str] = None,
+    speed: Optional[float] = None,
+    skip_tts: bool = False,
+    transport: str = "speak-only",
+    after: Optional[asyncio.Event] = None,
+    started: Optional[asyncio.Event] = None
+) -> Tuple[bool, str, Optional[dict]]:
+    """Speak a message without listening for a response.
+
+    Used by converse(wait_for_response=False) and by the background speech
+    queue. ``after`` and ``started`` order playback behind the session's
+    queued speech (see voice_mode.speech_queue).
+
+    Returns:
+        Tuple of (success, result message, tts_metrics)
+    """
+    try:
+        async with get_audio_scheduler().job(owner, "speak", AudioPriority.SPEAK, AUDIO_DEVICE_WAIT_TIMEOUT,
+                                             after=after, started=started):
+            if skip_tts:
+                # Skip TTS entirely
+                success = True
+                tts_metrics = {
+                    'ttfa': 0,
+                    'generation': 0,
+                    'playback': 0,
+                    'total': 0
+                }
+                tts_config = {'provider': 'no-op', 'voice': 'none'}
+            else:
+                success, tts_metrics, tts_config = await text_to_speech_with_failover(
+                    message=message,
+                    voice=voice,
+                    model=tts_model,
+                    instructions=tts_instructions,
+                    audio_format=audio_format,
+                    initial_provider=tts_provider,
+                    speed=speed
+                )
+            
+        if success:
+            voice_metrics.record_tts(tts_metrics, tts_config, transport)
+
+        # Include timing info if available
+        timing_info = ""
+        timing_str = ""
+        tts_timings = None
+        if success and tts_metrics:
+            timing_info = f" (gen: {tts_metrics.get('generation', 0):.1f}s, play: {tts_metrics.get('playback', 0):.1f}s)"
+            if tts_metrics.get('interrupted'):
+                timing_info += " - interrupted"
+            # Create timing string for statistics
+            timing_parts = []
+            if 'ttfa' in tts_metrics:
+                timing_parts.append(f"ttfa {tts_metrics['ttfa']:.1f}s")
+            if 'generation' in tts_metrics:
+                timing_parts.append(f"tts_gen {tts_metrics['generation']:.1f}s")
+            if 'playback' in tts_metrics:
+                timing_parts.append(f"tts_play {tts_metrics['playback']:.1f}s")
+            timing_str = ", ".join(timing_parts)
+            # Stage timings in seconds for statistics and the exchange log
+            tts_timings = {
+                'ttfa': tts_metrics.get('ttfa'),
+                'tts_gen': tts_metrics.get('generation'),
+                'tts_play': tts_metrics.get('playback'),
+            }
+        
+        # Format result with error details if available
+        if success:
+            result = f"✓ Message spoken successfully{timing_info}"
+        else:
+            # Debug logging
+            logger.debug(f"TTS failed - tts_config: {tts_config}")
+            # Check if we have error details from failover
+            if tts_config and 'error_type' in tts_config:
+                if tts_config['error_type'] == 'all_providers_failed':
+                    # Extract error details from attempted endpoints
+                    error_messages = []
+                    for attempt in tts_config.get('attempted_endpoints', []):
+                        if attempt.get('error_details'):
+                            # We have parsed OpenAI error details
+                            error_details = attempt['error_details']
+                            error_messages.append(error_details.get('message', attempt.get('error', 'Unknown error')))
+                        else:
+                            error_messages.append(attempt.get('error', 'Unknown error'))
+
+                    # Use the first meaningful error message
+                    if error_messages:
+                        # Prioritize OpenAI parsed errors
+                        for attempt in tts_config.get('attempted_endpoints', []):
+                            if attempt.get('error_details'):
+                                from voice_mode.openai_error_parser import OpenAIErrorParser
+                                formatted_error = OpenAIErrorParser.format_error_message(
+                                    attempt['error_details'],
+                                    include_fallback=True
+                                )
+                                result = formatted_error
+                                break
+                        else:
+                            # No parsed errors, format a helpful error message
+                            providers_attempted = [attempt.get('provider', 'unknown') for attempt in tts_config.get('attempted_endpoints', [])]
+
+                            # Include provider info in the error message
+                            provider_names = ', '.join(set(providers_attempted)) if providers_attempted else 'unknown'
+                            error_msg = f"✗ Failed to speak message ({provider_names}): {error_messages[0]}"
+
+                            # Add helpful suggestions based on error type
+                            if 'connection' in error_messages[0].lower() or 'refused' in error_messages[0].lower():
+                                suggestions = []
+                                if any(p in ['kokoro', 'whisper'] for p in providers_attempted):
+                                    suggestions.append("Check if local services (Kokoro/Whisper) are running")
+                                if 'openai' in providers_attempted:
+                                    suggestions.append("Verify OpenAI API key is set")
+                                if suggestions:
+                                    error_msg += f"\n   Suggestions: {', '.join(suggestions)}"
+                            result = error_msg
+                    else:
+                        result = "✗ Failed to speak message"
+                else:
+                    result = f"✗ Failed to speak message: {tts_config.get('error_type', 'Unknown error')}"
+            else:
+                result = "✗ Failed to speak message"
+        
+        # Track statistics for speak-only interaction
+        track_voice_interaction(
+            message=message,
+            response="[speak-only]",
+            timing_str=timing_str if success else None,
+            timings=tts_timings,
+            transport=transport,
+            voice_provider=tts_provider,
+            voice_name=voice,
+            model=tts_model,
+            success=success,
+            error_message=None if success else "TTS failed"
+        )
+        
+        # Log TTS to JSONL for speak-only mode
+        if success:
+            try:
+                conversation_logger = get_conversation_logger()
+                conversation_logger.log_tts(
+                    text=message,
+                    audio_file=os.path.basename(tts_metrics.get('audio_path')) if tts_metrics.get('audio_path') else None,
+                    model=tts_config.get('model') if tts_config else tts_model,
+                    voice=tts_config.get('voice') if tts_config else voice,
+                    provider=tts_config.get('provider') if tts_config else (tts_provider if tts_provider else 'openai'),
+                    provider_url=tts_config.get('base_url') if tts_config else None,
+                    provider_type=tts_config.get('provider_type') if tts_config else None,
+                    is_fallback=tts_config.get('is_fallback', False) if tts_config else False,
+                    fallback_reason=tts_config.get('fallback_reason') if tts_config else None,
+                    timing=timing_str,
+                    timings=tts_timings,
+                    audio_format=audio_format,
+                    transport=transport
+                )
+            except Exception as e:
+                logger.error(f"Failed to log TTS to JSONL: {e}")
+        
+        logger.info(f"Speak-only result: {result}")
+        # success is already set correctly from TTS result
+        return success, result, tts_metrics
+    except Exception as e:
+        logger.error(f"Speak error: {e}")
+        error_msg = f"Error: {str(e)}"
+        
+        # Track failed speak-only interaction
+        track_voice_interaction(
+            message=message,
+            response="[error]",
+            timing_str=None,
+            transport=transport,
+            voice_provider=tts_provider,
+            voice_name=voice,
+            model=tts_model,
+            success=False,
+            error_message=str(e)
+        )
+        
+        logger.error(f"Returning error: {error_msg}")
+        return False, error_msg, None
+
+
+async def speak_queued_message(job) -> Tuple[bool, str, Optional[dict]]:
+    """Speak a job from the background speech queue."""
+    # Its own trace: the converse call that queued it has returned
+    with start_span("speak", {"job": job.id}, root=True):
+        return await speak_message(
+            job.message,
+            job.owner,
+            transport="speak-background",
+            after=job.after,
+            started=job.started,
+            **job.options
+        )
+
+
 @mcp.tool()
 async def converse(
     message: str,
     wait_for_response: Union[bool, str] = True,
+    wait_for_playback: Optional[Union[bool, str]] = None,
     listen_duration_max: float = DEFAULT_LISTEN_DURATION,
     listen_duration_min: float = 2.0,
     transport: Literal["auto", "local", "livekit"] = "auto",
@@ -986,6 +1213,8 @@ async def converse(
 KEY PARAMETERS:
 • message (required): The message to speak
 • wait_for_response (bool, default: true): Listen for response after speaking
+• wait_for_playback (bool, default: true): With wait_for_response=false, set false to queue
+  the message for background playback and return immediately (check with speak_status)
 • listen_duration_max (number, default: 120): Max listen time in seconds
 • listen_duration_min (number, default: 2.0): Min recording time before silence detection
 • voice (string): TTS voice name (auto-selected unless specified)
@@ -1006,6 +1235,10 @@ consult the MCP resources listed above.
     # Convert string booleans to actual booleans
     if isinstance(wait_for_response, str):
         wait_for_response = wait_for_response.lower() in ('true', '1', 'yes', 'on')
+    if wait_for_playback is None:
+        wait_for_playback = WAIT_FOR_PLAYBACK
+    elif isinstance(wait_for_playback, str):
+        wait_for_playback = wait_for_playback.lower() in ('true', '1', 'yes', 'on')
     if isinstance(disable_silence_detection, str):
         disable_silence_detection = disable_silence_detection.lower() in ('true', '1', 'yes', 'on')
     if isinstance(chime_enabled, str):
@@ -1116,167 +1349,52 @@ consult the MCP resources listed above.
         start_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
         logger.debug(f"Starting converse - Memory: {start_memory} KB")
     
+    # Root span of the turn's trace, ended in the finally block
+    turn_span = start_span("converse", {
+        "wait_for_response": wait_for_response,
+        "transport": transport,
+        "message.length": len(message)
+    })
+    if turn_span.recording:
+        turn_span.set_attribute("conversation_id", get_conversation_logger().conversation_id)
+    profiler = start_turn_profile()
+    
     result = None
     success = False
+    timings = {}
     
     try:
         # If not waiting for response, just speak and return
         if not wait_for_response:
-            try:
-                async with audio_operation_lock:
-                    if should_skip_tts:
-                        # Skip TTS entirely
-                        success = True
-                        tts_metrics = {
-                            'ttfa': 0,
-                            'generation': 0,
-                            'playback': 0,
-                            'total': 0
-                        }
-                        tts_config = {'provider': 'no-op', 'voice': 'none'}
-                    else:
-                        success, tts_metrics, tts_config = await text_to_speech_with_failover(
-                            message=message,
-                            voice=voice,
-                            model=tts_model,
-                            instructions=tts_instructions,
-                            audio_format=audio_format,
-                            initial_provider=tts_provider,
-                            speed=speed
-                        )
-                    
-                # Include timing info if available
-                timing_info = ""
-                timing_str = ""
-                if success and tts_metrics:
-                    timing_info = f" (gen: {tts_metrics.get('generation', 0):.1f}s, play: {tts_metrics.get('playback', 0):.1f}s)"
-                    # Create timing string for statistics
-                    timing_parts = []
-                    if 'ttfa' in tts_metrics:
-                        timing_parts.append(f"ttfa {tts_metrics['ttfa']:.1f}s")
-                    if 'generation' in tts_metrics:
-                        timing_parts.append(f"tts_gen {tts_metrics['generation']:.1f}s")
-                    if 'playback' in tts_metrics:
-                        timing_parts.append(f"tts_play {tts_metrics['playback']:.1f}s")
-                    timing_str = ", ".join(timing_parts)
-                
-                # Format result with error details if available
-                if success:
-                    result = f"✓ Message spoken successfully{timing_info}"
-                else:
-                    # Debug logging
-                    logger.debug(f"TTS failed - tts_config: {tts_config}")
-                    # Check if we have error details from failover
-                    if tts_config and 'error_type' in tts_config:
-                        if tts_config['error_type'] == 'all_providers_failed':
-                            # Extract error details from attempted endpoints
-                            error_messages = []
-                            for attempt in tts_config.get('attempted_endpoints', []):
-                                if attempt.get('error_details'):
-                                    # We have parsed OpenAI error details
-                                    error_details = attempt['error_details']
-                                    error_messages.append(error_details.get('message', attempt.get('error', 'Unknown error')))
-                                else:
-                                    error_messages.append(attempt.get('error', 'Unknown error'))
-
-                            # Use the first meaningful error message
-                            if error_messages:
-                                # Prioritize OpenAI parsed errors
-                                for attempt in tts_config.get('attempted_endpoints', []):
-                                    if attempt.get('error_details'):
-                                        from voice_mode.openai_error_parser import OpenAIErrorParser
-                                        formatted_error = OpenAIErrorParser.format_error_message(
-                                            attempt['error_details'],
-                                            include_fallback=True
-                                        )
-                                        result = formatted_error
-                                        break
-                                else:
-                                    # No parsed errors, format a helpful error message
-                                    providers_attempted = [attempt.get('provider', 'unknown') for attempt in tts_config.get('attempted_endpoints', [])]
-
-                                    # Include provider info in the error message
-                                    provider_names = ', '.join(set(providers_attempted)) if providers_attempted else 'unknown'
-                                    error_msg = f"✗ Failed to speak message ({provider_names}): {error_messages[0]}"
-
-                                    # Add helpful suggestions based on error type
-                                    if 'connection' in error_messages[0].lower() or 'refused' in error_messages[0].lower():
-                                        suggestions = []
-                                        if any(p in ['kokoro', 'whisper'] for p in providers_attempted):
-                                            suggestions.append("Check if local services (Kokoro/Whisper) are running")
-                                        if 'openai' in providers_attempted:
-                                            suggestions.append("Verify OpenAI API key is set")
-                                        if suggestions:
-                                            error_msg += f"\n   Suggestions: {', '.join(suggestions)}"
-                                    result = error_msg
-                            else:
-                                result = "✗ Failed to speak message"
-                        else:
-                            result = f"✗ Failed to speak message: {tts_config.get('error_type', 'Unknown error')}"
-                    else:
-                        result = "✗ Failed to speak message"
-                
-                # Track statistics for speak-only interaction
-                track_voice_interaction(
-                    message=message,
-                    response="[speak-only]",
-                    timing_str=timing_str if success else None,
-                    transport="speak-only",
-                    voice_provider=tts_provider,
-                    voice_name=voice,
-                    model=tts_model,
-                    success=success,
-                    error_message=None if success else "TTS failed"
-                )
-                
-                # Log TTS to JSONL for speak-only mode
-                if success:
-                    try:
-                        conversation_logger = get_conversation_logger()
-                        conversation_logger.log_tts(
-                            text=message,
-                            audio_file=os.path.basename(tts_metrics.get('audio_path')) if tts_metrics.get('audio_path') else None,
-                            model=tts_config.get('model') if tts_config else tts_model,
-                            voice=tts_config.get('voice') if tts_config else voice,
-                            provider=tts_config.get('provider') if tts_config else (tts_provider if tts_provider else 'openai'),
-                            provider_url=tts_config.get('base_url') if tts_config else None,
-                            provider_type=tts_config.get('provider_type') if tts_config else None,
-                            is_fallback=tts_config.get('is_fallback', False) if tts_config else False,
-                            fallback_reason=tts_config.get('fallback_reason') if tts_config else None,
-                            timing=timing_str,
-                            audio_format=audio_format,
-                            transport="speak-only",
-                            # Add timing metrics
-                            time_to_first_audio=tts_metrics.get('ttfa') if tts_metrics else None,
-                            generation_time=tts_metrics.get('generation') if tts_metrics else None,
-                            playback_time=tts_metrics.get('playback') if tts_metrics else None
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to log TTS to JSONL: {e}")
-                
-                logger.info(f"Speak-only result: {result}")
-                # success is already set correctly from TTS result
-                return result
-            except Exception as e:
-                logger.error(f"Speak error: {e}")
-                error_msg = f"Error: {str(e)}"
-                
-                # Track failed speak-only interaction
-                track_voice_interaction(
-                    message=message,
-                    response="[error]",
-                    timing_str=None,
-                    transport="speak-only",
-                    voice_provider=tts_provider,
-                    voice_name=voice,
-                    model=tts_model,
-                    success=False,
-                    error_message=str(e)
-                )
-                
-                logger.error(f"Returning error: {error_msg}")
-                result = error_msg
+            owner = current_session_id()
+            speech_queue = get_speech_queue()
+            speak_options = {
+                "voice": voice,
+                "tts_provider": tts_provider,
+                "tts_model": tts_model,
+                "tts_instructions": tts_instructions,
+                "audio_format": audio_format,
+                "speed": speed,
+                "skip_tts": should_skip_tts
+            }
+            if not wait_for_playback:
+                try:
+                    job = await speech_queue.submit(owner, message, speak_options)
+                except SpeechQueueFull as e:
+                    result = f"✗ {e}"
+                    return result
+                success = True
+                ahead = sum(1 for other in speech_queue.jobs(owner) if other.id < job.id and not other.finished)
+                queued = "Appended to queued" if job.coalesced else "Queued"
+                result = (f"✓ {queued} message for background playback (job {job.id}, {ahead} ahead). "
+                          f"Check completion with the speak_status tool or voice://audio/speech-queue.")
                 return result
+
+            # Play after any background speech this session queued earlier
+            success, result, _ = await speak_message(
+                message, owner, after=speech_queue.tail(owner), **speak_options
+            )
+            return result
         
         # Otherwise, speak and then listen for response
         # Determine transport method
@@ -1293,6 +1411,8 @@ consult the MCP resources listed above.
                 transport_duration = time.time() - transport_start
                 logger.info(f"Auto-selected local transport (selection took {transport_duration:.3f}s)")
         
+        turn_span.set_attribute("transport", transport)
+        
         if transport == "livekit":
             # For LiveKit, use the existing function but with the message parameter
             # Use listen_duration_max instead of timeout for consistent behavior
@@ -1318,9 +1438,14 @@ consult the MCP resources listed above.
         
         elif transport == "local":
             # Local microphone approach with timing
-            timings = {}
             try:
-                async with audio_operation_lock:
+                # Synthesis and STT run concurrently with other jobs; the device
+                # is held from TTS playback until recording has finished
+                # and waits for background speech this session queued earlier
+                audio_scheduler = get_audio_scheduler()
+                owner = current_session_id()
+                async with audio_scheduler.job(owner, "converse", AudioPriority.CONVERSE, AUDIO_DEVICE_WAIT_TIMEOUT,
+                                               hold_device=True, after=get_speech_queue().tail(owner)) as audio_job:
                     # Speak the message
                     tts_start = time.perf_counter()
                     if should_skip_tts:
@@ -1350,6 +1475,8 @@ consult the MCP resources listed above.
                         timings['tts_gen'] = tts_metrics.get('generation', 0)
                         timings['tts_play'] = tts_metrics.get('playback', 0)
                     timings['tts_total'] = time.perf_counter() - tts_start
+                    if tts_success:
+                        voice_metrics.record_tts(tts_metrics, tts_config, transport)
                     
                     # Log TTS immediately after it completes
                     if tts_success:
@@ -1376,13 +1503,10 @@ consult the MCP resources listed above.
                                 is_fallback=tts_config.get('is_fallback', False) if tts_config else False,
                                 fallback_reason=tts_config.get('fallback_reason') if tts_config else None,
                                 timing=tts_timing_str,
+                                timings={k: v for k, v in timings.items()
+                                         if k in ('ttfa', 'tts_gen', 'tts_play', 'tts_total')},
                                 audio_format=audio_format,
-                                transport=transport,
-                                # Add timing metrics
-                                time_to_first_audio=timings.get('ttfa') if timings else None,
-                                generation_time=timings.get('tts_gen') if timings else None,
-                                playback_time=timings.get('tts_play') if timings else None,
-                                total_turnaround_time=timings.get('total') if timings else None
+                                transport=transport
                             )
                         except Exception as e:
                             logger.error(f"Failed to log TTS to JSONL: {e}")
@@ -1422,6 +1546,10 @@ consult the MCP resources listed above.
                             result = "Error: Could not speak message. All TTS providers failed. Check that local services are running or set OPENAI_API_KEY for cloud fallback."
                         return result
                     
+                    if audio_job.cancelled:
+                        result = "Cancelled before listening"
+                        return result
+
                     # Brief pause before listening
                     await asyncio.sleep(0.5)
                     
@@ -1444,10 +1572,17 @@ consult the MCP resources listed above.
 
                     record_start = time.perf_counter()
                     logger.debug(f"About to call record_audio_with_silence_detection with duration={listen_duration_max}, disable_silence_detection={disable_silence_detection}, min_duration={listen_duration_min}, vad_aggressiveness={vad_aggressiveness}")
-                    audio_data, speech_detected = await asyncio.get_event_loop().run_in_executor(
-                        None, record_audio_with_silence_detection, listen_duration_max, disable_silence_detection, listen_duration_min, vad_aggressiveness
-                    )
+                    async with audio_scheduler.device("capture"):
+                        with start_span("capture", {"max_duration": listen_duration_max,
+                                                    "min_duration": listen_duration_min}) as capture_span:
+                            # The recording thread adds VAD events to the capture span
+                            audio_data, speech_detected = await asyncio.get_event_loop().run_in_executor(
+                                None, contextvars.copy_context().run, record_audio_with_silence_detection,
+                                listen_duration_max, disable_silence_detection, listen_duration_min, vad_aggressiveness
+                            )
+                            capture_span.set_attributes(samples=len(audio_data), speech_detected=speech_detected)
                     timings['record'] = time.perf_counter() - record_start
+                    voice_metrics.RECORD_SECONDS.observe(timings['record'], transport=transport)
                     
                     # Log recording end
                     if event_logger:
@@ -1465,6 +1600,8 @@ consult the MCP resources listed above.
                         chime_leading_silence=chime_leading_silence,
                         chime_trailing_silence=chime_trailing_silence
                     )
+                    # Let other jobs play while we transcribe
+                    audio_scheduler.release(audio_job)
                     
                     # Mark the end of recording - this is when user expects response to start
                     user_done_time = time.perf_counter()
@@ -1474,6 +1611,8 @@ consult the MCP resources listed above.
                         result = "Error: Could not record audio"
                         return result
                     
+                    stt_audio_file = None
+                    
                     # Check if no speech was detected
                     if not speech_detected:
                         logger.info("No speech detected during recording - skipping STT processing")
@@ -1482,10 +1621,14 @@ consult the MCP resources listed above.
                         
                         # Still save the audio if configured
                         if SAVE_AUDIO and AUDIO_DIR:
+                            from voice_mode.utils.audio_saver import get_audio_saver, wav_bytes
                             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                            audio_path = os.path.join(AUDIO_DIR, f"no_speech_{timestamp}.wav")
-                            write(audio_path, SAMPLE_RATE, audio_data)
-                            logger.debug(f"Saved no-speech audio to: {audio_path}")
+                            audio_path = get_audio_saver().save(
+                                wav_bytes(audio_data.astype(np.int16, copy=False).tobytes(), SAMPLE_RATE, CHANNELS),
+                                Path(AUDIO_DIR) / f"no_speech_{timestamp}.wav"
+                            )
+                            logger.debug(f"Saving no-speech audio to: {audio_path}")
+                            stt_audio_file = audio_path.name
                     else:
                         # Convert to text
                         # Log STT start
@@ -1498,6 +1641,7 @@ consult the MCP resources listed above.
 
                         # Handle structured STT result
                         if isinstance(stt_result, dict):
+                            stt_audio_file = stt_result.get("audio_file")
                             if "error_type" in stt_result:
                                 # Handle connection failures vs no speech
                                 if stt_result["error_type"] == "connection_failed":
@@ -1565,6 +1709,7 @@ consult the MCP resources listed above.
                         
                         conversation_logger.log_stt(
                             text=response_text if response_text else "[no speech detected]",
+                            audio_file=stt_audio_file,
                             model=stt_config.get('model', 'whisper-1'),
                             provider=stt_config.get('provider', 'openai'),
                             provider_url=stt_config.get('base_url'),
@@ -1572,14 +1717,12 @@ consult the MCP resources listed above.
                             audio_format='mp3',
                             transport=transport,
                             timing=stt_timing_str,
+                            timings={k: v for k, v in timings.items() if k in ('record', 'stt')},
                             silence_detection={
                                 "enabled": not (DISABLE_SILENCE_DETECTION or disable_silence_detection),
                                 "vad_aggressiveness": VAD_AGGRESSIVENESS,
                                 "silence_threshold_ms": SILENCE_THRESHOLD_MS
-                            },
-                            # Add timing metrics
-                            transcription_time=timings.get('stt'),
-                            total_turnaround_time=None  # Will be calculated and added later
+                            }
                         )
                     except Exception as e:
                         logger.error(f"Failed to log STT to JSONL: {e}")
@@ -1587,6 +1730,7 @@ consult the MCP resources listed above.
                 # Calculate total time (use tts_total instead of sub-metrics)
                 main_timings = {k: v for k, v in timings.items() if k in ['tts_total', 'record', 'stt']}
                 total_time = sum(main_timings.values())
+                voice_metrics.TURN_SECONDS.observe(total_time, transport=transport)
                 
                 # Format timing strings separately for TTS and STT
                 tts_timing_parts = []
@@ -1623,6 +1767,7 @@ consult the MCP resources listed above.
                     message=message,
                     response=actual_response,
                     timing_str=timing_str,
+                    timings={**timings, 'total': total_time},
                     transport=transport,
                     voice_provider=tts_provider,
                     voice_name=voice,
@@ -1694,10 +1839,23 @@ consult the MCP resources listed above.
         return result
         
     finally:
+        profiler.stop()
+        turn_span.set_attribute("success", success)
+        if not success:
+            voice_metrics.ERRORS.inc(stage="converse", provider=None, endpoint=None)
+        if not success and result:
+            turn_span.set_error(result)
+        turn_span.end()
+        
         # Log tool request end
         if event_logger:
             log_tool_request_end("converse", success=success)
         
+        # A turn that stopped early (an error, LiveKit) still has its event
+        # session open; close it so later calls don't keep adding to it
+        if event_logger and session_id and event_logger.session_id == session_id:
+            event_logger.end_session()
+        
         # Update last session end time for tracking AI thinking time
         if wait_for_response:
             last_session_end_time = time.time()
@@ -1716,6 +1874,14 @@ consult the MCP resources listed above.
             # Force garbage collection
             collected = gc.collect()
             logger.debug(f"Garbage collected {collected} objects")
+        
+        if profiler.recording:
+            # Serializing the samples takes a moment; keep it off the event loop
+            await asyncio.to_thread(
+                finish_turn_profile, profiler, get_conversation_logger().conversation_id,
+                timings=timings, elapsed=elapsed, success=success, transport=transport,
+                wait_for_response=wait_for_response
+            )
 
 
 
@@ -0,0 +1,79 @@
+"""Status of background speech queued by converse(wait_for_playback=false)."""
+
+import logging
+from typing import Optional, Union
+
+from voice_mode.server import mcp
+from voice_mode.audio_scheduler import current_session_id
+from voice_mode.speech_queue import get_speech_queue
+
+logger = logging.getLogger("voice-mode")
+
+
+@mcp.tool()
+async def speak_status(
+    job_id: Optional[Union[int, str]] = None,
+    wait: Union[bool, str] = False,
+    timeout: float = 60.0,
+    cancel: Union[bool, str] = False
+) -> str:
+    """Check on messages queued with converse(wait_for_response=false, wait_for_playback=false).
+
+    • job_id (int): Job to report on (default: all of this session's recent jobs)
+    • wait (bool): Wait until the job(s) finished playing, up to timeout seconds
+    • cancel (bool): Cancel the job(s) instead; queued messages are dropped, playing ones stop
+    """
+    if isinstance(wait, str):
+        wait = wait.lower() in ('true', '1', 'yes', 'on')
+    if isinstance(cancel, str):
+        cancel = cancel.lower() in ('true', '1', 'yes', 'on')
+    if job_id is not None:
+        try:
+            job_id = int(job_id)
+        except (TypeError, ValueError):
+            return f"❌ Error: job_id must be an integer (got '{job_id}')"
+
+    queue = get_speech_queue()
+    owner = current_session_id()
+
+    if job_id is not None:
+        job = queue.get(job_id)
+        if job is None or job.owner != owner:
+            return f"❌ Unknown speech job {job_id}"
+        jobs = [job]
+    else:
+        jobs = queue.jobs(owner)
+
+    if cancel:
+        if job_id is not None:
+            cancelled = queue.cancel(job_id=job_id)
+        else:
+            cancelled = queue.cancel(owner=owner)
+        return f"✓ Cancelled {cancelled} speech job(s)"
+
+    if not jobs:
+        return "No background speech queued in this session"
+
+    lines = []
+    if wait:
+        finished = await queue.wait(jobs, timeout)
+        if not finished:
+            lines.append(f"⏳ Still playing after {timeout:.0f}s")
+
+    for job in jobs:
+        info = job.to_dict()
+        line = f"[{job.id}] {job.state}: \"{info['message']}\" (queued {info['queued_seconds']:.1f}s"
+        if "run_seconds" in info:
+            line += f", ran {info['run_seconds']:.1f}s"
+        line += ")"
+        if job.finished and job.result:
+            line += f" - {job.result}"
+        lines.append(line)
+
+    status = queue.status()
+    lines.append(
+        f"Queue: {status['queue_depth']}/{status['maxsize']} waiting, {status['running']} running, "
+        f"policy {status['policy']} (completed {status['completed']}, failed {status['failed']}, "
+        f"dropped {status['dropped']}, coalesced {status['coalesced']})"
+    )
+    return "\n".join(lines)
@@ -1,5 +1,6 @@
 """Statistics tools for voice conversation tracking and dashboard."""
 
+import asyncio
 import json
 import time
 from typing import Optional
@@ -11,21 +12,42 @@ from ..config import logger
 
 
 @mcp.tool()
-async def voice_statistics() -> str:
+async def voice_statistics(days: Optional[int] = None) -> str:
     """
     Display live statistics dashboard for voice conversation performance.
     
     Shows current session statistics including:
     - Total responses and success rate
     - Average turnaround times (TTFA, TTS, STT)
-    - Min/max performance metrics
+    - Min/max/p95 performance metrics
     - Provider usage statistics
     - Recent interaction history
     
+    Args:
+        days: Instead of the current session, summarize the last N days of
+            conversation logs (includes p50/p95/p99 timings)
+    
     Returns:
         Formatted text dashboard with real-time conversation statistics
     """
     try:
+        if days is not None:
+            from ..exchanges import ExchangeReader
+            
+            reader = ExchangeReader()
+            stats = await asyncio.to_thread(reader.daily_stats, max(0, int(days)))
+            if not stats.total:
+                return f"No voice exchanges logged in the last {days} days."
+            
+            lines = [stats.get_summary_report(), "", "Timing percentiles:"]
+            for exchange_type, metrics in stats.timing_stats().items():
+                if exchange_type == 'overall':
+                    continue
+                for metric, values in metrics.items():
+                    lines.append(f"  {exchange_type} {metric}: p50 {values['p50']:.2f}s, "
+                                 f"p95 {values['p95']:.2f}s, p99 {values['p99']:.2f}s ({values['count']} samples)")
+            return "\n".join(lines)
+        
         tracker = get_statistics_tracker()
         dashboard = tracker.format_dashboard()
         
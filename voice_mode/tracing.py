@@ -0,0 +1,317 @@
+"""
+Trace spans for converse turns, exported as OTLP-JSON.
+
+A turn's timings are otherwise spread over the ``timings`` dict in
+converse, ``StreamMetrics`` and the event log. With ``VOICEMODE_TRACE=true``
+each turn is also recorded as one trace of nested spans::
+
+    converse
+    ├── tts                  (failover over TTS endpoints)
+    │   └── tts.request      (one endpoint; event: first_byte)
+    │       └── tts.playback (underruns, chunks)
+    ├── chime
+    ├── capture              (events: vad.speech_start, vad.endpoint)
+    ├── chime
+    └── stt
+        └── stt.request      (one endpoint; upload bytes)
+
+When a trace's root span ends, its spans are appended as one OTLP
+``ExportTraceServiceRequest`` (the JSON encoding of the OpenTelemetry
+protocol) per line to ``TRACE_DIR/traces_YYYY-MM-DD.jsonl``, through the
+shared background log writer. That is the format of the OpenTelemetry
+Collector's file exporter, so the files can be replayed into any OTLP
+backend (``otlpjsonfile`` receiver) or read directly.
+
+The current span is kept in a context variable, so spans started in a task
+nest under the span that was current when the task was created, and code
+run in a thread sees it if the context is passed along
+(``asyncio.to_thread`` does this; ``run_in_executor`` needs
+``contextvars.copy_context().run``).
+
+With tracing disabled ``start_span`` returns a shared no-op span, so
+instrumented code pays for one attribute check per span.
+"""
+
+import contextvars
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from voice_mode.__version__ import __version__
+
+logger = logging.getLogger("voicemode")
+
+# OTLP enum values
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+SCOPE_NAME = "voice_mode"
+
+# Wall-clock nanoseconds = perf_counter_ns() + offset, so spans are
+# monotonic within the process
+_CLOCK_OFFSET = time.time_ns() - time.perf_counter_ns()
+
+
+def _now_ns() -> int:
+    return time.perf_counter_ns() + _CLOCK_OFFSET
+
+
+def _any_value(value: Any) -> Dict[str, Any]:
+    """OTLP AnyValue for an attribute value (64-bit ints are strings in JSON)."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_any_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+
+def _key_values(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _any_value(value)} for key, value in attributes.items() if value is not None]
+
+
+class Span:
+    """A timed operation in a trace. Use as a context manager or call ``end()``."""
+
+    __slots__ = ('name', 'kind', 'trace_id', 'span_id', 'parent_id', 'start_ns', 'end_ns',
+                 'attributes', 'events', 'status', 'status_message', '_tracer', '_trace', '_token')
+
+    recording = True
+
+    def __init__(self, tracer: "Tracer", name: str, parent: Optional["Span"],
+                 attributes: Optional[Dict[str, Any]], kind: int):
+        self.name = name
+        self.kind = kind
+        self.span_id = f"{random.getrandbits(64):016x}"
+        if parent is not None:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+            self._trace = parent._trace
+        else:
+            self.trace_id = f"{random.getrandbits(128):032x}"
+            self.parent_id = None
+            self._trace = _Trace(self)
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.events: List[tuple] = []
+        self.status = STATUS_UNSET
+        self.status_message: Optional[str] = None
+        self.end_ns: Optional[int] = None
+        self._tracer = tracer
+        self._token = _current.set(self)
+        self.start_ns = _now_ns()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Mark a point in time within the span."""
+        self.events.append((_now_ns(), name, attributes))
+
+    def set_error(self, error: Any) -> None:
+        """Mark the span failed; exceptions are also recorded as an event."""
+        self.status = STATUS_ERROR
+        self.status_message = str(error)
+        if isinstance(error, BaseException):
+            self.add_event("exception", {"exception.type": type(error).__name__, "exception.message": str(error)})
+
+    def end(self) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = _now_ns()
+        try:
+            _current.reset(self._token)
+        except ValueError:
+            # Ended in another context than the one it was started in
+            pass
+        self._tracer._finish(self)
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None and not isinstance(exc, GeneratorExit):
+            self.set_error(exc)
+        self.end()
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _key_values(self.attributes),
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        if self.events:
+            span["events"] = [
+                {"timeUnixNano": str(at), "name": name, "attributes": _key_values(attributes or {})}
+                for at, name, attributes in self.events
+            ]
+        return span
+
+
+class _NoopSpan:
+    """Stands in for a span when tracing is off."""
+
+    __slots__ = ()
+
+    recording = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+    def set_error(self, error: Any) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("voicemode_span", default=None)
+
+
+class _Trace:
+    """Finished spans of one trace, waiting for the root to end."""
+
+    __slots__ = ('root', 'spans', 'exported')
+
+    def __init__(self, root: Span):
+        self.root = root
+        self.spans: List[Span] = []
+        self.exported = False
+
+
+class Tracer:
+    """Creates spans and exports each trace when its root span ends."""
+
+    def __init__(self, enabled: bool = False, directory: Optional[Path] = None, writer=None,
+                 service_name: str = "voicemode"):
+        """
+        Args:
+            enabled: Record spans; otherwise ``start_span`` returns ``NOOP_SPAN``
+            directory: Where the daily ``traces_YYYY-MM-DD.jsonl`` files go
+            writer: Log writer (defaults to the shared one)
+            service_name: ``service.name`` resource attribute
+        """
+        self.enabled = enabled
+        self.directory = Path(directory) if directory else None
+        self._writer = writer
+        self._lock = threading.Lock()
+        self._resource = {"attributes": _key_values({
+            "service.name": service_name,
+            "service.version": __version__,
+            "process.pid": os.getpid(),
+        })}
+        self.exported = 0
+
+    def start_span(self, name: str, attributes: Optional[Dict[str, Any]] = None,
+                   kind: int = SPAN_KIND_INTERNAL, root: bool = False):
+        """Start a span as a child of the current one and make it current.
+
+        Args:
+            name: Operation name
+            attributes: Initial attributes
+            kind: ``SPAN_KIND_INTERNAL`` or ``SPAN_KIND_CLIENT`` (a request to a service)
+            root: Start a new trace even if a span is current. A span whose
+                parent has already ended starts a new trace too
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = None if root else _current.get()
+        if parent is not None and parent.end_ns is not None:
+            # Inherited by a task that outlived the operation that created it
+            parent = None
+        return Span(self, name, parent, attributes, kind)
+
+    def _finish(self, span: Span) -> None:
+        trace = span._trace
+        with self._lock:
+            trace.spans.append(span)
+            if span is not trace.root and not trace.exported:
+                return
+            # The root ended: export the trace. Spans ending later (work the
+            # turn left running) follow on their own.
+            spans, trace.spans = trace.spans, []
+            trace.exported = True
+        self._export(spans)
+
+    def _export(self, spans: List[Span]) -> None:
+        if self.directory is None:
+            return
+        if self._writer is None:
+            from voice_mode.utils.append_log import get_append_log_writer
+            self._writer = get_append_log_writer()
+        record = {"resourceSpans": [{
+            "resource": self._resource,
+            "scopeSpans": [{
+                "scope": {"name": SCOPE_NAME, "version": __version__},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]}
+        path = self.directory / f"traces_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+        if self._writer.write(path, record):
+            self.exported += len(spans)
+
+
+def current_span():
+    """The span of the running operation, or ``NOOP_SPAN``."""
+    span = _current.get()
+    return span if span is not None else NOOP_SPAN
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer, configured from ``VOICEMODE_TRACE``."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                from voice_mode.config import TRACE_DIR, TRACE_ENABLED
+
+                _tracer = Tracer(enabled=TRACE_ENABLED, directory=TRACE_DIR)
+                if TRACE_ENABLED:
+                    logger.info(f"Tracing converse turns to {TRACE_DIR}")
+    return _tracer
+
+
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None,
+               kind: int = SPAN_KIND_INTERNAL, root: bool = False):
+    """Start a span with the process-wide tracer (see ``Tracer.start_span``)."""
+    return get_tracer().start_span(name, attributes, kind, root)
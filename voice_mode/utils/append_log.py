@@ -0,0 +1,387 @@
+"""
+Buffered writer for append-only JSONL logs.
+
+The exchange log (``ConversationLogger``) and the event log
+(``EventLogger``) both append one JSON record per line to a daily file.
+Rather than opening, writing and closing the file for every record on the
+caller's thread, both hand their records to one shared ``AppendLogWriter``:
+
+- ``write()`` only puts the record on a bounded queue, so it never blocks
+  the event loop. When the queue is full the record is dropped and counted.
+- A background thread serializes records and appends them in batches, once
+  ``batch_size`` records are waiting or the oldest has waited
+  ``flush_interval`` seconds.
+- Files stay open between batches. Each record carries its destination, so
+  records from either side of midnight land in the right daily file; files
+  that are no longer written to are closed, and a file that was deleted or
+  replaced is reopened.
+- ``fsync`` sets durability: ``never`` (leave it to the OS), ``batch``
+  (after each batch) or ``always`` (after each record).
+- ``flush()`` waits until everything queued so far is written; the queue is
+  flushed when the process exits.
+
+Several processes (one MCP server per editor session) append to the same
+daily exchange log. Files are opened with ``O_APPEND`` and every batch of
+complete lines goes out in a single ``write()``, so records from different
+processes never interleave within a line. The batch is written while
+holding an advisory ``flock`` on the file, which also covers the rare short
+write that needs a second ``write()`` and ``fsync=always``.
+
+``rewrite_log`` edits lines of such a file (the audio archiver uses it to
+point exchanges at transcoded audio). It takes the same lock and swaps in
+the new content with one rename; a writer that was waiting for the lock
+sees that the file was replaced and appends to the new one instead.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are still single O_APPEND writes
+    fcntl = None
+
+logger = logging.getLogger("voice-mode")
+
+FSYNC_POLICIES = ("never", "batch", "always")
+
+Record = Union[str, Dict[str, Any]]
+
+
+class _Marker:
+    """Queue item asking the writer thread to flush (and optionally stop)."""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class AppendLogWriter:
+    """Batches appends to JSONL files on a background thread."""
+
+    # Files kept open at once (least recently written are closed first)
+    MAX_OPEN_FILES = 8
+
+    def __init__(self, batch_size: int = 64, flush_interval: float = 1.0,
+                 fsync: str = "never", max_queue: int = 10000):
+        """
+        Args:
+            batch_size: Records written together
+            flush_interval: Longest a record waits before being written (seconds)
+            fsync: One of ``FSYNC_POLICIES``
+            max_queue: Records queued before new ones are dropped
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {', '.join(FSYNC_POLICIES)}")
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval)
+        self.fsync = fsync
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._files: "OrderedDict[Path, int]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        # Guards open files and write counters
+        self._lock = threading.Lock()
+        self._drop_lock = threading.Lock()
+        self._closed = False
+
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+
+    def write(self, path: Union[str, Path], record: Record) -> bool:
+        """Queue a record to be appended to a file.
+
+        Args:
+            path: File to append to (created with its directory if missing)
+            record: JSON-serializable dict, or an already serialized line
+
+        Returns:
+            False if the record was dropped because the queue is full
+        """
+        if self._closed:
+            # After shutdown there is no writer thread; write directly
+            with self._lock:
+                self._write_batch([(Path(path), record)])
+            return True
+
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((Path(path), record))
+        except queue.Full:
+            with self._drop_lock:
+                self.dropped += 1
+                if self.dropped == 1 or self.dropped % 1000 == 0:
+                    logger.warning(f"Log writer queue full, {self.dropped} records dropped")
+            return False
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every record queued so far has been written.
+
+        Returns:
+            False if the records were not written within the timeout
+        """
+        return self._send(_Marker(), timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write queued records, stop the writer thread and close files."""
+        if self._closed:
+            return
+        self._send(_Marker(stop=True), timeout)
+        self._closed = True
+        with self._lock:
+            self._close_files()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for diagnostics."""
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "errors": self.errors,
+            "open_files": len(self._files),
+            "fsync": self.fsync,
+        }
+
+    def _send(self, marker: _Marker, timeout: float) -> bool:
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return True
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        if not marker.done.wait(timeout):
+            return False
+        if marker.stop:
+            thread.join(timeout)
+        return True
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="append-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        pending: List[Tuple[Path, Record]] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, _Marker):
+                self._flush_pending(pending)
+                pending = []
+                item.done.set()
+                if item.stop:
+                    return
+                continue
+
+            if item is not None:
+                pending.append(item)
+                if len(pending) == 1:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(pending) < self.batch_size and time.monotonic() < deadline:
+                    continue
+
+            self._flush_pending(pending)
+            pending = []
+
+    def _flush_pending(self, pending: List[Tuple[Path, Record]]) -> None:
+        if not pending:
+            return
+        with self._lock:
+            try:
+                self._write_batch(pending)
+            except Exception as e:
+                self.errors += len(pending)
+                logger.error(f"Log writer failed: {e}")
+
+    def _write_batch(self, records: List[Tuple[Path, Record]]) -> None:
+        by_file: Dict[Path, List[bytes]] = {}
+        for path, record in records:
+            try:
+                line = record if isinstance(record, str) else json.dumps(record)
+            except (TypeError, ValueError) as e:
+                self.errors += 1
+                logger.error(f"Unserializable log record for {path.name}: {e}")
+                continue
+            by_file.setdefault(path, []).append((line.rstrip("\n") + "\n").encode("utf-8"))
+
+        for path, lines in by_file.items():
+            try:
+                with self._locked(path) as fd:
+                    if self.fsync == "always":
+                        for line in lines:
+                            _write_all(fd, line)
+                            os.fsync(fd)
+                    else:
+                        _write_all(fd, b"".join(lines))
+                        if self.fsync == "batch":
+                            os.fsync(fd)
+                self.written += len(lines)
+            except OSError as e:
+                self.errors += len(lines)
+                logger.error(f"Failed to append {len(lines)} records to {path}: {e}")
+                self._close_file(path)
+        self.batches += 1
+
+    @contextmanager
+    def _locked(self, path: Path) -> Iterator[int]:
+        """Open a file for appending and hold its lock."""
+        while True:
+            fd = self._open(path)
+            with _append_lock(fd):
+                # rewrite_log may have replaced the file while we waited
+                if fcntl is None or _is_current(path, fd):
+                    yield fd
+                    return
+            self._close_file(path)
+
+    def _open(self, path: Path) -> int:
+        fd = self._files.get(path)
+        if fd is not None:
+            # Reopen if the file was deleted or replaced since it was opened
+            if _is_current(path, fd):
+                self._files.move_to_end(path)
+                return fd
+            self._close_file(path)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._files[path] = fd
+        while len(self._files) > self.MAX_OPEN_FILES:
+            oldest = next(iter(self._files))
+            self._close_file(oldest)
+        return fd
+
+    def _close_file(self, path: Path) -> None:
+        fd = self._files.pop(path, None)
+        if fd is not None:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _close_files(self) -> None:
+        for path in list(self._files):
+            self._close_file(path)
+
+
+@contextmanager
+def _append_lock(fd: int) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a shared log file."""
+    if fcntl is None:
+        yield
+        return
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _is_current(path: Path, fd: int) -> bool:
+    """Whether ``fd`` is still the file at ``path``."""
+    try:
+        current = os.stat(path)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(fd)
+    return (current.st_ino, current.st_dev) == (opened.st_ino, opened.st_dev)
+
+
+def rewrite_log(path: Union[str, Path], transform: Callable[[str], str]) -> int:
+    """Rewrite the lines of a shared log file atomically.
+
+    The new content goes to a temporary file that replaces the log in one
+    rename, made while holding the lock that appending writers take, so no
+    appended record is lost and readers see either the old or the new file.
+
+    Args:
+        path: Log file
+        transform: Called with each line (without its newline); returns the
+            line to write in its place
+
+    Returns:
+        Number of lines changed. The file is left untouched if none were.
+    """
+    path = Path(path)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        with _append_lock(fd):
+            with os.fdopen(os.dup(fd), "rb") as f:
+                lines = f.read().split(b"\n")
+
+            changed = 0
+            for i, raw in enumerate(lines):
+                if not raw:
+                    continue
+                line = raw.decode("utf-8", "surrogateescape")
+                new_line = transform(line)
+                if new_line != line:
+                    lines[i] = new_line.encode("utf-8", "surrogateescape")
+                    changed += 1
+            if not changed:
+                return 0
+
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(b"\n".join(lines))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.chmod(tmp, os.fstat(fd).st_mode & 0o777)
+                os.replace(tmp, path)
+            except BaseException:
+                tmp.unlink(missing_ok=True)
+                raise
+            return changed
+    finally:
+        os.close(fd)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+_writer: Optional[AppendLogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_append_log_writer() -> AppendLogWriter:
+    """Get the process-wide writer shared by the exchange and event logs."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            from voice_mode.config import LOG_BATCH_SIZE, LOG_FLUSH_INTERVAL, LOG_FSYNC, LOG_QUEUE_SIZE
+
+            _writer = AppendLogWriter(
+                batch_size=LOG_BATCH_SIZE,
+                flush_interval=LOG_FLUSH_INTERVAL,
+                fsync=LOG_FSYNC,
+                max_queue=LOG_QUEUE_SIZE,
+            )
+            atexit.register(_writer.close)
+        return _writer
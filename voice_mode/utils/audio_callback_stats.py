@@ -0,0 +1,152 @@
+"""
+Counters and timings for real-time audio callbacks.
+
+PortAudio calls a stream's callback on its own high-priority thread, once
+per block. If the callback runs longer than the audio it handles (the
+block's *budget*), or the process isn't scheduled in time, the device
+under- or overflows (an *xrun*) and the user hears a dropout.
+
+``CallbackStats`` is filled in by one callback and read once the stream
+has stopped, so recording takes no lock: a clock read, a few additions
+and a bucket increment per block. ``finish()`` then reports
+the stream's totals to the event log (``AUDIO_STREAM_STATS``), the current
+trace span and the Prometheus metrics, so a dropout in a turn can be
+matched with slow callbacks or a deep queue at the same time.
+"""
+
+import bisect
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from voice_mode.metrics import CALLBACK_BUCKETS, record_audio_callbacks
+
+logger = logging.getLogger("voicemode")
+
+
+class CallbackStats:
+    """Per-stream callback statistics, written by the callback thread only."""
+
+    __slots__ = ('stream', 'sample_rate', 'callbacks', 'frames', 'total', 'max', 'buckets', 'over_budget',
+                 'underflows', 'overflows', 'queue_depth_max', 'queue_depth_total', 'latency_min', 'latency_max',
+                 'reported_latency')
+
+    def __init__(self, stream: str, sample_rate: int):
+        """
+        Args:
+            stream: ``input`` or ``output``
+            sample_rate: Stream sample rate, for the per-block budget
+        """
+        self.stream = stream
+        self.sample_rate = sample_rate
+        self.callbacks = 0
+        self.frames = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(CALLBACK_BUCKETS) + 1)
+        self.over_budget = 0
+        self.underflows = 0
+        self.overflows = 0
+        self.queue_depth_max = 0
+        self.queue_depth_total = 0
+        # Measured from the callback's time info: ADC to callback for input,
+        # callback to DAC for output
+        self.latency_min: Optional[float] = None
+        self.latency_max: Optional[float] = None
+        # What the stream reports (``Stream.latency``)
+        self.reported_latency: Optional[float] = None
+
+    def record(self, started: float, frames: int, time_info: Any, status: Any, queue_depth: int = 0) -> None:
+        """Record one callback; call it last thing in the callback.
+
+        Args:
+            started: ``time.perf_counter()`` on entering the callback
+            frames: Frames in the block
+            time_info: The callback's time info (``inputBufferAdcTime``,
+                ``currentTime``, ``outputBufferDacTime``)
+            status: The callback's ``CallbackFlags``
+            queue_depth: Items waiting in the queue the callback feeds or drains
+        """
+        duration = time.perf_counter() - started
+        self.callbacks += 1
+        self.frames += frames
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        self.buckets[bisect.bisect_left(CALLBACK_BUCKETS, duration)] += 1
+        if duration * self.sample_rate > frames:
+            self.over_budget += 1
+        if status:
+            if status.input_underflow or status.output_underflow:
+                self.underflows += 1
+            if status.input_overflow or status.output_overflow:
+                self.overflows += 1
+        if queue_depth > self.queue_depth_max:
+            self.queue_depth_max = queue_depth
+        self.queue_depth_total += queue_depth
+        if time_info is not None:
+            if self.stream == "input":
+                latency = time_info.currentTime - time_info.inputBufferAdcTime
+            else:
+                latency = time_info.outputBufferDacTime - time_info.currentTime
+            # Some host APIs leave the times at zero
+            if 0 < latency < 10:
+                if self.latency_min is None or latency < self.latency_min:
+                    self.latency_min = latency
+                if self.latency_max is None or latency > self.latency_max:
+                    self.latency_max = latency
+
+    @property
+    def xruns(self) -> int:
+        return self.underflows + self.overflows
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Totals for logs and metrics; times in milliseconds."""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return None if value is None else round(value * 1000, 3)
+
+        count = self.callbacks or 1
+        return {
+            "stream": self.stream,
+            "callbacks": self.callbacks,
+            "frames": self.frames,
+            "xruns": self.xruns,
+            "underflows": self.underflows,
+            "overflows": self.overflows,
+            "over_budget": self.over_budget,
+            "callback_mean_ms": ms(self.total / count),
+            "callback_max_ms": ms(self.max),
+            # Callbacks per duration bucket, keyed by upper bound in ms
+            "callback_ms": dict(zip([f"{bound * 1000:g}" for bound in CALLBACK_BUCKETS] + ["+Inf"], self.buckets)),
+            "queue_depth_max": self.queue_depth_max,
+            "queue_depth_mean": round(self.queue_depth_total / count, 2),
+            "latency_min_ms": ms(self.latency_min),
+            "latency_max_ms": ms(self.latency_max),
+            "reported_latency_ms": ms(self.reported_latency),
+        }
+
+    def finish(self, span=None) -> Dict[str, Any]:
+        """Report the stream's totals once it has stopped.
+
+        Logs an ``AUDIO_STREAM_STATS`` event, sets attributes on ``span`` (if
+        given) and adds the callbacks to the Prometheus metrics.
+
+        Returns:
+            ``to_dict()``
+        """
+        from voice_mode.utils.event_logger import get_event_logger
+
+        stats = self.to_dict()
+        if not self.callbacks:
+            return stats
+        record_audio_callbacks(self)
+        event_logger = get_event_logger()
+        if event_logger:
+            event_logger.log_event(event_logger.AUDIO_STREAM_STATS, stats)
+        if span is not None:
+            span.set_attributes(**{f"audio.{key}": value for key, value in stats.items()
+                                   if key not in ("stream", "callback_ms")})
+        if self.xruns or self.over_budget:
+            logger.warning(f"Audio {self.stream} stream: {self.xruns} xruns, {self.over_budget} of "
+                           f"{self.callbacks} callbacks over budget (max {stats['callback_max_ms']} ms)")
+        return stats
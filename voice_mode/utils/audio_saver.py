@@ -0,0 +1,243 @@
+"""
+Background writer for saved audio.
+
+Saving audio (``SAVE_AUDIO``, debug recordings) used to write each file on
+the event loop before transcription or playback could go on, so disk
+latency, hundreds of milliseconds on a network home directory, was added
+to every exchange. ``AudioSaver`` keeps the writes off that path:
+
+- ``save()`` decides the final path, queues the audio already in memory and
+  returns the path at once, so the exchange can be logged with it while the
+  file is still being written.
+- A background thread creates the year/month directory and writes the file
+  under a temporary name that is renamed into place, so readers never see
+  a partial file.
+- With ``compress`` on, WAV audio is transcoded to Opus on the way (see
+  ``voice_mode.audio_archive.transcode``) and the returned path already
+  ends in ``.opus``. If transcoding fails the WAV is kept, and
+  ``find_audio_file`` resolves the reference to it.
+- When the queue is full the file is written on the caller's thread rather
+  than dropped. ``flush()`` waits for queued files; the queue is flushed
+  when the process exits.
+- Each written file is recorded in the audio catalogue (see
+  ``voice_mode.audio_catalogue``) with its conversation ID and duration,
+  so the ``audio://`` resources list it without rescanning the directory.
+"""
+
+import atexit
+import io
+import logging
+import os
+import queue
+import threading
+import wave
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Union
+
+if TYPE_CHECKING:
+    from voice_mode.audio_catalogue import AudioCatalogue
+
+logger = logging.getLogger("voicemode")
+
+
+def wav_bytes(pcm: bytes, sample_rate: int, channels: int = 1, sample_width: int = 2) -> bytes:
+    """Wrap raw PCM samples (16-bit by default) in a WAV header, in memory."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(sample_width)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class _Flush:
+    """Queue item the worker sets once everything before it is written."""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class AudioSaver:
+    """Writes audio files on a background thread."""
+
+    def __init__(self, compress: bool = False, bitrate: int = 24000, max_queue: int = 32,
+                 catalogue: Optional["AudioCatalogue"] = None):
+        """
+        Args:
+            compress: Transcode WAV audio to Opus before it is stored
+            bitrate: Opus bitrate in bits per second
+            max_queue: Files queued before ``save()`` writes on the caller's thread
+            catalogue: Catalogue to record saved files in
+        """
+        self.compress = compress
+        self.bitrate = bitrate
+        self.catalogue = catalogue
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, max_queue))
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._closed = False
+
+        self.saved = 0
+        self.compressed = 0
+        self.inline = 0
+        self.errors = 0
+
+    def save(self, data: bytes, path: Union[str, Path], conversation_id: Optional[str] = None) -> Path:
+        """Queue audio to be written to ``path``.
+
+        Args:
+            data: The encoded audio
+            path: Where to write it
+            conversation_id: Conversation the audio belongs to, for the catalogue
+
+        Returns:
+            Where the audio will be: ``path``, or its ``.opus`` sibling when
+            compressing WAV audio
+        """
+        path = Path(path)
+        final = path.with_suffix('.opus') if self._compresses(path) else path
+        if self._closed:
+            self._write(path, data, conversation_id)
+            return final
+
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((path, data, conversation_id))
+        except queue.Full:
+            # Better late than lost
+            self.inline += 1
+            self._write(path, data, conversation_id)
+        return final
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until every file queued so far has been written.
+
+        Returns:
+            False if they were not written within the timeout
+        """
+        return self._send(_Flush(), timeout)
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Write queued files and stop the worker thread."""
+        if self._closed:
+            return
+        self._send(_Flush(stop=True), timeout)
+        self._closed = True
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for diagnostics."""
+        return {
+            "queued": self._queue.qsize(),
+            "saved": self.saved,
+            "compressed": self.compressed,
+            "inline": self.inline,
+            "errors": self.errors,
+        }
+
+    def _compresses(self, path: Path) -> bool:
+        return self.compress and path.suffix.lower() == '.wav'
+
+    def _send(self, marker: _Flush, timeout: float) -> bool:
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return True
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        if not marker.done.wait(timeout):
+            return False
+        if marker.stop:
+            thread.join(timeout)
+        return True
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audio-saver", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if isinstance(item, _Flush):
+                item.done.set()
+                if item.stop:
+                    return
+                continue
+            self._write(*item)
+
+    def _write(self, path: Path, data: bytes, conversation_id: Optional[str] = None) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.tmp")
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            self.errors += 1
+            logger.error(f"Failed to save audio {path}: {e}")
+            return
+        self.saved += 1
+        final = self._compress(path) if self._compresses(path) else path
+        logger.debug(f"Audio saved: {final}")
+        if self.catalogue is not None:
+            self._record(final, data if path.suffix.lower() == '.wav' else None, conversation_id)
+
+    def _compress(self, path: Path) -> Path:
+        """Transcode a written WAV file; returns the file that was kept."""
+        from voice_mode.audio_archive import transcode
+
+        _, target, error = transcode(str(path), self.bitrate)
+        if target is None:
+            # The WAV stays; find_audio_file falls back to it
+            if error:
+                self.errors += 1
+                logger.warning(f"Could not compress saved audio {error}")
+            return path
+        self.compressed += 1
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        return Path(target)
+
+    def _record(self, path: Path, wav: Optional[bytes], conversation_id: Optional[str]) -> None:
+        duration = None
+        if wav is not None:
+            try:
+                with wave.open(io.BytesIO(wav)) as f:
+                    duration = f.getnframes() / f.getframerate()
+            except (wave.Error, EOFError, ZeroDivisionError):
+                pass
+        try:
+            self.catalogue.record(path, conversation_id=conversation_id, duration=duration)
+        except Exception as e:
+            # The next refresh picks the file up
+            logger.warning(f"Could not catalogue saved audio {path}: {e}")
+
+
+_saver: Optional[AudioSaver] = None
+_saver_lock = threading.Lock()
+
+
+def get_audio_saver() -> AudioSaver:
+    """Get the process-wide audio saver."""
+    global _saver
+    with _saver_lock:
+        if _saver is None:
+            from voice_mode.audio_catalogue import get_audio_catalogue
+            from voice_mode.config import AUDIO_ARCHIVE_BITRATE, SAVE_AUDIO_COMPRESS
+
+            try:
+                catalogue = get_audio_catalogue()
+            except Exception as e:
+                logger.warning(f"Audio catalogue unavailable: {e}")
+                catalogue = None
+            _saver = AudioSaver(compress=SAVE_AUDIO_COMPRESS, bitrate=AUDIO_ARCHIVE_BITRATE, catalogue=catalogue)
+            atexit.register(_saver.close)
+        return _saver
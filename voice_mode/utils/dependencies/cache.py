@@ -1,47 +1,78 @@
-"""In-memory caching for dependency check results."""
+"""Caching for dependency check results."""
 
-from typing import Optional, Dict
+from typing import Any, Dict, List, Optional
+
+from voice_mode.utils.probe_cache import ProbeCache, get_probe_cache
+
+# Key prefix for dependency entries in the persistent probe cache
+CACHE_KEY_PREFIX = "dependency:"
 
 
 class DependencyCache:
-    """In-memory cache for dependency status.
+    """Cache for dependency status.
 
     Caches present dependencies (don't recheck).
     Always rechecks missing dependencies (they might get installed).
+
+    When backed by a ProbeCache, results that come with a fingerprint of
+    the binary or package database they were checked against are persisted
+    across processes and reused until that fingerprint changes. Installing
+    a package changes the fingerprint, so persisted misses are safe too.
     """
 
-    def __init__(self):
+    def __init__(self, store: Optional[ProbeCache] = None):
         self._cache: Dict[str, bool] = {}
+        self._store = store
 
-    def get(self, package: str) -> Optional[bool]:
+    def get(self, package: str, fp: Optional[List[Any]] = None) -> Optional[bool]:
         """Get cached status for a package.
 
+        Args:
+            package: Package name
+            fp: Fingerprint to validate a persisted entry against
+
         Returns:
             True if installed (cached)
-            None if missing (never cached) or not yet checked
+            False if missing according to a persisted entry for ``fp``
+            None if not cached
         """
         status = self._cache.get(package)
-        # Only return cached result if package was found installed
-        return status if status else None
+        if status:
+            return status
+
+        if self._store is not None and fp is not None:
+            hit, installed = self._store.lookup(CACHE_KEY_PREFIX + package, fp)
+            if hit:
+                if installed:
+                    self._cache[package] = True
+                return bool(installed)
+        return None
 
-    def set(self, package: str, installed: bool):
+    def set(self, package: str, installed: bool, fp: Optional[List[Any]] = None):
         """Cache dependency status.
 
-        Only caches positive results (installed=True).
-        Missing packages are not cached so they get rechecked.
+        Only positive results (installed=True) are cached in memory.
+        Both outcomes are persisted when a fingerprint is given.
         """
         if installed:
             self._cache[package] = True
+        if self._store is not None and fp is not None:
+            self._store.set(CACHE_KEY_PREFIX + package, fp, installed)
 
     def clear(self):
-        """Clear all cached results."""
+        """Clear all cached results, including persisted ones."""
         self._cache.clear()
+        if self._store is not None:
+            self._store.invalidate(CACHE_KEY_PREFIX)
 
 
-# Global cache instance (created on module import)
-_dependency_cache = DependencyCache()
+# Global cache instance (created on first use)
+_dependency_cache: Optional[DependencyCache] = None
 
 
 def get_cache() -> DependencyCache:
     """Get the global dependency cache instance."""
+    global _dependency_cache
+    if _dependency_cache is None:
+        _dependency_cache = DependencyCache(get_probe_cache())
     return _dependency_cache
@@ -3,19 +3,28 @@
 import yaml
 import platform
 import os
+import shutil
 import subprocess
 import logging
 import sys
 import threading
 import time
 from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from .package_managers import get_package_manager
 from .cache import get_cache
+from voice_mode.utils.probe_cache import fingerprint
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent dependency checks
+MAX_CHECK_WORKERS = 8
+
+# libyaml's loader parses dependencies.yaml ~10x faster than the pure Python one
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_dependencies() -> dict:
     """Load dependencies.yaml from package.
@@ -32,20 +41,20 @@ def load_dependencies() -> dict:
         from importlib.resources import files
         yaml_path = files("voice_mode") / "dependencies.yaml"
         with yaml_path.open() as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_YamlLoader)
     except (ImportError, AttributeError):
         # Fallback to pkg_resources
         try:
             import pkg_resources
             yaml_text = pkg_resources.resource_string("voice_mode", "dependencies.yaml")
-            return yaml.safe_load(yaml_text)
+            return yaml.load(yaml_text, Loader=_YamlLoader)
         except Exception:
             # Last resort: try reading from relative path (development mode)
             current_dir = Path(__file__).parent.parent.parent
             yaml_file = current_dir / "dependencies.yaml"
             if yaml_file.exists():
                 with yaml_file.open() as f:
-                    return yaml.safe_load(f)
+                    return yaml.load(f, Loader=_YamlLoader)
             raise FileNotFoundError("Could not find dependencies.yaml")
 
 
@@ -85,6 +94,27 @@ def detect_platform() -> str:
     return "unknown"
 
 
+def _dependency_fingerprint(package: dict) -> Optional[list]:
+    """Fingerprint of what a dependency check depends on.
+
+    For packages with a check_command this is the resolved binary; otherwise
+    it is the package manager's database, tagged with the manager's name.
+    Returns None when there is nothing stable to fingerprint (result is then
+    only cached in memory).
+    """
+    if "check_command" in package:
+        binary = package["check_command"].split()[0]
+        path = shutil.which(binary)
+        return fingerprint(path) if path else None
+
+    try:
+        pm = get_package_manager()
+    except RuntimeError:
+        return None
+    paths = pm.database_paths()
+    return [pm.__class__.__name__, *fingerprint(*paths)] if paths else None
+
+
 def check_dependency(package: dict, platform_key: str) -> bool:
     """Check if a single dependency is installed.
 
@@ -97,11 +127,12 @@ def check_dependency(package: dict, platform_key: str) -> bool:
     """
     cache = get_cache()
     package_name = package["name"]
+    fp = _dependency_fingerprint(package)
 
     # Check cache first
-    cached = cache.get(package_name)
+    cached = cache.get(package_name, fp)
     if cached is not None:
-        logger.debug(f"Cache hit for {package_name}: installed")
+        logger.debug(f"Cache hit for {package_name}: {'installed' if cached else 'not installed'}")
         return cached
 
     # Use check_command if provided
@@ -130,7 +161,7 @@ def check_dependency(package: dict, platform_key: str) -> bool:
             installed = False
 
     # Cache result
-    cache.set(package_name, installed)
+    cache.set(package_name, installed, fp)
     return installed
 
 
@@ -140,6 +171,9 @@ def check_component_dependencies(
 ) -> Dict[str, bool]:
     """Check all dependencies for a component.
 
+    Packages that aren't cached are checked concurrently, since each check
+    is usually a short-lived subprocess.
+
     Args:
         component: Component name ('core', 'whisper', 'kokoro', 'installation')
         dependencies_yaml: Loaded dependencies (if None, loads from file)
@@ -157,7 +191,8 @@ def check_component_dependencies(
     is_wsl = platform_key.startswith("wsl-")
     package_platform_key = platform_key.replace("wsl-", "") if is_wsl else platform_key
 
-    results = {}
+    # (package, platform key) pairs to check, in report order
+    to_check = []
 
     component_deps = dependencies_yaml["voicemode"].get(component, {})
 
@@ -166,7 +201,7 @@ def check_component_dependencies(
     for package in common_deps:
         required = package.get("required", False)
         if required:
-            results[package["name"]] = check_dependency(package, "common")
+            to_check.append((package, "common"))
 
     # Check platform-specific packages
     platform_deps = component_deps.get(package_platform_key, {}).get("packages", [])
@@ -181,9 +216,15 @@ def check_component_dependencies(
 
         # Skip non-required packages unless explicitly required
         if required:
-            results[package["name"]] = check_dependency(package, package_platform_key)
+            to_check.append((package, package_platform_key))
+
+    if len(to_check) <= 1:
+        return {package["name"]: check_dependency(package, key) for package, key in to_check}
+
+    with ThreadPoolExecutor(max_workers=min(MAX_CHECK_WORKERS, len(to_check))) as executor:
+        statuses = list(executor.map(lambda item: check_dependency(*item), to_check))
 
-    return results
+    return {package["name"]: status for (package, _), status in zip(to_check, statuses)}
 
 
 def _spinner(stop_event, message="Installing"):
@@ -2,6 +2,7 @@
 
 from abc import ABC, abstractmethod
 from typing import List, Tuple
+import os
 import subprocess
 import shutil
 import logging
@@ -27,6 +28,13 @@ class PackageManager(ABC):
         """Install packages. Returns (success, message)."""
         pass
 
+    def database_paths(self) -> List[str]:
+        """Files that change whenever packages are installed or removed.
+
+        Used to fingerprint cached check results.
+        """
+        return []
+
 
 class BrewManager(PackageManager):
     """Homebrew package manager (macOS)."""
@@ -34,6 +42,13 @@ class BrewManager(PackageManager):
     def check_available(self) -> bool:
         return shutil.which("brew") is not None
 
+    def database_paths(self) -> List[str]:
+        brew = shutil.which("brew")
+        if not brew:
+            return []
+        # <prefix>/bin/brew -> <prefix>/Cellar
+        return [os.path.join(os.path.dirname(os.path.dirname(brew)), "Cellar")]
+
     def check_package(self, package_name: str) -> bool:
         try:
             result = subprocess.run(
@@ -66,6 +81,9 @@ class AptManager(PackageManager):
     def check_available(self) -> bool:
         return shutil.which("apt-get") is not None
 
+    def database_paths(self) -> List[str]:
+        return ["/var/lib/dpkg/status"]
+
     def check_package(self, package_name: str) -> bool:
         try:
             result = subprocess.run(
@@ -99,6 +117,9 @@ class DnfManager(PackageManager):
     def check_available(self) -> bool:
         return shutil.which("dnf") is not None
 
+    def database_paths(self) -> List[str]:
+        return ["/var/lib/rpm", "/var/lib/rpm/rpmdb.sqlite"]
+
     def check_package(self, package_name: str) -> bool:
         try:
             result = subprocess.run(
@@ -2,19 +2,20 @@
 Unified event logging system for Voice Mode.
 
 This module provides real-time event tracking for voice interactions,
-enabling accurate timing calculations, debugging, and analytics.
+enabling accurate timing calculations, debugging, and analytics. Events are
+written in batches by the shared background log writer
+(voice_mode.utils.append_log).
 """
 
-import json
 import time
 import threading
-import queue
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict, field
 import logging
-import atexit
+
+from voice_mode.utils.append_log import AppendLogWriter, get_append_log_writer
 
 logger = logging.getLogger("voice-mode.event-logger")
 
@@ -66,18 +67,21 @@ class EventLogger:
     SESSION_END = "SESSION_END"
     TRANSPORT_SWITCH = "TRANSPORT_SWITCH"
     PROVIDER_SWITCH = "PROVIDER_SWITCH"
+    AUDIO_STREAM_STATS = "AUDIO_STREAM_STATS"
     
     # Tool Events
     TOOL_REQUEST_START = "TOOL_REQUEST_START"
     TOOL_REQUEST_END = "TOOL_REQUEST_END"
     
-    def __init__(self, log_dir: Optional[Path] = None, enabled: bool = True):
+    def __init__(self, log_dir: Optional[Path] = None, enabled: bool = True,
+                 writer: Optional[AppendLogWriter] = None):
         """
         Initialize the event logger.
         
         Args:
             log_dir: Directory for log files (default: ~/voicemode_logs)
             enabled: Whether event logging is enabled
+            writer: Log writer (defaults to the shared one)
         """
         self.enabled = enabled
         if not self.enabled:
@@ -91,19 +95,14 @@ class EventLogger:
         self.log_file: Optional[Path] = None
         self.current_date: Optional[datetime] = None
         
-        # Thread-safe queue for async writing
-        self.event_queue: queue.Queue = queue.Queue()
-        self.writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
-        self.writer_thread.start()
+        # Batched, non-blocking file writes (flushed at exit)
+        self.writer = writer or get_append_log_writer()
         
         # In-memory event buffer for current session
         self.session_events: List[VoiceEvent] = []
         self.session_id: Optional[str] = None
         self._lock = threading.Lock()
         
-        # Register cleanup on exit
-        atexit.register(self._cleanup)
-        
         logger.info(f"Event logger initialized, logging to {self.log_dir}")
     
     def log_event(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> None:
@@ -124,8 +123,8 @@ class EventLogger:
             data=data or {}
         )
         
-        # Add to queue for file writing
-        self.event_queue.put(event)
+        # Queue for file writing
+        self.writer.write(self._get_log_file(), event.to_dict())
         
         # Keep in memory for current session
         with self._lock:
@@ -231,46 +230,20 @@ class EventLogger:
         with self._lock:
             return list(self.session_events)
     
-    def _writer_loop(self) -> None:
-        """Background thread for writing events to file."""
-        while True:
-            try:
-                # Use timeout to allow thread to exit on shutdown
-                event = self.event_queue.get(timeout=1)
-                self._write_event(event)
-            except queue.Empty:
-                continue
-            except Exception as e:
-                logger.error(f"Error in event writer: {e}")
-    
-    def _write_event(self, event: VoiceEvent) -> None:
-        """Write event to log file."""
-        # Check if we need to rotate log file
+    def _get_log_file(self) -> Path:
+        """Today's log file (rotated daily)."""
         today = datetime.now().date()
         if self.current_date != today:
             self.current_date = today
-            log_filename = f"voicemode_events_{today.isoformat()}.jsonl"
-            self.log_file = self.log_dir / log_filename
+            self.log_file = self.log_dir / f"voicemode_events_{today.isoformat()}.jsonl"
             logger.info(f"Rotating log file to: {self.log_file}")
-        
-        # Append event
-        try:
-            with open(self.log_file, 'a') as f:
-                f.write(json.dumps(event.to_dict()) + '\n')
-        except Exception as e:
-            logger.error(f"Failed to write event to log: {e}")
+        return self.log_file
     
-    def _cleanup(self) -> None:
-        """Cleanup on exit - flush any remaining events."""
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until logged events have been written to disk."""
         if not self.enabled:
-            return
-            
-        # Give writer thread time to flush queue
-        timeout = time.time() + 2  # 2 second timeout
-        while not self.event_queue.empty() and time.time() < timeout:
-            time.sleep(0.1)
-        
-        logger.info("Event logger cleanup complete")
+            return True
+        return self.writer.flush(timeout)
 
 
 # Global event logger instance (singleton)
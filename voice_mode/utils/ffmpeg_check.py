@@ -31,9 +31,20 @@ def check_ffprobe() -> Tuple[bool, Optional[str]]:
 def get_ffmpeg_version() -> Optional[str]:
     """Get FFmpeg version if installed.
     
+    The result is cached persistently and reused until the ffmpeg binary
+    (or PATH) changes.
+    
     Returns:
         Version string or None if not installed
     """
+    from .probe_cache import fingerprint, get_probe_cache
+    
+    fp = fingerprint(shutil.which('ffmpeg'))
+    return get_probe_cache().get_or_probe('ffmpeg_version', fp, _probe_ffmpeg_version)
+
+
+def _probe_ffmpeg_version() -> Optional[str]:
+    """Run ``ffmpeg -version`` and extract the version number."""
     try:
         result = subprocess.run(
             ['ffmpeg', '-version'], 
@@ -1,16 +1,23 @@
 """GPU detection utilities for voice mode."""
 
 import platform
+import shutil
 import subprocess
 from typing import Tuple, Optional
 import logging
 
 logger = logging.getLogger("voice-mode")
 
+# Commands whose presence determines the detection result on Linux
+GPU_PROBE_TOOLS = ("nvidia-smi", "rocm-smi", "lspci")
+
 
 def detect_gpu() -> Tuple[bool, Optional[str]]:
     """Detect GPU availability and type.
     
+    The result is cached persistently and reused until the probed tools
+    (nvidia-smi, rocm-smi, lspci) or PATH change.
+    
     Returns:
         Tuple of (has_gpu, gpu_type) where gpu_type is one of:
         - "metal" for macOS Metal Performance Shaders
@@ -18,7 +25,16 @@ def detect_gpu() -> Tuple[bool, Optional[str]]:
         - "rocm" for AMD ROCm
         - "cpu" or None if no GPU detected
     """
+    from .probe_cache import fingerprint, get_probe_cache
+    
     system = platform.system()
+    fp = fingerprint(*(shutil.which(tool) for tool in GPU_PROBE_TOOLS))
+    has_gpu, gpu_type = get_probe_cache().get_or_probe(f"gpu:{system}", fp, lambda: list(_probe_gpu(system)))
+    return has_gpu, gpu_type
+
+
+def _probe_gpu(system: str) -> Tuple[bool, Optional[str]]:
+    """Run the platform-specific GPU detection commands."""
     
     if system == "Darwin":
         # macOS always has Metal support on modern systems
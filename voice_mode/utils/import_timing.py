@@ -0,0 +1,131 @@
+"""Import-time measurement for MCP server startup.
+
+Runs a fresh interpreter with ``python -X importtime`` and parses its report
+so that startup regressions (e.g. a tool module pulling in numpy at import
+time) are easy to spot with ``voicemode diag startup``.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Matches lines like: "import time:       512 |       1873 |   voice_mode.config"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+@dataclass
+class ImportTiming:
+    """Timing for a single imported module (microseconds)."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        """Top-level package name."""
+        return self.module.split(".")[0]
+
+
+@dataclass
+class StartupReport:
+    """Result of measuring a module's import cost."""
+    target: str
+    wall_time: float
+    timings: List[ImportTiming]
+    returncode: int
+    error: Optional[str] = None
+
+    @property
+    def total_us(self) -> int:
+        """Total self time of every module imported."""
+        return sum(t.self_us for t in self.timings)
+
+    def by_package(self) -> Dict[str, int]:
+        """Sum self time per top-level package, slowest first."""
+        totals: Dict[str, int] = {}
+        for timing in self.timings:
+            totals[timing.package] = totals.get(timing.package, 0) + timing.self_us
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def slowest(self, limit: int = 20, prefix: Optional[str] = None) -> List[ImportTiming]:
+        """Modules with the highest cumulative import time."""
+        timings = self.timings
+        if prefix:
+            timings = [t for t in timings if t.module == prefix or t.module.startswith(prefix + ".")]
+        return sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:limit]
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Parse the stderr produced by ``python -X importtime``.
+
+    Args:
+        output: Raw stderr text
+
+    Returns:
+        List of ImportTiming entries in import order
+    """
+    timings = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        timings.append(ImportTiming(
+            module=module,
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=max(0, (len(indent) - 1) // 2)
+        ))
+    return timings
+
+
+def measure_startup(target: str = "voice_mode.server", timeout: float = 120.0) -> StartupReport:
+    """Import ``target`` in a clean interpreter and collect per-module timings.
+
+    Args:
+        target: Module to import (defaults to the MCP server module)
+        timeout: Seconds to wait for the import to finish
+
+    Returns:
+        StartupReport with parsed timings
+    """
+    env = dict(os.environ)
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+
+    start = time.perf_counter()
+    try:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            env=env
+        )
+    except subprocess.TimeoutExpired:
+        return StartupReport(
+            target=target,
+            wall_time=time.perf_counter() - start,
+            timings=[],
+            returncode=-1,
+            error=f"Import of {target} timed out after {timeout:.0f}s"
+        )
+    wall_time = time.perf_counter() - start
+
+    error = None
+    if result.returncode != 0:
+        # Last non-importtime line is usually the exception message
+        messages = [l for l in result.stderr.splitlines() if not l.startswith("import time:")]
+        error = messages[-1] if messages else f"exit code {result.returncode}"
+
+    return StartupReport(
+        target=target,
+        wall_time=wall_time,
+        timings=parse_importtime(result.stderr),
+        returncode=result.returncode,
+        error=error
+    )
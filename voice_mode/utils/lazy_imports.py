@@ -0,0 +1,119 @@
+"""Deferred imports for heavy optional modules.
+
+The MCP server registers its tools at import time, but most tool bodies only
+need numpy, sounddevice, scipy, pydub, openai or httpx once they are actually
+called. Binding those names to lazy proxies keeps server startup fast while
+the rest of the code keeps using ``np.array(...)`` or ``AsyncOpenAI(...)``
+unchanged.
+"""
+
+import importlib
+import importlib.util
+import logging
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("voice-mode")
+
+# Time spent importing each lazily loaded target, keyed by "module[:attr]"
+_load_times: Dict[str, float] = {}
+
+
+class LazyImport:
+    """Proxy that imports a module (or one of its attributes) on first use.
+
+    Attribute access, calls and ``repr`` are forwarded to the real object.
+    Tests can still replace the proxy wholesale with ``patch(...)`` since it is
+    just a module-level name.
+    """
+
+    __slots__ = ("_lazy_module", "_lazy_attr", "_lazy_target", "_lazy_lock")
+
+    def __init__(self, module_name: str, attribute: Optional[str] = None):
+        object.__setattr__(self, "_lazy_module", module_name)
+        object.__setattr__(self, "_lazy_attr", attribute)
+        object.__setattr__(self, "_lazy_target", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+
+    @property
+    def _lazy_key(self) -> str:
+        if self._lazy_attr:
+            return f"{self._lazy_module}:{self._lazy_attr}"
+        return self._lazy_module
+
+    def _lazy_load(self) -> Any:
+        target = self._lazy_target
+        if target is not None:
+            return target
+
+        with self._lazy_lock:
+            if self._lazy_target is None:
+                start = time.perf_counter()
+                module = importlib.import_module(self._lazy_module)
+                target = getattr(module, self._lazy_attr) if self._lazy_attr else module
+                elapsed = time.perf_counter() - start
+                _load_times[self._lazy_key] = elapsed
+                logger.debug(f"Lazy import of {self._lazy_key} took {elapsed * 1000:.1f}ms")
+                object.__setattr__(self, "_lazy_target", target)
+        return self._lazy_target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._lazy_load(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._lazy_load(), name, value)
+
+    def __call__(self, *args, **kwargs):
+        return self._lazy_load()(*args, **kwargs)
+
+    def __dir__(self):
+        return dir(self._lazy_load())
+
+    def __repr__(self) -> str:
+        if self._lazy_target is None:
+            return f"<lazy import {self._lazy_key} (not loaded)>"
+        return repr(self._lazy_target)
+
+
+def lazy_import(module_name: str, attribute: Optional[str] = None) -> Any:
+    """Return a proxy for ``module_name`` (or ``module_name.attribute``).
+
+    Args:
+        module_name: Fully qualified module name, e.g. ``"scipy.io.wavfile"``
+        attribute: Optional attribute to resolve from the module, e.g. ``"write"``
+
+    Returns:
+        A LazyImport proxy that behaves like the target once touched
+    """
+    return LazyImport(module_name, attribute)
+
+
+def is_available(module_name: str) -> bool:
+    """Check whether a module can be imported, without importing it.
+
+    Modules already present in ``sys.modules`` (including ones replaced by
+    test doubles, which have no ``__spec__``) count as available.
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name] is not None
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def is_loaded(proxy: Any) -> bool:
+    """Check whether a lazy proxy has already imported its target.
+
+    Non-proxy objects are always considered loaded.
+    """
+    if isinstance(proxy, LazyImport):
+        return proxy._lazy_target is not None
+    return True
+
+
+def get_lazy_load_times() -> Dict[str, float]:
+    """Get the seconds spent importing each lazily loaded target so far."""
+    return dict(_load_times)
@@ -0,0 +1,220 @@
+"""Persistent cache for slow system probes.
+
+Probes such as ``ffmpeg -version``, ``nvidia-smi``, ``git describe`` in the
+whisper/kokoro checkouts and ``dpkg -l`` only change when the underlying
+binaries change. Results are stored in ``~/.voicemode/cache/probes.json``
+together with a fingerprint of the files they depend on (path, mtime, size)
+and ``PATH``; an entry is reused only while its fingerprint still matches.
+
+Several processes (MCP servers, the daemon, ``voicemode diag``) share the
+file: writers hold an advisory lock while they read, modify and replace it,
+and readers reload it whenever it is replaced, so ``diag probes --clear``
+takes effect in processes that are already running.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from voice_mode.metrics import CACHE_HITS, CACHE_MISSES
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes are still atomic replaces
+    fcntl = None
+
+logger = logging.getLogger("voice-mode")
+
+PathLike = Union[str, Path, None]
+
+
+def fingerprint(*paths: PathLike) -> List[Any]:
+    """Build a fingerprint for a set of files.
+
+    Each path contributes ``[path, mtime_ns, size]`` (``None`` values when the
+    file does not exist), and the current ``PATH`` is always included so that
+    installing a binary earlier on the search path invalidates the entry.
+
+    Args:
+        *paths: Files or directories the probe result depends on
+
+    Returns:
+        JSON-serialisable fingerprint
+    """
+    parts: List[Any] = [os.environ.get("PATH", "")]
+    for path in paths:
+        if path is None:
+            parts.append(None)
+            continue
+        try:
+            st = os.stat(path)
+            parts.append([str(path), st.st_mtime_ns, st.st_size])
+        except OSError:
+            parts.append([str(path), None, None])
+    return parts
+
+
+class ProbeCache:
+    """JSON-file backed cache of probe results keyed by name and fingerprint.
+
+    The file is loaded lazily, reloaded when another process changes it and
+    rewritten atomically under a lock on every change, so concurrent
+    voicemode processes see each other's results and don't lose them.
+    """
+
+    def __init__(self, path: Optional[Path] = None, enabled: bool = True):
+        self.path = Path(path) if path else None
+        self.enabled = enabled and self.path is not None
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        # (inode, mtime, size) of the file the entries were read from; every
+        # save replaces the file, so the inode changes even within one mtime tick
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.RLock()
+
+    def _stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def _load(self, force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """The entries, reloaded if the file changed since they were read."""
+        stamp = self._stat()
+        if force or self._entries is None or stamp != self._stamp:
+            entries = {}
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    entries = data
+            except FileNotFoundError:
+                pass
+            except (OSError, ValueError) as e:
+                logger.debug(f"Ignoring unreadable probe cache {self.path}: {e}")
+            self._entries = entries
+            self._stamp = stamp
+        return self._entries
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        """Hold an exclusive advisory lock for a read-modify-write of the file."""
+        if fcntl is None:
+            yield
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            lock_file = open(self.path.with_name(f"{self.path.name}.lock"), "a")
+        except OSError as e:
+            logger.debug(f"Could not lock probe cache {self.path}: {e}")
+            yield
+            return
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self._stamp = self._stat()
+        except OSError as e:
+            logger.debug(f"Could not write probe cache {self.path}: {e}")
+
+    def lookup(self, key: str, fp: List[Any]) -> Tuple[bool, Any]:
+        """Look up a cached probe result.
+
+        Returns:
+            Tuple of (hit, value). ``value`` is only meaningful when ``hit`` is True.
+        """
+        if not self.enabled:
+            return False, None
+        with self._lock:
+            entry = self._load().get(key)
+        if entry is not None and entry.get("fingerprint") == fp:
+            CACHE_HITS.inc(cache="probe")
+            return True, entry.get("value")
+        CACHE_MISSES.inc(cache="probe")
+        return False, None
+
+    def set(self, key: str, fp: List[Any], value: Any) -> None:
+        """Store a probe result for the given fingerprint."""
+        if not self.enabled:
+            return
+        with self._lock, self._file_lock():
+            # Pick up entries written by other processes before rewriting the file
+            self._load(force=True)[key] = {
+                "fingerprint": fp,
+                "value": value,
+                "cached_at": time.time()
+            }
+            self._save()
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """Remove cached entries.
+
+        Args:
+            prefix: Only remove keys starting with this prefix (all if None)
+
+        Returns:
+            Number of entries removed
+        """
+        if not self.path:
+            return 0
+        with self._lock, self._file_lock():
+            entries = self._load(force=True)
+            keys = [k for k in entries if prefix is None or k.startswith(prefix)]
+            for key in keys:
+                del entries[key]
+            if keys:
+                self._save()
+        return len(keys)
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Get a copy of all cached entries."""
+        if not self.path:
+            return {}
+        with self._lock:
+            return dict(self._load(force=True))
+
+    def get_or_probe(self, key: str, fp: List[Any], probe: Callable[[], Any]) -> Any:
+        """Return the cached result for ``key`` or run ``probe`` and cache it.
+
+        Args:
+            key: Cache key, e.g. ``"ffmpeg_version"``
+            fp: Fingerprint from :func:`fingerprint`
+            probe: Zero-argument callable producing a JSON-serialisable result
+
+        Returns:
+            The cached or freshly probed value
+        """
+        hit, value = self.lookup(key, fp)
+        if hit:
+            logger.debug(f"Probe cache hit for {key}")
+            return value
+        value = probe()
+        self.set(key, fp, value)
+        return value
+
+
+_probe_cache: Optional[ProbeCache] = None
+
+
+def get_probe_cache() -> ProbeCache:
+    """Get the global probe cache (configured from VOICEMODE_PROBE_CACHE)."""
+    global _probe_cache
+    if _probe_cache is None:
+        from voice_mode.config import PROBE_CACHE_ENABLED, PROBE_CACHE_FILE
+        _probe_cache = ProbeCache(PROBE_CACHE_FILE, enabled=PROBE_CACHE_ENABLED)
+    return _probe_cache
@@ -5,7 +5,7 @@ import json
 import re
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from voice_mode.server import mcp
@@ -18,6 +18,35 @@ from voice_mode.utils.version_helpers import get_current_version
 logger = logging.getLogger("voice-mode")
 
 
+def _git_version_paths(git_dir: Path) -> List[Path]:
+    """Files whose change can change ``git describe --tags`` for a checkout."""
+    paths = [git_dir / "HEAD", git_dir / "index", git_dir / "packed-refs"]
+    # The branch HEAD points at moves on commit, pull or reset without touching HEAD
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        head = ""
+    if head.startswith("ref: "):
+        paths.append(git_dir / head[len("ref: "):])
+    # A fetch adds loose tags; a directory's mtime changes when an entry is added
+    tags_dir = git_dir / "refs" / "tags"
+    paths.append(tags_dir)
+    if tags_dir.is_dir():
+        paths.extend(sorted(path for path in tags_dir.rglob("*") if path.is_dir()))
+    return paths
+
+
+def _get_cached_version(install_dir: Path) -> Optional[str]:
+    """Get the git version of an installation, reusing the cached value until the checkout changes."""
+    from voice_mode.utils.probe_cache import fingerprint, get_probe_cache
+    
+    fp = fingerprint(*_git_version_paths(install_dir / ".git"))
+    return get_probe_cache().get_or_probe(
+        f"git_version:{install_dir}", fp,
+        lambda: get_current_version(install_dir)
+    )
+
+
 def get_whisper_version() -> Dict[str, Any]:
     """Get Whisper installation and version information."""
     info = {
@@ -49,7 +78,7 @@ def get_whisper_version() -> Dict[str, Any]:
                 whisper_dir = BASE_DIR / "whisper.cpp"
                 if whisper_dir.exists():
                     # Get version using version helper
-                    version = get_current_version(whisper_dir)
+                    version = _get_cached_version(whisper_dir)
                     if version:
                         info["version"] = version
                     
@@ -121,7 +150,7 @@ def get_kokoro_version() -> Dict[str, Any]:
             
             # Try to get version from git
             try:
-                version = get_current_version(Path(kokoro_dir))
+                version = _get_cached_version(Path(kokoro_dir))
                 if version:
                     info["version"] = version
             except:
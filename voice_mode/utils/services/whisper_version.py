@@ -32,6 +32,23 @@ def get_whisper_version_info() -> Dict[str, Any]:
     if not whisper_cli.exists():
         return info
     
+    from voice_mode.utils.probe_cache import fingerprint, get_probe_cache
+    
+    # Reuse the previous answer until the binary, checkout or build config changes
+    fp = fingerprint(
+        whisper_cli,
+        whisper_dir / ".git" / "HEAD",
+        whisper_dir / ".git" / "index",
+        whisper_dir / "build" / "CMakeCache.txt"
+    )
+    return get_probe_cache().get_or_probe(
+        "whisper_version_info", fp,
+        lambda: _probe_whisper_version_info(whisper_dir, whisper_cli, info)
+    )
+
+
+def _probe_whisper_version_info(whisper_dir: Path, whisper_cli: Path, info: Dict[str, Any]) -> Dict[str, Any]:
+    """Run git and whisper-cli to fill in version and capability info."""
     try:
         # Get version from git if available
         if (whisper_dir / ".git").exists():